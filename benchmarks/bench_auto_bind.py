@@ -0,0 +1,88 @@
+"""Benchmark: auto-binding, per-PRG scans vs the settlement-grouped batch.
+
+The reference is the previous auto_bind_all_prg flow: a candidate scan over
+all consumers per PRG, then bind_prg_to_settlement() per PRG (another scan).
+It is timed on a slice of the PRGs and extrapolated. Equality of the two is
+covered by tests/test_binding_service.py.
+
+Usage:
+    python benchmarks/bench_auto_bind.py [population_rows]
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import BindingService, ValidationService
+from prg.data import parse_prg_bindings
+from benchmarks.synthetic_workbook import build_records
+
+
+def reference_candidates(validation, prg_data, consumers):
+    prg_to_process = []
+    for prg in prg_data:
+        in_location = [
+            c for c in consumers
+            if c['mo'].strip().lower() == prg['mo'].strip().lower()
+            and c['settlement'].strip().lower() == prg['settlement'].strip().lower()
+            and not parse_prg_bindings(c.get('code', ''))
+            and validation.has_expenses(c)
+        ]
+        if in_location:
+            prg_to_process.append({'prg': prg, 'consumers': in_location})
+    return prg_to_process
+
+
+def reference_bind(service, validation, prgs, consumers, grs_data):
+    totals = [0, 0, 0]
+    changes = []
+    for prg in prgs:
+        grs_name = validation.get_grs_name_by_id(grs_data, prg.get('grs_id', ''))
+        result = service.bind_prg_to_settlement(
+            prg, {'mo': prg['mo'], 'settlement': prg['settlement']}, consumers, grs_name, share=1.0)
+        totals[0] += result.success_count
+        totals[1] += result.skipped_count + result.already_bound_count
+        totals[2] += len(result.errors)
+        changes.extend(result.changes)
+    return totals, changes
+
+
+def batch(service, prg_data, consumers, grs_data):
+    candidates = service.find_auto_bind_candidates(prg_data, consumers)
+    result = service.bind_prgs_to_settlements([c['prg'] for c in candidates], consumers, grs_data)
+    totals = [result.success_count, result.skipped_count + result.already_bound_count, len(result.errors)]
+    return candidates, totals, result.changes
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    validation = ValidationService()
+    service = BindingService(validation)
+
+    data = build_records(n_population=n_population)
+    ref_consumers = copy.deepcopy(data['consumers'])
+    sample = data['prg'][:100]
+    _, ref_scan_s = timed(lambda: reference_candidates(validation, sample, ref_consumers))
+    _, ref_bind_s = timed(lambda: reference_bind(service, validation, sample, ref_consumers, data['grs']))
+    reference_s = (ref_scan_s + ref_bind_s) * len(data['prg']) / len(sample)
+    (candidates, totals, _), batch_s = timed(lambda: batch(service, data['prg'], data['consumers'], data['grs']))
+
+    print("=" * 70)
+    print(f"AUTO-BINDING ({len(data['prg'])} PRG, {len(data['consumers'])} consumers)")
+    print("=" * 70)
+    print(f"  per-PRG scans (extrapolated): {reference_s:8.1f} s")
+    print(f"  settlement-grouped batch:     {batch_s:8.2f} s  ({reference_s / batch_s:.0f}x)")
+    print(f"  PRG processed: {len(candidates)}, bound: {totals[0]}, skipped: {totals[1]}, errors: {totals[2]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: memory of binding strings and parsed bindings, interned vs not.
+
+Consumers are loader-shaped records whose binding strings repeat on many
+rows (one string per settlement). Codes are first given as separate string
+objects per row, as pandas returns them, then interned the way the loader
+does it now. Parsed bindings of all consumers are kept alive, as the
+services and the UI do, and traced with tracemalloc. Equality of the
+decoded results is covered by tests/test_binding_codec.py.
+
+Usage:
+    python benchmarks/bench_binding_codec.py [population_rows]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.data import BindingCodec, intern_string_column, parse_share_from_excel
+from benchmarks.synthetic_workbook import build_records
+
+
+def reference_parse(binding_string):
+    """Previous parse_prg_bindings: a fresh list of dicts per call."""
+    if not binding_string or binding_string.strip() == '':
+        return []
+    bindings = []
+    for part in binding_string.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        components = part.split('|')
+        if len(components) >= 3:
+            bindings.append({
+                'prg_id': components[0].strip(),
+                'share': parse_share_from_excel(components[1].strip()),
+                'grs_name': '|'.join(components[2:]).strip()
+            })
+    return bindings
+
+
+def traced(func):
+    """Run func, return (result, retained bytes, seconds)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    consumers = build_records(n_population=n_population)['consumers']
+    raw_codes = [c['code'] for c in consumers]
+
+    per_row, per_row_mb, _ = traced(lambda: [code.encode().decode() for code in raw_codes])
+    interned, interned_mb, _ = traced(lambda: intern_string_column(pd.Series(per_row, dtype=object)).tolist())
+
+    codec = BindingCodec()
+    ref, ref_mb, ref_s = traced(lambda: [reference_parse(code) for code in per_row])
+    decoded, decoded_mb, decoded_s = traced(lambda: [codec.decode(code) for code in interned])
+    stats = codec.get_stats()
+
+    mb = 1024 * 1024
+    print("=" * 70)
+    print(f"BINDING CODEC ({len(consumers)} consumers, {len(set(raw_codes))} distinct binding strings)")
+    print("=" * 70)
+    print(f"  binding strings:  per row {per_row_mb / mb:7.1f} MB | interned {interned_mb / mb:6.2f} MB")
+    print(f"  parsed bindings:  per row {ref_mb / mb:7.1f} MB | codec    {decoded_mb / mb:6.2f} MB "
+          f"({ref_mb / decoded_mb:.0f}x)")
+    print(f"  parse time:       per row {ref_s:7.2f} s  | codec    {decoded_s:6.2f} s")
+    print(f"  codec: {stats['parses']} parses, {stats['hits']} hits, {stats['strings']} interned strings")
+
+
+if __name__ == '__main__':
+    main()
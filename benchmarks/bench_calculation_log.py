@@ -0,0 +1,83 @@
+"""Benchmark: calculation log cost, eager strings vs structured entries vs fast mode.
+
+The eager variant renders every log line right after the calculation, as
+calculate_prg_loads used to. Memory is the traced size of the kept log.
+Paging renders only the lines of one page; the rendered format is covered
+by tests/test_calculation_details.py and tests/test_load_matrix.py.
+
+Usage:
+    python benchmarks/bench_calculation_log.py [population_rows]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import CalculationService, ValidationService
+from prg.data import DataStore
+from benchmarks.synthetic_workbook import build_records
+
+PAGE_SIZE = 500
+
+
+def traced(func):
+    """Run func untraced for time, then traced for memory; return (result, retained bytes, seconds)."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    data = build_records(n_population=n_population, n_organizations=200000)
+    prg_data, consumers = data['prg'], data['consumers']
+    store = DataStore(prg_data, data['grs'], consumers)
+    service = CalculationService(ValidationService(store), store)
+    service.calculate_prg_loads(prg_data, consumers, record_details=False)  # warm the binding cache
+
+    _, fast_mb, fast_s = traced(lambda: service.calculate_prg_loads(prg_data, consumers, record_details=False))
+    lazy, lazy_mb, lazy_s = traced(lambda: service.calculate_prg_loads(prg_data, consumers))
+
+    def eager():
+        """Every line formatted right away, like the previous inline f-strings."""
+        result = service.calculate_prg_loads(prg_data, consumers)
+        details = result.details
+        lines = []
+        for index, column, share, yearly_load, hourly_load in zip(
+                details._consumer_indexes.tolist(), details._prg_columns.tolist(), details._shares.tolist(),
+                details._yearly_loads.tolist(), details._hourly_loads.tolist()):
+            consumer = consumers[index]
+            lines.append(
+                f"{consumer.get('name', 'Unknown')} (тип: {consumer.get('type')}) -> "
+                f"ПРГ {details.prg_ids[column]}: доля {share:.3f}, годовая {yearly_load:.3f}, "
+                f"часовая {hourly_load:.3f}"
+            )
+        result.details = None
+        return result, lines
+
+    _, eager_mb, eager_s = traced(eager)
+
+    start = time.perf_counter()
+    lazy.details.render_page(len(lazy.details) // 2, PAGE_SIZE)
+    page_s = time.perf_counter() - start
+
+    mb = 1024 * 1024
+    print("=" * 70)
+    print(f"CALCULATION LOG ({len(consumers)} consumers, {lazy.processed_bindings} bindings)")
+    print("=" * 70)
+    print(f"  eager text log:     {eager_s:6.2f} s, log {eager_mb / mb:7.1f} MB")
+    print(f"  structured entries: {lazy_s:6.2f} s, log {lazy_mb / mb:7.1f} MB")
+    print(f"  fast mode (no log): {fast_s:6.2f} s, log {fast_mb / mb:7.1f} MB")
+    print(f"  render one page ({PAGE_SIZE} lines): {page_s * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark: journaling pending changes, fsync per change vs per operation.
+
+A session of single binding edits (one change each) and PRG load
+calculations (six changes per PRG each) is journaled twice: syncing after
+every change, and syncing once per operation through ChangeJournal. The
+journal is then read back as on the next start. Replay, also after a
+crash tore the last line, is covered by tests/test_change_wal.py.
+
+Usage:
+    python benchmarks/bench_change_wal.py [binding_edits] [prg_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.data import ChangeJournal, ChangeWAL
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def make_session(n_edits, n_prg, n_calculations=3):
+    """Operations as lists of change dictionaries, like the UI records them."""
+    rnd = random.Random(11)
+    operations = []
+    for i in range(n_edits):
+        row = rnd.randrange(10, 400000)
+        operations.append([{
+            'change_id': f"manual_bind_{row}_{i}",
+            'type': 'manual_bind',
+            'consumer_id': f"pop_{row}",
+            'sheet_name': 'Население',
+            'row': row,
+            'col': 12,
+            'new_value': f"PRG-{rnd.randrange(n_prg)}|0.5|ГРС Станция {rnd.randrange(60)}",
+            'old_value': '',
+            'description': f"Привязка: Потребитель {row} → ПРГ (доля: 0.500)",
+        }])
+        if (i + 1) % (n_edits // n_calculations) == 0:
+            operations.append([{
+                'change_id': f"prg_load_{p}_{field}_{i}",
+                'type': 'prg_load',
+                'prg_id': f"PRG-{p}",
+                'sheet_name': 'ПРГ',
+                'row': 9 + p,
+                'col': 4 + k,
+                'new_value': round(rnd.uniform(0, 1e6), 4),
+                'old_value': 0.0,
+                'description': f"Нагрузка ПРГ PRG-{p}: {field}",
+            } for p in range(n_prg) for k, field in enumerate(('QY_pop', 'QH_pop', 'QY_ind', 'QH_ind',
+                                                               'Year_volume', 'Max_Hour'))])
+    return operations
+
+
+def main():
+    n_edits = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_prg = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    operations = make_session(n_edits, n_prg)
+    changes = [change for operation in operations for change in operation]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workbook = Path(tmp) / 'workbook.xlsx'
+        workbook.write_bytes(os.urandom(1 << 20))
+
+        per_change = ChangeWAL(Path(tmp) / 'per_change')
+        per_change.start(workbook)
+
+        def sync_every_change():
+            for change in changes:
+                per_change.append(change)
+                per_change.sync()
+
+        _, per_change_s = timed(sync_every_change)
+        per_change.close()
+
+        wal = ChangeWAL(Path(tmp) / 'batched')
+        wal.start(workbook)
+        journal = ChangeJournal(wal)
+        _, batched_s = timed(lambda: [journal.record_all(operation) for operation in operations])
+        stats = wal.get_stats()
+        wal.close()
+
+        pending, replay_s = timed(lambda: wal.read(workbook))
+        restored = ChangeJournal()
+        _, restore_s = timed(lambda: restored.restore(pending['changes']))
+        size = wal._journal_path(workbook).stat().st_size
+
+        print("=" * 70)
+        print(f"CHANGE JOURNAL ({len(operations)} operations, {len(changes)} changes)")
+        print("=" * 70)
+        print(f"  fsync per change:     {per_change_s:7.2f} s  ({len(changes)} syncs)")
+        print(f"  fsync per operation:  {batched_s:7.2f} s  ({stats['syncs']} syncs, "
+              f"{per_change_s / batched_s:.1f}x)")
+        print(f"  journal size:         {size / 1024 / 1024:7.2f} MB ({size / len(changes):.0f} bytes per change)")
+        print(f"  read on next start:   {replay_s:7.2f} s, coalesce {restore_s:.2f} s "
+              f"({len(restored)} pending cells)")
+
+
+if __name__ == '__main__':
+    main()
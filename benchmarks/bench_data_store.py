@@ -0,0 +1,66 @@
+"""Benchmark: service lookups with and without the DataStore indexes.
+
+Equality of indexed lookups and linear scans, also after binding changes,
+is covered by tests/test_data_store.py.
+
+Usage:
+    python benchmarks/bench_data_store.py [population_rows]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import SearchService, ValidationService
+from prg.data import DataStore, parse_prg_bindings
+from benchmarks.synthetic_workbook import build_records
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def scan_bound(consumers, prg_id):
+    return [c for c in consumers if any(b['prg_id'] == prg_id for b in parse_prg_bindings(c.get('code', '')))]
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = build_records(n_population=n_population)
+    prg_data, grs_data, consumers = data['prg'], data['grs'], data['consumers']
+    rnd = random.Random(1)
+    targets = [rnd.choice(consumers) for _ in range(200)]
+    prg_ids = [rnd.choice(prg_data)['prg_id'] for _ in range(200)]
+
+    store, build_s = timed(lambda: DataStore(prg_data, grs_data, consumers))
+    _, bind_index_s = timed(lambda: store.find_consumers_by_prg_id('ПРГ-0'))
+
+    plain = SearchService(ValidationService())
+    indexed = SearchService(ValidationService(store), store)
+
+    def by_location(service):
+        return [service.find_consumers_by_location(consumers, t['mo'], t['settlement']).matches for t in targets]
+
+    _, plain_s = timed(lambda: by_location(plain))
+    _, indexed_s = timed(lambda: by_location(indexed))
+
+    _, scan_prg_s = timed(lambda: [scan_bound(consumers, p) for p in prg_ids[:20]])
+    _, index_prg_s = timed(lambda: [store.find_consumers_by_prg_id(p) for p in prg_ids[:20]])
+
+    print("=" * 70)
+    print(f"DATA STORE ({len(prg_data)} PRG, {len(consumers)} consumers)")
+    print("=" * 70)
+    print(f"  build indexes:                 {build_s:7.3f} s (+{bind_index_s:.3f} s binding index on first use)")
+    print(f"  200 settlement lookups:  scan  {plain_s:7.3f} s | indexed {indexed_s:7.4f} s "
+          f"({plain_s / indexed_s:.0f}x)")
+    print(f"  20 bound-consumer lookups: scan {scan_prg_s:6.3f} s | indexed {index_prg_s:7.4f} s "
+          f"({scan_prg_s / index_prg_s:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: ExcelLoader.load_all_data modes on a synthetic workbook.
+
+Equality of the outputs is covered by tests/test_excel_loader.py.
+
+Usage:
+    python benchmarks/bench_excel_loading.py [population_rows]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader
+from benchmarks.synthetic_workbook import build_workbook
+from benchmarks import iterrows_reference
+
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f} s")
+    return result, elapsed
+
+
+def main():
+    population_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    settings_manager = SettingsManager(str(Path(__file__).resolve().parent.parent / 'prg_settings.json'))
+    loader = ExcelLoader(settings_manager)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'synthetic.xlsx'
+        print(f"Building workbook with {population_rows} population rows...")
+        build_workbook(path, settings_manager, n_population=population_rows,
+                       n_organizations=population_rows // 10)
+        print(f"Workbook size: {path.stat().st_size / 1e6:.1f} MB\n")
+
+        print("=" * 70)
+        print("LOAD_ALL_DATA MODES")
+        print("=" * 70)
+        per_sheet, t_per_sheet = timed('per_sheet', loader.load_all_data, path, mode='per_sheet')
+        single, t_single = timed('single_pass', loader.load_all_data, path, mode='single_pass')
+
+        print(f"\n  single_pass speedup: {t_per_sheet / t_single:.2f}x")
+
+        print("\n" + "=" * 70)
+        print("SHEET READ AND PARSE: full read + iterrows vs projected read + columnar")
+        print("=" * 70)
+        table = lambda t: settings_manager.get_table_settings(t)
+        sheet_names = [table(t)['sheet'] for t in ('prg', 'grs', 'population', 'organizations')]
+        full, _ = timed('full sheet read', pd.read_excel, path, sheet_name=sheet_names, header=None)
+        frames, _ = timed('projected read (read_sheets)', loader.read_sheets, path)
+        full_mb = sum(df.memory_usage(deep=True).sum() for df in full.values()) / 1e6
+        projected_mb = sum(df.memory_usage(deep=True).sum() for df in frames.values()) / 1e6
+        print(f"  {'frame memory':<28} {full_mb:8.1f} MB full, {projected_mb:.1f} MB projected\n")
+
+        full = {t: full[table(t)['sheet']] for t in ('prg', 'grs', 'population', 'organizations')}
+        cases = [
+            ('prg', lambda: iterrows_reference.load_prg(full['prg'], table('prg')),
+             lambda: loader.load_prg_data(path, frames['prg'])),
+            ('grs', lambda: iterrows_reference.load_grs(full['grs'], table('grs')),
+             lambda: loader.load_grs_data(path, frames['grs'])),
+            ('population', lambda: iterrows_reference.load_consumers(
+                full['population'], table('population'), organizations=False),
+             lambda: loader.load_population_data(path, frames['population'])),
+            ('organizations', lambda: iterrows_reference.load_consumers(
+                full['organizations'], table('organizations'), organizations=True),
+             lambda: loader.load_organization_data(path, frames['organizations'])),
+        ]
+        for name, reference, columnar in cases:
+            _, t_reference = timed(f"{name} iterrows", reference)
+            _, t_columnar = timed(f"{name} columnar", columnar)
+            print(f"  {'':<28} speedup {t_reference / t_columnar:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark: fuzzy street search vs substring search on inconsistent names.
+
+Organization names spell their street in several ways ("ул.Ленина",
+"улица Ленина", "УЛ. «Ленина»", ё written as е, the odd typo). Each query
+asks for one street of one settlement, as typed in SmartSearchDialog.
+Reports how many of the organizations on that street each mode finds
+(recall), how many fuzzy matches are on another street, and query time
+with the name index built and while building it.
+
+Usage:
+    python benchmarks/bench_fuzzy_search.py [organizations] [settlements] [queries]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import SearchService, ValidationService
+from prg.data import DataStore
+from benchmarks.synthetic_workbook import build_records
+
+STREETS = ['Ленина', 'Мира', 'Советская', 'Гагарина', 'Школьная', 'Садовая', 'Лётчиков',
+           'Молодёжная', 'Первомайская', 'Октябрьская', 'Пушкина', 'Зелёная']
+
+
+def typo(word, rnd):
+    """Drop, double or swap one letter."""
+    i = rnd.randrange(1, len(word) - 1)
+    kind = rnd.randrange(3)
+    if kind == 0:
+        return word[:i] + word[i + 1:]
+    if kind == 1:
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def spell(street, rnd):
+    """Street as it may appear in an organization name."""
+    if rnd.random() < 0.5:
+        street = street.replace('ё', 'е')
+    if rnd.random() < 0.05:
+        street = typo(street, rnd)
+    spelled = rnd.choice([f"ул.{street}", f"ул. {street}", f"улица {street}", f"ул. «{street}»",
+                          f'ул."{street}"', f"{street} ул."])
+    return spelled.upper() if rnd.random() < 0.1 else spelled
+
+
+def main():
+    n_organizations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_settlements = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    n_queries = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    data = build_records(n_population=1000, n_organizations=n_organizations, n_settlements=n_settlements)
+    consumers = data['consumers']
+    rnd = random.Random(3)
+    truth = {}
+    for consumer in consumers:
+        if consumer['type'] == 'Организация':
+            street = rnd.choice(STREETS)
+            consumer['name'] = f'ООО "Фирма {consumer["excel_row"]}", {spell(street, rnd)}, {rnd.randrange(1, 90)}'
+            truth[consumer['id']] = street
+    store = DataStore(data['prg'], data['grs'], consumers)
+    service = SearchService(ValidationService(store), store)
+
+    organizations = [c for c in consumers if c['type'] == 'Организация']
+    queries = []
+    for organization in (rnd.choice(organizations) for _ in range(n_queries)):
+        street = rnd.choice(STREETS)
+        queries.append((organization['mo'], organization['settlement'], street,
+                        rnd.choice([street, f"ул. {street}", f"улица {street.replace('ё', 'е')}"])))
+
+    def run(fuzzy, timings):
+        found = []
+        for mo, settlement, street, query in queries:
+            start = time.perf_counter()
+            result = service.smart_search_organizations(
+                consumers, mo, settlement, street if not fuzzy else query, require_expenses=False, fuzzy=fuzzy)
+            timings.append((time.perf_counter() - start) * 1000)
+            found.append(result.matches)
+        return found
+
+    build_ms, exact_ms, fuzzy_ms = [], [], []
+    run(True, build_ms)
+    exact = run(False, exact_ms)
+    fuzzy = run(True, fuzzy_ms)
+
+    expected = hits_exact = hits_fuzzy = wrong_fuzzy = 0
+    for (mo, settlement, street, _), exact_matches, fuzzy_matches in zip(queries, exact, fuzzy):
+        wanted = {c['id'] for c in store.find_consumers_by_location(mo, settlement, 'Организация')
+                  if truth[c['id']] == street}
+        expected += len(wanted)
+        hits_exact += len(wanted & {c['id'] for c in exact_matches})
+        hits_fuzzy += len(wanted & {c['id'] for c in fuzzy_matches})
+        wrong_fuzzy += len({c['id'] for c in fuzzy_matches} - wanted)
+
+    print("=" * 70)
+    print(f"FUZZY STREET SEARCH ({len(organizations)} organizations, {n_settlements} settlements, "
+          f"{len(queries)} queries)")
+    print("=" * 70)
+    print(f"  substring: recall {hits_exact / expected:6.1%}, "
+          f"{statistics.mean(exact_ms):6.3f} ms per query")
+    print(f"  fuzzy:     recall {hits_fuzzy / expected:6.1%}, {wrong_fuzzy} matches on another street, "
+          f"{statistics.mean(fuzzy_ms):6.3f} ms per query (max {max(fuzzy_ms):.3f} ms)")
+    print(f"  fuzzy, building the index: {statistics.mean(build_ms):6.3f} ms per query "
+          f"(max {max(build_ms):.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: incremental reload after editing only the organizations sheet.
+
+The synthetic workbook is first re-saved with openpyxl, so both versions
+come from the same writer (as when colleagues keep saving from Excel). It
+is then edited and re-saved, which rewrites every part of the package
+including the shared string table, and reloaded both fully and
+incrementally. Equality of the merged data and the full reload is covered
+by tests/test_incremental_reload.py.
+
+Usage:
+    python benchmarks/bench_incremental_reload.py [population_rows]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader
+from prg.utils import col_to_index
+from benchmarks.synthetic_workbook import build_workbook
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    settings_manager = SettingsManager(str(Path(__file__).resolve().parent.parent / 'prg_settings.json'))
+    loader = ExcelLoader(settings_manager)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'workbook.xlsx'
+        build_workbook(path, settings_manager, n_population=n_population)
+        wb = load_workbook(path)
+        wb.save(path)
+        wb.close()
+        data = loader.load_all_data(path)
+
+        org_settings = settings_manager.get_table_settings('organizations')
+        wb = load_workbook(path)
+        ws = wb[org_settings['sheet']]
+        row = int(org_settings['start_row'])
+        ws.cell(row=row, column=col_to_index(org_settings['name_col']) + 1, value='ООО "Новая фирма"')
+        wb.save(path)
+        wb.close()
+
+        full, full_s = timed(lambda: ExcelLoader(settings_manager).load_all_data(path))
+        changed, reload_s = timed(lambda: loader.reload_changed(path, data))
+        _, noop_s = timed(lambda: loader.reload_changed(path, data))
+
+        print("=" * 70)
+        print(f"INCREMENTAL RELOAD ({len(full['consumers'])} consumers)")
+        print("=" * 70)
+        print(f"  changed tables:       {', '.join(changed)}")
+        print(f"  full reload:          {full_s:7.2f} s")
+        print(f"  incremental reload:   {reload_s:7.2f} s  ({full_s / reload_s:.1f}x)")
+        print(f"  unchanged workbook:   {noop_s:7.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: keeping PRG loads current, full recompute vs live deltas.
+
+A mix of binding edits (single binds with partial shares, unbinds, PRG
+removals, settlement binds) is applied through BindingService. The
+reference recomputes all loads after every edit; the live accumulators
+apply only each edit's delta. Equality of live loads and a full
+recompute is covered by tests/test_live_loads.py.
+
+Usage:
+    python benchmarks/bench_live_loads.py [population_rows] [edits]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import BindingService, CalculationService, ValidationService
+from prg.data import DataStore
+from benchmarks.synthetic_workbook import build_records
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def edit(service, rnd, prg_data, consumers):
+    consumer = rnd.choice(consumers)
+    prg = rnd.choice(prg_data)
+    action = rnd.randrange(4)
+    if action == 0:
+        service.bind_single_consumer(consumer, prg, 'ГРС Станция 0', rnd.choice((0.25, 0.5, 1.0)), force=True)
+    elif action == 1:
+        service.unbind_single_consumer(consumer)
+    elif action == 2 and consumer.get('code'):
+        service.remove_prg_from_consumer(consumer, consumer['code'].split('|', 1)[0])
+    else:
+        service.bind_prg_to_settlement(prg, consumer, consumers, 'ГРС Станция 0', 0.5)
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_edits = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    data = build_records(n_population=n_population)
+    prg_data, consumers = data['prg'], data['consumers']
+    store = DataStore(prg_data, data['grs'], consumers)
+    validation = ValidationService(store)
+    calculation = CalculationService(validation, store)
+    binding = BindingService(validation, store, calculation)
+
+    _, start_s = timed(lambda: calculation.start_live_loads(consumers))
+    _, full_s = timed(lambda: calculation.calculate_prg_loads(prg_data, consumers))
+
+    rnd = random.Random(3)
+    _, edits_s = timed(lambda: [edit(binding, rnd, prg_data, consumers) for _ in range(n_edits)])
+    # Settlement binds scan their settlement; the live delta part alone:
+    sample = [rnd.choice(consumers) for _ in range(n_edits)]
+    _, delta_s = timed(lambda: [calculation.apply_binding_change(c, '', c.get('code', '')) for c in sample])
+    for consumer in sample:
+        calculation.apply_binding_change(consumer, consumer.get('code', ''), '')
+
+    print("=" * 70)
+    print(f"LIVE PRG LOADS ({len(consumers)} consumers, {n_edits} binding edits)")
+    print("=" * 70)
+    print(f"  initial full calculation:       {start_s:8.2f} s")
+    print(f"  recompute after every edit:     {full_s * n_edits:8.1f} s (extrapolated, {full_s:.2f} s each)")
+    print(f"  edits with live deltas:         {edits_s:8.2f} s (binding work included)")
+    print(f"  load delta per binding change:  {delta_s / n_edits * 1e6:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark: search-as-you-type, blocking queries vs LiveSearch.
+
+Types street names into the smart search one key at a time (every
+TYPING_MS) for random settlements, as a user of SmartSearchDialog would.
+The blocking variant runs the search in the key handler; LiveSearch
+debounces the keys and runs queries on its worker thread. The Tk event
+loop is replaced by a small after()-scheduler running in this thread, so
+no display is needed. Reported: the longest event loop callback (what
+typing would stall for), the time from the last key to the first result
+rows, and how many queries ran. Debouncing, superseding and row chunks
+are covered by tests/test_live_search.py.
+
+Usage:
+    python benchmarks/bench_live_search.py [organizations] [streets_typed]
+"""
+
+import heapq
+import itertools
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import SearchService, ValidationService
+from prg.data import DataStore
+from prg.ui.dialogs.live_search import LiveSearch
+from benchmarks.synthetic_workbook import build_records
+
+TYPING_MS = 80
+STREETS = ['Ленина', 'Молодёжная', 'Советская', 'Первомайская', 'Гагарина', 'Октябрьская']
+
+
+class EventLoop:
+    """after()/after_cancel() of a Tk widget, with callback durations recorded."""
+
+    def __init__(self):
+        self._tasks = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+        self.durations = []
+
+    def after(self, ms, func):
+        task_id = next(self._ids)
+        heapq.heappush(self._tasks, (time.perf_counter() + ms / 1000, task_id, func))
+        return task_id
+
+    def after_cancel(self, task_id):
+        self._cancelled.add(task_id)
+
+    def run(self):
+        while self._tasks:
+            due, task_id, func = heapq.heappop(self._tasks)
+            if task_id in self._cancelled:
+                continue
+            time.sleep(max(0.0, due - time.perf_counter()))
+            start = time.perf_counter()
+            func()
+            self.durations.append((time.perf_counter() - start) * 1000)
+
+
+def type_streets(loop, sessions, on_key):
+    """Schedule key presses: each session types its street, then pauses."""
+    at = 0
+    for session, (mo, settlement, street) in enumerate(sessions):
+        for length in range(1, len(street) + 1):
+            loop.after(at, lambda s=session, q=(mo, settlement, street[:length], True): on_key(s, q))
+            at += TYPING_MS
+        at += 1000
+
+
+def main():
+    n_organizations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    data = build_records(n_population=1000, n_organizations=n_organizations, n_settlements=100)
+    consumers = data['consumers']
+    store = DataStore(data['prg'], data['grs'], consumers)
+    service = SearchService(ValidationService(store), store)
+    rnd = random.Random(4)
+    organizations = [c for c in consumers if c['type'] == 'Организация']
+    sessions = [(o['mo'], o['settlement'], rnd.choice(STREETS)) for o in rnd.sample(organizations, n_sessions)]
+
+    def search(query):
+        return service.smart_search_organizations(consumers, *query[:3], require_expenses=True, fuzzy=query[3])
+
+    # Blocking: search and fill the list in the key handler
+    blocking = EventLoop()
+    shown = []
+    type_streets(blocking, sessions, lambda session, query: shown.extend(search(query).matches))
+    blocking.run()
+
+    # LiveSearch: debounced, worker thread, rows in chunks
+    live_loop = EventLoop()
+    last_key = {}
+    first_rows = {}
+    current = {}
+
+    def on_key(session, query):
+        last_key[session] = time.perf_counter()
+        current['session'] = session
+        live.request(query)
+
+    def on_result(query, result):
+        first_rows.setdefault(current['session'], time.perf_counter())
+
+    live = LiveSearch(live_loop, search, on_result, lambda rows: None)
+    type_streets(live_loop, sessions, on_key)
+    live_loop.run()
+    stats = live.get_stats()
+    live.close()
+
+    latencies = [(first_rows[s] - last_key[s]) * 1000 for s in first_rows]
+
+    print("=" * 70)
+    print(f"SEARCH AS YOU TYPE ({len(organizations)} organizations, {n_sessions} streets typed, "
+          f"{stats['requested']} keys, fuzzy)")
+    print("=" * 70)
+    print(f"  blocking:    longest callback {max(blocking.durations):7.2f} ms, "
+          f"{stats['requested']} queries run in key handlers")
+    print(f"  LiveSearch:  longest callback {max(live_loop.durations):7.2f} ms, "
+          f"{stats['started']} queries run ({stats['skipped']} superseded before start, "
+          f"{stats['dropped']} results dropped)")
+    print(f"  last key -> first rows: mean {statistics.mean(latencies):6.1f} ms, max {max(latencies):6.1f} ms "
+          f"(debounce {live.delay_ms} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: PRG load calculation, per-binding dict accumulation vs LoadMatrix.
+
+The reference is the previous calculate_prg_loads loop (nested dict updates
+per binding). Equality of the two is covered by tests/test_load_matrix.py.
+The default dataset has about 1M bindings.
+
+Usage:
+    python benchmarks/bench_load_matrix.py [population_rows] [organization_rows]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import CalculationService, CalculationResult, LoadMatrix, ValidationService
+from prg.data import DataStore, consumer_bindings
+from benchmarks.synthetic_workbook import build_records
+
+
+def reference_loads(service, consumer_data):
+    """Previous calculate_prg_loads body (detail lines returned in result.details as text)."""
+    result = CalculationResult()
+    result.details = []
+    for consumer in consumer_data:
+        expenses = service._get_expenses(consumer)
+        if not expenses or (expenses.get('yearly', 0) == 0 and expenses.get('hourly', 0) == 0):
+            continue
+        bindings = consumer_bindings(consumer, service.data_store)
+        if not bindings:
+            continue
+        result.processed_consumers += 1
+        is_population = (consumer.get('type') == 'Население')
+        is_organization = (consumer.get('type') == 'Организация')
+        for binding in bindings:
+            prg_id = binding['prg_id']
+            share = binding['share']
+            if prg_id not in result.prg_loads:
+                result.prg_loads[prg_id] = {'QY_pop': 0.0, 'QH_pop': 0.0, 'QY_ind': 0.0, 'QH_ind': 0.0}
+            yearly_load = expenses['yearly'] * share
+            hourly_load = expenses['hourly'] * share
+            if is_population:
+                result.prg_loads[prg_id]['QY_pop'] += yearly_load
+                result.prg_loads[prg_id]['QH_pop'] += hourly_load
+            elif is_organization:
+                result.prg_loads[prg_id]['QY_ind'] += yearly_load
+                result.prg_loads[prg_id]['QH_ind'] += hourly_load
+            result.processed_bindings += 1
+            result.details.append(
+                f"{consumer.get('name', 'Unknown')} (тип: {consumer.get('type')}) -> "
+                f"ПРГ {prg_id}: доля {share:.3f}, годовая {yearly_load:.3f}, "
+                f"часовая {hourly_load:.3f}"
+            )
+    result.updated_prg_count = len(result.prg_loads)
+    return result
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    n_organizations = int(sys.argv[2]) if len(sys.argv) > 2 else 680000
+    data = build_records(n_prg=5000, n_population=n_population, n_organizations=n_organizations)
+    prg_data, consumers = data['prg'], data['consumers']
+    store = DataStore(prg_data, data['grs'], consumers)
+    validation = ValidationService(store)
+    service = CalculationService(validation, store)
+    service.calculate_prg_loads(prg_data, consumers)  # warm the binding cache for both runs
+
+    ref, ref_s = timed(lambda: reference_loads(service, consumers))
+    new, new_s = timed(lambda: service.calculate_prg_loads(prg_data, consumers))
+
+    # Matrix product alone
+    rows = [(c, service._get_expenses(c), consumer_bindings(c, store)) for c in consumers]
+    rows = [row for row in rows if row[1] and row[2]]
+    matrix = LoadMatrix([c for c, _, _ in rows], [e['yearly'] for _, e, _ in rows],
+                        [e['hourly'] for _, e, _ in rows], [b for _, _, b in rows])
+    _, product_s = timed(matrix.loads)
+
+    print("=" * 70)
+    print(f"PRG LOADS ({len(consumers)} consumers, {new.processed_bindings} bindings, "
+          f"{new.updated_prg_count} PRG)")
+    print("=" * 70)
+    print(f"  dict accumulation:  {ref_s:7.2f} s")
+    print(f"  LoadMatrix:         {new_s:7.2f} s  ({ref_s / new_s:.2f}x)")
+    print(f"  S^T @ E product:    {product_s:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: smart organization search, scans vs the organization name index.
+
+Runs street queries of SmartSearchDialog (full street names, fragments and
+two-letter prefixes) three ways: scanning all consumers (no data store),
+scanning the consumers of the location (DataStore location index) and
+through the name index. Then some organizations are renamed and the
+store is reloaded, which re-indexes only the touched partitions. Equality
+with the scans is covered by tests/test_name_index.py.
+
+Usage:
+    python benchmarks/bench_organization_search.py [organizations] [settlements] [queries]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import SearchService, ValidationService
+from prg.data import DataStore, location_key
+from benchmarks.synthetic_workbook import build_records
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def location_scan(store, consumers, district, settlement, pattern):
+    """Smart search as before the name index: location candidates, substring test."""
+    pattern = pattern.lower()
+    return [c for c in store.find_consumers_by_location(district, settlement)
+            if c.get('type') == 'Организация' and pattern in c['name'].lower()]
+
+
+def main():
+    n_organizations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_settlements = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    n_queries = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    data = build_records(n_population=100000, n_organizations=n_organizations, n_settlements=n_settlements)
+    consumers = data['consumers']
+    organizations = [c for c in consumers if c['type'] == 'Организация']
+    store = DataStore(data['prg'], data['grs'], consumers)
+
+    rnd = random.Random(5)
+    patterns = ['Ленина', 'ул.Мира', 'совет', 'Гагарина, 1', 'ад', 'Фирма 12', ', 4', 'Нет такой']
+    queries = [(o['mo'], o['settlement'], rnd.choice(patterns))
+               for o in (rnd.choice(organizations) for _ in range(n_queries))]
+
+    plain = SearchService(ValidationService())
+    indexed = SearchService(ValidationService(store), store)
+
+    def run(service):
+        return [service.smart_search_organizations(consumers, *query, require_expenses=False).matches
+                for query in queries]
+
+    _, scan_s = timed(lambda: run(plain))
+    _, location_s = timed(lambda: [location_scan(store, consumers, *query) for query in queries])
+    _, first_s = timed(lambda: run(indexed))
+    _, index_s = timed(lambda: run(indexed))
+    stats = store.name_index.get_stats()
+
+    # Rename organizations of a few settlements and reload into fresh lists
+    renamed = {location_key(o['mo'], o['settlement']) for o in rnd.sample(organizations, 5)}
+    reloaded = [dict(c) for c in consumers]
+    for consumer in reloaded:
+        if consumer['type'] == 'Организация' and location_key(consumer['mo'], consumer['settlement']) in renamed:
+            consumer['name'] = consumer['name'].replace('ул.', 'улица ')
+    store.load(data['prg'], data['grs'], reloaded)
+    builds, rebinds = store.name_index.builds, store.name_index.rebinds
+    _, reload_s = timed(lambda: [indexed.smart_search_organizations(reloaded, *query, require_expenses=False)
+                                 for query in queries])
+    rebuilt = store.name_index.builds - builds
+
+    print("=" * 70)
+    print(f"ORGANIZATION SEARCH ({len(organizations)} organizations, {n_settlements} settlements, "
+          f"{len(queries)} queries)")
+    print("=" * 70)
+    print(f"  full scan:            {scan_s / len(queries) * 1000:8.3f} ms per query")
+    print(f"  location scan:        {location_s / len(queries) * 1000:8.3f} ms per query")
+    print(f"  name index, building: {first_s / len(queries) * 1000:8.3f} ms per query "
+          f"({stats['partitions']} partitions, {stats['names']} names, {stats['trigrams']} trigrams)")
+    print(f"  name index, built:    {index_s / len(queries) * 1000:8.3f} ms per query "
+          f"({location_s / index_s:.1f}x vs location scan, {scan_s / index_s:.0f}x vs full scan)")
+    print(f"  after reload:         {reload_s / len(queries) * 1000:8.3f} ms per query "
+          f"({rebuilt} partitions re-indexed, {store.name_index.rebinds - rebinds} reused)")
+
+
+if __name__ == '__main__':
+    main()
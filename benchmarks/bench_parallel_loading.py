@@ -0,0 +1,52 @@
+"""Benchmark: serial vs process-pool loading of the four sheets.
+
+Equality of the 'parallel' and 'per_sheet' results is covered by
+tests/test_parallel_loading.py. The speedup is bounded by the largest sheet and
+needs at least as many cores as sheets.
+
+Usage:
+    python benchmarks/bench_parallel_loading.py [population_rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader
+from benchmarks.synthetic_workbook import build_workbook
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    settings_manager = SettingsManager(str(Path(__file__).resolve().parent.parent / 'prg_settings.json'))
+    loader = ExcelLoader(settings_manager)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'workbook.xlsx'
+        build_workbook(path, settings_manager, n_population=n_population)
+
+        serial, serial_s = timed(lambda: loader.load_all_data(path, 'per_sheet'))
+        _, single_s = timed(lambda: loader.load_all_data(path, 'single_pass'))
+        _, parallel_s = timed(lambda: loader.load_all_data(path, 'parallel'))
+
+        print("=" * 70)
+        print(f"PARALLEL LOADING ({len(serial['consumers'])} consumers, {os.cpu_count()} CPUs)")
+        print("=" * 70)
+        print(f"  per_sheet:    {serial_s:7.2f} s")
+        print(f"  single_pass:  {single_s:7.2f} s")
+        print(f"  parallel:     {parallel_s:7.2f} s  ({serial_s / parallel_s:.1f}x vs per_sheet)")
+
+
+if __name__ == '__main__':
+    main()
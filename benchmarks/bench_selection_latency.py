@@ -0,0 +1,123 @@
+"""Benchmark: latency of rapid tree selection changes, linear scan vs id index.
+
+Simulates keyboard scrolling through the consumer tree: each event selects
+the next consumer row, and the handler looks the record up by the id in
+its tags. The previous handler scanned consumer_data with next(); the
+current one asks DataStore. With a display, the full handlers run on a
+real Treeview and detail Text widget as well. Per-event latency is
+reported as mean / p95 / max.
+
+Usage:
+    python benchmarks/bench_selection_latency.py [population_rows] [events]
+"""
+
+import random
+import statistics
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import CalculationService, ValidationService
+from prg.data import DataStore
+from prg.ui import PRGPipelineManager
+from prg.ui.trees import LazyTree
+from benchmarks.synthetic_workbook import build_records
+
+# Keyboard auto-repeat: a new selection event about every 33 ms
+KEY_REPEAT_MS = 1000 / 30
+
+
+def latencies(handler, events):
+    """Run handler for every event; return per-event latencies in ms."""
+    result = []
+    for event in events:
+        start = time.perf_counter()
+        handler(event)
+        result.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def report(label, values):
+    values = sorted(values)
+    p95 = values[int(len(values) * 0.95) - 1]
+    lagging = sum(1 for value in values if value > KEY_REPEAT_MS)
+    print(f"  {label:26s} mean {statistics.mean(values):8.3f} ms, p95 {p95:8.3f} ms, "
+          f"max {values[-1]:8.3f} ms, {lagging} events over {KEY_REPEAT_MS:.0f} ms")
+
+
+def window_handlers(window):
+    """(previous, current) consumer selection handlers bound to window."""
+    def previous(event):
+        selection = window.consumer_tree.selection()
+        tags = window.consumer_tree.item(selection[0], 'tags')
+        window.selected_consumer = next((c for c in window.consumer_data if c['id'] == tags[0]), None)
+        window.update_detail_panel_consumer(window.selected_consumer)
+        window.update_button_states()
+
+    def current(event):
+        PRGPipelineManager.on_consumer_tree_select(window, event)
+
+    return previous, current
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 250000
+    n_events = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    data = build_records(n_population=n_population)
+    consumers = data['consumers']
+    store = DataStore(data['prg'], data['grs'], consumers)
+
+    # Consecutive rows of settlements, as when holding an arrow key
+    rnd = random.Random(2)
+    by_settlement = {}
+    for consumer in consumers:
+        by_settlement.setdefault((consumer['mo'], consumer['settlement']), []).append(consumer['id'])
+    ids = []
+    settlements = list(by_settlement.values())
+    while len(ids) < n_events:
+        ids.extend(rnd.choice(settlements)[:n_events - len(ids)])
+
+    print("=" * 70)
+    print(f"SELECTION LATENCY ({len(consumers)} consumers, {len(ids)} selection events)")
+    print("=" * 70)
+    report("lookup, linear scan:", latencies(
+        lambda record_id: next((c for c in consumers if c['id'] == record_id), None), ids))
+    report("lookup, DataStore index:", latencies(store.get_consumer, ids))
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  [WARNING] No display for Tk, full handlers skipped: {e}")
+        return
+    root.withdraw()
+
+    validation = ValidationService(store)
+    window = SimpleNamespace(
+        data_store=store, validation_service=validation, consumer_data=consumers,
+        calculation_service=CalculationService(validation, store),
+        consumer_tree=ttk.Treeview(root, columns=('type', 'binding', 'total_share')),
+        detail_text=tk.Text(root), selected_consumer=None, update_button_states=lambda: None)
+    window.update_detail_panel_consumer = lambda c: PRGPipelineManager.update_detail_panel_consumer(window, c)
+    rows = LazyTree(window.consumer_tree, lambda c: PRGPipelineManager._consumer_row(window, c))
+    rows.populate([('', [('', [store.get_consumer(record_id) for record_id in dict.fromkeys(ids)])])])
+    rows.expand(window.consumer_tree.get_children()[0])
+    rows.expand(window.consumer_tree.get_children(window.consumer_tree.get_children()[0])[0])
+
+    def select(record_id):
+        window.consumer_tree.selection_set(rows.item_for(record_id))
+        return record_id
+
+    previous, current = window_handlers(window)
+    report("handler, linear scan:", latencies(lambda record_id: previous(select(record_id)), ids))
+    report("handler, DataStore index:", latencies(lambda record_id: current(select(record_id)), ids))
+    assert window.selected_consumer is store.get_consumer(ids[-1])
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark: cold load vs warm load from the snapshot cache.
+
+Also times a touched workbook (new mtime, same content), which stays cached
+after a content hash. Invalidation is covered by tests/test_snapshot_cache.py.
+
+Usage:
+    python benchmarks/bench_snapshot_cache.py [population_rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader, SnapshotCache
+from prg.data.excel_loader import TABLE_TYPES
+from benchmarks.synthetic_workbook import build_workbook
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    settings_manager = SettingsManager(str(Path(__file__).resolve().parent.parent / 'prg_settings.json'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'workbook.xlsx'
+        build_workbook(path, settings_manager, n_population=n_population)
+        cache = SnapshotCache(Path(tmp) / 'cache')
+        loader = ExcelLoader(settings_manager, cache)
+        table_settings = {t: settings_manager.get_table_settings(t) for t in TABLE_TYPES}
+
+        cold, cold_s = timed(lambda: loader.load_all_data(path))
+        _, warm_s = timed(lambda: loader.load_all_data(path))
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        _, touched_s = timed(lambda: cache.load(path, table_settings))
+
+        print("=" * 70)
+        print(f"SNAPSHOT CACHE ({len(cold['consumers'])} consumers)")
+        print("=" * 70)
+        print(f"  cold load (parse + store):   {cold_s:7.3f} s")
+        print(f"  warm load (size/mtime hit):  {warm_s:7.3f} s  ({cold_s / warm_s:.0f}x)")
+        print(f"  touched workbook (hash hit): {touched_s:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
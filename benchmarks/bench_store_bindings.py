@@ -0,0 +1,73 @@
+"""Benchmark: repeated binding passes with and without the data store.
+
+Simulates a session that recalculates loads and re-checks bindings several
+times: calculate_prg_loads(), find_unbound_consumers() and a share check,
+repeated. Without a store every binding string goes through the shared,
+bounded BINDING_CODEC; with one, through the codec of the store's load.
+Equality of the results is covered by tests/test_binding_codec.py.
+
+Usage:
+    python benchmarks/bench_store_bindings.py [population_rows] [passes]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import CalculationService, ValidationService
+from prg.data import DataStore, parse_prg_bindings, calculate_total_share
+from benchmarks.synthetic_workbook import build_records
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def session(calculation, validation, bindings_of, prg_data, consumers, passes):
+    results = []
+    for _ in range(passes):
+        loads = calculation.calculate_prg_loads(prg_data, consumers).prg_loads
+        unbound = validation.find_unbound_consumers(consumers)
+        bad_shares = [c['id'] for c in consumers
+                      if bindings_of(c) and abs(calculate_total_share(bindings_of(c)) - 1.0) > 0.01]
+        results.append((loads, unbound, bad_shares))
+    return results
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    passes = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    data = build_records(n_population=n_population)
+    prg_data, grs_data, consumers = data['prg'], data['grs'], data['consumers']
+
+    plain_validation = ValidationService()
+    plain = (CalculationService(plain_validation), plain_validation,
+             lambda c: parse_prg_bindings(c.get('code', '')))
+
+    store = DataStore(prg_data, grs_data, consumers)
+    store_validation = ValidationService(store)
+    indexed = (CalculationService(store_validation, store), store_validation, store.bindings)
+
+    _, plain_s = timed(lambda: session(*plain, prg_data, consumers, passes))
+    _, store_s = timed(lambda: session(*indexed, prg_data, consumers, passes))
+    stats = store.binding_codec.get_stats()
+
+    # Binding retrieval alone, one pass over all consumers
+    _, parse_s = timed(lambda: [parse_prg_bindings(c.get('code', '')) for c in consumers])
+    _, lookup_s = timed(lambda: [store.bindings(c) for c in consumers])
+
+    print("=" * 70)
+    print(f"STORE BINDINGS ({len(consumers)} consumers, {passes} passes)")
+    print("=" * 70)
+    print(f"  without store:     {plain_s:7.2f} s")
+    print(f"  with store:        {store_s:7.2f} s  ({plain_s / store_s:.1f}x)")
+    print(f"  bindings only:     shared codec {parse_s:6.3f} s | store codec {lookup_s:6.3f} s")
+    print(f"  store codec: {stats['codes']} binding strings, {stats['parses']} parses, {stats['hits']} hits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark: peak memory of DataFrame vs streaming population loading.
+
+Peak Python memory (tracemalloc) is measured while counting population records,
+for two sheet sizes. The streaming reader should stay roughly flat.
+
+Usage:
+    python benchmarks/bench_streaming_memory.py [small_rows] [large_rows]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader
+from benchmarks.synthetic_workbook import build_workbook
+
+
+def peak_mb(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak / 1e6, elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:3]] or [20000, 80000]
+    settings_manager = SettingsManager(str(Path(__file__).resolve().parent.parent / 'prg_settings.json'))
+    loader = ExcelLoader(settings_manager)
+
+    print("=" * 70)
+    print("PEAK MEMORY WHILE COUNTING POPULATION RECORDS")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = Path(tmp) / f'population_{rows}.xlsx'
+            build_workbook(path, settings_manager, n_prg=100, n_grs=10,
+                           n_population=rows, n_organizations=10)
+
+            _, frame_mb, frame_s = peak_mb(lambda: len(loader.load_population_data(path)))
+            _, stream_mb, stream_s = peak_mb(
+                lambda: sum(1 for _ in loader.iter_population_records(path)))
+
+            print(f"  {rows:>8} rows: DataFrame {frame_mb:7.1f} MB ({frame_s:5.1f} s) | "
+                  f"streaming {stream_mb:6.1f} MB ({stream_s:5.1f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark: consumer tree filling, all rows up front vs lazy expansion.
+
+The eager variant inserts every district, settlement and consumer row, as
+populate_consumer_tree did. The lazy variant inserts districts only; opening
+a district and a settlement then inserts just their children. Rows are
+built by the same function as in the main window. Needs a display (Tk).
+
+Usage:
+    python benchmarks/bench_tree_population.py [population_rows]
+"""
+
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import ValidationService
+from prg.data import DataStore
+from prg.ui import PRGPipelineManager
+from prg.ui.trees import LazyTree
+from benchmarks.synthetic_workbook import build_records
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def count_items(tree, item=''):
+    return sum(1 + count_items(tree, child) for child in tree.get_children(item))
+
+
+def group(consumers):
+    structure = {}
+    for consumer in consumers:
+        groups = structure.setdefault(consumer.get('mo', ''), {}).setdefault(
+            consumer.get('settlement', ''), {'Население': [], 'Организация': []})
+        if consumer.get('type') in groups:
+            groups[consumer['type']].append(consumer)
+    return [(f"📍 {mo}", [(f"🏘️ {settlement}", groups['Население'] + groups['Организация'])
+                         for settlement, groups in sorted(structure[mo].items())])
+            for mo in sorted(structure)]
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 150000
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"[WARNING] No display for Tk: {e}")
+        return
+    root.withdraw()
+
+    data = build_records(n_population=n_population)
+    consumers = data['consumers']
+    store = DataStore(data['prg'], data['grs'], consumers)
+    window = SimpleNamespace(data_store=store, validation_service=ValidationService(store))
+
+    def make_row(consumer):
+        return PRGPipelineManager._consumer_row(window, consumer)
+
+    for consumer in consumers:
+        make_row(consumer)  # warm the binding cache for both variants
+
+    eager_tree = ttk.Treeview(root, columns=('type', 'binding', 'total_share'))
+
+    def eager():
+        for district_text, settlements in group(consumers):
+            district = eager_tree.insert('', 'end', text=district_text, values=('', '', ''))
+            for settlement_text, records in settlements:
+                settlement = eager_tree.insert(district, 'end', text=settlement_text, values=('', '', ''))
+                for consumer in records:
+                    text, values, tags = make_row(consumer)
+                    eager_tree.insert(settlement, 'end', text=text, values=values, tags=tags)
+
+    _, eager_s = timed(eager)
+    eager_items = count_items(eager_tree)
+    _, eager_clear_s = timed(lambda: eager_tree.delete(*eager_tree.get_children()))
+
+    lazy_tree = ttk.Treeview(root, columns=('type', 'binding', 'total_share'))
+    lazy = LazyTree(lazy_tree, make_row)
+    _, lazy_s = timed(lambda: lazy.populate(group(consumers)))
+    lazy_items = count_items(lazy_tree)
+
+    district = lazy_tree.get_children()[0]
+    _, open_district_s = timed(lambda: lazy.expand(district))
+    settlement = lazy_tree.get_children(district)[0]
+    _, open_settlement_s = timed(lambda: lazy.expand(settlement))
+    opened_items = count_items(lazy_tree)
+
+    first = lazy_tree.get_children(settlement)[0]
+    consumer_id = lazy_tree.item(first, 'tags')[0]
+    assert lazy.item_for(consumer_id) == first and store.get_consumer(consumer_id) is not None
+
+    root.destroy()
+
+    print("=" * 70)
+    print(f"CONSUMER TREE ({len(consumers)} consumers)")
+    print("=" * 70)
+    print(f"  eager fill:        {eager_s:7.2f} s, {eager_items} items (clear {eager_clear_s:.2f} s)")
+    print(f"  lazy fill:         {lazy_s:7.2f} s, {lazy_items} items ({eager_s / lazy_s:.0f}x)")
+    print(f"  open district:     {open_district_s * 1000:7.1f} ms")
+    print(f"  open settlement:   {open_settlement_s * 1000:7.1f} ms, {opened_items} items in the tree")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark: find_unbound_prg, nested-loop reference vs settlement key set.
+
+The reference is the previous O(P x C) implementation, timed on a slice of
+the PRGs and extrapolated. Equality of the two is covered by
+tests/test_validation_service.py.
+
+Usage:
+    python benchmarks/bench_unbound_prg.py [population_rows]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.business import ValidationService
+from prg.data import DataStore
+from benchmarks.synthetic_workbook import build_records
+
+
+def nested_loop_unbound(prg_data, consumer_data):
+    unbound_prg = []
+    for prg in prg_data:
+        prg_mo = prg['mo'].strip().lower()
+        prg_settlement = prg['settlement'].strip().lower()
+        has_consumers = False
+        for consumer in consumer_data:
+            if (prg_mo == consumer['mo'].strip().lower()
+                    and prg_settlement == consumer['settlement'].strip().lower()):
+                has_consumers = True
+                break
+        if not has_consumers:
+            unbound_prg.append(prg)
+    return unbound_prg
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 250000
+    # More settlements than consumers cover, so some PRGs are unbound
+    data = build_records(n_population=n_population, n_settlements=3000)
+    prg_data, consumers = data['prg'], data['consumers']
+    for consumer in consumers:
+        if consumer['settlement'].endswith('7'):
+            consumer['settlement'] = consumer['settlement'] + ' (старый)'
+
+    sample = prg_data[:300]
+    _, reference_s = timed(lambda: nested_loop_unbound(sample, consumers))
+    reference_s *= len(prg_data) / len(sample)
+
+    service = ValidationService()
+    (unbound, counts), linear_s = timed(lambda: service.analyze_prg_coverage(prg_data, consumers))
+
+    store = DataStore(prg_data, data['grs'], consumers)
+    indexed = ValidationService(store)
+    _, indexed_s = timed(lambda: indexed.analyze_prg_coverage(prg_data, consumers))
+
+    print("=" * 70)
+    print(f"FIND UNBOUND PRG ({len(prg_data)} PRG, {len(consumers)} consumers)")
+    print("=" * 70)
+    print(f"  nested loops (extrapolated):  {reference_s:8.2f} s")
+    print(f"  settlement key set:           {linear_s:8.3f} s  ({reference_s / linear_s:.0f}x)")
+    print(f"  with DataStore counts:        {indexed_s:8.4f} s")
+    print(f"  unbound PRG: {len(unbound)}, settlements with consumers: {len(counts)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: saving pending changes, openpyxl load/save vs direct cell patch.
+
+The synthetic workbook is re-saved with openpyxl first (as in the
+incremental reload benchmark). Binding code edits on random consumers and
+load edits on random PRG rows are then saved both ways into copies of it.
+Equivalence of the two writes is covered by tests/test_xlsx_patcher.py.
+
+Usage:
+    python benchmarks/bench_xlsx_patcher.py [population_rows] [changes]
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader, patch_cells
+from benchmarks.synthetic_workbook import build_workbook
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def make_edits(data, n_changes):
+    """Sheet name -> {(row, col): value}, like the grouped change records."""
+    rnd = random.Random(5)
+    edits = {}
+    consumers = [c for c in data['consumers'] if c.get('code_col') is not None]
+    for consumer in rnd.sample(consumers, min(n_changes, len(consumers))):
+        code = f"PRG-{rnd.randrange(1000)}|{rnd.choice(('0.5', '1', '0.25'))}|ГРС <{rnd.randrange(60)}> & Ко"
+        edits.setdefault(consumer['sheet_name'], {})[(consumer['excel_row'], consumer['code_col'])] = code
+    for prg in rnd.sample(data['prg'], min(n_changes // 4, len(data['prg']))):
+        cells = edits.setdefault(prg['sheet_name'], {})
+        for key in ('qy_pop_col', 'qh_pop_col', 'qy_ind_col', 'qh_ind_col'):
+            cells[(prg['excel_row'], prg[key])] = round(rnd.uniform(0, 1e6), 3)
+    return edits
+
+
+def save_openpyxl(path, edits):
+    """Previous save_changes_to_excel write path."""
+    wb = load_workbook(str(path))
+    for sheet_name, cells in edits.items():
+        ws = wb[sheet_name]
+        for (row, col), value in cells.items():
+            ws.cell(row=row + 1, column=col + 1, value=value)
+    wb.save(str(path))
+    wb.close()
+
+
+def main():
+    n_population = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_changes = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    settings_manager = SettingsManager(str(Path(__file__).resolve().parent.parent / 'prg_settings.json'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original = Path(tmp) / 'workbook.xlsx'
+        build_workbook(original, settings_manager, n_population=n_population)
+        wb = load_workbook(original)
+        wb.save(original)
+        wb.close()
+        data = ExcelLoader(settings_manager).load_all_data(original)
+        edits = make_edits(data, n_changes)
+        cell_count = sum(len(cells) for cells in edits.values())
+
+        by_openpyxl = Path(tmp) / 'openpyxl.xlsx'
+        patched = Path(tmp) / 'patched.xlsx'
+        shutil.copyfile(original, by_openpyxl)
+        shutil.copyfile(original, patched)
+
+        _, openpyxl_s = timed(lambda: save_openpyxl(by_openpyxl, edits))
+        _, patch_s = timed(lambda: patch_cells(patched, edits))
+
+        print("=" * 70)
+        print(f"SAVE CHANGES ({len(data['consumers'])} consumers, {cell_count} cells in {len(edits)} sheets, "
+              f"{original.stat().st_size / 1024 / 1024:.1f} MB file)")
+        print("=" * 70)
+        print(f"  openpyxl load/save: {openpyxl_s:7.2f} s")
+        print(f"  direct cell patch:  {patch_s:7.2f} s  ({openpyxl_s / patch_s:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Row-by-row (df.iterrows) reference loaders.
+
+These reproduce the pre-columnar ExcelLoader parsing exactly and are kept only so
+tests can check that the columnar loaders return identical records (and
+benchmarks can time both).
+"""
+
+from typing import Dict, Any, List
+
+import pandas as pd
+
+from prg.utils import col_to_index
+from prg.data.parsers import parse_numeric_value, parse_grs_id_column, normalize_string
+
+
+def _rows(df: pd.DataFrame, settings: Dict[str, Any]):
+    start_row = int(settings['start_row']) - 1
+    if start_row > 0:
+        df = df.iloc[start_row:].reset_index(drop=True)
+    return start_row, df.iterrows()
+
+
+def _cell(row, col):
+    return row.iloc[col] if col < len(row) else ""
+
+
+def load_prg(df: pd.DataFrame, settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    start_row, rows = _rows(df, settings)
+    cols = {key: col_to_index(settings[key]) for key in settings if key.endswith('_col')}
+    data = []
+    for idx, row in rows:
+        if max(cols['mo_col'], cols['settlement_col'], cols['prg_id_col'], cols['grs_id_col']) >= len(row):
+            continue
+        mo = normalize_string(row.iloc[cols['mo_col']])
+        settlement = normalize_string(row.iloc[cols['settlement_col']])
+        prg_id = normalize_string(row.iloc[cols['prg_id_col']])
+        grs_raw = row.iloc[cols['grs_id_col']] if pd.notna(row.iloc[cols['grs_id_col']]) else ""
+        grs_id = parse_grs_id_column(grs_raw)
+        loads = {field: parse_numeric_value(_cell(row, cols[key])) for field, key in (
+            ('QY_pop', 'qy_pop_col'), ('QH_pop', 'qh_pop_col'), ('QY_ind', 'qy_ind_col'),
+            ('QH_ind', 'qh_ind_col'), ('Year_volume', 'year_volume_col'), ('Max_Hour', 'max_hour_col'))}
+        if mo and settlement and prg_id and grs_id:
+            record = {'id': f"prg_{idx}", 'mo': mo, 'settlement': settlement,
+                      'prg_id': prg_id, 'grs_id': grs_id}
+            record.update(loads)
+            record.update({'sheet_name': settings['sheet'], 'excel_row': start_row + idx})
+            record.update({key: cols[key] for key in ('qy_pop_col', 'qh_pop_col', 'qy_ind_col',
+                                                       'qh_ind_col', 'year_volume_col', 'max_hour_col')})
+            data.append(record)
+    return data
+
+
+def load_grs(df: pd.DataFrame, settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    start_row, rows = _rows(df, settings)
+    mo_col, id_col, name_col = (col_to_index(settings[k]) for k in ('mo_col', 'grs_id_col', 'grs_name_col'))
+    data = []
+    for idx, row in rows:
+        if max(mo_col, id_col, name_col) >= len(row):
+            continue
+        mo, grs_id, grs_name = (normalize_string(row.iloc[c]) for c in (mo_col, id_col, name_col))
+        if mo and grs_id and grs_name:
+            data.append({'id': f"grs_{idx}", 'mo': mo, 'grs_id': grs_id, 'grs_name': grs_name,
+                         'sheet_name': settings['sheet'], 'excel_row': start_row + idx})
+    return data
+
+
+def load_consumers(df: pd.DataFrame, settings: Dict[str, Any], organizations: bool) -> List[Dict[str, Any]]:
+    start_row, rows = _rows(df, settings)
+    mo_col = col_to_index(settings['mo_col'])
+    settlement_col = col_to_index(settings['settlement_col'])
+    code_col = col_to_index(settings['code_col'])
+    expenses_col = col_to_index(settings['expenses_col'])
+    hourly_col = col_to_index(settings.get('hourly_expenses_col', 'O'))
+    name_col = col_to_index(settings['name_col']) if organizations else None
+    grs_id_col = col_to_index(settings['grs_id_col']) if organizations else None
+    data = []
+    for idx, row in rows:
+        required = (mo_col, settlement_col) + ((name_col,) if organizations else ())
+        if max(required) >= len(row):
+            continue
+        mo = normalize_string(row.iloc[mo_col])
+        settlement = normalize_string(row.iloc[settlement_col])
+        code = normalize_string(_cell(row, code_col))
+        yearly = parse_numeric_value(_cell(row, expenses_col))
+        hourly = parse_numeric_value(_cell(row, hourly_col))
+        base = {'sheet_name': settings['sheet'], 'excel_row': start_row + idx, 'code_col': code_col,
+                'expenses_col': expenses_col, 'hourly_expenses_col': hourly_col}
+        if organizations:
+            name = normalize_string(row.iloc[name_col])
+            grs_id = normalize_string(_cell(row, grs_id_col))
+            if name and mo and settlement:
+                record = {'id': f"org_{settings['sheet']}_{start_row + idx}", 'type': 'Организация',
+                          'consumer_type': 'organization', 'mo': mo, 'settlement': settlement,
+                          'name': name, 'code': code, 'grs_id': grs_id, 'grs_id_col': grs_id_col,
+                          'yearly_expenses': yearly, 'hourly_expenses': hourly}
+                record.update(base)
+                data.append(record)
+        elif mo and settlement:
+            record = {'id': f"pop_{settings['sheet']}_{start_row + idx}", 'type': 'Население',
+                      'consumer_type': 'population', 'mo': mo, 'settlement': settlement,
+                      'name': f"Население {settlement}", 'code': code,
+                      'yearly_expenses': yearly, 'hourly_expenses': hourly}
+            record.update(base)
+            data.append(record)
+    return data
@@ -0,0 +1,198 @@
+"""Synthetic workbook generator for loader benchmarks.
+
+Builds an .xlsx laid out according to the column letters in a SettingsManager,
+so the benchmarks exercise the same sheets and columns as a real regional file.
+build_records() produces the same kind of data directly as loaded records,
+for benchmarks of the services that do not need to go through Excel.
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, Any, List
+
+from openpyxl import Workbook
+
+from prg.utils import col_to_index
+
+
+def _blank_row(settings: Dict[str, Any], width: int) -> list:
+    """Row wide enough for every configured column (and some unused ones)."""
+    max_col = max(col_to_index(v) for k, v in settings.items() if k.endswith('_col'))
+    return [None] * max(max_col + 1, width)
+
+
+def _put(row: list, settings: Dict[str, Any], key: str, value) -> None:
+    row[col_to_index(settings[key])] = value
+
+
+def _header_rows(ws, settings: Dict[str, Any], width: int) -> None:
+    for _ in range(int(settings['start_row']) - 1):
+        ws.append(['Заголовок'] * len(_blank_row(settings, width)))
+
+
+def build_workbook(path: Path, settings_manager, n_prg: int = 3000, n_grs: int = 60,
+                   n_population: int = 200000, n_organizations: int = 20000,
+                   n_settlements: int = 1500, seed: int = 7) -> Path:
+    """
+    Write a synthetic workbook with the four configured sheets.
+
+    Args:
+        path: Output .xlsx path
+        settings_manager: SettingsManager with sheet names and column letters
+        n_prg, n_grs, n_population, n_organizations: Row counts per sheet
+        n_settlements: Number of distinct (district, settlement) pairs
+        seed: Random seed (output is deterministic)
+
+    Returns:
+        The output path
+    """
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+
+    districts = [f"Район {i}" for i in range(max(1, n_settlements // 50))]
+    places = [(districts[i % len(districts)], f"НП {i}") for i in range(n_settlements)]
+    grs_names = [f"ГРС Станция {i}" for i in range(n_grs)]
+
+    prg = settings_manager.get_table_settings('prg')
+    ws = wb.create_sheet(prg['sheet'])
+    _header_rows(ws, prg, 54)
+    for i in range(n_prg):
+        mo, settlement = places[i % len(places)]
+        row = _blank_row(prg, 54)
+        _put(row, prg, 'mo_col', mo)
+        _put(row, prg, 'settlement_col', settlement)
+        _put(row, prg, 'prg_id_col', f"ПРГ-{i}")
+        _put(row, prg, 'grs_id_col', f"0; {i % n_grs + 1}")
+        _put(row, prg, 'qy_pop_col', round(rnd.random() * 500, 3))
+        _put(row, prg, 'qh_pop_col', f"{rnd.random():.4f}".replace('.', ','))
+        _put(row, prg, 'qy_ind_col', None if i % 3 else round(rnd.random() * 100, 2))
+        _put(row, prg, 'qh_ind_col', 0)
+        _put(row, prg, 'year_volume_col', round(rnd.random() * 600, 3))
+        _put(row, prg, 'max_hour_col', f"{rnd.random() * 2:.3f}".replace('.', ','))
+        for col in range(len(row)):
+            if row[col] is None and col % 4 == 0:
+                row[col] = f"прочее {i}"
+        ws.append(row)
+
+    grs = settings_manager.get_table_settings('grs')
+    ws = wb.create_sheet(grs['sheet'])
+    _header_rows(ws, grs, 6)
+    for i in range(n_grs):
+        row = _blank_row(grs, 6)
+        _put(row, grs, 'mo_col', districts[i % len(districts)])
+        _put(row, grs, 'grs_id_col', i + 1)
+        _put(row, grs, 'grs_name_col', grs_names[i])
+        ws.append(row)
+
+    pop = settings_manager.get_table_settings('population')
+    ws = wb.create_sheet(pop['sheet'])
+    _header_rows(ws, pop, 16)
+    for i in range(n_population):
+        place = rnd.randrange(len(places))
+        mo, settlement = places[place]
+        row = _blank_row(pop, 16)
+        _put(row, pop, 'mo_col', mo)
+        _put(row, pop, 'settlement_col', settlement)
+        if i % 5:
+            prg_id = f"ПРГ-{place % max(1, n_prg)}"
+            _put(row, pop, 'code_col', f"{prg_id}|1|{grs_names[i % n_grs]}")
+        expenses = rnd.random() * 10
+        _put(row, pop, 'expenses_col', f"{expenses:.3f}".replace('.', ',') if i % 2 else expenses)
+        _put(row, pop, 'hourly_expenses_col', None if i % 7 == 0 else round(expenses / 2000, 6))
+        row[0] = i + 1
+        ws.append(row)
+
+    org = settings_manager.get_table_settings('organizations')
+    ws = wb.create_sheet(org['sheet'])
+    _header_rows(ws, org, 16)
+    streets = ['Ленина', 'Мира', 'Советская', 'Гагарина', 'Школьная', 'Садовая']
+    for i in range(n_organizations):
+        mo, settlement = places[rnd.randrange(len(places))]
+        row = _blank_row(org, 16)
+        _put(row, org, 'name_col', f'ООО "Фирма {i}", ул.{rnd.choice(streets)}, {i % 90 + 1}')
+        _put(row, org, 'mo_col', mo)
+        _put(row, org, 'settlement_col', settlement)
+        if i % 3:
+            _put(row, org, 'code_col', f"ПРГ-{i % max(1, n_prg)}|0,5|{grs_names[i % n_grs]};"
+                                       f"ПРГ-{(i + 1) % max(1, n_prg)}|0,5|{grs_names[i % n_grs]}")
+        _put(row, org, 'expenses_col', round(rnd.random() * 50, 2) if i % 4 else None)
+        _put(row, org, 'hourly_expenses_col', f"{rnd.random():.5f}".replace('.', ','))
+        _put(row, org, 'grs_id_col', str(i % n_grs + 1) if i % 6 else None)
+        ws.append(row)
+
+    wb.save(str(path))
+    return path
+
+
+def build_records(n_prg: int = 3000, n_grs: int = 60, n_population: int = 200000,
+                  n_organizations: int = 20000, n_settlements: int = 1500,
+                  seed: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate loaded-style records without writing a workbook.
+
+    Same distributions as build_workbook(): consumers spread over
+    n_settlements places, 4 of 5 population rows bound to one PRG, 2 of 3
+    organizations bound to two PRGs with shares of 0.5.
+
+    Consumers also carry 'expenses' (= yearly expenses), the key the
+    business services' expense checks read.
+
+    Returns:
+        Dictionary with 'prg', 'grs' and 'consumers' lists (as load_all_data)
+    """
+    rnd = random.Random(seed)
+
+    districts = [f"Район {i}" for i in range(max(1, n_settlements // 50))]
+    places = [(districts[i % len(districts)], f"НП {i}") for i in range(n_settlements)]
+    grs_names = [f"ГРС Станция {i}" for i in range(n_grs)]
+    streets = ['Ленина', 'Мира', 'Советская', 'Гагарина', 'Школьная', 'Садовая']
+
+    grs_data = [{
+        'id': f"grs_{i}", 'mo': districts[i % len(districts)], 'grs_id': str(i + 1),
+        'grs_name': grs_names[i], 'sheet_name': 'ГРС', 'excel_row': i + 2,
+    } for i in range(n_grs)]
+
+    prg_data = []
+    for i in range(n_prg):
+        mo, settlement = places[i % len(places)]
+        prg_data.append({
+            'id': f"prg_{i}", 'mo': mo, 'settlement': settlement, 'prg_id': f"ПРГ-{i}",
+            'grs_id': str(i % n_grs + 1),
+            'QY_pop': 0.0, 'QH_pop': 0.0, 'QY_ind': 0.0, 'QH_ind': 0.0,
+            'Year_volume': round(rnd.random() * 600, 3), 'Max_Hour': round(rnd.random() * 2, 3),
+            'sheet_name': 'ПРГ', 'excel_row': i + 2,
+            'qy_pop_col': 4, 'qh_pop_col': 5, 'qy_ind_col': 6, 'qh_ind_col': 7,
+            'year_volume_col': 8, 'max_hour_col': 9,
+        })
+
+    consumers = []
+    for i in range(n_population):
+        place = rnd.randrange(len(places))
+        mo, settlement = places[place]
+        expenses = rnd.random() * 10
+        consumers.append({
+            'id': f"pop_Население_{i + 1}", 'type': 'Население', 'consumer_type': 'population',
+            'mo': mo, 'settlement': settlement, 'name': f"Население {settlement}",
+            'code': f"ПРГ-{place % max(1, n_prg)}|1|{grs_names[i % n_grs]}" if i % 5 else '',
+            'yearly_expenses': expenses, 'hourly_expenses': 0.0 if i % 7 == 0 else expenses / 2000,
+            'expenses': expenses,
+            'sheet_name': 'Население', 'excel_row': i + 2,
+            'code_col': 11, 'expenses_col': 7, 'hourly_expenses_col': 14,
+        })
+    for i in range(n_organizations):
+        mo, settlement = places[rnd.randrange(len(places))]
+        grs_name = grs_names[i % n_grs]
+        yearly = round(rnd.random() * 50, 2) if i % 4 else 0.0
+        consumers.append({
+            'id': f"org_Организации_{i + 1}", 'type': 'Организация', 'consumer_type': 'organization',
+            'mo': mo, 'settlement': settlement,
+            'name': f'ООО "Фирма {i}", ул.{rnd.choice(streets)}, {i % 90 + 1}',
+            'code': (f"ПРГ-{i % max(1, n_prg)}|0,5|{grs_name};"
+                     f"ПРГ-{(i + 1) % max(1, n_prg)}|0,5|{grs_name}") if i % 3 else '',
+            'grs_id': str(i % n_grs + 1) if i % 6 else None, 'grs_id_col': 13,
+            'yearly_expenses': yearly, 'hourly_expenses': rnd.random(), 'expenses': yearly,
+            'sheet_name': 'Организации', 'excel_row': i + 2,
+            'code_col': 11, 'expenses_col': 7, 'hourly_expenses_col': 14,
+        })
+
+    return {'prg': prg_data, 'grs': grs_data, 'consumers': consumers}
@@ -12,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from prg.config import SettingsManager
-from prg.data import ExcelLoader
+from prg.data import ExcelLoader, SnapshotCache, DataStore, ChangeWAL
 from prg.business import (
     ValidationService,
     CalculationService,
@@ -35,14 +35,21 @@ def main():
     print("[OK] Settings loaded")
 
     # Initialize data layer
-    excel_loader = ExcelLoader(settings_manager)
+    snapshot_cache = SnapshotCache(settings_manager.settings_file.parent / '.prg_cache')
+    excel_loader = ExcelLoader(settings_manager, snapshot_cache)
     print("[OK] Excel loader initialized")
 
+    # Indexed store of the loaded data, shared by services and UI
+    data_store = DataStore()
+
+    # On-disk journal of pending changes, replayed when the workbook is opened again
+    change_wal = ChangeWAL(settings_manager.settings_file.parent / '.prg_journal')
+
     # Initialize business services
-    validation_service = ValidationService()
-    calculation_service = CalculationService(validation_service)
-    binding_service = BindingService(validation_service)
-    search_service = SearchService(validation_service)
+    validation_service = ValidationService(data_store)
+    calculation_service = CalculationService(validation_service, data_store)
+    binding_service = BindingService(validation_service, data_store, calculation_service)
+    search_service = SearchService(validation_service, data_store)
     print("[OK] Business services initialized")
 
     # Initialize UI styling with saved theme preference
@@ -63,7 +70,9 @@ def main():
         calculation_service=calculation_service,
         binding_service=binding_service,
         search_service=search_service,
-        style_manager=style_manager
+        style_manager=style_manager,
+        data_store=data_store,
+        change_wal=change_wal
     )
 
     print("[OK] Application initialized")
@@ -1,7 +1,8 @@
 """Business logic services."""
 
 from .validation_service import ValidationService
-from .calculation_service import CalculationService, CalculationResult
+from .calculation_service import CalculationService, CalculationResult, CalculationDetails
+from .load_matrix import LoadMatrix, LOAD_COLUMNS
 from .binding_service import BindingService, BindingResult
 from .search_service import SearchService, SearchResult
 
@@ -9,6 +10,9 @@ __all__ = [
     'ValidationService',
     'CalculationService',
     'CalculationResult',
+    'CalculationDetails',
+    'LoadMatrix',
+    'LOAD_COLUMNS',
     'BindingService',
     'BindingResult',
     'SearchService',
@@ -2,7 +2,8 @@
 
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from ..data.parsers import parse_prg_bindings, format_prg_bindings, calculate_total_share
+from ..data.parsers import consumer_bindings, format_prg_bindings, calculate_total_share
+from ..data.data_store import location_key
 
 
 class BindingResult:
@@ -37,6 +38,16 @@ class BindingResult:
         self.failed_consumers.append(consumer)
         self.errors.append(f"{consumer.get('name', 'Unknown')}: {error}")
 
+    def merge(self, other: 'BindingResult'):
+        """Add counts, changes and messages of another result."""
+        self.success_count += other.success_count
+        self.skipped_count += other.skipped_count
+        self.already_bound_count += other.already_bound_count
+        self.failed_consumers.extend(other.failed_consumers)
+        self.changes.extend(other.changes)
+        self.errors.extend(other.errors)
+        self.details.extend(other.details)
+
 
 class BindingService:
     """
@@ -49,14 +60,20 @@ class BindingService:
     - Binding validation
     """
 
-    def __init__(self, validation_service=None):
+    def __init__(self, validation_service=None, data_store=None, calculation_service=None):
         """
         Initialize binding service.
 
         Args:
             validation_service: ValidationService instance for validation
+            data_store: Optional DataStore; its indexes are used for the
+                consumer list it holds and kept current on binding changes
+            calculation_service: Optional CalculationService whose live PRG
+                loads are updated on binding changes
         """
         self.validation_service = validation_service
+        self.data_store = data_store
+        self.calculation_service = calculation_service
 
     def bind_prg_to_settlement(
         self,
@@ -81,20 +98,111 @@ class BindingService:
         """
         result = BindingResult(operation_type="settlement_bind")
 
-        prg_id = prg['prg_id']
-        target_mo = target_consumer['mo'].strip()
-        target_settlement = target_consumer['settlement'].strip()
-
         # Find all consumers in the same settlement
-        consumers_in_settlement = []
-        for consumer in all_consumers:
-            if (consumer['mo'].strip().lower() == target_mo.lower() and
-                    consumer['settlement'].strip().lower() == target_settlement.lower()):
-                consumers_in_settlement.append(consumer)
+        consumers_in_settlement = self._consumers_in_settlement(target_consumer, all_consumers)
+        self._bind_consumers_to_prg(result, prg, consumers_in_settlement, grs_name, share)
+
+        return result
+
+    def find_auto_bind_candidates(
+        self,
+        prg_data: List[Dict[str, Any]],
+        all_consumers: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Find PRGs whose settlement has unbound consumers with expenses.
+
+        Consumers are grouped by settlement once, and each settlement is
+        checked once however many PRGs it has.
+
+        Args:
+            prg_data: List of PRG dictionaries
+            all_consumers: List of all consumers
+
+        Returns:
+            List of {'prg': PRG, 'consumers': unbound consumers with expenses},
+            in PRG order (PRGs of one settlement share the consumer list)
+        """
+        consumers_by_settlement = self._group_by_settlement(all_consumers)
+        unbound_by_settlement: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
+        candidates = []
+        for prg in prg_data:
+            key = location_key(prg['mo'], prg['settlement'])
+            if key not in unbound_by_settlement:
+                unbound_by_settlement[key] = [
+                    consumer for consumer in consumers_by_settlement.get(key, ())
+                    if not consumer_bindings(consumer, self.data_store) and self._has_expenses(consumer)
+                ]
+            if unbound_by_settlement[key]:
+                candidates.append({'prg': prg, 'consumers': unbound_by_settlement[key]})
+
+        return candidates
+
+    def bind_prgs_to_settlements(
+        self,
+        prgs: List[Dict[str, Any]],
+        all_consumers: List[Dict[str, Any]],
+        grs_data: List[Dict[str, Any]],
+        share: float = 1.0
+    ) -> BindingResult:
+        """
+        Bind each PRG to all consumers of its own settlement in one batch.
+
+        Same result as calling bind_prg_to_settlement() for every PRG in
+        order (with the GRS name looked up by the PRG's grs_id), but
+        consumers are grouped by settlement once instead of being scanned
+        for every PRG.
+
+        Args:
+            prgs: PRGs to bind, processed in order
+            all_consumers: List of all consumers
+            grs_data: List of GRS dictionaries (for GRS names)
+            share: Share to assign to each consumer
+
+        Returns:
+            Merged BindingResult of all PRGs
+        """
+        result = BindingResult(operation_type="settlement_bind")
+
+        consumers_by_settlement = self._group_by_settlement(all_consumers)
+        grs_names: Dict[Any, str] = {}
+        for grs in grs_data:
+            grs_id = grs.get('grs_id')
+            if grs_id not in grs_names:
+                grs_names[grs_id] = grs.get('grs_name', f"ГРС {grs_id}")
+
+        for prg in prgs:
+            grs_id = prg.get('grs_id', '')
+            grs_name = grs_names.get(grs_id, f"ГРС {grs_id}")
+            consumers = consumers_by_settlement.get(location_key(prg['mo'], prg['settlement']), ())
+            self._bind_consumers_to_prg(result, prg, consumers, grs_name, share)
+
+        return result
+
+    def _bind_consumers_to_prg(
+        self,
+        result: BindingResult,
+        prg: Dict[str, Any],
+        consumers: List[Dict[str, Any]],
+        grs_name: str,
+        share: float
+    ):
+        """
+        Bind a PRG to consumers with expense and free share checks.
+
+        Args:
+            result: BindingResult to record outcomes in
+            prg: PRG dictionary
+            consumers: Consumers to bind
+            grs_name: GRS name for the PRG
+            share: Share to assign to each consumer
+        """
+        prg_id = prg['prg_id']
 
         # Categorize consumers
-        for consumer in consumers_in_settlement:
-            current_bindings = parse_prg_bindings(consumer.get('code', ''))
+        for consumer in consumers:
+            current_bindings = list(consumer_bindings(consumer, self.data_store))
 
             # Check if already bound to this PRG
             already_bound = any(b['prg_id'] == prg_id for b in current_bindings)
@@ -128,7 +236,7 @@ class BindingService:
 
                 # Create change record
                 old_code = consumer.get('code', '')
-                consumer['code'] = new_binding_string
+                self._set_code(consumer, new_binding_string)
 
                 change_id = f"settlement_bind_{consumer['id']}_{datetime.now().timestamp()}"
                 change = {
@@ -148,8 +256,6 @@ class BindingService:
             except Exception as e:
                 result.add_error(consumer, str(e))
 
-        return result
-
     def bind_single_consumer(
         self,
         consumer: Dict[str, Any],
@@ -181,8 +287,8 @@ class BindingService:
                 result.add_skip(consumer, "нет расходов")
                 return result
 
-            # Get current bindings
-            current_bindings = parse_prg_bindings(consumer.get('code', ''))
+            # Get current bindings (copied: shares are updated in place below)
+            current_bindings = [dict(binding) for binding in consumer_bindings(consumer, self.data_store)]
 
             # Check if already bound to this PRG
             existing_binding_idx = None
@@ -211,7 +317,7 @@ class BindingService:
             # Format and save
             new_binding_string = format_prg_bindings(current_bindings)
             old_code = consumer.get('code', '')
-            consumer['code'] = new_binding_string
+            self._set_code(consumer, new_binding_string)
 
             # Create change record
             change_id = f"manual_bind_{consumer['id']}_{datetime.now().timestamp()}"
@@ -250,14 +356,14 @@ class BindingService:
         result = BindingResult(operation_type="unbind")
 
         try:
-            bindings = parse_prg_bindings(consumer.get('code', ''))
+            bindings = consumer_bindings(consumer, self.data_store)
             if not bindings:
                 result.add_skip(consumer, "нет привязок")
                 return result
 
             # Clear bindings
             old_code = consumer['code']
-            consumer['code'] = ''
+            self._set_code(consumer, '')
 
             # Create change record
             change_id = f"unbind_{consumer['id']}_{datetime.now().timestamp()}"
@@ -297,23 +403,9 @@ class BindingService:
         """
         result = BindingResult(operation_type="unbind_settlement")
 
-        target_mo = target_consumer['mo'].strip()
-        target_settlement = target_consumer['settlement'].strip()
-
-        # Find all consumers in the same settlement
-        for consumer in all_consumers:
-            if (consumer['mo'].strip().lower() == target_mo.lower() and
-                    consumer['settlement'].strip().lower() == target_settlement.lower()):
-
-                # Unbind this consumer
-                unbind_result = self.unbind_single_consumer(consumer)
-
-                # Merge results
-                result.success_count += unbind_result.success_count
-                result.skipped_count += unbind_result.skipped_count
-                result.changes.extend(unbind_result.changes)
-                result.errors.extend(unbind_result.errors)
-                result.failed_consumers.extend(unbind_result.failed_consumers)
+        # Unbind all consumers in the same settlement
+        for consumer in self._consumers_in_settlement(target_consumer, all_consumers):
+            result.merge(self.unbind_single_consumer(consumer))
 
         return result
 
@@ -335,7 +427,7 @@ class BindingService:
         result = BindingResult(operation_type="remove_prg")
 
         try:
-            current_bindings = parse_prg_bindings(consumer.get('code', ''))
+            current_bindings = consumer_bindings(consumer, self.data_store)
 
             # Find and remove the binding
             new_bindings = [b for b in current_bindings if b['prg_id'] != prg_id]
@@ -347,7 +439,7 @@ class BindingService:
             # Update bindings
             new_binding_string = format_prg_bindings(new_bindings)
             old_code = consumer.get('code', '')
-            consumer['code'] = new_binding_string
+            self._set_code(consumer, new_binding_string)
 
             # Create change record
             change_id = f"remove_prg_{consumer['id']}_{datetime.now().timestamp()}"
@@ -370,6 +462,65 @@ class BindingService:
 
         return result
 
+    def _consumers_in_settlement(
+        self,
+        target_consumer: Dict[str, Any],
+        all_consumers: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Find all consumers in the settlement of target_consumer (case-insensitive).
+
+        Args:
+            target_consumer: Consumer defining the settlement
+            all_consumers: List of all consumers
+
+        Returns:
+            List of consumers in the settlement, in list order
+        """
+        if self.data_store is not None and self.data_store.covers(all_consumers):
+            return self.data_store.find_consumers_by_location(target_consumer['mo'],
+                                                              target_consumer['settlement'])
+
+        target_mo = target_consumer['mo'].strip()
+        target_settlement = target_consumer['settlement'].strip()
+        return [
+            consumer for consumer in all_consumers
+            if (consumer['mo'].strip().lower() == target_mo.lower() and
+                consumer['settlement'].strip().lower() == target_settlement.lower())
+        ]
+
+    def _group_by_settlement(self, all_consumers: List[Dict[str, Any]]) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """
+        Group consumers by normalized (mo, settlement) key in one pass.
+
+        Args:
+            all_consumers: List of all consumers
+
+        Returns:
+            Dictionary (mo, settlement) key -> consumers in list order
+        """
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for consumer in all_consumers:
+            groups.setdefault(location_key(consumer['mo'], consumer['settlement']), []).append(consumer)
+        return groups
+
+    def _set_code(self, consumer: Dict[str, Any], code: str):
+        """
+        Store a new binding string of a consumer.
+
+        Args:
+            consumer: Consumer dictionary
+            code: New binding string
+        """
+        old_code = consumer.get('code', '')
+        if self.data_store is not None:
+            self.data_store.set_consumer_code(consumer, code)
+        else:
+            consumer['code'] = code
+
+        if self.calculation_service is not None:
+            self.calculation_service.apply_binding_change(consumer, old_code, code)
+
     def _has_expenses(self, consumer: Dict[str, Any]) -> bool:
         """
         Check if consumer has expenses (using validation service if available).
@@ -1,7 +1,10 @@
 """Calculation service for PRG load computations."""
 
-from typing import List, Dict, Any, Tuple
-from ..data.parsers import parse_prg_bindings
+import math
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from ..data.parsers import parse_prg_bindings, consumer_bindings
+from .load_matrix import LoadMatrix, LOAD_COLUMNS
 
 
 class CalculationResult:
@@ -9,19 +12,103 @@ class CalculationResult:
 
     def __init__(self):
         self.prg_loads: Dict[str, Dict[str, float]] = {}
+        self.prg_binding_counts: Dict[str, int] = {}  # Bindings counted per PRG ID
         self.processed_consumers: int = 0
         self.processed_bindings: int = 0
         self.updated_prg_count: int = 0
         self.errors: List[str] = []
-        self.details: List[str] = []  # Detailed log entries
+        self.details: Optional[CalculationDetails] = None  # Per-binding log (None in fast mode)
 
     def add_error(self, error: str):
         """Add error message to result."""
         self.errors.append(error)
 
-    def add_detail(self, detail: str):
-        """Add detail message to result."""
-        self.details.append(detail)
+
+# (consumer index, prg_id, share, yearly load, hourly load)
+DetailEntry = Tuple[int, str, float, float, float]
+
+
+class CalculationDetails:
+    """
+    Per-binding calculation log.
+
+    Entries are kept as arrays and returned as DetailEntry tuples; the text
+    of an entry is rendered only when asked for (e.g. by a log viewer page).
+    """
+
+    def __init__(self, consumer_data: List[Dict[str, Any]], consumer_indexes: np.ndarray,
+                 prg_ids: List[str], prg_columns: np.ndarray, shares: np.ndarray,
+                 yearly_loads: np.ndarray, hourly_loads: np.ndarray):
+        """
+        Initialize calculation log.
+
+        Args:
+            consumer_data: Consumer list the calculation ran on
+            consumer_indexes: Index in consumer_data per entry
+            prg_ids: PRG IDs referenced by prg_columns
+            prg_columns: Index in prg_ids per entry
+            shares: Binding share per entry
+            yearly_loads: Yearly load per entry
+            hourly_loads: Hourly load per entry
+        """
+        self.consumer_data = consumer_data
+        self.prg_ids = prg_ids
+        self._consumer_indexes = consumer_indexes
+        self._prg_columns = prg_columns
+        self._shares = shares
+        self._yearly_loads = yearly_loads
+        self._hourly_loads = hourly_loads
+
+    def __len__(self) -> int:
+        return len(self._shares)
+
+    def __getitem__(self, index: int) -> DetailEntry:
+        """
+        Get one entry.
+
+        Args:
+            index: Entry index (negative values count from the end)
+
+        Returns:
+            Tuple of (consumer index, prg_id, share, yearly load, hourly load)
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("calculation detail index out of range")
+        return (int(self._consumer_indexes[index]), self.prg_ids[self._prg_columns[index]],
+                float(self._shares[index]), float(self._yearly_loads[index]), float(self._hourly_loads[index]))
+
+    def render(self, index: int) -> str:
+        """
+        Render one entry as a log line.
+
+        Args:
+            index: Entry index
+
+        Returns:
+            str: Log line
+        """
+        consumer_index, prg_id, share, yearly_load, hourly_load = self[index]
+        consumer = self.consumer_data[consumer_index]
+        return (
+            f"{consumer.get('name', 'Unknown')} (тип: {consumer.get('type')}) -> "
+            f"ПРГ {prg_id}: доля {share:.3f}, годовая {yearly_load:.3f}, "
+            f"часовая {hourly_load:.3f}"
+        )
+
+    def render_page(self, start: int, count: int) -> List[str]:
+        """
+        Render a page of entries.
+
+        Args:
+            start: Index of the first entry
+            count: Maximum number of entries
+
+        Returns:
+            List of log lines
+        """
+        return [self.render(index) for index in range(max(0, start), min(len(self), start + count))]
 
 
 class CalculationService:
@@ -32,21 +119,30 @@ class CalculationService:
     - Calculating PRG loads from consumer bindings
     - Separating population and organization loads
     - Computing totals (Year_volume, Max_Hour)
+    - Keeping live PRG loads current on binding changes
     """
 
-    def __init__(self, validation_service=None):
+    def __init__(self, validation_service=None, data_store=None):
         """
         Initialize calculation service.
 
         Args:
             validation_service: ValidationService instance for expense retrieval
+            data_store: Optional DataStore providing cached parsed bindings
         """
         self.validation_service = validation_service
+        self.data_store = data_store
+
+        # Live loads: None until start_live_loads()
+        self.live_loads: Optional[Dict[str, Dict[str, float]]] = None
+        self._live_binding_counts: Dict[str, int] = {}
+        self._changed_live_prg_ids: set = set()
 
     def calculate_prg_loads(
         self,
         prg_data: List[Dict[str, Any]],
-        consumer_data: List[Dict[str, Any]]
+        consumer_data: List[Dict[str, Any]],
+        record_details: bool = True
     ) -> CalculationResult:
         """
         Calculate PRG loads from consumer bindings.
@@ -54,7 +150,7 @@ class CalculationService:
         Logic:
         1. Process all consumers with expenses
         2. Extract PRG bindings from each consumer
-        3. Accumulate loads by PRG ID:
+        3. Accumulate loads by PRG ID (sparse share matrix x expense matrix, see LoadMatrix):
            - QY_pop (population yearly volume)
            - QH_pop (population hourly rate)
            - QY_ind (organization yearly volume)
@@ -66,70 +162,58 @@ class CalculationService:
         Args:
             prg_data: List of PRG dictionaries
             consumer_data: List of consumer dictionaries
+            record_details: Keep the per-binding log in result.details
+                (False - "fast" mode, no log)
 
         Returns:
             CalculationResult with prg_loads dictionary and statistics
         """
         result = CalculationResult()
 
-        # Process each consumer
-        for consumer in consumer_data:
+        # Collect consumer rows of the share matrix
+        yearly_expenses, hourly_expenses = self._get_expense_vectors(consumer_data)
+        positions = []
+        consumers = []
+        yearly = []
+        hourly = []
+        bindings = []
+        for position, consumer, consumer_yearly, consumer_hourly in zip(
+                range(len(consumer_data)), consumer_data, yearly_expenses, hourly_expenses):
             try:
-                # Get consumer expenses
-                expenses = self._get_expenses(consumer)
-                if not expenses or (expenses.get('yearly', 0) == 0 and expenses.get('hourly', 0) == 0):
+                if consumer_yearly is None or (consumer_yearly == 0 and consumer_hourly == 0):
                     continue  # Skip consumers without expenses
 
                 # Get consumer bindings
-                bindings = parse_prg_bindings(consumer.get('code', ''))
-                if not bindings:
+                bound = consumer_bindings(consumer, self.data_store)
+                if not bound:
                     continue  # Skip unbound consumers
 
-                result.processed_consumers += 1
-
-                # Determine consumer type
-                is_population = (consumer.get('type') == 'Население')
-                is_organization = (consumer.get('type') == 'Организация')
-
-                # Process each binding
-                for binding in bindings:
-                    prg_id = binding['prg_id']
-                    share = binding['share']
-
-                    # Initialize PRG load if not exists
-                    if prg_id not in result.prg_loads:
-                        result.prg_loads[prg_id] = {
-                            'QY_pop': 0.0,  # Population yearly volume
-                            'QH_pop': 0.0,  # Population hourly rate
-                            'QY_ind': 0.0,  # Organization yearly volume
-                            'QH_ind': 0.0   # Organization hourly rate
-                        }
-
-                    # Add loads with share weighting
-                    yearly_load = expenses['yearly'] * share
-                    hourly_load = expenses['hourly'] * share
-
-                    if is_population:
-                        result.prg_loads[prg_id]['QY_pop'] += yearly_load
-                        result.prg_loads[prg_id]['QH_pop'] += hourly_load
-                    elif is_organization:
-                        result.prg_loads[prg_id]['QY_ind'] += yearly_load
-                        result.prg_loads[prg_id]['QH_ind'] += hourly_load
-
-                    result.processed_bindings += 1
-
-                    # Log detail
-                    result.add_detail(
-                        f"{consumer.get('name', 'Unknown')} (тип: {consumer.get('type')}) -> "
-                        f"ПРГ {prg_id}: доля {share:.3f}, годовая {yearly_load:.3f}, "
-                        f"часовая {hourly_load:.3f}"
-                    )
+                positions.append(position)
+                consumers.append(consumer)
+                yearly.append(consumer_yearly)
+                hourly.append(consumer_hourly)
+                bindings.append(bound)
 
             except Exception as e:
                 error_msg = f"Ошибка обработки потребителя {consumer.get('name', 'Unknown')}: {str(e)}"
                 result.add_error(error_msg)
                 continue
 
+        matrix = LoadMatrix(consumers, yearly, hourly, bindings)
+
+        # All PRG loads in one product
+        result.prg_loads = matrix.load_dict()
+        result.prg_binding_counts = matrix.binding_counts()
+        result.processed_consumers = len(matrix.consumers)
+        result.processed_bindings = matrix.binding_count
+
+        # Log details (rendered to text on demand)
+        if record_details:
+            rows, prg_columns, shares, yearly_loads, hourly_loads = matrix.binding_arrays()
+            consumer_indexes = np.asarray(positions, dtype=np.intp)[rows]
+            result.details = CalculationDetails(consumer_data, consumer_indexes, matrix.prg_ids, prg_columns,
+                                                shares, yearly_loads, hourly_loads)
+
         # Count updated PRGs
         result.updated_prg_count = len(result.prg_loads)
 
@@ -195,6 +279,177 @@ class CalculationService:
         """
         return sum(binding.get('share', 0.0) for binding in bindings)
 
+    # === LIVE LOADS ===
+
+    def start_live_loads(self, consumer_data: List[Dict[str, Any]]) -> CalculationResult:
+        """
+        Calculate loads from scratch and keep them as live accumulators.
+
+        Args:
+            consumer_data: List of consumer dictionaries
+
+        Returns:
+            CalculationResult of the full calculation
+        """
+        result = self.calculate_prg_loads([], consumer_data, record_details=False)
+        self.reset_live_loads(result)
+        return result
+
+    def reset_live_loads(self, result: CalculationResult):
+        """
+        Replace live loads with the result of a full calculation.
+
+        Args:
+            result: CalculationResult from calculate_prg_loads
+        """
+        previous = set(self.live_loads or ())
+        self.live_loads = {prg_id: dict(load) for prg_id, load in result.prg_loads.items()}
+        self._live_binding_counts = dict(result.prg_binding_counts)
+        self._changed_live_prg_ids |= previous | set(self.live_loads)
+
+    def stop_live_loads(self):
+        """Stop maintaining live loads (e.g. while no data is loaded)."""
+        self.live_loads = None
+        self._live_binding_counts = {}
+        self._changed_live_prg_ids = set()
+
+    def apply_binding_change(self, consumer: Dict[str, Any], old_code: str, new_code: str) -> List[str]:
+        """
+        Update live loads after a consumer's binding string changed.
+
+        The consumer's contribution under the old bindings is subtracted and
+        the one under the new bindings is added, so the cost depends only on
+        the bindings changed.
+
+        Args:
+            consumer: Consumer dictionary
+            old_code: Binding string before the change
+            new_code: Binding string after the change
+
+        Returns:
+            List of PRG IDs whose live loads changed
+        """
+        if self.live_loads is None or old_code == new_code:
+            return []
+
+        expenses = self._get_expenses(consumer)
+        if not expenses or (expenses.get('yearly', 0) == 0 and expenses.get('hourly', 0) == 0):
+            return []  # Consumers without expenses do not load PRGs
+
+        yearly = expenses['yearly']
+        hourly = expenses['hourly']
+        changed = []
+        for binding in parse_prg_bindings(old_code):
+            self._add_live_load(consumer, binding['prg_id'], -1, -yearly * binding['share'],
+                                -hourly * binding['share'])
+            changed.append(binding['prg_id'])
+        for binding in parse_prg_bindings(new_code):
+            self._add_live_load(consumer, binding['prg_id'], 1, yearly * binding['share'],
+                                hourly * binding['share'])
+            changed.append(binding['prg_id'])
+
+        changed = list(dict.fromkeys(changed))
+        self._changed_live_prg_ids.update(changed)
+        return changed
+
+    def get_live_load(self, prg_id: str) -> Optional[Dict[str, float]]:
+        """
+        Get the live load of a PRG.
+
+        Args:
+            prg_id: PRG ID
+
+        Returns:
+            Dict with QY_pop, QH_pop, QY_ind, QH_ind, Year_volume, Max_Hour
+            (zeros for PRGs without bindings), or None if live loads are not kept
+        """
+        if self.live_loads is None:
+            return None
+
+        load = dict(self.live_loads.get(prg_id) or dict.fromkeys(LOAD_COLUMNS, 0.0))
+        load['Year_volume'] = load['QY_pop'] + load['QY_ind']
+        load['Max_Hour'] = load['QH_pop'] + load['QH_ind']
+        return load
+
+    def pop_changed_live_prg_ids(self) -> List[str]:
+        """
+        Get and forget PRG IDs whose live loads changed since the last call.
+
+        Returns:
+            List of PRG IDs
+        """
+        changed = list(self._changed_live_prg_ids)
+        self._changed_live_prg_ids = set()
+        return changed
+
+    def check_live_loads(self, result: CalculationResult, tolerance: float = 1e-6) -> List[str]:
+        """
+        Compare live loads with a full calculation.
+
+        Args:
+            result: CalculationResult from calculate_prg_loads
+            tolerance: Relative and absolute tolerance per load value
+
+        Returns:
+            List of PRG IDs whose live loads differ (all PRGs of the result
+            if live loads are not kept)
+        """
+        if self.live_loads is None:
+            return list(result.prg_loads)
+
+        zero = dict.fromkeys(LOAD_COLUMNS, 0.0)
+        mismatches = []
+        for prg_id in dict.fromkeys([*result.prg_loads, *self.live_loads]):
+            expected = result.prg_loads.get(prg_id, zero)
+            actual = self.live_loads.get(prg_id, zero)
+            if not all(math.isclose(actual[column], expected[column], rel_tol=tolerance, abs_tol=tolerance)
+                       for column in LOAD_COLUMNS):
+                mismatches.append(prg_id)
+        return mismatches
+
+    def _add_live_load(self, consumer: Dict[str, Any], prg_id: str, count: int,
+                       yearly_load: float, hourly_load: float):
+        """Add one binding's contribution (negative to remove it) to the live loads."""
+        remaining = self._live_binding_counts.get(prg_id, 0) + count
+        if remaining <= 0:
+            # Last binding gone: drop the entry instead of keeping rounding residue
+            self._live_binding_counts.pop(prg_id, None)
+            self.live_loads.pop(prg_id, None)
+            return
+
+        self._live_binding_counts[prg_id] = remaining
+        load = self.live_loads.setdefault(prg_id, dict.fromkeys(LOAD_COLUMNS, 0.0))
+        consumer_type = consumer.get('type')
+        if consumer_type == 'Население':
+            load['QY_pop'] += yearly_load
+            load['QH_pop'] += hourly_load
+        elif consumer_type == 'Организация':
+            load['QY_ind'] += yearly_load
+            load['QH_ind'] += hourly_load
+
+    def _get_expense_vectors(self, consumer_data: List[Dict[str, Any]]
+                             ) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+        """
+        Get yearly and hourly expenses of many consumers.
+
+        Args:
+            consumer_data: List of consumer dictionaries
+
+        Returns:
+            Tuple of (yearly, hourly) lists aligned with consumer_data;
+            None for consumers without expenses
+        """
+        if self.validation_service:
+            return self.validation_service.get_expense_vectors(consumer_data)
+
+        yearly = []
+        hourly = []
+        for consumer in consumer_data:
+            expenses = self._get_expenses(consumer)
+            yearly.append(expenses['yearly'] if expenses else None)
+            hourly.append(expenses['hourly'] if expenses else None)
+        return yearly, hourly
+
     def _get_expenses(self, consumer: Dict[str, Any]) -> Dict[str, float]:
         """
         Get consumer expenses using validation service.
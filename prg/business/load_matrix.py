@@ -0,0 +1,149 @@
+"""Sparse consumer x PRG share matrix for PRG load calculation."""
+
+from typing import List, Dict, Any, Tuple
+import numpy as np
+
+# Load columns, in the order of the expense matrix columns
+LOAD_COLUMNS = ('QY_pop', 'QH_pop', 'QY_ind', 'QH_ind')
+
+
+class LoadMatrix:
+    """
+    Consumer x PRG share matrix with per-consumer expense columns.
+
+    The share matrix S is kept in coordinate form (row = consumer,
+    column = PRG, value = share). The expense matrix E has one row per
+    consumer and the columns of LOAD_COLUMNS: yearly/hourly expenses in the
+    population columns for population consumers, in the organization columns
+    for organizations (zeros otherwise). All PRG loads are then S^T @ E,
+    computed as one weighted bincount per column.
+
+    Rows and columns keep the order of the consumers and the order in which
+    PRG IDs first appear, so the results match sequential accumulation.
+    """
+
+    def __init__(self, consumers: List[Dict[str, Any]], yearly: List[float], hourly: List[float],
+                 bindings: List[List[Dict[str, Any]]]):
+        """
+        Build the matrix.
+
+        Args:
+            consumers: Consumer dictionaries (matrix rows)
+            yearly: Yearly expenses per consumer
+            hourly: Hourly expenses per consumer
+            bindings: Parsed bindings per consumer (prg_id, share)
+        """
+        self.consumers = consumers
+        self.prg_ids: List[str] = []
+        self._yearly = np.asarray(yearly, dtype=np.float64)
+        self._hourly = np.asarray(hourly, dtype=np.float64)
+        self._kinds = np.array([self._kind(consumer.get('type')) for consumer in consumers], dtype=np.int8)
+        self._rows, self._cols, self._shares = self._coordinates(bindings)
+
+    @property
+    def binding_count(self) -> int:
+        """Number of non-zero entries (bindings) of the share matrix."""
+        return len(self._shares)
+
+    def expense_matrix(self) -> np.ndarray:
+        """
+        Build the expense matrix E (consumers x LOAD_COLUMNS).
+
+        Returns:
+            np.ndarray: float64 array of shape (consumers, 4)
+        """
+        expenses = np.zeros((len(self.consumers), len(LOAD_COLUMNS)))
+        population = self._kinds == 0
+        organization = self._kinds == 1
+        expenses[population, 0] = self._yearly[population]
+        expenses[population, 1] = self._hourly[population]
+        expenses[organization, 2] = self._yearly[organization]
+        expenses[organization, 3] = self._hourly[organization]
+        return expenses
+
+    def loads(self) -> np.ndarray:
+        """
+        Compute S^T @ E.
+
+        Returns:
+            np.ndarray: float64 array of shape (PRG IDs, 4), rows in prg_ids order
+        """
+        weighted = self.expense_matrix()[self._rows] * self._shares[:, None]
+
+        loads = np.empty((len(self.prg_ids), len(LOAD_COLUMNS)))
+        for column in range(len(LOAD_COLUMNS)):
+            loads[:, column] = np.bincount(self._cols, weights=weighted[:, column], minlength=len(self.prg_ids))
+        return loads
+
+    def load_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        Compute PRG loads as dictionaries.
+
+        Returns:
+            Dict of prg_id -> {'QY_pop', 'QH_pop', 'QY_ind', 'QH_ind'}
+        """
+        return {
+            prg_id: dict(zip(LOAD_COLUMNS, values))
+            for prg_id, values in zip(self.prg_ids, self.loads().tolist())
+        }
+
+    def binding_counts(self) -> Dict[str, int]:
+        """
+        Count bindings (matrix entries) per PRG ID.
+
+        Returns:
+            Dict of prg_id -> number of bindings, in prg_ids order
+        """
+        counts = np.bincount(self._cols, minlength=len(self.prg_ids)).tolist()
+        return dict(zip(self.prg_ids, counts))
+
+    def binding_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get matrix entries with their loads, in row order.
+
+        Returns:
+            Tuple of arrays (row, PRG column, share, yearly load, hourly load)
+        """
+        return (self._rows, self._cols, self._shares,
+                self._yearly[self._rows] * self._shares, self._hourly[self._rows] * self._shares)
+
+    def _coordinates(self, bindings: List[List[Dict[str, Any]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build (row, column, share) arrays of the share matrix.
+
+        Binding lists shared between consumers (see BindingCodec) are
+        converted once.
+        """
+        columns: Dict[str, int] = {}
+        converted: Dict[int, Tuple[List[Dict[str, Any]], List[int], List[float]]] = {}
+        counts = []
+        cols = []
+        shares = []
+        for consumer_bindings in bindings:
+            entry = converted.get(id(consumer_bindings))
+            if entry is None:
+                entry_cols = []
+                for binding in consumer_bindings:
+                    col = columns.get(binding['prg_id'])
+                    if col is None:
+                        col = columns[binding['prg_id']] = len(self.prg_ids)
+                        self.prg_ids.append(binding['prg_id'])
+                    entry_cols.append(col)
+                # The list itself is kept so its id stays unique while converting
+                entry = converted[id(consumer_bindings)] = (
+                    consumer_bindings, entry_cols, [float(binding['share']) for binding in consumer_bindings])
+            counts.append(len(entry[1]))
+            cols.extend(entry[1])
+            shares.extend(entry[2])
+
+        rows = np.repeat(np.arange(len(counts), dtype=np.intp), counts)
+        return rows, np.asarray(cols, dtype=np.intp), np.asarray(shares, dtype=np.float64)
+
+    @staticmethod
+    def _kind(consumer_type: Any) -> int:
+        """Expense column group: 0 - population, 1 - organization, 2 - none."""
+        if consumer_type == 'Население':
+            return 0
+        if consumer_type == 'Организация':
+            return 1
+        return 2
@@ -1,6 +1,9 @@
 """Search and filter service for consumers and PRGs."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from ..data.parsers import consumer_bindings
+from ..data.data_store import location_key
+from ..data.name_index import NameIndex
 
 
 class SearchResult:
@@ -12,10 +15,13 @@ class SearchResult:
         self.with_expenses_count: int = 0
         self.without_expenses_count: int = 0
         self.details: List[str] = []
+        self.scores: Dict[str, float] = {}
 
-    def add_match(self, item: Dict[str, Any], has_expenses: bool = True):
-        """Add matched item to results."""
+    def add_match(self, item: Dict[str, Any], has_expenses: bool = True, score: Optional[float] = None):
+        """Add matched item to results (score of fuzzy matches by item 'id')."""
         self.matches.append(item)
+        if score is not None:
+            self.scores[item['id']] = score
         self.total_count += 1
         if has_expenses:
             self.with_expenses_count += 1
@@ -38,14 +44,17 @@ class SearchService:
     - Filter operations
     """
 
-    def __init__(self, validation_service=None):
+    def __init__(self, validation_service=None, data_store=None):
         """
         Initialize search service.
 
         Args:
             validation_service: ValidationService instance for expense checks
+            data_store: Optional DataStore; its indexes are used for the
+                lists it holds
         """
         self.validation_service = validation_service
+        self.data_store = data_store
 
     def smart_search_organizations(
         self,
@@ -53,7 +62,8 @@ class SearchService:
         district: str,
         settlement: str,
         street_pattern: str,
-        require_expenses: bool = True
+        require_expenses: bool = True,
+        fuzzy: bool = False
     ) -> SearchResult:
         """
         Smart search for organizations by location and street name.
@@ -64,9 +74,11 @@ class SearchService:
             settlement: Settlement to filter
             street_pattern: Street name pattern to search in consumer name
             require_expenses: If True, only include consumers with expenses
+            fuzzy: If True, match name words loosely (street type spelling,
+                ё/е, case, quotes, typos) and rank matches by score
 
         Returns:
-            SearchResult with matching organizations
+            SearchResult with matching organizations (best first if fuzzy)
         """
         result = SearchResult()
 
@@ -75,7 +87,25 @@ class SearchService:
         result.add_detail(f"  НП: {settlement}")
         result.add_detail(f"  Улица в названии: {street_pattern}")
 
-        for consumer in consumer_data:
+        if fuzzy:
+            result.add_detail(f"  Режим: нечёткий поиск")
+            for consumer, score in self._fuzzy_candidates(consumer_data, district, settlement, street_pattern):
+                has_expenses = self._has_expenses(consumer)
+                if require_expenses and not has_expenses:
+                    result.add_detail(f"  Пропуск {consumer['name']} - нет расходов")
+                    continue
+
+                result.add_match(consumer, has_expenses, score)
+                result.add_detail(f"  Найдена: {consumer['name']} (сходство {score:.2f})")
+            return result
+
+        if self.data_store is not None and self.data_store.covers(consumer_data):
+            # Name index: only organizations of the location containing the pattern
+            candidates = self.data_store.find_organizations_by_name(district, settlement, street_pattern)
+        else:
+            candidates = consumer_data
+
+        for consumer in candidates:
             # Check if organization
             if consumer.get('type') != 'Организация':
                 continue
@@ -124,7 +154,7 @@ class SearchService:
         """
         result = SearchResult()
 
-        for consumer in consumer_data:
+        for consumer in self._consumers_in_location(consumer_data, district, settlement):
             # Check type if specified
             if consumer_type and consumer.get('type') != consumer_type:
                 continue
@@ -157,6 +187,10 @@ class SearchService:
         Returns:
             PRG dictionary or None if not found
         """
+        if self.data_store is not None and self.data_store.covers(prg_data):
+            matches = self.data_store.find_prg_by_prg_id(prg_id)
+            return matches[0] if matches else None
+
         for prg in prg_data:
             if prg['prg_id'] == prg_id:
                 return prg
@@ -181,7 +215,7 @@ class SearchService:
         """
         matches = []
 
-        for prg in prg_data:
+        for prg in self._prg_in_location(prg_data, district, settlement):
             # Check district (case-insensitive)
             if prg['mo'].strip().lower() != district.strip().lower():
                 continue
@@ -252,7 +286,7 @@ class SearchService:
             Sorted list of PRG IDs in the location
         """
         prg_ids = []
-        for prg in prg_data:
+        for prg in self._prg_in_location(prg_data, district, settlement):
             if (prg.get('mo', '').strip().lower() == district.strip().lower() and
                     prg.get('settlement', '').strip().lower() == settlement.strip().lower()):
                 prg_id = prg.get('prg_id', '').strip()
@@ -279,8 +313,6 @@ class SearchService:
         Returns:
             SearchResult with matching consumers
         """
-        from ..data.parsers import parse_prg_bindings
-
         result = SearchResult()
 
         for consumer in consumer_data:
@@ -290,7 +322,7 @@ class SearchService:
 
             # Check bindings
             if has_bindings is not None:
-                bindings = parse_prg_bindings(consumer.get('code', ''))
+                bindings = consumer_bindings(consumer, self.data_store)
                 has_binding = len(bindings) > 0
                 if has_binding != has_bindings:
                     continue
@@ -304,6 +336,84 @@ class SearchService:
 
         return result
 
+    def _consumers_in_location(
+        self,
+        consumer_data: List[Dict[str, Any]],
+        district: str,
+        settlement: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Narrow consumers down to a location using the data store index.
+
+        Without a data store (or for lists it does not hold) all records are
+        returned; callers still check the location themselves.
+
+        Args:
+            consumer_data: List of consumer dictionaries
+            district: District (MO)
+            settlement: Settlement
+
+        Returns:
+            Consumers to check, in list order
+        """
+        if self.data_store is not None and self.data_store.covers(consumer_data):
+            return self.data_store.find_consumers_by_location(district, settlement)
+        return consumer_data
+
+    def _prg_in_location(
+        self,
+        prg_data: List[Dict[str, Any]],
+        district: str,
+        settlement: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Narrow PRGs down to a location using the data store index.
+
+        Without a data store (or for lists it does not hold) all records are
+        returned; callers still check the location themselves.
+
+        Args:
+            prg_data: List of PRG dictionaries
+            district: District (MO)
+            settlement: Settlement
+
+        Returns:
+            PRGs to check, in list order
+        """
+        if self.data_store is not None and self.data_store.covers(prg_data):
+            return self.data_store.find_prg_by_location(district, settlement)
+        return prg_data
+
+    def _fuzzy_candidates(
+        self,
+        consumer_data: List[Dict[str, Any]],
+        district: str,
+        settlement: str,
+        query: str
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Rank organizations of a location by fuzzy name match.
+
+        Uses the data store's name index for its consumer list; other lists
+        are filtered by location and indexed for this query only.
+
+        Args:
+            consumer_data: List of consumer dictionaries
+            district: District (MO)
+            settlement: Settlement
+            query: Street query
+
+        Returns:
+            (consumer, score) pairs, best first
+        """
+        if self.data_store is not None and self.data_store.covers(consumer_data):
+            return self.data_store.find_organizations_fuzzy(district, settlement, query)
+
+        key = location_key(district, settlement)
+        located = [consumer for consumer in consumer_data
+                   if location_key(consumer.get('mo'), consumer.get('settlement')) == key]
+        return NameIndex().search_fuzzy(key, located, query)
+
     def _has_expenses(self, consumer: Dict[str, Any]) -> bool:
         """
         Check if consumer has expenses (using validation service if available).
@@ -2,7 +2,8 @@
 
 import pandas as pd
 from typing import List, Dict, Any, Optional, Tuple
-from ..data.parsers import parse_prg_bindings
+from ..data.parsers import consumer_bindings
+from ..data.data_store import location_key
 
 
 class ValidationService:
@@ -15,6 +16,16 @@ class ValidationService:
     - GRS validation
     """
 
+    def __init__(self, data_store=None):
+        """
+        Initialize validation service.
+
+        Args:
+            data_store: Optional DataStore; its indexes are used for the
+                lists it holds
+        """
+        self.data_store = data_store
+
     def has_expenses(self, consumer: Dict[str, Any]) -> bool:
         """
         Check if consumer has expense data.
@@ -81,6 +92,41 @@ class ValidationService:
             'hourly': hourly_expenses
         }
 
+    def get_expense_vectors(self, consumer_data: List[Dict[str, Any]]
+                            ) -> Tuple[List[Optional[float]], List[Optional[float]]]:
+        """
+        Get expenses of many consumers (column-wise get_consumer_expenses).
+
+        Float cells, as produced by the loader, are taken directly; other
+        values go through get_consumer_expenses.
+
+        Args:
+            consumer_data: List of consumer dictionaries
+
+        Returns:
+            Tuple of (yearly, hourly) lists aligned with consumer_data;
+            both are None for consumers without valid expenses
+        """
+        yearly = []
+        hourly = []
+        for consumer in consumer_data:
+            yearly_raw = consumer.get('expenses', '')
+            hourly_raw = consumer.get('hourly_expenses', '')
+            if type(yearly_raw) is float and type(hourly_raw) is float:
+                if yearly_raw > 0:
+                    yearly.append(yearly_raw)
+                    hourly.append(hourly_raw if hourly_raw > 0 else yearly_raw / 8760)
+                else:
+                    yearly.append(None)
+                    hourly.append(None)
+                continue
+
+            expenses = self.get_consumer_expenses(consumer)
+            yearly.append(expenses['yearly'] if expenses else None)
+            hourly.append(expenses['hourly'] if expenses else None)
+
+        return yearly, hourly
+
     def find_unbound_prg(self, prg_data: List[Dict[str, Any]],
                         consumer_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -93,25 +139,51 @@ class ValidationService:
         Returns:
             List of PRG dictionaries without matching consumers
         """
-        unbound_prg = []
+        unbound_prg, _ = self.analyze_prg_coverage(prg_data, consumer_data)
+        return unbound_prg
 
-        for prg in prg_data:
-            prg_mo = prg['mo'].strip().lower()
-            prg_settlement = prg['settlement'].strip().lower()
+    def analyze_prg_coverage(self, prg_data: List[Dict[str, Any]],
+                             consumer_data: List[Dict[str, Any]]
+                             ) -> Tuple[List[Dict[str, Any]], Dict[Tuple[str, str], int]]:
+        """
+        Count consumers per settlement and find PRGs in settlements without consumers.
 
-            has_consumers = False
-            for consumer in consumer_data:
-                consumer_mo = consumer['mo'].strip().lower()
-                consumer_settlement = consumer['settlement'].strip().lower()
+        Runs in O(P + C): consumers are counted once by normalized
+        (mo, settlement) key (see location_key), then every PRG is checked
+        with a single lookup.
 
-                if prg_mo == consumer_mo and prg_settlement == consumer_settlement:
-                    has_consumers = True
-                    break
+        Args:
+            prg_data: List of PRG dictionaries
+            consumer_data: List of consumer dictionaries
 
-            if not has_consumers:
-                unbound_prg.append(prg)
+        Returns:
+            Tuple of (PRGs without consumers, consumer count by (mo, settlement) key)
+        """
+        settlement_counts = self.count_consumers_by_settlement(consumer_data)
+        unbound_prg = [
+            prg for prg in prg_data
+            if location_key(prg['mo'], prg['settlement']) not in settlement_counts
+        ]
+        return unbound_prg, settlement_counts
+
+    def count_consumers_by_settlement(self, consumer_data: List[Dict[str, Any]]) -> Dict[Tuple[str, str], int]:
+        """
+        Count consumers per normalized (mo, settlement) key.
 
-        return unbound_prg
+        Args:
+            consumer_data: List of consumer dictionaries
+
+        Returns:
+            Dictionary (mo, settlement) key -> number of consumers
+        """
+        if self.data_store is not None and self.data_store.covers(consumer_data):
+            return self.data_store.consumer_counts_by_location()
+
+        settlement_counts: Dict[Tuple[str, str], int] = {}
+        for consumer in consumer_data:
+            key = location_key(consumer['mo'], consumer['settlement'])
+            settlement_counts[key] = settlement_counts.get(key, 0) + 1
+        return settlement_counts
 
     def find_unbound_consumers(self, consumer_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -126,7 +198,7 @@ class ValidationService:
         unbound_consumers = []
 
         for consumer in consumer_data:
-            bindings = parse_prg_bindings(consumer.get('code', ''))
+            bindings = consumer_bindings(consumer, self.data_store)
             if not bindings:
                 unbound_consumers.append(consumer)
 
@@ -194,7 +266,7 @@ class ValidationService:
                 continue
 
             # Skip if no bindings
-            bindings = parse_prg_bindings(consumer.get('code', ''))
+            bindings = consumer_bindings(consumer, self.data_store)
             if not bindings:
                 continue
 
@@ -237,6 +309,10 @@ class ValidationService:
         Returns:
             str: GRS name or fallback string
         """
+        if self.data_store is not None and self.data_store.covers(grs_data):
+            matches = self.data_store.find_grs_by_grs_id(grs_id)
+            return matches[0].get('grs_name', f"ГРС {grs_id}") if matches else f"ГРС {grs_id}"
+
         for grs in grs_data:
             if grs.get('grs_id') == grs_id:
                 return grs.get('grs_name', f"ГРС {grs_id}")
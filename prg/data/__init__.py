@@ -1,29 +1,60 @@
 """Data layer for Excel I/O operations."""
 
-from .excel_loader import ExcelLoader
+from .excel_loader import ExcelLoader, LoadCancelledError
+from .snapshot_cache import SnapshotCache
+from .data_store import DataStore, location_key
+from .name_index import NameIndex, normalize_name_tokens
+from .binding_codec import BindingCodec, BINDING_CODEC
+from .change_journal import ChangeJournal
+from .change_wal import ChangeWAL
+from .file_hash import content_hash
+from .xlsx_patcher import patch_cells, XlsxPatchError
 from .parsers import (
     parse_numeric_value,
     parse_share_from_excel,
     format_share_for_excel,
     parse_prg_bindings,
+    consumer_bindings,
     format_prg_bindings,
     calculate_total_share,
     parse_grs_id_column,
     extract_grs_name_from_id,
     extract_grs_name_from_code,
-    normalize_string
+    normalize_string,
+    normalize_string_column,
+    parse_numeric_column,
+    parse_grs_id_series,
+    intern_string_column
 )
 
 __all__ = [
     'ExcelLoader',
+    'LoadCancelledError',
+    'SnapshotCache',
+    'DataStore',
+    'location_key',
+    'NameIndex',
+    'normalize_name_tokens',
+    'BindingCodec',
+    'BINDING_CODEC',
+    'ChangeJournal',
+    'ChangeWAL',
+    'content_hash',
+    'patch_cells',
+    'XlsxPatchError',
     'parse_numeric_value',
     'parse_share_from_excel',
     'format_share_for_excel',
     'parse_prg_bindings',
+    'consumer_bindings',
     'format_prg_bindings',
     'calculate_total_share',
     'parse_grs_id_column',
     'extract_grs_name_from_id',
     'extract_grs_name_from_code',
     'normalize_string',
+    'normalize_string_column',
+    'parse_numeric_column',
+    'parse_grs_id_series',
+    'intern_string_column',
 ]
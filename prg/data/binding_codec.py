@@ -0,0 +1,205 @@
+"""Interning codec for consumer binding strings."""
+
+from typing import List, Dict, Any, Tuple, Optional
+
+BindingFields = Tuple[str, float, str]
+
+# Entries per table of the process-wide BINDING_CODEC
+SHARED_CODEC_MAX_ENTRIES = 50000
+
+
+class BindingCodec:
+    """
+    Parses binding strings once per distinct string and interns their parts.
+
+    Workbooks repeat the same binding string on many rows (every house of a
+    village bound to one PRG), so decoded results are cached by string and
+    shared: identical strings cost one parse and one list of bindings.
+    PRG IDs, GRS names and the binding strings themselves are interned, so
+    equal values are also one object.
+
+    Two formats are supported:
+    - workbook format "PRG_ID|share|GRS_name" (decode)
+    - model format "PRG_ID:share[:GRS_name]" (decode_colon, split_colon)
+    Multiple bindings are separated by semicolons in both.
+
+    Decoded results are shared between all callers and must be treated as
+    read-only; copy them before adding, removing or changing bindings.
+
+    With max_entries, a table (interned strings, decoded results) that is
+    full is emptied before its next entry is added, which bounds the memory
+    of a codec that lives as long as the process.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize empty codec.
+
+        Args:
+            max_entries: Entries kept per table at most (None: unbounded)
+        """
+        self.max_entries = max_entries
+        self._strings: Dict[str, str] = {}
+        self._decoded: Dict[str, List[Dict[str, Any]]] = {}
+        self._decoded_colon: Dict[str, Tuple[BindingFields, ...]] = {}
+        self.hits = 0
+        self.parses = 0
+
+    def intern(self, value: str) -> str:
+        """
+        Get the shared instance of a string.
+
+        Args:
+            value: Any string
+
+        Returns:
+            str: Equal string, the same object for equal values
+        """
+        shared = self._strings.get(value)
+        if shared is None:
+            self._make_room(self._strings)
+            shared = self._strings[value] = value
+        return shared
+
+    def decode(self, code: str) -> List[Dict[str, Any]]:
+        """
+        Decode a workbook binding string.
+
+        Format: "PRG_ID1|share1|GRS_Name1;PRG_ID2|share2|GRS_Name2".
+        Parts with fewer than three fields are skipped; pipes after the
+        second one belong to the GRS name; shares accept comma decimals.
+
+        Args:
+            code: Semicolon-separated binding string
+
+        Returns:
+            List of binding dictionaries with keys: prg_id, share, grs_name
+            (shared, treat as read-only)
+        """
+        if not code:
+            code = ''
+        bindings = self._decoded.get(code)
+        if bindings is not None:
+            self.hits += 1
+            return bindings
+
+        self.parses += 1
+        bindings = []
+        for part in code.split(';'):
+            part = part.strip()
+            if not part:
+                continue
+
+            components = part.split('|')
+            if len(components) >= 3:
+                bindings.append({
+                    'prg_id': self.intern(components[0].strip()),
+                    'share': self._parse_share(components[1].strip()),
+                    'grs_name': self.intern('|'.join(components[2:]).strip())
+                })
+
+        self._make_room(self._decoded)
+        self._decoded[self.intern(code)] = bindings
+        return bindings
+
+    def decode_colon(self, code: str) -> Tuple[BindingFields, ...]:
+        """
+        Decode a model-format binding string.
+
+        Format: "PRG_ID1:share1:GRS_name1;PRG_ID2:share2". Invalid parts
+        are skipped.
+
+        Args:
+            code: Semicolon-separated binding string
+
+        Returns:
+            Tuple of (prg_id, share, grs_name) tuples
+        """
+        if not code or not isinstance(code, str):
+            return ()
+        fields = self._decoded_colon.get(code)
+        if fields is not None:
+            self.hits += 1
+            return fields
+
+        self.parses += 1
+        decoded = []
+        for binding_str in code.split(';'):
+            binding_str = binding_str.strip()
+            if binding_str:
+                try:
+                    decoded.append(self.split_colon(binding_str))
+                except ValueError:
+                    continue
+
+        fields = tuple(decoded)
+        self._make_room(self._decoded_colon)
+        self._decoded_colon[self.intern(code)] = fields
+        return fields
+
+    def split_colon(self, binding_str: str) -> BindingFields:
+        """
+        Split one model-format binding.
+
+        Args:
+            binding_str: "PRG_ID:share" or "PRG_ID:share:GRS_name"
+
+        Returns:
+            Tuple of (prg_id, share, grs_name)
+
+        Raises:
+            ValueError: If format is invalid
+        """
+        parts = binding_str.split(':')
+
+        if len(parts) < 2:
+            raise ValueError(f"Invalid binding format: {binding_str}")
+
+        try:
+            share = float(parts[1].strip())
+        except ValueError:
+            raise ValueError(f"Invalid share value in binding: {binding_str}")
+
+        grs_name = parts[2].strip() if len(parts) > 2 else ""
+
+        return self.intern(parts[0].strip()), share, self.intern(grs_name)
+
+    def clear(self):
+        """Drop all interned strings and decoded results (counters are kept)."""
+        self._strings.clear()
+        self._decoded.clear()
+        self._decoded_colon.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get codec statistics.
+
+        Returns:
+            Dictionary with keys: strings, codes, hits, parses
+        """
+        return {
+            'strings': len(self._strings),
+            'codes': len(self._decoded) + len(self._decoded_colon),
+            'hits': self.hits,
+            'parses': self.parses,
+        }
+
+    def _make_room(self, table: Dict[str, Any]):
+        """Empty a full table before an entry is added."""
+        if self.max_entries is not None and len(table) >= self.max_entries:
+            table.clear()
+
+    @staticmethod
+    def _parse_share(share_str: str) -> float:
+        """Share from a binding string (comma or dot decimals, 0.0 if invalid)."""
+        if not share_str:
+            return 0.0
+        try:
+            return float(share_str.replace(',', '.'))
+        except ValueError:
+            return 0.0
+
+
+# Codec of parse_prg_bindings(), format_prg_bindings() and the models; a
+# DataStore decodes the bindings of its records with a codec of its own
+BINDING_CODEC = BindingCodec(SHARED_CODEC_MAX_ENTRIES)
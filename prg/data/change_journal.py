@@ -0,0 +1,189 @@
+"""Pending Excel changes keyed by cell address."""
+
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, Optional
+
+from .change_wal import ChangeWAL
+
+# (sheet_name, row, col), 0-based like change records
+CellKey = Tuple[str, int, int]
+
+
+class ChangeJournal:
+    """
+    Pending cell writes, coalesced per cell.
+
+    Every recorded change dictionary (with 'sheet_name', 'row', 'col',
+    'new_value', 'old_value') is kept in the operation history. The pending
+    entry of its cell takes the latest new value and keeps the old value of
+    the first change since the last save, so saving writes each cell once.
+    A cell whose latest value equals that original value has nothing to
+    write and is dropped from the pending entries.
+
+    With a write-ahead log attached (see ChangeWAL), every recorded change
+    is also appended to it, and each record()/record_all() call syncs it
+    once.
+    """
+
+    def __init__(self, wal: Optional[ChangeWAL] = None):
+        """
+        Initialize empty journal.
+
+        Args:
+            wal: Optional ChangeWAL that recorded changes are appended to
+        """
+        self.wal = wal
+        self._pending: Dict[CellKey, Dict[str, Any]] = {}
+        self._history: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def cell_key(change: Dict[str, Any]) -> CellKey:
+        """
+        Get the cell address of a change.
+
+        Args:
+            change: Change dictionary
+
+        Returns:
+            Tuple (sheet_name, row, col)
+        """
+        return change.get('sheet_name', ''), change.get('row', 0), change.get('col', 0)
+
+    def record(self, change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Record a change and coalesce it with the pending write of its cell.
+
+        Args:
+            change: Change dictionary (kept as-is in the history)
+
+        Returns:
+            Pending entry of the cell, or None if the cell is back to its
+            original value
+        """
+        entry = self._record(change)
+        if self.wal is not None:
+            self.wal.append(change)
+            self.wal.sync()
+        return entry
+
+    def record_all(self, changes: Iterable[Dict[str, Any]]):
+        """
+        Record several changes in order (one write-ahead log sync).
+
+        Args:
+            changes: Change dictionaries
+        """
+        for change in changes:
+            self._record(change)
+            if self.wal is not None:
+                self.wal.append(change)
+        if self.wal is not None:
+            self.wal.sync()
+
+    def restore(self, changes: Iterable[Dict[str, Any]]):
+        """
+        Record changes replayed from the write-ahead log (not appended again).
+
+        Args:
+            changes: Change dictionaries
+        """
+        for change in changes:
+            self._record(change)
+
+    def _record(self, change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Add a change to the history and coalesce it into its cell entry."""
+        self._history.append(change)
+        key = self.cell_key(change)
+
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = dict(change)
+            entry['operations'] = 0
+        else:
+            original = entry['old_value']
+            entry.update(change)
+            entry['old_value'] = original
+        entry['operations'] += 1
+
+        if self.same_value(entry['new_value'], entry['old_value']):
+            self._pending.pop(key, None)
+            return None
+        self._pending[key] = entry
+        return entry
+
+    def get(self, sheet_name: str, row: int, col: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the pending entry of a cell.
+
+        Returns:
+            Pending entry or None
+        """
+        return self._pending.get((sheet_name, row, col))
+
+    def values(self) -> List[Dict[str, Any]]:
+        """Pending entries in the order their cells were first changed."""
+        return list(self._pending.values())
+
+    def history(self, sheet_name: Optional[str] = None, row: Optional[int] = None,
+                col: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get recorded changes since the last clear, oldest first.
+
+        Args:
+            sheet_name, row, col: Optional cell address to filter by
+
+        Returns:
+            List of change dictionaries as they were recorded
+        """
+        if sheet_name is None:
+            return list(self._history)
+        return [change for change in self._history if self.cell_key(change) == (sheet_name, row, col)]
+
+    def discard_sheets(self, sheet_names: Iterable[str]) -> int:
+        """
+        Drop pending entries and history of the given sheets.
+
+        Args:
+            sheet_names: Sheet names
+
+        Returns:
+            Number of dropped pending entries
+        """
+        sheet_names = set(sheet_names)
+        dropped = [key for key in self._pending if key[0] in sheet_names]
+        for key in dropped:
+            del self._pending[key]
+        self._history = [change for change in self._history if change.get('sheet_name') not in sheet_names]
+        return len(dropped)
+
+    def clear(self):
+        """Drop all pending entries and the history (after saving)."""
+        self._pending.clear()
+        self._history.clear()
+
+    @property
+    def operation_count(self) -> int:
+        """Number of recorded changes since the last clear."""
+        return len(self._history)
+
+    @staticmethod
+    def same_value(new_value: Any, old_value: Any) -> bool:
+        """
+        Check whether writing new_value leaves a cell holding old_value unchanged.
+
+        Empty strings and None are the same (an empty cell); numbers are
+        compared by value.
+        """
+        if new_value in ('', None) or old_value in ('', None):
+            return new_value in ('', None) and old_value in ('', None)
+        if isinstance(new_value, (int, float)) and isinstance(old_value, (int, float)):
+            return float(new_value) == float(old_value)
+        return type(new_value) is type(old_value) and new_value == old_value
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._pending.values()))
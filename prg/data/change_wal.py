@@ -0,0 +1,266 @@
+"""Append-only on-disk journal of pending changes (write-ahead log)."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable
+
+from .file_hash import content_hash
+
+
+# Bump when the journal line layout changes so old journals are ignored
+WAL_FORMAT = 1
+
+
+class ChangeWAL:
+    """
+    Write-ahead journal of change records for one workbook at a time.
+
+    Every change is appended as one line "<crc32> <json>" as it is made.
+    Appends are buffered and made durable by sync(), which callers issue
+    once per user operation, so a batch of thousands of changes costs one
+    fsync. The first line describes the workbook the changes apply to
+    (size, mtime and content hash), so a journal can be matched to the
+    file it was written for. A torn last line left by a crash fails its
+    checksum and is dropped on read.
+
+    There is one journal file per workbook path. It is rewritten from
+    scratch when the workbook is saved and its pending changes are gone.
+    """
+
+    def __init__(self, journal_dir: Path):
+        """
+        Initialize journal.
+
+        Args:
+            journal_dir: Directory for journal files (created on first start)
+        """
+        self.journal_dir = Path(journal_dir)
+        self.excel_path: Optional[Path] = None
+        self._file = None
+        self._unsynced = 0
+        self.appended = 0
+        self.syncs = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while a journal is open for appending."""
+        return self._file is not None
+
+    def is_open_for(self, excel_path: Path) -> bool:
+        """Check whether the open journal belongs to a workbook."""
+        return self.is_open and Path(excel_path).resolve() == self.excel_path
+
+    def read(self, excel_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read the journal of a workbook.
+
+        Args:
+            excel_path: Path to Excel file
+
+        Returns:
+            Dictionary with keys: changes (change dictionaries in order),
+            created (timestamp of the journal), matches_workbook (False if
+            the file was modified since the journal was started), or None if
+            there is no readable journal
+        """
+        journal_path = self._journal_path(excel_path)
+        try:
+            with open(journal_path, 'rb') as f:
+                header = None
+                changes = []
+                for line in f:
+                    record = self._decode_line(line)
+                    if record is None:
+                        break
+                    if header is None:
+                        header = record
+                    else:
+                        changes.append(record)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[WARNING] Change journal read failed: {str(e)}")
+            return None
+
+        if header is None or header.get('format') != WAL_FORMAT:
+            return None
+        return {
+            'changes': changes,
+            'created': header.get('created', 0),
+            'matches_workbook': self._matches_workbook(excel_path, header),
+        }
+
+    def start(self, excel_path: Path, changes: Iterable[Dict[str, Any]] = ()):
+        """
+        Start a new journal for a workbook, replacing any previous one.
+
+        The header and the given changes are written to a temporary file,
+        synced and moved into place before the journal is opened for appends.
+
+        Args:
+            excel_path: Path to Excel file in its current state
+            changes: Changes already pending against that state
+
+        Raises:
+            Exception: If the journal cannot be written
+        """
+        self.close()
+        excel_path = Path(excel_path).resolve()
+        tmp_path = None
+        try:
+            stat = os.stat(excel_path)
+            header = {
+                'format': WAL_FORMAT,
+                'workbook': str(excel_path),
+                'created': time.time(),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'content_hash': content_hash(excel_path),
+            }
+            self.journal_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.journal_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._encode_line(header))
+                for change in changes:
+                    f.write(self._encode_line(change))
+                f.flush()
+                os.fsync(f.fileno())
+            journal_path = self._journal_path(excel_path)
+            os.replace(tmp_path, journal_path)
+            tmp_path = None
+            self._open(excel_path, journal_path)
+        except Exception as e:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise Exception(f"Change journal start error: {str(e)}")
+
+    def resume(self, excel_path: Path):
+        """
+        Continue appending to the existing journal of a workbook.
+
+        A torn last line is cut off first. Starts a new journal if there is
+        no readable one.
+
+        Args:
+            excel_path: Path to Excel file
+        """
+        self.close()
+        excel_path = Path(excel_path).resolve()
+        journal_path = self._journal_path(excel_path)
+        try:
+            valid_size = 0
+            with open(journal_path, 'rb') as f:
+                for line in f:
+                    if self._decode_line(line) is None:
+                        break
+                    valid_size += len(line)
+            if valid_size == 0:
+                raise ValueError("empty journal")
+            with open(journal_path, 'r+b') as f:
+                f.truncate(valid_size)
+            self._open(excel_path, journal_path)
+        except Exception:
+            self.start(excel_path)
+
+    def append(self, change: Dict[str, Any]):
+        """
+        Append a change (durable after the next sync()).
+
+        Args:
+            change: Change dictionary (JSON-serializable values)
+        """
+        if self._file is None:
+            return
+        self._file.write(self._encode_line(change))
+        self._unsynced += 1
+        self.appended += 1
+
+    def sync(self):
+        """Flush appended changes and fsync them to disk."""
+        if self._file is None or self._unsynced == 0:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self.syncs += 1
+
+    def close(self):
+        """Sync and close the journal file (the file is kept)."""
+        if self._file is None:
+            return
+        try:
+            self.sync()
+        finally:
+            self._file.close()
+            self._file = None
+            self.excel_path = None
+
+    def discard(self, excel_path: Path):
+        """
+        Close and delete the journal of a workbook.
+
+        Args:
+            excel_path: Path to Excel file
+        """
+        if self.is_open_for(excel_path):
+            self.close()
+        journal_path = self._journal_path(excel_path)
+        if journal_path.exists():
+            journal_path.unlink()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get journal statistics.
+
+        Returns:
+            Dictionary with keys: appended, syncs, unsynced
+        """
+        return {'appended': self.appended, 'syncs': self.syncs, 'unsynced': self._unsynced}
+
+    def _open(self, excel_path: Path, journal_path: Path):
+        """Open a journal file for appending."""
+        self._file = open(journal_path, 'ab')
+        self.excel_path = excel_path
+        self._unsynced = 0
+
+    def _journal_path(self, excel_path: Path) -> Path:
+        """Get journal file for a workbook path."""
+        key = str(Path(excel_path).resolve())
+        name = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return self.journal_dir / f"{name}.wal"
+
+    def _matches_workbook(self, excel_path: Path, header: Dict[str, Any]) -> bool:
+        """Check whether a workbook is still in the state the journal started from."""
+        try:
+            stat = os.stat(excel_path)
+        except OSError:
+            return False
+        if header.get('size') != stat.st_size:
+            return False
+        if header.get('mtime_ns') == stat.st_mtime_ns:
+            return True
+        return header.get('content_hash') == content_hash(excel_path)
+
+    @staticmethod
+    def _encode_line(record: Dict[str, Any]) -> bytes:
+        """Serialize one record as a checksummed line."""
+        payload = json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+        return b'%08x ' % zlib.crc32(payload) + payload + b'\n'
+
+    @staticmethod
+    def _decode_line(line: bytes) -> Optional[Dict[str, Any]]:
+        """Parse a checksummed line (None if it is torn or corrupt)."""
+        if not line.endswith(b'\n') or len(line) < 10 or line[8:9] != b' ':
+            return None
+        payload = line[9:-1]
+        try:
+            if int(line[:8], 16) != zlib.crc32(payload):
+                return None
+            return json.loads(payload.decode('utf-8'))
+        except ValueError:
+            return None
@@ -0,0 +1,311 @@
+"""Indexed in-memory store of loaded PRG, GRS and consumer records."""
+
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+from .binding_codec import BindingCodec
+from .name_index import NameIndex
+
+
+def location_key(mo: Any, settlement: Any) -> Tuple[str, str]:
+    """
+    Normalized (district, settlement) key.
+
+    Matches the case-insensitive, whitespace-insensitive comparison the
+    services use for locations.
+
+    Args:
+        mo: District (MO) name
+        settlement: Settlement name
+
+    Returns:
+        Tuple of stripped lower-case names
+    """
+    return (str(mo or '').strip().lower(), str(settlement or '').strip().lower())
+
+
+class DataStore:
+    """
+    Holds loaded records together with hash indexes over them.
+
+    The record lists are the ones produced by ExcelLoader and are kept as-is
+    (records are shared, not copied). Indexes:
+    - records by 'id' (PRG, GRS, consumers)
+    - PRGs by 'prg_id' and by 'grs_id', GRS by 'grs_id'
+    - PRGs and consumers by normalized (mo, settlement)
+    - consumers by 'type'
+    - consumers by bound PRG ID (built on first use from 'code')
+
+    Binding strings are decoded by binding_codec, a codec of the current
+    load (replaced by the next one), organization names are indexed per
+    location in name_index.
+
+    Index lists keep the order of the record lists. When a consumer's
+    'code' changes, call reindex_consumer() (or use set_consumer_code()).
+    """
+
+    def __init__(self, prg_data: Optional[List[Dict[str, Any]]] = None,
+                 grs_data: Optional[List[Dict[str, Any]]] = None,
+                 consumer_data: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initialize data store.
+
+        Args:
+            prg_data: List of PRG dictionaries
+            grs_data: List of GRS dictionaries
+            consumer_data: List of consumer dictionaries
+        """
+        self.name_index = NameIndex()
+        self.load(prg_data or [], grs_data or [], consumer_data or [])
+
+    def load(self, prg_data: List[Dict[str, Any]], grs_data: List[Dict[str, Any]],
+             consumer_data: List[Dict[str, Any]]):
+        """
+        Replace the stored records and rebuild all indexes.
+
+        Also used after the lists were modified in place (e.g. by
+        ExcelLoader.reload_changed).
+
+        Args:
+            prg_data: List of PRG dictionaries
+            grs_data: List of GRS dictionaries
+            consumer_data: List of consumer dictionaries
+        """
+        self.prg_data = prg_data
+        self.grs_data = grs_data
+        self.consumer_data = consumer_data
+
+        self._prg_by_id = {prg['id']: prg for prg in prg_data}
+        self._grs_by_id = {grs['id']: grs for grs in grs_data}
+        self._consumer_by_id = {consumer['id']: consumer for consumer in consumer_data}
+        self._consumer_position = {consumer['id']: i for i, consumer in enumerate(consumer_data)}
+
+        self._prg_by_prg_id = self._group(prg_data, lambda prg: prg.get('prg_id', ''))
+        self._prg_by_grs_id = self._group(prg_data, lambda prg: prg.get('grs_id'))
+        self._grs_by_grs_id = self._group(grs_data, lambda grs: grs.get('grs_id'))
+        self._prg_by_location = self._group(prg_data, lambda prg: location_key(prg.get('mo'), prg.get('settlement')))
+        self._consumers_by_location = self._group(
+            consumer_data, lambda consumer: location_key(consumer.get('mo'), consumer.get('settlement')))
+        self._consumers_by_type = self._group(consumer_data, lambda consumer: consumer.get('type'))
+
+        # Decoded bindings of the previous records are not kept
+        self.binding_codec = BindingCodec()
+        self.name_index.retain(self._consumers_by_location)
+
+        # Built lazily: parsing every binding string is the costly part
+        self._consumers_by_prg_id: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+        self._consumer_prg_ids: Dict[str, Tuple[str, ...]] = {}
+
+    def covers(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether a record list is one of the lists this store indexes.
+
+        Services use the indexes only for the lists they were built from.
+
+        Args:
+            records: List of records passed to a service
+
+        Returns:
+            bool: True if records is the stored PRG, GRS or consumer list
+        """
+        return records is self.prg_data or records is self.grs_data or records is self.consumer_data
+
+    # === LOOKUPS ===
+
+    def get_prg(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Get PRG record by its 'id'."""
+        return self._prg_by_id.get(record_id)
+
+    def get_grs(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Get GRS record by its 'id'."""
+        return self._grs_by_id.get(record_id)
+
+    def get_consumer(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Get consumer record by its 'id'."""
+        return self._consumer_by_id.get(record_id)
+
+    def find_prg_by_prg_id(self, prg_id: str) -> List[Dict[str, Any]]:
+        """Get PRGs with the given PRG ID."""
+        return list(self._prg_by_prg_id.get(prg_id, ()))
+
+    def find_prg_by_grs_id(self, grs_id: str) -> List[Dict[str, Any]]:
+        """Get PRGs fed by the given GRS ID."""
+        return list(self._prg_by_grs_id.get(grs_id, ()))
+
+    def find_grs_by_grs_id(self, grs_id: str) -> List[Dict[str, Any]]:
+        """Get GRS records with the given GRS ID."""
+        return list(self._grs_by_grs_id.get(grs_id, ()))
+
+    def find_prg_by_location(self, mo: str, settlement: str) -> List[Dict[str, Any]]:
+        """Get PRGs of a settlement (case-insensitive)."""
+        return list(self._prg_by_location.get(location_key(mo, settlement), ()))
+
+    def find_consumers_by_location(self, mo: str, settlement: str,
+                                   consumer_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get consumers of a settlement (case-insensitive).
+
+        Args:
+            mo: District (MO) name
+            settlement: Settlement name
+            consumer_type: Optional filter by type ('Население' or 'Организация')
+
+        Returns:
+            List of consumer dictionaries in load order
+        """
+        consumers = self._consumers_by_location.get(location_key(mo, settlement), ())
+        if consumer_type:
+            return [consumer for consumer in consumers if consumer.get('type') == consumer_type]
+        return list(consumers)
+
+    def find_organizations_by_name(self, mo: str, settlement: str, pattern: str) -> List[Dict[str, Any]]:
+        """
+        Get organizations of a settlement whose name contains a pattern.
+
+        Args:
+            mo: District (MO) name
+            settlement: Settlement name
+            pattern: Substring of the name (case-insensitive)
+
+        Returns:
+            List of organization dictionaries in load order
+        """
+        key = location_key(mo, settlement)
+        consumers = self._consumers_by_location.get(key)
+        if not consumers:
+            return []
+        return self.name_index.search(key, consumers, pattern)
+
+    def find_organizations_fuzzy(self, mo: str, settlement: str,
+                                 query: str) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Get organizations of a settlement ranked by fuzzy name match.
+
+        Args:
+            mo: District (MO) name
+            settlement: Settlement name
+            query: Street query (see NameIndex.search_fuzzy)
+
+        Returns:
+            (organization dictionary, score) pairs, best first
+        """
+        key = location_key(mo, settlement)
+        consumers = self._consumers_by_location.get(key)
+        if not consumers:
+            return []
+        return self.name_index.search_fuzzy(key, consumers, query)
+
+    def find_consumers_by_type(self, consumer_type: str) -> List[Dict[str, Any]]:
+        """Get consumers of a type ('Население' or 'Организация')."""
+        return list(self._consumers_by_type.get(consumer_type, ()))
+
+    def find_consumers_by_prg_id(self, prg_id: str) -> List[Dict[str, Any]]:
+        """
+        Get consumers bound to a PRG.
+
+        Args:
+            prg_id: PRG ID
+
+        Returns:
+            List of consumer dictionaries in load order
+        """
+        bound = self._binding_index().get(prg_id)
+        if not bound:
+            return []
+        return sorted(bound.values(), key=lambda consumer: self._consumer_position[consumer['id']])
+
+    def bindings(self, consumer: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get parsed bindings of a consumer (one parse per distinct binding string).
+
+        Args:
+            consumer: Consumer dictionary
+
+        Returns:
+            List of binding dictionaries (shared, treat as read-only)
+        """
+        return self.binding_codec.decode(consumer.get('code', ''))
+
+    def consumer_counts_by_location(self) -> Dict[Tuple[str, str], int]:
+        """Get number of consumers per normalized (mo, settlement) key."""
+        return {key: len(consumers) for key, consumers in self._consumers_by_location.items()}
+
+    def locations(self) -> List[Tuple[str, str]]:
+        """Get normalized (mo, settlement) keys of all PRGs and consumers."""
+        return list(self._prg_by_location.keys() | self._consumers_by_location.keys())
+
+    # === UPDATES ===
+
+    def set_consumer_code(self, consumer: Dict[str, Any], code: str):
+        """
+        Change a consumer's binding string and update the binding index.
+
+        Args:
+            consumer: Consumer dictionary
+            code: New binding string
+        """
+        consumer['code'] = code
+        self.reindex_consumer(consumer)
+
+    def reindex_consumer(self, consumer: Dict[str, Any]):
+        """
+        Update the binding index after a consumer's 'code' changed.
+
+        Consumers that are not stored here are ignored.
+
+        Args:
+            consumer: Consumer dictionary
+        """
+        consumer_id = consumer.get('id')
+        if self._consumers_by_prg_id is None or self._consumer_by_id.get(consumer_id) is not consumer:
+            return
+
+        old_prg_ids = self._consumer_prg_ids.get(consumer_id, ())
+        new_prg_ids = self._bound_prg_ids(self.bindings(consumer))
+        if old_prg_ids == new_prg_ids:
+            return
+
+        for prg_id in old_prg_ids:
+            bound = self._consumers_by_prg_id.get(prg_id)
+            if bound is not None:
+                bound.pop(consumer_id, None)
+                if not bound:
+                    del self._consumers_by_prg_id[prg_id]
+        for prg_id in new_prg_ids:
+            self._consumers_by_prg_id.setdefault(prg_id, {})[consumer_id] = consumer
+
+        if new_prg_ids:
+            self._consumer_prg_ids[consumer_id] = new_prg_ids
+        else:
+            self._consumer_prg_ids.pop(consumer_id, None)
+
+    def _binding_index(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get (building on first use) the PRG ID -> bound consumers index."""
+        if self._consumers_by_prg_id is None:
+            index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            prg_ids_by_code: Dict[str, Tuple[str, ...]] = {}
+            for consumer in self.consumer_data:
+                code = consumer.get('code', '')
+                if not code:
+                    continue
+                if code not in prg_ids_by_code:
+                    prg_ids_by_code[code] = self._bound_prg_ids(self.bindings(consumer))
+                prg_ids = prg_ids_by_code[code]
+                if prg_ids:
+                    self._consumer_prg_ids[consumer['id']] = prg_ids
+                    for prg_id in prg_ids:
+                        index.setdefault(prg_id, {})[consumer['id']] = consumer
+            self._consumers_by_prg_id = index
+        return self._consumers_by_prg_id
+
+    @staticmethod
+    def _bound_prg_ids(bindings: List[Dict[str, Any]]) -> Tuple[str, ...]:
+        """Distinct PRG IDs of parsed bindings, in binding order."""
+        return tuple(dict.fromkeys(binding['prg_id'] for binding in bindings))
+
+    @staticmethod
+    def _group(records: List[Dict[str, Any]], key) -> Dict[Any, List[Dict[str, Any]]]:
+        """Group records by key(record), keeping record order."""
+        groups = defaultdict(list)
+        for record in records:
+            groups[key(record)].append(record)
+        return dict(groups)
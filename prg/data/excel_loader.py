@@ -1,11 +1,57 @@
 """Excel data loading operations."""
 
+import json
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
 import pandas as pd
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable
+from openpyxl import load_workbook
 from ..config import SettingsManager
 from ..utils import col_to_index
-from .parsers import parse_numeric_value, parse_grs_id_column, normalize_string
+from .parsers import normalize_string_column, parse_numeric_column, parse_grs_id_series, intern_string_column
+from .snapshot_cache import SnapshotCache
+from .xlsx_parts import sheet_fingerprints
+
+
+# Table types in the order load_all_data() reads them
+TABLE_TYPES = ('prg', 'grs', 'population', 'organizations')
+
+# Supported load_all_data() modes
+LOAD_MODES = ('single_pass', 'per_sheet', 'streaming', 'parallel')
+
+# ExcelLoader method loading each table type from its own sheet
+_TABLE_LOADERS = {
+    'prg': 'load_prg_data',
+    'grs': 'load_grs_data',
+    'population': 'load_population_data',
+    'organizations': 'load_organization_data',
+}
+
+# Rows parsed at a time by the streaming consumer readers
+STREAM_CHUNK_ROWS = 5000
+
+# Seconds between checks of cancel_event while worker processes load sheets
+PARALLEL_CANCEL_POLL_SECONDS = 0.1
+
+# Progress callback of load_all_data(): (sheet name, rows parsed so far)
+ProgressCallback = Callable[[str, int], None]
+
+# Cell texts pd.read_excel turns into NaN by default (plus Excel error values)
+_NA_STRINGS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+    '#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!',
+})
+
+
+class LoadCancelledError(Exception):
+    """Raised by load_all_data() when loading is cancelled through cancel_event."""
 
 
 class ExcelLoader:
@@ -15,21 +61,29 @@ class ExcelLoader:
     Handles loading of PRG, GRS, and consumer data based on configuration settings.
     """
 
-    def __init__(self, settings_manager: SettingsManager):
+    def __init__(self, settings_manager: SettingsManager,
+                 snapshot_cache: Optional[SnapshotCache] = None):
         """
         Initialize Excel loader.
 
         Args:
             settings_manager: SettingsManager instance with column mappings
+            snapshot_cache: Optional cache used by load_all_data() to skip
+                parsing of unchanged workbooks
         """
         self.settings_manager = settings_manager
+        self.snapshot_cache = snapshot_cache
+        # Sheet fingerprints of the last load, keyed by resolved workbook path
+        self._loaded_fingerprints: Dict[str, Optional[Dict[str, Tuple[str, str]]]] = {}
 
-    def load_prg_data(self, excel_path: Path) -> List[Dict[str, Any]]:
+    def load_prg_data(self, excel_path: Path,
+                      df: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """
         Load PRG (pipeline) data from Excel.
 
         Args:
             excel_path: Path to Excel file
+            df: Sheet frame from read_sheets() (excel_path is not opened then)
 
         Returns:
             List of PRG dictionaries with structure, loads, and Excel metadata
@@ -39,12 +93,10 @@ class ExcelLoader:
         """
         try:
             settings = self.settings_manager.get_table_settings('prg')
-            df = pd.read_excel(excel_path, sheet_name=settings['sheet'], header=None)
+            if df is None:
+                df = self._read_sheet(excel_path, settings)
             start_row = int(settings['start_row']) - 1
 
-            if start_row > 0:
-                df = df.iloc[start_row:].reset_index(drop=True)
-
             # Get column indices
             mo_col = col_to_index(settings['mo_col'])
             settlement_col = col_to_index(settings['settlement_col'])
@@ -60,55 +112,51 @@ class ExcelLoader:
             max_hour_col = col_to_index(settings.get('max_hour_col', 'J'))
 
             prg_data = []
-            for idx, row in df.iterrows():
-                try:
-                    # Check required columns exist
-                    if mo_col >= len(row) or settlement_col >= len(row) or \
-                       prg_id_col >= len(row) or grs_id_col >= len(row):
-                        continue
-
-                    mo = normalize_string(row.iloc[mo_col])
-                    settlement = normalize_string(row.iloc[settlement_col])
-                    prg_id = normalize_string(row.iloc[prg_id_col])
-                    grs_id_raw = row.iloc[grs_id_col] if pd.notna(row.iloc[grs_id_col]) else ""
-
-                    grs_id = parse_grs_id_column(grs_id_raw)
-
-                    # Load values from Excel
-                    qy_pop = parse_numeric_value(row.iloc[qy_pop_col] if qy_pop_col < len(row) else "")
-                    qh_pop = parse_numeric_value(row.iloc[qh_pop_col] if qh_pop_col < len(row) else "")
-                    qy_ind = parse_numeric_value(row.iloc[qy_ind_col] if qy_ind_col < len(row) else "")
-                    qh_ind = parse_numeric_value(row.iloc[qh_ind_col] if qh_ind_col < len(row) else "")
-                    year_volume = parse_numeric_value(
-                        row.iloc[year_volume_col] if year_volume_col < len(row) else "")
-                    max_hour = parse_numeric_value(row.iloc[max_hour_col] if max_hour_col < len(row) else "")
-
-                    if mo and settlement and prg_id and grs_id:
-                        prg_data.append({
-                            'id': f"prg_{idx}",
-                            'mo': mo,
-                            'settlement': settlement,
-                            'prg_id': prg_id,
-                            'grs_id': grs_id,
-                            # Load values
-                            'QY_pop': qy_pop,
-                            'QH_pop': qh_pop,
-                            'QY_ind': qy_ind,
-                            'QH_ind': qh_ind,
-                            'Year_volume': year_volume,
-                            'Max_Hour': max_hour,
-                            # Excel metadata for persistence
-                            'sheet_name': settings['sheet'],
-                            'excel_row': start_row + idx,
-                            'qy_pop_col': qy_pop_col,
-                            'qh_pop_col': qh_pop_col,
-                            'qy_ind_col': qy_ind_col,
-                            'qh_ind_col': qh_ind_col,
-                            'year_volume_col': year_volume_col,
-                            'max_hour_col': max_hour_col
-                        })
-                except Exception:
-                    continue
+            if self._has_columns(df, mo_col, settlement_col, prg_id_col, grs_id_col):
+                mo = self._string_column(df, mo_col)
+                settlement = self._string_column(df, settlement_col)
+                prg_id = self._string_column(df, prg_id_col)
+                grs_id = parse_grs_id_series(df[grs_id_col])
+
+                # Load values from Excel
+                qy_pop = self._numeric_column(df, qy_pop_col)
+                qh_pop = self._numeric_column(df, qh_pop_col)
+                qy_ind = self._numeric_column(df, qy_ind_col)
+                qh_ind = self._numeric_column(df, qh_ind_col)
+                year_volume = self._numeric_column(df, year_volume_col)
+                max_hour = self._numeric_column(df, max_hour_col)
+
+                keep = (mo != '') & (settlement != '') & (prg_id != '') & grs_id.notna()
+
+                rows = self._take(keep, mo, settlement, prg_id, grs_id,
+                                  qy_pop, qh_pop, qy_ind, qh_ind, year_volume, max_hour)
+
+                for idx, mo_value, settlement_value, prg_id_value, grs_id_value, \
+                        qy_pop_value, qh_pop_value, qy_ind_value, qh_ind_value, \
+                        year_volume_value, max_hour_value in rows:
+                    prg_data.append({
+                        'id': f"prg_{idx}",
+                        'mo': mo_value,
+                        'settlement': settlement_value,
+                        'prg_id': prg_id_value,
+                        'grs_id': grs_id_value,
+                        # Load values
+                        'QY_pop': qy_pop_value,
+                        'QH_pop': qh_pop_value,
+                        'QY_ind': qy_ind_value,
+                        'QH_ind': qh_ind_value,
+                        'Year_volume': year_volume_value,
+                        'Max_Hour': max_hour_value,
+                        # Excel metadata for persistence
+                        'sheet_name': settings['sheet'],
+                        'excel_row': start_row + idx,
+                        'qy_pop_col': qy_pop_col,
+                        'qh_pop_col': qh_pop_col,
+                        'qy_ind_col': qy_ind_col,
+                        'qh_ind_col': qh_ind_col,
+                        'year_volume_col': year_volume_col,
+                        'max_hour_col': max_hour_col
+                    })
 
             print(f"[OK] Loaded PRG: {len(prg_data)}")
 
@@ -127,12 +175,14 @@ class ExcelLoader:
         except Exception as e:
             raise Exception(f"PRG loading error: {str(e)}")
 
-    def load_grs_data(self, excel_path: Path) -> List[Dict[str, Any]]:
+    def load_grs_data(self, excel_path: Path,
+                      df: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """
         Load GRS (Gas Reduction Station) reference data from Excel.
 
         Args:
             excel_path: Path to Excel file
+            df: Sheet frame from read_sheets() (excel_path is not opened then)
 
         Returns:
             List of GRS dictionaries
@@ -142,37 +192,31 @@ class ExcelLoader:
         """
         try:
             settings = self.settings_manager.get_table_settings('grs')
-            df = pd.read_excel(excel_path, sheet_name=settings['sheet'], header=None)
+            if df is None:
+                df = self._read_sheet(excel_path, settings)
             start_row = int(settings['start_row']) - 1
 
-            if start_row > 0:
-                df = df.iloc[start_row:].reset_index(drop=True)
-
             mo_col = col_to_index(settings['mo_col'])
             grs_id_col = col_to_index(settings['grs_id_col'])
             grs_name_col = col_to_index(settings['grs_name_col'])
 
             grs_data = []
-            for idx, row in df.iterrows():
-                try:
-                    if mo_col >= len(row) or grs_id_col >= len(row) or grs_name_col >= len(row):
-                        continue
-
-                    mo = normalize_string(row.iloc[mo_col])
-                    grs_id = normalize_string(row.iloc[grs_id_col])
-                    grs_name = normalize_string(row.iloc[grs_name_col])
-
-                    if mo and grs_id and grs_name:
-                        grs_data.append({
-                            'id': f"grs_{idx}",
-                            'mo': mo,
-                            'grs_id': grs_id,
-                            'grs_name': grs_name,
-                            'sheet_name': settings['sheet'],
-                            'excel_row': start_row + idx
-                        })
-                except Exception:
-                    continue
+            if self._has_columns(df, mo_col, grs_id_col, grs_name_col):
+                mo = self._string_column(df, mo_col)
+                grs_id = self._string_column(df, grs_id_col)
+                grs_name = self._string_column(df, grs_name_col)
+
+                keep = (mo != '') & (grs_id != '') & (grs_name != '')
+
+                for idx, mo_value, grs_id_value, grs_name_value in self._take(keep, mo, grs_id, grs_name):
+                    grs_data.append({
+                        'id': f"grs_{idx}",
+                        'mo': mo_value,
+                        'grs_id': grs_id_value,
+                        'grs_name': grs_name_value,
+                        'sheet_name': settings['sheet'],
+                        'excel_row': start_row + idx
+                    })
 
             print(f"[OK] Loaded GRS: {len(grs_data)}")
             return grs_data
@@ -180,12 +224,14 @@ class ExcelLoader:
         except Exception as e:
             raise Exception(f"GRS loading error: {str(e)}")
 
-    def load_population_data(self, excel_path: Path) -> List[Dict[str, Any]]:
+    def load_population_data(self, excel_path: Path,
+                             df: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """
         Load population consumer data from Excel.
 
         Args:
             excel_path: Path to Excel file
+            df: Sheet frame from read_sheets() (excel_path is not opened then)
 
         Returns:
             List of population consumer dictionaries
@@ -195,55 +241,9 @@ class ExcelLoader:
         """
         try:
             settings = self.settings_manager.get_table_settings('population')
-            df = pd.read_excel(excel_path, sheet_name=settings['sheet'], header=None)
-            start_row = int(settings['start_row']) - 1
-
-            if start_row > 0:
-                df = df.iloc[start_row:].reset_index(drop=True)
-
-            mo_col = col_to_index(settings['mo_col'])
-            settlement_col = col_to_index(settings['settlement_col'])
-            code_col = col_to_index(settings['code_col'])
-            expenses_col = col_to_index(settings['expenses_col'])
-            hourly_expenses_col = col_to_index(settings.get('hourly_expenses_col', 'O'))
-
-            population_data = []
-            for idx, row in df.iterrows():
-                try:
-                    if mo_col >= len(row) or settlement_col >= len(row):
-                        continue
-
-                    mo = normalize_string(row.iloc[mo_col])
-                    settlement = normalize_string(row.iloc[settlement_col])
-                    code = normalize_string(row.iloc[code_col]) if code_col < len(row) else ""
-
-                    # Yearly expenses - parse as numeric
-                    yearly_expenses = parse_numeric_value(
-                        row.iloc[expenses_col] if expenses_col < len(row) else "")
-
-                    # Hourly expenses (v7.4) - parse as numeric
-                    hourly_expenses = parse_numeric_value(
-                        row.iloc[hourly_expenses_col] if hourly_expenses_col < len(row) else "")
-
-                    if mo and settlement:
-                        population_data.append({
-                            'id': f"pop_{settings['sheet']}_{start_row + idx}",
-                            'type': 'Население',
-                            'consumer_type': 'population',
-                            'mo': mo,
-                            'settlement': settlement,
-                            'name': f"Население {settlement}",
-                            'code': code if code else '',
-                            'yearly_expenses': yearly_expenses,
-                            'hourly_expenses': hourly_expenses,
-                            'sheet_name': settings['sheet'],
-                            'excel_row': start_row + idx,
-                            'code_col': code_col,
-                            'expenses_col': expenses_col,
-                            'hourly_expenses_col': hourly_expenses_col
-                        })
-                except Exception:
-                    continue
+            if df is None:
+                df = self._read_sheet(excel_path, settings)
+            population_data = self._population_records(df, settings)
 
             print(f"[OK] Loaded population: {len(population_data)}")
             return population_data
@@ -251,12 +251,14 @@ class ExcelLoader:
         except Exception as e:
             raise Exception(f"Population loading error: {str(e)}")
 
-    def load_organization_data(self, excel_path: Path) -> List[Dict[str, Any]]:
+    def load_organization_data(self, excel_path: Path,
+                               df: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """
         Load organization consumer data from Excel.
 
         Args:
             excel_path: Path to Excel file
+            df: Sheet frame from read_sheets() (excel_path is not opened then)
 
         Returns:
             List of organization consumer dictionaries
@@ -266,95 +268,633 @@ class ExcelLoader:
         """
         try:
             settings = self.settings_manager.get_table_settings('organizations')
-            df = pd.read_excel(excel_path, sheet_name=settings['sheet'], header=None)
-            start_row = int(settings['start_row']) - 1
+            if df is None:
+                df = self._read_sheet(excel_path, settings)
+            organization_data = self._organization_records(df, settings)
 
-            if start_row > 0:
-                df = df.iloc[start_row:].reset_index(drop=True)
+            print(f"[OK] Loaded organizations: {len(organization_data)}")
+            return organization_data
 
-            name_col = col_to_index(settings['name_col'])
-            mo_col = col_to_index(settings['mo_col'])
-            settlement_col = col_to_index(settings['settlement_col'])
-            code_col = col_to_index(settings['code_col'])
-            expenses_col = col_to_index(settings['expenses_col'])
-            hourly_expenses_col = col_to_index(settings.get('hourly_expenses_col', 'O'))
-            grs_id_col = col_to_index(settings['grs_id_col'])
+        except Exception as e:
+            raise Exception(f"Organization loading error: {str(e)}")
 
-            organization_data = []
-            for idx, row in df.iterrows():
-                try:
-                    if name_col >= len(row) or mo_col >= len(row) or settlement_col >= len(row):
-                        continue
-
-                    name = normalize_string(row.iloc[name_col])
-                    mo = normalize_string(row.iloc[mo_col])
-                    settlement = normalize_string(row.iloc[settlement_col])
-                    code = normalize_string(row.iloc[code_col]) if code_col < len(row) else ""
-
-                    # Yearly expenses - parse as numeric
-                    yearly_expenses = parse_numeric_value(
-                        row.iloc[expenses_col] if expenses_col < len(row) else "")
-
-                    # Hourly expenses (v7.4) - parse as numeric
-                    hourly_expenses = parse_numeric_value(
-                        row.iloc[hourly_expenses_col] if hourly_expenses_col < len(row) else "")
-
-                    grs_id = normalize_string(row.iloc[grs_id_col]) if grs_id_col < len(row) else ""
-
-                    if name and mo and settlement:
-                        organization_data.append({
-                            'id': f"org_{settings['sheet']}_{start_row + idx}",
-                            'type': 'Организация',
-                            'consumer_type': 'organization',
-                            'mo': mo,
-                            'settlement': settlement,
-                            'name': name,
-                            'code': code if code else '',
-                            'grs_id': grs_id if grs_id else '',
-                            'grs_id_col': grs_id_col,
-                            'yearly_expenses': yearly_expenses,
-                            'hourly_expenses': hourly_expenses,
-                            'sheet_name': settings['sheet'],
-                            'excel_row': start_row + idx,
-                            'code_col': code_col,
-                            'expenses_col': expenses_col,
-                            'hourly_expenses_col': hourly_expenses_col
-                        })
-                except Exception:
-                    continue
+    def iter_population_records(self, excel_path: Path,
+                                chunk_size: int = STREAM_CHUNK_ROWS) -> Iterator[Dict[str, Any]]:
+        """
+        Stream population consumer records without reading the sheet into a DataFrame.
 
-            print(f"[OK] Loaded organizations: {len(organization_data)}")
-            return organization_data
+        Rows come from openpyxl in read-only mode and are parsed chunk_size rows
+        at a time, so peak memory depends on the chunk size, not the sheet size.
 
+        Args:
+            excel_path: Path to Excel file
+            chunk_size: Number of rows parsed at a time
+
+        Yields:
+            Population consumer dictionaries (same structure as load_population_data)
+
+        Raises:
+            Exception: If loading fails
+        """
+        settings = self.settings_manager.get_table_settings('population')
+        try:
+            for chunk in self._iter_sheet_chunks(excel_path, settings, chunk_size):
+                yield from self._population_records(chunk, settings)
+        except Exception as e:
+            raise Exception(f"Population loading error: {str(e)}")
+
+    def iter_organization_records(self, excel_path: Path,
+                                  chunk_size: int = STREAM_CHUNK_ROWS) -> Iterator[Dict[str, Any]]:
+        """
+        Stream organization consumer records without reading the sheet into a DataFrame.
+
+        Args:
+            excel_path: Path to Excel file
+            chunk_size: Number of rows parsed at a time
+
+        Yields:
+            Organization consumer dictionaries (same structure as load_organization_data)
+
+        Raises:
+            Exception: If loading fails
+        """
+        settings = self.settings_manager.get_table_settings('organizations')
+        try:
+            for chunk in self._iter_sheet_chunks(excel_path, settings, chunk_size):
+                yield from self._organization_records(chunk, settings)
         except Exception as e:
             raise Exception(f"Organization loading error: {str(e)}")
 
-    def load_all_data(self, excel_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    def _population_records(self, df: pd.DataFrame, settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build population records from a sheet frame (or a chunk of one).
+
+        Args:
+            df: Sheet frame (see _read_options); index is the row offset from start_row
+            settings: Population table settings
+
+        Returns:
+            List of population consumer dictionaries
+        """
+        start_row = int(settings['start_row']) - 1
+
+        mo_col = col_to_index(settings['mo_col'])
+        settlement_col = col_to_index(settings['settlement_col'])
+        code_col = col_to_index(settings['code_col'])
+        expenses_col = col_to_index(settings['expenses_col'])
+        hourly_expenses_col = col_to_index(settings.get('hourly_expenses_col', 'O'))
+
+        population_data = []
+        if self._has_columns(df, mo_col, settlement_col):
+            mo = self._string_column(df, mo_col)
+            settlement = self._string_column(df, settlement_col)
+            code = intern_string_column(self._string_column(df, code_col))
+
+            # Yearly and hourly (v7.4) expenses - parse as numeric
+            yearly_expenses = self._numeric_column(df, expenses_col)
+            hourly_expenses = self._numeric_column(df, hourly_expenses_col)
+
+            keep = (mo != '') & (settlement != '')
+
+            for idx, mo_value, settlement_value, code_value, yearly, hourly in self._take(
+                    keep, mo, settlement, code, yearly_expenses, hourly_expenses):
+                population_data.append({
+                    'id': f"pop_{settings['sheet']}_{start_row + idx}",
+                    'type': 'Население',
+                    'consumer_type': 'population',
+                    'mo': mo_value,
+                    'settlement': settlement_value,
+                    'name': f"Население {settlement_value}",
+                    'code': code_value,
+                    'yearly_expenses': yearly,
+                    'hourly_expenses': hourly,
+                    'sheet_name': settings['sheet'],
+                    'excel_row': start_row + idx,
+                    'code_col': code_col,
+                    'expenses_col': expenses_col,
+                    'hourly_expenses_col': hourly_expenses_col
+                })
+
+        return population_data
+
+    def _organization_records(self, df: pd.DataFrame, settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build organization records from a sheet frame (or a chunk of one).
+
+        Args:
+            df: Sheet frame (see _read_options); index is the row offset from start_row
+            settings: Organization table settings
+
+        Returns:
+            List of organization consumer dictionaries
+        """
+        start_row = int(settings['start_row']) - 1
+
+        name_col = col_to_index(settings['name_col'])
+        mo_col = col_to_index(settings['mo_col'])
+        settlement_col = col_to_index(settings['settlement_col'])
+        code_col = col_to_index(settings['code_col'])
+        expenses_col = col_to_index(settings['expenses_col'])
+        hourly_expenses_col = col_to_index(settings.get('hourly_expenses_col', 'O'))
+        grs_id_col = col_to_index(settings['grs_id_col'])
+
+        organization_data = []
+        if self._has_columns(df, name_col, mo_col, settlement_col):
+            name = self._string_column(df, name_col)
+            mo = self._string_column(df, mo_col)
+            settlement = self._string_column(df, settlement_col)
+            code = intern_string_column(self._string_column(df, code_col))
+
+            # Yearly and hourly (v7.4) expenses - parse as numeric
+            yearly_expenses = self._numeric_column(df, expenses_col)
+            hourly_expenses = self._numeric_column(df, hourly_expenses_col)
+
+            grs_id = self._string_column(df, grs_id_col)
+
+            keep = (name != '') & (mo != '') & (settlement != '')
+
+            for idx, name_value, mo_value, settlement_value, code_value, yearly, hourly, grs_id_value \
+                    in self._take(keep, name, mo, settlement, code, yearly_expenses, hourly_expenses, grs_id):
+                organization_data.append({
+                    'id': f"org_{settings['sheet']}_{start_row + idx}",
+                    'type': 'Организация',
+                    'consumer_type': 'organization',
+                    'mo': mo_value,
+                    'settlement': settlement_value,
+                    'name': name_value,
+                    'code': code_value,
+                    'grs_id': grs_id_value,
+                    'grs_id_col': grs_id_col,
+                    'yearly_expenses': yearly,
+                    'hourly_expenses': hourly,
+                    'sheet_name': settings['sheet'],
+                    'excel_row': start_row + idx,
+                    'code_col': code_col,
+                    'expenses_col': expenses_col,
+                    'hourly_expenses_col': hourly_expenses_col
+                })
+
+        return organization_data
+
+    def read_sheets(self, excel_path: Path,
+                    table_types: Tuple[str, ...] = TABLE_TYPES) -> Dict[str, pd.DataFrame]:
+        """
+        Read all configured sheets in a single pass over the workbook.
+
+        The workbook is opened (unzipped) once and each configured sheet is
+        parsed once, even if several table types share the same sheet and
+        columns. Only the configured columns and rows from start_row on are
+        kept (see _read_options).
+
+        Args:
+            excel_path: Path to Excel file
+            table_types: Table types to read
+
+        Returns:
+            Dictionary of sheet frames keyed by table type
+
+        Raises:
+            Exception: If the workbook or a sheet cannot be read
+        """
+        return dict(self.iter_sheets(excel_path, table_types))
+
+    def iter_sheets(self, excel_path: Path,
+                    table_types: Tuple[str, ...] = TABLE_TYPES) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Read configured sheets one by one in a single pass over the workbook.
+
+        Same reading as read_sheets(), but each frame is handed out as soon
+        as its sheet is parsed.
+
+        Args:
+            excel_path: Path to Excel file
+            table_types: Table types to read
+
+        Yields:
+            (table type, sheet frame) tuples in table_types order
+
+        Raises:
+            Exception: If the workbook or a sheet cannot be read
+        """
+        try:
+            frames_by_sheet: Dict[Tuple, pd.DataFrame] = {}
+
+            with pd.ExcelFile(excel_path) as workbook:
+                for table_type in table_types:
+                    settings = self.settings_manager.get_table_settings(table_type)
+                    key = (settings['sheet'], self._configured_columns(settings),
+                           self._skip_rows(settings))
+                    if key not in frames_by_sheet:
+                        frames_by_sheet[key] = workbook.parse(settings['sheet'],
+                                                              **self._read_options(settings))
+                    yield table_type, frames_by_sheet[key]
+
+        except Exception as e:
+            raise Exception(f"Workbook loading error: {str(e)}")
+
+    def load_all_data(self, excel_path: Path, mode: str = 'single_pass',
+                      progress_callback: Optional[ProgressCallback] = None,
+                      cancel_event: Optional[threading.Event] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Load all data from Excel file.
 
+        Modes:
+        - 'single_pass': open the workbook once and parse each sheet once
+        - 'per_sheet': every loader reads its own sheet from excel_path
+        - 'streaming': PRG/GRS in one pass, consumer sheets streamed row chunk
+          by row chunk (for very large consumer sheets)
+        - 'parallel': every table is loaded from its own sheet in a separate
+          process; the result is identical to 'per_sheet'
+
+        With a snapshot cache an unchanged workbook is not parsed at all; the
+        data is restored from the snapshot stored by the previous load.
+
+        Loading may run in a worker thread: progress_callback is called from
+        that thread after each sheet (and every STREAM_CHUNK_ROWS streamed
+        rows), and setting cancel_event stops loading at the next such point.
+
         Args:
             excel_path: Path to Excel file
+            mode: One of LOAD_MODES
+            progress_callback: Optional callback receiving (sheet name, rows parsed)
+            cancel_event: Optional event that cancels loading when set
 
         Returns:
             Dictionary with keys: 'prg', 'grs', 'consumers'
 
         Raises:
+            ValueError: If mode is invalid
+            LoadCancelledError: If cancel_event was set
             Exception: If any loading operation fails
         """
-        print(f"\n[INFO] Loading data from: {excel_path}")
-
-        prg_data = self.load_prg_data(excel_path)
-        grs_data = self.load_grs_data(excel_path)
-        population_data = self.load_population_data(excel_path)
-        organization_data = self.load_organization_data(excel_path)
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Invalid load mode: {mode}")
 
-        consumer_data = population_data + organization_data
+        table_settings = {
+            table_type: self.settings_manager.get_table_settings(table_type)
+            for table_type in TABLE_TYPES
+        }
+        path_key = self._path_key(excel_path)
+        if self.snapshot_cache is not None:
+            cached = self.snapshot_cache.load(excel_path, table_settings)
+            if cached is not None:
+                data = cached['data']
+                self._loaded_fingerprints[path_key] = cached['fingerprints']
+                print(f"\n[OK] Loaded from snapshot cache: {excel_path} "
+                      f"(PRG={len(data['prg'])}, GRS={len(data['grs'])}, "
+                      f"Consumers={len(data['consumers'])})\n")
+                return data
+
+        print(f"\n[INFO] Loading data from: {excel_path} (mode: {mode})")
+
+        # Taken before parsing, so a save during the parse is seen by reload_changed()
+        fingerprints = self.sheet_fingerprints(excel_path)
+
+        loaders = {table_type: getattr(self, name) for table_type, name in _TABLE_LOADERS.items()}
+        tables: Dict[str, List[Dict[str, Any]]] = {}
+
+        self._check_cancelled(cancel_event)
+        if mode == 'parallel':
+            tables = self._load_tables_parallel(excel_path, table_settings, progress_callback, cancel_event)
+        elif mode == 'streaming':
+            for table_type, frame in self.iter_sheets(excel_path, ('prg', 'grs')):
+                tables[table_type] = loaders[table_type](excel_path, frame)
+                self._report_progress(progress_callback, cancel_event,
+                                      table_settings[table_type]['sheet'], len(tables[table_type]))
+
+            streams = (('population', self.iter_population_records(excel_path)),
+                       ('organizations', self.iter_organization_records(excel_path)))
+            for table_type, records in streams:
+                sheet = table_settings[table_type]['sheet']
+                tables[table_type] = []
+                for record in records:
+                    tables[table_type].append(record)
+                    if len(tables[table_type]) % STREAM_CHUNK_ROWS == 0:
+                        self._report_progress(progress_callback, cancel_event, sheet, len(tables[table_type]))
+                print(f"[OK] Loaded {table_type}: {len(tables[table_type])}")
+                self._report_progress(progress_callback, cancel_event, sheet, len(tables[table_type]))
+        else:
+            if mode == 'single_pass':
+                frames = self.iter_sheets(excel_path)
+            else:
+                frames = ((table_type, None) for table_type in TABLE_TYPES)
+            for table_type, frame in frames:
+                tables[table_type] = loaders[table_type](excel_path, frame)
+                self._report_progress(progress_callback, cancel_event,
+                                      table_settings[table_type]['sheet'], len(tables[table_type]))
+
+        prg_data = tables['prg']
+        grs_data = tables['grs']
+        consumer_data = tables['population'] + tables['organizations']
 
         print(f"\n[OK] Total loaded: PRG={len(prg_data)}, GRS={len(grs_data)}, Consumers={len(consumer_data)}\n")
 
-        return {
+        data = {
             'prg': prg_data,
             'grs': grs_data,
             'consumers': consumer_data
         }
+        self._loaded_fingerprints[path_key] = fingerprints
+        if self.snapshot_cache is not None:
+            self.snapshot_cache.store(excel_path, table_settings,
+                                      {'data': data, 'fingerprints': fingerprints})
+
+        return data
+
+    def reload_changed(self, excel_path: Path, data: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+        """
+        Re-parse only the tables whose sheets changed since the last load.
+
+        Sheets are compared by sheet_fingerprints() with the fingerprints
+        recorded by the last load_all_data()/reload_changed() of excel_path;
+        without such a record every table counts as changed. Changed tables
+        are read in one pass and merged into data in place: the 'prg' and
+        'grs' lists are replaced, and in 'consumers' only the records of the
+        changed consumer table are replaced (population first, as loaded).
+
+        The snapshot of the workbook is dropped rather than updated, so the
+        next load_all_data() parses the workbook and stores a fresh one.
+
+        Args:
+            excel_path: Path to Excel file
+            data: Dictionary returned by load_all_data(), updated in place
+
+        Returns:
+            List of changed table types (empty if the workbook is unchanged)
+
+        Raises:
+            Exception: If loading a changed table fails
+        """
+        path_key = self._path_key(excel_path)
+        previous = self._loaded_fingerprints.get(path_key)
+        fingerprints = self.sheet_fingerprints(excel_path)
+
+        changed = [
+            table_type for table_type in TABLE_TYPES
+            if previous is None or fingerprints is None
+            or previous.get(table_type) != fingerprints[table_type]
+        ]
+        if not changed:
+            print(f"[OK] No changed sheets in: {excel_path}")
+            return []
+
+        print(f"\n[INFO] Reloading changed tables from: {excel_path} ({', '.join(changed)})")
+        frames = self.read_sheets(excel_path, tuple(changed))
+
+        if 'prg' in changed:
+            data['prg'][:] = self.load_prg_data(excel_path, frames['prg'])
+        if 'grs' in changed:
+            data['grs'][:] = self.load_grs_data(excel_path, frames['grs'])
+        if 'population' in changed or 'organizations' in changed:
+            consumers = data['consumers']
+            if 'population' in changed:
+                population_data = self.load_population_data(excel_path, frames['population'])
+            else:
+                population_data = [c for c in consumers if c.get('consumer_type') == 'population']
+            if 'organizations' in changed:
+                organization_data = self.load_organization_data(excel_path, frames['organizations'])
+            else:
+                organization_data = [c for c in consumers if c.get('consumer_type') == 'organization']
+            consumers[:] = population_data + organization_data
+
+        self._loaded_fingerprints[path_key] = fingerprints
+        if self.snapshot_cache is not None:
+            # Records of unchanged tables are the caller's, possibly with
+            # unsaved edits, so they must not become the workbook's snapshot
+            table_settings = {
+                table_type: self.settings_manager.get_table_settings(table_type)
+                for table_type in TABLE_TYPES
+            }
+            self.snapshot_cache.invalidate(excel_path, table_settings)
+
+        return changed
+
+    def sheet_fingerprints(self, excel_path: Path) -> Optional[Dict[str, Tuple[str, str]]]:
+        """
+        Fingerprint the configured sheets without parsing them.
+
+        A table's fingerprint is the content hash of its sheet (see
+        xlsx_parts.sheet_fingerprints) together with its table settings, so
+        changing the column settings of a table also marks it as changed.
+
+        Args:
+            excel_path: Path to Excel file
+
+        Returns:
+            Dictionary of (sheet hash, settings) keyed by table type, or None
+            if the file is not an xlsx package or a sheet is missing
+        """
+        table_settings = {
+            table_type: self.settings_manager.get_table_settings(table_type)
+            for table_type in TABLE_TYPES
+        }
+        try:
+            hashes = sheet_fingerprints(excel_path, [s['sheet'] for s in table_settings.values()])
+        except (zipfile.BadZipFile, KeyError):
+            return None
+
+        return {
+            table_type: (hashes[settings['sheet']], json.dumps(settings, sort_keys=True, ensure_ascii=False))
+            for table_type, settings in table_settings.items()
+        }
+
+    def _load_tables_parallel(self, excel_path: Path, table_settings: Dict[str, Dict[str, Any]],
+                              progress_callback: Optional[ProgressCallback],
+                              cancel_event: Optional[threading.Event]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load every table in its own worker process.
+
+        Each worker reads only its sheet with the same loader as 'per_sheet'
+        mode, so records and IDs do not depend on the order workers finish.
+
+        Workers are spawned, not forked: loading runs in a thread of the Tk
+        process, which must not be forked. cancel_event is checked every
+        PARALLEL_CANCEL_POLL_SECONDS; on cancel the pool is left without
+        waiting for sheets still being parsed.
+
+        Args:
+            excel_path: Path to Excel file
+            table_settings: Settings of every table type (for progress sheet names)
+            progress_callback: Optional callback receiving (sheet name, rows parsed)
+            cancel_event: Optional event that cancels loading when set
+
+        Returns:
+            Dictionary of loaded records keyed by table type
+        """
+        tables: Dict[str, List[Dict[str, Any]]] = {}
+        executor = ProcessPoolExecutor(max_workers=min(len(TABLE_TYPES), os.cpu_count() or 1),
+                                       mp_context=multiprocessing.get_context('spawn'))
+        try:
+            pending = {
+                executor.submit(_load_table, self.settings_manager, table_type, str(excel_path)): table_type
+                for table_type in TABLE_TYPES
+            }
+            while pending:
+                done, _ = wait(pending, timeout=PARALLEL_CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                self._check_cancelled(cancel_event)
+                for future in done:
+                    table_type = pending.pop(future)
+                    tables[table_type] = future.result()
+                    self._report_progress(progress_callback, cancel_event,
+                                          table_settings[table_type]['sheet'], len(tables[table_type]))
+        finally:
+            executor.shutdown(wait=len(tables) == len(TABLE_TYPES), cancel_futures=True)
+        return tables
+
+    @staticmethod
+    def _check_cancelled(cancel_event: Optional[threading.Event]):
+        """Raise LoadCancelledError if cancel_event is set."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelledError("Loading cancelled")
+
+    def _report_progress(self, progress_callback: Optional[ProgressCallback],
+                         cancel_event: Optional[threading.Event], sheet: str, rows: int):
+        """Report loading progress and stop if loading was cancelled."""
+        if progress_callback is not None:
+            progress_callback(sheet, rows)
+        self._check_cancelled(cancel_event)
+
+    @staticmethod
+    def _path_key(excel_path: Path) -> str:
+        """Key of a workbook in _loaded_fingerprints."""
+        return str(Path(excel_path).resolve())
+
+    def _read_sheet(self, excel_path: Path, settings: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Read one configured sheet from the workbook.
+
+        Args:
+            excel_path: Path to Excel file
+            settings: Table settings with the 'sheet' name
+
+        Returns:
+            Sheet frame (see _read_options)
+        """
+        return pd.read_excel(excel_path, sheet_name=settings['sheet'], **self._read_options(settings))
+
+    def _iter_sheet_chunks(self, excel_path: Path, settings: Dict[str, Any],
+                           chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Read a sheet with openpyxl (read-only) as a sequence of small frames.
+
+        Each chunk has the same layout as a _read_options() read: configured
+        columns only, labelled by sheet column index, and an index continuing
+        the row offset from start_row across chunks.
+
+        Args:
+            excel_path: Path to Excel file
+            settings: Table settings
+            chunk_size: Number of rows per chunk
+
+        Yields:
+            Sheet chunk frames
+        """
+        columns = sorted(self._configured_columns(settings))
+        workbook = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            rows = workbook[settings['sheet']].iter_rows(min_row=self._skip_rows(settings) + 1,
+                                                         max_col=columns[-1] + 1, values_only=True)
+            offset = 0
+            while True:
+                batch = [[_cell_value(row, col) for col in columns] for row in islice(rows, chunk_size)]
+                if not batch:
+                    break
+                yield pd.DataFrame(batch, index=range(offset, offset + len(batch)),
+                                   columns=columns, dtype=object)
+                offset += len(batch)
+        finally:
+            workbook.close()
+
+    def _read_options(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        pd.read_excel options that read only what the loaders use.
+
+        Columns not configured in settings are dropped during the read and rows
+        before start_row are skipped, so frame row 0 is Excel row start_row.
+        Column labels stay the zero-based sheet column indices. Cells are kept
+        as read (dtype=object) so numeric IDs do not turn into floats.
+
+        Args:
+            settings: Table settings from SettingsManager
+
+        Returns:
+            Keyword arguments for pd.read_excel / ExcelFile.parse
+        """
+        columns = self._configured_columns(settings)
+        return {
+            'header': None,
+            'usecols': lambda col: col in columns,
+            'skiprows': self._skip_rows(settings),
+            'dtype': object,
+        }
+
+    @staticmethod
+    def _configured_columns(settings: Dict[str, Any]) -> frozenset:
+        """Zero-based indices of all columns configured for a table."""
+        return frozenset(col_to_index(value) for key, value in settings.items() if key.endswith('_col'))
+
+    @staticmethod
+    def _skip_rows(settings: Dict[str, Any]) -> int:
+        """Number of sheet rows above start_row."""
+        return max(int(settings['start_row']) - 1, 0)
+
+    @staticmethod
+    def _has_columns(df: pd.DataFrame, *cols: int) -> bool:
+        """Check that all required columns are present in the sheet frame."""
+        return all(col in df.columns for col in cols)
+
+    @staticmethod
+    def _string_column(df: pd.DataFrame, col: int) -> pd.Series:
+        """Normalized string column, or empty strings if the column is missing."""
+        if col not in df.columns:
+            return pd.Series('', index=df.index, dtype=object)
+        return normalize_string_column(df[col])
+
+    @staticmethod
+    def _numeric_column(df: pd.DataFrame, col: int) -> pd.Series:
+        """Parsed numeric column, or zeros if the column is missing."""
+        if col not in df.columns:
+            return pd.Series(0.0, index=df.index)
+        return parse_numeric_column(df[col].infer_objects())
+
+    @staticmethod
+    def _take(keep: pd.Series, *columns: pd.Series) -> Iterator[Tuple]:
+        """
+        Select rows where keep is True from several columns at once.
+
+        Yields:
+            Tuples of (row offset from start_row, value from each column) as plain Python values
+        """
+        positions = np.flatnonzero(keep.to_numpy())
+        return zip(keep.index[positions].tolist(), *(column.iloc[positions].tolist() for column in columns))
+
+
+def _cell_value(row: Tuple, col: int) -> Any:
+    """
+    Cell value from an openpyxl values-only row, converted like pandas' reader.
+
+    Whole-number floats become ints and NA/error texts become None, so both
+    read paths give the same records.
+    """
+    value = row[col] if col < len(row) else None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in _NA_STRINGS:
+        return None
+    return value
+
+
+def _load_table(settings_manager: SettingsManager, table_type: str, excel_path: str) -> List[Dict[str, Any]]:
+    """
+    Load one table in a worker process of the 'parallel' load mode.
+
+    Args:
+        settings_manager: SettingsManager with column mappings (pickled to the worker)
+        table_type: One of TABLE_TYPES
+        excel_path: Path to Excel file
+
+    Returns:
+        Loaded records of the table
+    """
+    loader = ExcelLoader(settings_manager)
+    return getattr(loader, _TABLE_LOADERS[table_type])(excel_path)
@@ -0,0 +1,51 @@
+"""Content hashes of workbook files, shared by the snapshot cache and the change journal."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+# Bytes read at a time while hashing a workbook
+HASH_CHUNK_BYTES = 1 << 20
+
+# Hashes kept for files whose size and mtime did not change
+HASH_MEMO_MAX_ENTRIES = 16
+
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def content_hash(path: Path) -> str:
+    """
+    Hash file content.
+
+    The hash is remembered per path, size and mtime, so callers that hash
+    the same unchanged file (a loader worker, then the change journal on
+    the UI thread) read it only once. Equal size and mtime are trusted as
+    an unchanged file, as by SnapshotCache.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest of the file content
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _hash_memo.get(key)
+    if digest is not None:
+        return digest
+
+    hasher = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
+
+    if len(_hash_memo) >= HASH_MEMO_MAX_ENTRIES:
+        _hash_memo.clear()
+    _hash_memo[key] = digest
+    return digest
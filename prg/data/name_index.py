@@ -0,0 +1,341 @@
+"""Inverted index over organization names, partitioned by location."""
+
+import re
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Set
+
+# Maximal runs of letters/digits; a query of word characters only always
+# occurs inside one such run
+_WORD_RE = re.compile(r'\w+')
+
+# Words of normalized names; hyphenated words ("пр-т", "Мамина-Сибиряка") stay whole
+_NORMALIZED_WORD_RE = re.compile(r'\w+(?:-\w+)*')
+
+_QUOTES = str.maketrans({quote: ' ' for quote in '"\'«»“”„‘’`'})
+
+ORGANIZATION_TYPE = 'Организация'
+
+# Spellings of street types -> one abbreviation
+STREET_TYPES = {
+    'ул': 'ул', 'улица': 'ул',
+    'пр': 'пр', 'пр-т': 'пр', 'пр-кт': 'пр', 'просп': 'пр', 'проспект': 'пр',
+    'пер': 'пер', 'переулок': 'пер',
+    'пл': 'пл', 'площадь': 'пл',
+    'б-р': 'б-р', 'бул': 'б-р', 'бульвар': 'б-р',
+    'ш': 'ш', 'шоссе': 'ш',
+    'наб': 'наб', 'набережная': 'наб',
+    'мкр': 'мкр', 'мкрн': 'мкр', 'микрорайон': 'мкр',
+    'пр-д': 'пр-д', 'проезд': 'пр-д',
+    'туп': 'туп', 'тупик': 'туп',
+}
+_STREET_TYPE_ABBREVIATIONS = frozenset(STREET_TYPES.values())
+
+# Largest edit distance of fuzzy matching (for words of 7+ letters)
+MAX_EDIT_DISTANCE = 2
+
+
+def normalize_name_tokens(text: Any) -> List[str]:
+    """
+    Split a name or query into normalized words for fuzzy matching.
+
+    Lower-cases, replaces 'ё' with 'е', drops quotes and punctuation and
+    writes street types one way ("улица", "ул." -> "ул").
+
+    Args:
+        text: Organization name or street query
+
+    Returns:
+        List of words in text order
+    """
+    text = str(text or '').lower().replace('ё', 'е').translate(_QUOTES)
+    return [STREET_TYPES.get(word, word) for word in _NORMALIZED_WORD_RE.findall(text)]
+
+
+def allowed_edit_distance(word: str) -> int:
+    """
+    Get the edit distance tolerated for a query word.
+
+    Numbers and words of up to 3 letters must match exactly, words of 4-6
+    letters may have one typo, longer words two.
+    """
+    if word.isdigit() or len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 6 else MAX_EDIT_DISTANCE
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance of two words, bounded.
+
+    Args:
+        a, b: Words
+        limit: Largest distance of interest
+
+    Returns:
+        Distance, or limit + 1 if it exceeds limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """Variants of a word with up to distance characters deleted (with the word itself)."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+class _Partition:
+    """Index of the organization names of one (mo, settlement) location."""
+
+    __slots__ = ('source', 'records', 'names', 'tokens', 'trigrams', 'words', 'variants')
+
+    def __init__(self, source: List[Dict[str, Any]], records: List[Dict[str, Any]], names: Tuple[str, ...]):
+        self.source = source
+        self.records = records
+        self.names = names
+        self.tokens: Dict[str, List[int]] = {}
+        self.trigrams: Dict[str, List[int]] = {}
+        # Fuzzy matching, built on first fuzzy query
+        self.words: Optional[Dict[str, List[int]]] = None
+        self.variants: Optional[Dict[str, List[str]]] = None
+        for position, name in enumerate(names):
+            for token in set(_WORD_RE.findall(name)):
+                self.tokens.setdefault(token, []).append(position)
+            for trigram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                self.trigrams.setdefault(trigram, []).append(position)
+
+    def build_fuzzy(self):
+        """Index normalized words and their deletion variants."""
+        words: Dict[str, List[int]] = {}
+        for position, record in enumerate(self.records):
+            for word in dict.fromkeys(normalize_name_tokens(record.get('name'))):
+                words.setdefault(word, []).append(position)
+        variants: Dict[str, List[str]] = {}
+        for word in words:
+            distance = 0 if word.isdigit() else MAX_EDIT_DISTANCE
+            for variant in _deletes(word, distance):
+                variants.setdefault(variant, []).append(word)
+        # Published complete, words last: queries may run on a worker thread
+        self.variants = variants
+        self.words = words
+
+    def similar_words(self, word: str) -> Dict[str, float]:
+        """
+        Get indexed words within the allowed edit distance of a query word.
+
+        Returns:
+            Dictionary indexed word -> similarity (1.0 for the word itself)
+        """
+        limit = allowed_edit_distance(word)
+        candidates = set()
+        for variant in _deletes(word, limit):
+            candidates.update(self.variants.get(variant, ()))
+        similar = {}
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                similar[candidate] = 1.0 - distance / max(len(word), len(candidate))
+        return similar
+
+
+class NameIndex:
+    """
+    Word token and character trigram postings over organization names.
+
+    Names are indexed lower-cased, one partition per normalized
+    (mo, settlement) key, so a query only touches the organizations of its
+    location. Postings hold record positions in location order, which keeps
+    results in load order.
+
+    Substring queries of 3+ characters take the postings of their rarest
+    trigram as candidates; shorter queries of word characters take the
+    postings of the tokens containing them. Candidates are then checked
+    with a plain substring test, so results equal a full scan.
+
+    For fuzzy queries (search_fuzzy) a partition also indexes the
+    normalized words of its names together with their variants of up to
+    MAX_EDIT_DISTANCE deleted characters; words sharing a variant with the
+    query word are candidates, checked by a bounded edit distance.
+
+    Partitions are built on first use. After a reload they are checked
+    against the new location lists: a partition whose names did not change
+    only takes the new records, the others are re-indexed on their next
+    query.
+    """
+
+    def __init__(self):
+        """Initialize empty index."""
+        self._partitions: Dict[Tuple[str, str], _Partition] = {}
+        self.builds = 0
+        self.rebinds = 0
+
+    def search(self, key: Tuple[str, str], source: List[Dict[str, Any]],
+               pattern: str) -> List[Dict[str, Any]]:
+        """
+        Find organizations of a location whose name contains a pattern.
+
+        Args:
+            key: Normalized (mo, settlement) key
+            source: Current consumers of that location (all types, load order)
+            pattern: Substring to look for (case-insensitive)
+
+        Returns:
+            Organization records in load order
+        """
+        partition = self._partition(key, source)
+        pattern = pattern.lower()
+        names = partition.names
+        if not pattern:
+            return list(partition.records)
+
+        if len(pattern) >= 3:
+            postings = None
+            for trigram in {pattern[i:i + 3] for i in range(len(pattern) - 2)}:
+                found = partition.trigrams.get(trigram)
+                if found is None:
+                    return []
+                if postings is None or len(found) < len(postings):
+                    postings = found
+            candidates: Iterable[int] = postings
+        elif _WORD_RE.fullmatch(pattern):
+            hits = set()
+            for token, positions in partition.tokens.items():
+                if pattern in token:
+                    hits.update(positions)
+            candidates = sorted(hits)
+        else:
+            candidates = range(len(names))
+
+        records = partition.records
+        return [records[position] for position in candidates if pattern in names[position]]
+
+    def find_word(self, key: Tuple[str, str], source: List[Dict[str, Any]],
+                  word: str) -> List[Dict[str, Any]]:
+        """
+        Find organizations of a location having a whole word in their name.
+
+        Args:
+            key: Normalized (mo, settlement) key
+            source: Current consumers of that location (all types, load order)
+            word: Word to look for (case-insensitive)
+
+        Returns:
+            Organization records in load order
+        """
+        partition = self._partition(key, source)
+        return [partition.records[position] for position in partition.tokens.get(word.lower(), ())]
+
+    def search_fuzzy(self, key: Tuple[str, str], source: List[Dict[str, Any]],
+                     query: str) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find organizations of a location whose name words match a query loosely.
+
+        Name and query are normalized (normalize_name_tokens). Every query
+        word other than a street type must match a word of the name within
+        allowed_edit_distance(); street types only add to the score when
+        the name has the same one. The score is the mean word similarity
+        (1 - distance / word length), 1.0 for an exact match of all words.
+
+        Args:
+            key: Normalized (mo, settlement) key
+            source: Current consumers of that location (all types, load order)
+            query: Street query, e.g. "ул. Ленина" or "Гагарина 5"
+
+        Returns:
+            (organization record, score) pairs, best score first, then load order
+        """
+        partition = self._partition(key, source)
+        if partition.words is None:
+            partition.build_fuzzy()
+
+        query_words = list(dict.fromkeys(normalize_name_tokens(query)))
+        street_types = [word for word in query_words if word in _STREET_TYPE_ABBREVIATIONS]
+        words = [word for word in query_words if word not in _STREET_TYPE_ABBREVIATIONS] or street_types
+        if not words:
+            return []
+        if words is street_types:
+            street_types = []
+
+        totals: Optional[Dict[int, float]] = None
+        for word in words:
+            best: Dict[int, float] = {}
+            for candidate, similarity in partition.similar_words(word).items():
+                for position in partition.words[candidate]:
+                    if (totals is None or position in totals) and similarity > best.get(position, 0.0):
+                        best[position] = similarity
+            if totals is None:
+                totals = best
+            else:
+                totals = {position: totals[position] + similarity for position, similarity in best.items()}
+            if not totals:
+                return []
+
+        for street_type in street_types:
+            for position in partition.words.get(street_type, ()):
+                if position in totals:
+                    totals[position] += 1.0
+
+        count = len(words) + len(street_types)
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return [(partition.records[position], total / count) for position, total in ranked]
+
+    def retain(self, keys: Iterable[Tuple[str, str]]):
+        """
+        Drop partitions of locations that no longer exist (after a reload).
+
+        Args:
+            keys: Normalized (mo, settlement) keys still present
+        """
+        keys = set(keys)
+        for key in [key for key in self._partitions if key not in keys]:
+            del self._partitions[key]
+
+    def clear(self):
+        """Drop all partitions."""
+        self._partitions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with keys: partitions, names, trigrams, builds, rebinds
+        """
+        return {
+            'partitions': len(self._partitions),
+            'names': sum(len(p.names) for p in self._partitions.values()),
+            'trigrams': sum(len(p.trigrams) for p in self._partitions.values()),
+            'builds': self.builds,
+            'rebinds': self.rebinds,
+        }
+
+    def _partition(self, key: Tuple[str, str], source: List[Dict[str, Any]]) -> _Partition:
+        """Get the partition of a location, (re)building it if its names changed."""
+        partition = self._partitions.get(key)
+        if partition is not None and partition.source is source:
+            return partition
+
+        records = [record for record in source if record.get('type') == ORGANIZATION_TYPE]
+        names = tuple(str(record.get('name') or '').lower() for record in records)
+        if partition is not None and partition.names == names:
+            partition.source = source
+            partition.records = records
+            self.rebinds += 1
+            return partition
+
+        partition = _Partition(source, records, names)
+        self._partitions[key] = partition
+        self.builds += 1
+        return partition
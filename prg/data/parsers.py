@@ -1,8 +1,10 @@
 """Data parsing and formatting utilities for Excel I/O."""
 
 import re
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
+from .binding_codec import BINDING_CODEC
 
 
 def parse_numeric_value(value) -> float:
@@ -67,42 +69,32 @@ def parse_prg_bindings(binding_string: str) -> List[Dict[str, Any]]:
 
     Format: "PRG_ID1|share1|GRS_Name1;PRG_ID2|share2|GRS_Name2"
 
+    Parsing is done once per distinct string by the shared BindingCodec.
+
     Args:
         binding_string: Semicolon-separated binding string
 
     Returns:
         List of binding dictionaries with keys: prg_id, share, grs_name
+        (shared between equal strings, copy before changing)
     """
-    if not binding_string or binding_string.strip() == '':
-        return []
-
-    bindings = []
-    parts = binding_string.split(';')
-
-    for part in parts:
-        part = part.strip()
-        if not part:
-            continue
+    return BINDING_CODEC.decode(binding_string)
 
-        components = part.split('|')
-        if len(components) >= 3:
-            try:
-                prg_id = components[0].strip()
-                share_str = components[1].strip()
-                grs_name = '|'.join(components[2:]).strip()  # Handle pipes in GRS name
 
-                share = parse_share_from_excel(share_str)
+def consumer_bindings(consumer: Dict[str, Any], data_store=None) -> List[Dict[str, Any]]:
+    """
+    Get parsed bindings of a consumer.
 
-                bindings.append({
-                    'prg_id': prg_id,
-                    'share': share,
-                    'grs_name': grs_name
-                })
-            except (ValueError, IndexError) as e:
-                print(f"[WARNING] Failed to parse binding: {part} - {e}")
-                continue
+    Args:
+        consumer: Consumer dictionary
+        data_store: Optional DataStore; its bindings() is used if given
 
-    return bindings
+    Returns:
+        List of binding dictionaries (shared, copy before changing)
+    """
+    if data_store is not None:
+        return data_store.bindings(consumer)
+    return parse_prg_bindings(consumer.get('code', ''))
 
 
 def format_prg_bindings(bindings: List[Dict[str, Any]]) -> str:
@@ -123,7 +115,7 @@ def format_prg_bindings(bindings: List[Dict[str, Any]]) -> str:
         share_str = format_share_for_excel(binding['share'])
         formatted_parts.append(f"{binding['prg_id']}|{share_str}|{binding['grs_name']}")
 
-    return ';'.join(formatted_parts)
+    return BINDING_CODEC.intern(';'.join(formatted_parts))
 
 
 def calculate_total_share(bindings: List[Dict[str, Any]]) -> float:
@@ -241,3 +233,87 @@ def normalize_string(value) -> str:
     if value is None or str(value).strip() == '' or str(value) == 'nan' or pd.isna(value):
         return ""
     return str(value).strip()
+
+
+def normalize_string_column(column: pd.Series) -> pd.Series:
+    """
+    Normalize a whole Excel column (column-wise normalize_string).
+
+    Args:
+        column: Column of a sheet frame
+
+    Returns:
+        pd.Series: Normalized strings (empty where invalid), same index
+    """
+    text = _column_text(column)
+    invalid = column.isna() | (text == 'nan')
+    return text.str.strip().where(~invalid, '')
+
+
+def parse_numeric_column(column: pd.Series) -> pd.Series:
+    """
+    Parse a whole Excel column as numbers (column-wise parse_numeric_value).
+
+    Numeric columns are converted directly; text columns (comma decimals) are
+    parsed once per distinct value.
+
+    Args:
+        column: Column of a sheet frame
+
+    Returns:
+        pd.Series: float values (0.0 where parsing fails), same index
+    """
+    if pd.api.types.is_bool_dtype(column):
+        return pd.Series(0.0, index=column.index)
+
+    if pd.api.types.is_numeric_dtype(column):
+        values = column.astype('float64').fillna(0.0)
+        return values.where(values != 0, 0.0)
+
+    text = _column_text(column)
+    values = _map_unique(text, parse_numeric_value).astype('float64')
+    return values.where(~column.isna(), 0.0)
+
+
+def parse_grs_id_series(column: pd.Series) -> pd.Series:
+    """
+    Parse a whole GRS ID column (column-wise parse_grs_id_column).
+
+    Args:
+        column: Column of a sheet frame
+
+    Returns:
+        pd.Series: GRS ID strings or None, same index
+    """
+    text = _column_text(column)
+    values = _map_unique(text, parse_grs_id_column)
+    return values.where(~column.isna(), None)
+
+
+def intern_string_column(text: pd.Series) -> pd.Series:
+    """
+    Intern a normalized string column.
+
+    Equal cells become one string object (used for binding strings, which
+    repeat on many rows).
+
+    Args:
+        text: Normalized string column (see normalize_string_column)
+
+    Returns:
+        pd.Series: Same strings, one object per distinct value, same index
+    """
+    return _map_unique(text, lambda value: value)
+
+
+def _column_text(column: pd.Series) -> pd.Series:
+    """str() of every cell as an object Series (NaN becomes 'nan')."""
+    return pd.Series(column.astype(object).map(str), index=column.index, dtype=object)
+
+
+def _map_unique(text: pd.Series, func: Callable[[str], Any]) -> pd.Series:
+    """Apply a scalar parser once per distinct string and broadcast the results."""
+    codes, uniques = pd.factorize(text)
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [func(value) for value in uniques]
+    return pd.Series(mapped[codes], index=text.index, dtype=object)
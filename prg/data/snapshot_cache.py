@@ -0,0 +1,151 @@
+"""On-disk snapshot cache of parsed workbook data."""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .file_hash import content_hash
+
+
+# Bump when the layout of loaded records changes so old snapshots are ignored
+SNAPSHOT_FORMAT = 2
+
+
+class SnapshotCache:
+    """
+    Stores data parsed from a workbook by ExcelLoader as binary snapshots.
+
+    There is one snapshot per workbook path and column settings. A snapshot
+    is valid while the workbook content is unchanged: equal size and mtime
+    are trusted as-is, otherwise the content hash decides, so a workbook
+    that was only touched or copied back stays cached. Any change of the
+    table settings selects a different snapshot file.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize snapshot cache.
+
+        Args:
+            cache_dir: Directory for snapshot files (created on first store)
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def load(self, excel_path: Path,
+             table_settings: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Load cached data for a workbook.
+
+        Args:
+            excel_path: Path to Excel file
+            table_settings: Settings of every table type, keyed by table type
+
+        Returns:
+            Data passed to store(), or None if there is no valid snapshot
+        """
+        snapshot_path = self._snapshot_path(excel_path, table_settings)
+        try:
+            stat = os.stat(excel_path)
+            with open(snapshot_path, 'rb') as f:
+                header = pickle.load(f)
+                if header.get('format') != SNAPSHOT_FORMAT or header.get('size') != stat.st_size:
+                    return None
+                if header.get('settings') != self._settings_key(table_settings):
+                    return None
+                if header.get('mtime_ns') != stat.st_mtime_ns:
+                    if header.get('content_hash') != content_hash(excel_path):
+                        return None
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[WARNING] Snapshot cache read failed: {str(e)}")
+            return None
+
+    def store(self, excel_path: Path, table_settings: Dict[str, Dict[str, Any]],
+              data: Dict[str, Any]) -> bool:
+        """
+        Save loaded data as the snapshot of a workbook.
+
+        The snapshot is written to a temporary file and moved into place, so
+        an interrupted write never leaves a truncated snapshot behind.
+
+        Args:
+            excel_path: Path to Excel file the data was loaded from
+            table_settings: Settings of every table type, keyed by table type
+            data: Parsed workbook data (picklable)
+
+        Returns:
+            True if the snapshot was written
+        """
+        tmp_path = None
+        try:
+            stat = os.stat(excel_path)
+            header = {
+                'format': SNAPSHOT_FORMAT,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'content_hash': content_hash(excel_path),
+                'settings': self._settings_key(table_settings),
+            }
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._snapshot_path(excel_path, table_settings))
+            return True
+        except Exception as e:
+            print(f"[WARNING] Snapshot cache write failed: {str(e)}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def invalidate(self, excel_path: Path, table_settings: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Remove the snapshot of a workbook.
+
+        Args:
+            excel_path: Path to Excel file
+            table_settings: Settings of every table type, keyed by table type
+
+        Returns:
+            True if a snapshot was removed
+        """
+        try:
+            self._snapshot_path(excel_path, table_settings).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"[WARNING] Snapshot cache invalidation failed: {str(e)}")
+            return False
+
+    def clear(self) -> int:
+        """
+        Remove all snapshots.
+
+        Returns:
+            Number of removed snapshot files
+        """
+        removed = 0
+        if self.cache_dir.is_dir():
+            for snapshot_path in self.cache_dir.glob('*.snapshot'):
+                snapshot_path.unlink()
+                removed += 1
+        return removed
+
+    def _snapshot_path(self, excel_path: Path, table_settings: Dict[str, Dict[str, Any]]) -> Path:
+        """Get snapshot file for a workbook path and column settings."""
+        key = f"{Path(excel_path).resolve()}\n{self._settings_key(table_settings)}"
+        name = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return self.cache_dir / f"{name}.snapshot"
+
+    @staticmethod
+    def _settings_key(table_settings: Dict[str, Dict[str, Any]]) -> str:
+        """Serialize table settings into a stable string."""
+        return json.dumps(table_settings, sort_keys=True, ensure_ascii=False)
@@ -0,0 +1,110 @@
+"""Low-level access to the XML parts of an xlsx package."""
+
+import hashlib
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List, Dict, Iterable
+
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_DOC_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+WORKBOOK_PART = 'xl/workbook.xml'
+WORKBOOK_RELS_PART = 'xl/_rels/workbook.xml.rels'
+SHARED_STRINGS_PART = 'xl/sharedStrings.xml'
+
+# Shared string items and the shared string cells that point at them
+_SHARED_STRING_ITEM = re.compile(rb'<(?:\w+:)?si>.*?</(?:\w+:)?si>|<(?:\w+:)?si/>', re.S)
+_SHARED_STRING_CELL = re.compile(rb'<(?:\w+:)?c\b[^>]*?\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</(?:\w+:)?v>')
+SHEET_DATA_START = re.compile(rb'<(?:\w+:)?sheetData\b')
+
+
+def sheet_part_paths(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """
+    Map worksheet names to their XML part paths.
+
+    Args:
+        archive: Opened xlsx package
+
+    Returns:
+        Dictionary sheet name -> part path inside the zip (e.g. 'xl/worksheets/sheet1.xml')
+    """
+    rels = ET.fromstring(archive.read(WORKBOOK_RELS_PART))
+    targets = {}
+    for rel in rels.iter(f'{{{_PKG_REL_NS}}}Relationship'):
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            targets[rel.get('Id')] = target.lstrip('/')
+        else:
+            targets[rel.get('Id')] = posixpath.normpath(posixpath.join('xl', target))
+
+    workbook = ET.fromstring(archive.read(WORKBOOK_PART))
+    paths = {}
+    for sheet in workbook.iter(f'{{{_MAIN_NS}}}sheet'):
+        rel_id = sheet.get(f'{{{_DOC_REL_NS}}}id')
+        if rel_id in targets:
+            paths[sheet.get('name')] = targets[rel_id]
+    return paths
+
+
+def sheet_fingerprints(excel_path: Path, sheet_names: Iterable[str]) -> Dict[str, str]:
+    """
+    Hash the content of worksheets without parsing them.
+
+    A fingerprint covers the cell data of the sheet XML part and the shared
+    strings the sheet refers to. Markup outside the cell data (selection,
+    active tab, dimension) is left out, and editing text on one sheet does
+    not change the fingerprints of the others even though all sheets share
+    one string table.
+
+    Args:
+        excel_path: Path to xlsx file
+        sheet_names: Worksheets to fingerprint
+
+    Returns:
+        Dictionary sheet name -> hex digest
+
+    Raises:
+        zipfile.BadZipFile: If the file is not an xlsx package
+        KeyError: If a sheet does not exist
+    """
+    with zipfile.ZipFile(excel_path) as archive:
+        paths = sheet_part_paths(archive)
+        shared_strings: List[bytes] = []
+        if SHARED_STRINGS_PART in archive.namelist():
+            shared_strings = _SHARED_STRING_ITEM.findall(archive.read(SHARED_STRINGS_PART))
+
+        fingerprints = {}
+        for name in sheet_names:
+            if name in fingerprints:
+                continue
+            xml = sheet_data(archive.read(paths[name]))
+            digest = hashlib.blake2b(xml, digest_size=16)
+            for index in sorted({int(i) for i in _SHARED_STRING_CELL.findall(xml)}):
+                if index < len(shared_strings):
+                    digest.update(shared_strings[index])
+            fingerprints[name] = digest.hexdigest()
+        return fingerprints
+
+
+def sheet_data(xml: bytes) -> bytes:
+    """
+    Cut the <sheetData> element (the cells) out of a worksheet part.
+
+    Args:
+        xml: Worksheet XML part
+
+    Returns:
+        The <sheetData> element, or b'' for a sheet without cells
+    """
+    start = SHEET_DATA_START.search(xml)
+    if start is None:
+        return b''
+    end = xml.rfind(b'sheetData>')
+    if end < start.start():
+        return b''
+    return xml[start.start():end + len(b'sheetData>')]
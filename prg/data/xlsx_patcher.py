@@ -0,0 +1,283 @@
+"""In-place cell edits of an xlsx package without loading the workbook."""
+
+import math
+import os
+import re
+import shutil
+import struct
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Union
+
+from ..utils import col_to_index, index_to_col
+from .xlsx_parts import sheet_part_paths, SHEET_DATA_START
+
+# 0-based (row, column) -> new value
+CellEdits = Dict[Tuple[int, int], Any]
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Header ID of the zip64 extended information extra field
+_ZIP64_EXTRA_ID = 0x0001
+
+_ROW_START = re.compile(rb'<(\w+:)?row\b([^>]*?)(/)?>')
+_ROW_NUMBER = re.compile(rb'\br="(\d+)"')
+_CELL = re.compile(rb'<(?:\w+:)?c\b([^>]*?)(?:/>|>(.*?)</(?:\w+:)?c>)', re.S)
+_CELL_REF = re.compile(rb'\br="([A-Z]+)(\d+)"')
+_CELL_STYLE = re.compile(rb'\bs="(\d+)"')
+_FORMULA = re.compile(rb'<(?:\w+:)?f\b')
+_SPANS = re.compile(rb'\s+spans="[^"]*"')
+_DIMENSION = re.compile(rb'(<(?:\w+:)?dimension\b[^>]*?\bref=")([^"]*)(")')
+_DIMENSION_REF = re.compile(r'([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?$')
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class XlsxPatchError(Exception):
+    """The package cannot be patched in place; save it with a full writer instead."""
+
+
+def patch_cells(excel_path: Union[str, Path], edits: Dict[str, CellEdits]) -> Dict[str, int]:
+    """
+    Write cell values into an xlsx file by rewriting only the edited rows.
+
+    Worksheets with edits are scanned row by row up to the last edited row;
+    only the edited rows are rebuilt (cell styles are kept, strings are
+    written as inline strings). All other parts, and the rest of each
+    edited worksheet, are copied byte for byte. The new package replaces
+    the file atomically.
+
+    Args:
+        excel_path: Path to xlsx file
+        edits: Sheet name -> {(row, column): value}, 0-based like change records
+
+    Returns:
+        Dictionary sheet name -> number of cells written (sheets that do not
+        exist are left out)
+
+    Raises:
+        XlsxPatchError: If a cell cannot be written faithfully (formula cells,
+            rows without numbers, unsupported values); nothing is written
+        OSError: If the file cannot be read or replaced
+    """
+    excel_path = Path(excel_path)
+    try:
+        with zipfile.ZipFile(excel_path) as source:
+            paths = sheet_part_paths(source)
+            part_edits = {paths[name]: (name, cells) for name, cells in edits.items() if name in paths and cells}
+
+            # Build all patched parts first so a failure leaves the file untouched
+            patched = {part: _patch_sheet(source.read(part), cells) for part, (_, cells) in part_edits.items()}
+
+            fd, temp_name = tempfile.mkstemp(dir=excel_path.parent, prefix='.~', suffix='.xlsx')
+            os.close(fd)
+            try:
+                with zipfile.ZipFile(temp_name, 'w', allowZip64=True) as target:
+                    target.comment = source.comment
+                    for info in source.infolist():
+                        with target.open(_copy_info(info), 'w', force_zip64=info.file_size > 0x7fffffff) as out:
+                            if info.filename in patched:
+                                for piece in patched[info.filename]:
+                                    out.write(piece)
+                            else:
+                                with source.open(info) as data:
+                                    shutil.copyfileobj(data, out, _COPY_CHUNK_SIZE)
+                # mkstemp creates the file with mode 0600; keep the workbook's permissions
+                shutil.copymode(excel_path, temp_name)
+                os.replace(temp_name, excel_path)
+            except BaseException:
+                if os.path.exists(temp_name):
+                    os.remove(temp_name)
+                raise
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise XlsxPatchError(f"not a readable xlsx package: {e}")
+
+    return {name: len(cells) for name, cells in part_edits.values()}
+
+
+def _copy_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    """ZipInfo for writing a part with the same name, timestamp and compression."""
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    copy.compress_type = info.compress_type
+    copy.external_attr = info.external_attr
+    copy.create_system = info.create_system
+    copy.comment = info.comment
+    # zipfile adds its own zip64 field where the copy needs one
+    copy.extra = _strip_zip64_extra(info.extra)
+    return copy
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """Extra field records (header ID, size, data) without the zip64 one."""
+    kept = []
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, size = struct.unpack_from('<HH', extra, pos)
+        end = pos + 4 + size
+        if header_id != _ZIP64_EXTRA_ID:
+            kept.append(extra[pos:end])
+        pos = end
+    return b''.join(kept)
+
+
+def _patch_sheet(xml: bytes, cells: CellEdits) -> List[bytes]:
+    """
+    Apply cell edits to a worksheet part.
+
+    Returns:
+        Pieces of the new part (untouched ranges are slices of xml)
+    """
+    rows: Dict[int, Dict[int, Any]] = {}
+    for (row, col), value in cells.items():
+        if row < 0 or col < 0:
+            raise XlsxPatchError(f"invalid cell position: row {row}, column {col}")
+        rows.setdefault(row + 1, {})[col + 1] = value
+    targets = sorted(rows)
+
+    start = SHEET_DATA_START.search(xml)
+    if start is None:
+        raise XlsxPatchError("worksheet without sheetData")
+    open_end = xml.index(b'>', start.end()) + 1
+    head = _expand_dimension(xml[:start.start()], max(targets), max(max(cols) for cols in rows.values()))
+    prefix = xml[start.start() + 1:start.end()][:-len(b'sheetData')]
+
+    pieces = [head]
+    if xml[open_end - 2:open_end] == b'/>':
+        # Empty <sheetData/>
+        pieces.append(b'<' + prefix + b'sheetData>')
+        pieces.extend(_new_row(prefix, row, rows[row]) for row in targets)
+        pieces.append(b'</' + prefix + b'sheetData>')
+        pieces.append(xml[open_end:])
+        return pieces
+
+    pos = start.start()
+    index = 0
+    for match in _ROW_START.finditer(xml, open_end):
+        number = _ROW_NUMBER.search(match.group(2))
+        if number is None:
+            raise XlsxPatchError("row without a row number")
+        row = int(number.group(1))
+
+        while index < len(targets) and targets[index] < row:
+            pieces.append(xml[pos:match.start()])
+            pieces.append(_new_row(prefix, targets[index], rows[targets[index]]))
+            pos = match.start()
+            index += 1
+
+        if index < len(targets) and targets[index] == row:
+            if match.group(3):
+                end = match.end()
+                inner = b''
+            else:
+                close = b'</' + (match.group(1) or b'') + b'row>'
+                end = xml.index(close, match.end()) + len(close)
+                inner = xml[match.end():end - len(close)]
+            pieces.append(xml[pos:match.start()])
+            pieces.append(_patch_row(match, inner, rows[row]))
+            pos = end
+            index += 1
+
+        if index == len(targets):
+            break
+
+    if index < len(targets):
+        close = xml.index(b'</' + prefix + b'sheetData>', pos)
+        pieces.append(xml[pos:close])
+        pieces.extend(_new_row(prefix, row, rows[row]) for row in targets[index:])
+        pos = close
+
+    pieces.append(xml[pos:])
+    return pieces
+
+
+def _patch_row(match: 're.Match', inner: bytes, values: Dict[int, Any]) -> bytes:
+    """Rebuild one existing row with edited cells (1-based columns)."""
+    prefix = match.group(1) or b''
+    row = int(_ROW_NUMBER.search(match.group(2)).group(1))
+
+    cells: Dict[int, bytes] = {}
+    styles: Dict[int, bytes] = {}
+    covered = 0
+    for cell in _CELL.finditer(inner):
+        if inner[covered:cell.start()].strip():
+            raise XlsxPatchError(f"unexpected content in row {row}")
+        covered = cell.end()
+        ref = _CELL_REF.search(cell.group(1))
+        if ref is None:
+            raise XlsxPatchError(f"cell without a reference in row {row}")
+        col = col_to_index(ref.group(1).decode('ascii')) + 1
+        if col in values:
+            if cell.group(2) and _FORMULA.search(cell.group(2)):
+                raise XlsxPatchError(f"formula cell {ref.group(1).decode('ascii')}{row}")
+            style = _CELL_STYLE.search(cell.group(1))
+            styles[col] = style.group(1) if style else None
+        cells[col] = cell.group(0)
+    if inner[covered:].strip():
+        raise XlsxPatchError(f"unexpected content in row {row}")
+
+    for col, value in values.items():
+        cells[col] = _cell_xml(prefix, row, col, value, styles.get(col))
+
+    attributes = _SPANS.sub(b'', match.group(2))
+    return (b'<' + prefix + b'row' + attributes + b'>' + b''.join(cells[col] for col in sorted(cells))
+            + b'</' + prefix + b'row>')
+
+
+def _new_row(prefix: bytes, row: int, values: Dict[int, Any]) -> bytes:
+    """Build a row that does not exist in the sheet yet (1-based row and columns)."""
+    cells = b''.join(_cell_xml(prefix, row, col, values[col], None) for col in sorted(values))
+    return b'<' + prefix + b'row r="' + str(row).encode('ascii') + b'">' + cells + b'</' + prefix + b'row>'
+
+
+def _cell_xml(prefix: bytes, row: int, col: int, value: Any, style: Any) -> bytes:
+    """Serialize one cell (1-based row and column), keeping its style index."""
+    attributes = f' r="{index_to_col(col - 1)}{row}"'
+    if style is not None:
+        attributes += f' s="{style.decode("ascii")}"'
+    tag = prefix.decode('ascii') + 'c'
+
+    if value is None or value == '':
+        body = None
+    elif isinstance(value, bool):
+        attributes += ' t="b"'
+        body = f'<{prefix.decode("ascii")}v>{int(value)}</{prefix.decode("ascii")}v>'
+    elif isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise XlsxPatchError(f"non-finite number for {index_to_col(col - 1)}{row}")
+        # Builtin repr: subclasses such as numpy.float64 repr as "np.float64(1.5)"
+        number = repr(int(value)) if isinstance(value, int) else repr(float(value))
+        body = f'<{prefix.decode("ascii")}v>{number}</{prefix.decode("ascii")}v>'
+    elif isinstance(value, str):
+        if value.startswith('=') or _ILLEGAL_XML_CHARS.search(value):
+            raise XlsxPatchError(f"text for {index_to_col(col - 1)}{row} cannot be written as-is")
+        text = value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        space = ' xml:space="preserve"' if value != value.strip() else ''
+        attributes += ' t="inlineStr"'
+        p = prefix.decode('ascii')
+        body = f'<{p}is><{p}t{space}>{text}</{p}t></{p}is>'
+    else:
+        raise XlsxPatchError(f"unsupported value type {type(value).__name__} for {index_to_col(col - 1)}{row}")
+
+    if body is None:
+        return f'<{tag}{attributes}/>'.encode('utf-8')
+    return f'<{tag}{attributes}>{body}</{tag}>'.encode('utf-8')
+
+
+def _expand_dimension(head: bytes, max_row: int, max_col: int) -> bytes:
+    """Grow the <dimension ref> of the sheet to cover the edited cells (1-based)."""
+    match = _DIMENSION.search(head)
+    if match is None:
+        return head
+    ref = _DIMENSION_REF.match(match.group(2).decode('ascii'))
+    if ref is None:
+        return head
+
+    first_col, first_row, last_col, last_row = ref.group(1), int(ref.group(2)), ref.group(3), ref.group(4)
+    last_col = last_col or first_col
+    last_row = int(last_row or first_row)
+    new_last_col = index_to_col(max(col_to_index(last_col), max_col - 1))
+    new_last_row = max(last_row, max_row)
+    if (new_last_col, new_last_row) == (last_col, last_row):
+        return head
+    new_ref = f"{first_col}{first_row}:{new_last_col}{new_last_row}".encode('ascii')
+    return head[:match.start(2)] + new_ref + head[match.end(2):]
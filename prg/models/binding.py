@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 from typing import List
+from ..data.binding_codec import BINDING_CODEC
 
 
 @dataclass
@@ -52,21 +53,7 @@ class PRGBinding:
         Raises:
             ValueError: If format is invalid
         """
-        parts = binding_str.split(':')
-
-        if len(parts) < 2:
-            raise ValueError(f"Invalid binding format: {binding_str}")
-
-        prg_id = parts[0].strip()
-
-        try:
-            share = float(parts[1].strip())
-        except ValueError:
-            raise ValueError(f"Invalid share value in binding: {binding_str}")
-
-        grs_name = parts[2].strip() if len(parts) > 2 else ""
-
-        return cls(prg_id=prg_id, share=share, grs_name=grs_name)
+        return cls(*BINDING_CODEC.split_colon(binding_str))
 
     @classmethod
     def parse_bindings(cls, code: str) -> List['PRGBinding']:
@@ -79,21 +66,7 @@ class PRGBinding:
         Returns:
             List of PRGBinding instances
         """
-        if not code or not isinstance(code, str) or code.strip() == '':
-            return []
-
-        bindings = []
-        for binding_str in code.split(';'):
-            binding_str = binding_str.strip()
-            if binding_str:
-                try:
-                    binding = cls.from_string(binding_str)
-                    bindings.append(binding)
-                except ValueError:
-                    # Skip invalid bindings
-                    continue
-
-        return bindings
+        return [cls(*fields) for fields in BINDING_CODEC.decode_colon(code)]
 
     @classmethod
     def format_bindings(cls, bindings: List['PRGBinding']) -> str:
@@ -2,8 +2,10 @@
 
 from .smart_search_dialog import SmartSearchDialog
 from .settings_dialog import SettingsDialog
+from .live_search import LiveSearch
 
 __all__ = [
     'SmartSearchDialog',
     'SettingsDialog',
+    'LiveSearch',
 ]
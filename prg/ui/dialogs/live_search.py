@@ -0,0 +1,177 @@
+"""Debounced background queries for search-as-you-type fields."""
+
+import queue
+import threading
+from typing import List, Dict, Any, Callable, Optional
+
+# Pause in typing before a query starts
+DEBOUNCE_MS = 150
+
+# Interval of checking for finished queries
+POLL_INTERVAL_MS = 20
+
+# Result rows inserted per Tk event loop pass, and shown at most
+ROWS_PER_FRAME = 50
+MAX_SHOWN_ROWS = 500
+
+
+class LiveSearch:
+    """
+    Runs the query of an input field on a worker thread while the user types.
+
+    request() (re)starts a debounce timer; when it fires, the query goes to
+    a single daemon worker thread. A newer request supersedes older ones:
+    queued queries that are superseded are skipped before they start, and
+    results of superseded queries that were already running are dropped.
+
+    The current result is handed to on_result on the Tk thread, and its
+    rows (rows_of(result), at most max_rows) to on_rows in chunks of
+    rows_per_frame, one chunk per event loop pass, so long result lists
+    never block typing. Drawing stops as soon as a newer query is requested.
+
+    The search function must not touch Tk widgets.
+    """
+
+    def __init__(self, widget, search: Callable[[Any], Any],
+                 on_result: Callable[[Any, Any], None], on_rows: Callable[[List[Any]], None],
+                 rows_of: Callable[[Any], List[Any]] = lambda result: result.matches,
+                 on_error: Optional[Callable[[Any, str], None]] = None,
+                 delay_ms: int = DEBOUNCE_MS, rows_per_frame: int = ROWS_PER_FRAME,
+                 max_rows: int = MAX_SHOWN_ROWS):
+        """
+        Initialize live search.
+
+        Args:
+            widget: Tk widget used for after() scheduling
+            search: Function query -> result, run on the worker thread
+            on_result: Called with (query, result) of the current query
+            on_rows: Called with each chunk of result rows to show
+            rows_of: Function result -> list of rows
+            on_error: Called with (query, message) if the search raised
+            delay_ms: Debounce delay
+            rows_per_frame: Rows per on_rows call
+            max_rows: Rows shown at most
+        """
+        self.widget = widget
+        self.search = search
+        self.on_result = on_result
+        self.on_rows = on_rows
+        self.rows_of = rows_of
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.rows_per_frame = rows_per_frame
+        self.max_rows = max_rows
+
+        self._generation = 0
+        self._timer = None
+        self._poll = None
+        self._jobs: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pending = 0  # queries handed to the worker and not collected yet
+        self._closed = False
+        self.stats = {'requested': 0, 'started': 0, 'skipped': 0, 'dropped': 0, 'shown': 0}
+
+    def request(self, query: Any):
+        """
+        Schedule a query after the debounce delay, superseding earlier ones.
+
+        Args:
+            query: Query passed to the search function
+        """
+        if self._closed:
+            return
+        self._generation += 1
+        self.stats['requested'] += 1
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+        generation = self._generation
+        self._timer = self.widget.after(self.delay_ms, lambda: self._submit(generation, query))
+
+    def close(self):
+        """Stop the worker thread and drop pending queries and results."""
+        self._closed = True
+        self._generation += 1
+        for timer in (self._timer, self._poll):
+            if timer is not None:
+                self.widget.after_cancel(timer)
+        self._timer = self._poll = None
+        self._jobs.put(None)
+
+    def _submit(self, generation: int, query: Any):
+        """Hand a query to the worker thread (debounce timer fired)."""
+        self._timer = None
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name='live-search', daemon=True)
+            self._thread.start()
+        self._jobs.put((generation, query))
+        self._pending += 1
+        if self._poll is None:
+            self._poll = self.widget.after(POLL_INTERVAL_MS, self._collect)
+
+    def _work(self):
+        """Worker thread: run queries that are still current."""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            generation, query = job
+            if generation != self._generation:
+                self._results.put((generation, query, None, None, False))
+                continue
+            try:
+                self._results.put((generation, query, self.search(query), None, True))
+            except Exception as e:
+                self._results.put((generation, query, None, str(e), True))
+
+    def _collect(self):
+        """Pick up finished queries (runs on the Tk thread)."""
+        self._poll = None
+        current = None
+        while True:
+            try:
+                finished = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if not finished[4]:
+                self.stats['skipped'] += 1
+                continue
+            self.stats['started'] += 1
+            if finished[0] == self._generation:
+                current = finished
+            else:
+                self.stats['dropped'] += 1
+
+        if self._pending > 0 and not self._closed:
+            self._poll = self.widget.after(POLL_INTERVAL_MS, self._collect)
+
+        if current is not None:
+            generation, query, result, error, _ = current
+            if error is not None:
+                print(f"[ERROR] Live search failed: {error}")
+                if self.on_error:
+                    self.on_error(query, error)
+            else:
+                self.on_result(query, result)
+                self._show_rows(generation, list(self.rows_of(result)[:self.max_rows]), 0)
+
+    def _show_rows(self, generation: int, rows: List[Any], start: int):
+        """Pass one chunk of rows, scheduling the next for the next loop pass."""
+        if generation != self._generation:
+            return
+        chunk = rows[start:start + self.rows_per_frame]
+        if chunk:
+            self.on_rows(chunk)
+            self.stats['shown'] += len(chunk)
+        if start + self.rows_per_frame < len(rows):
+            self.widget.after(1, lambda: self._show_rows(generation, rows, start + self.rows_per_frame))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get query statistics.
+
+        Returns:
+            Dictionary with keys: requested, started, skipped, dropped, shown
+        """
+        return dict(self.stats)
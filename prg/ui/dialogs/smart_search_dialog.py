@@ -2,14 +2,17 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
+
+from .live_search import LiveSearch
 
 
 class SmartSearchDialog:
     """Диалог умного поиска с выпадающими списками"""
 
     def __init__(self, parent, districts: List[str], settlements: List[str],
-                 prg_ids: List[str], selected_prg: Dict[str, Any], style_manager=None):
+                 prg_ids: List[str], selected_prg: Dict[str, Any], style_manager=None,
+                 search_callback: Optional[Callable[[str, str, str, bool], Any]] = None):
         """
         Initialize smart search dialog.
 
@@ -20,9 +23,15 @@ class SmartSearchDialog:
             prg_ids: List of PRG IDs for dropdown
             selected_prg: Currently selected PRG dictionary
             style_manager: StyleManager instance for theming
+            search_callback: Optional function (district, settlement, street,
+                fuzzy) -> SearchResult; if given, results are shown while
+                the street is typed (called on a worker thread)
         """
         self.result: Optional[Dict[str, Any]] = None
         self.style_manager = style_manager
+        self.search_callback = search_callback
+        self.live_search: Optional[LiveSearch] = None
+        self.live_scores: Dict[str, float] = {}
 
         # Get colors from style manager or use defaults
         if style_manager:
@@ -52,6 +61,7 @@ class SmartSearchDialog:
         self.dialog.geometry(f"+{x}+{y}")
 
         self.create_dialog_content(districts, settlements, prg_ids, selected_prg, colors)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel_clicked)
 
         # Ожидание результата
         self.dialog.wait_window()
@@ -193,7 +203,15 @@ class SmartSearchDialog:
                  font=('Segoe UI', 9), fg=colors['text_secondary'],
                  bg=colors['bg']).grid(row=4, column=2, padx=(10, 0), pady=12, sticky=tk.W)
 
-        # Пример
+        if self.search_callback:
+            self.create_live_results(main_frame, colors)
+        else:
+            self.create_example(main_frame, selected_prg, colors)
+
+        self.create_buttons(main_frame, colors)
+
+    def create_example(self, main_frame, selected_prg, colors):
+        """Пример умного поиска"""
         example_frame = tk.LabelFrame(main_frame, text="Пример умного поиска",
                                       font=('Segoe UI', 11, 'bold'), fg=colors['text'],
                                       bg=colors['bg'], borderwidth=1, relief='solid')
@@ -215,10 +233,84 @@ class SmartSearchDialog:
         example_text.insert(tk.END, example_content)
         example_text.config(state=tk.DISABLED)
 
-        # Кнопки
+    def create_live_results(self, main_frame, colors):
+        """Список организаций, обновляемый при вводе улицы"""
+        results_frame = tk.LabelFrame(main_frame, text="Найденные организации (поиск при вводе)",
+                                      font=('Segoe UI', 11, 'bold'), fg=colors['text'],
+                                      bg=colors['bg'], borderwidth=1, relief='solid')
+        results_frame.pack(fill=tk.X, pady=(0, 25))
+
+        self.live_status_label = tk.Label(results_frame, text="Введите улицу",
+                                          font=('Segoe UI', 9), fg=colors['text'],
+                                          bg=colors['bg'], anchor=tk.W)
+        self.live_status_label.pack(fill=tk.X, padx=20, pady=(10, 5))
+
+        list_frame = tk.Frame(results_frame, bg=colors['bg'])
+        list_frame.pack(fill=tk.X, padx=20, pady=(0, 15))
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        self.live_results_list = tk.Listbox(list_frame, height=6, font=('Segoe UI', 10),
+                                            bg=colors['bg_panel'], fg=colors['text'],
+                                            borderwidth=0, yscrollcommand=scrollbar.set)
+        scrollbar.config(command=self.live_results_list.yview)
+        self.live_results_list.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.live_search = LiveSearch(
+            self.dialog,
+            lambda query: self.search_callback(*query) if query else None,
+            self.show_live_result,
+            self.show_live_rows,
+            rows_of=lambda search_result: search_result.matches if search_result else [],
+            on_error=lambda query, error: self.live_status_label.config(text=f"Ошибка поиска: {error}")
+        )
+        self.street_var.trace_add('write', lambda *args: self.request_live_search())
+        self.mo_combo.bind('<<ComboboxSelected>>', lambda e: self.request_live_search(), add='+')
+        self.settlement_combo.bind('<<ComboboxSelected>>', lambda e: self.request_live_search(), add='+')
+
+    def request_live_search(self):
+        """Запросить поиск по текущим параметрам (с задержкой, в фоне)"""
+        if self.live_search is None:
+            return
+        street = self.street_var.get().strip()
+        if not street:
+            # Отменяем начатый поиск и очищаем список
+            self.live_search.request(None)
+            return
+        self.live_search.request((self.mo_var.get().strip(), self.settlement_var.get().strip(),
+                                  street, self.fuzzy_var.get()))
+
+    def show_live_result(self, query, search_result):
+        """Показать итог поиска при вводе (строки добавляются порциями)"""
+        self.live_results_list.delete(0, tk.END)
+        self.live_scores = search_result.scores if search_result else {}
+        if search_result is None:
+            self.live_status_label.config(text="Введите улицу")
+            return
+        status = f"Найдено организаций: {search_result.total_count}"
+        if search_result.total_count > self.live_search.max_rows:
+            status += f" (показаны первые {self.live_search.max_rows})"
+        self.live_status_label.config(text=status)
+
+    def show_live_rows(self, consumers):
+        """Добавить порцию найденных организаций в список"""
+        for consumer in consumers:
+            score = self.live_scores.get(consumer['id'])
+            self.live_results_list.insert(
+                tk.END, consumer['name'] if score is None else f"{consumer['name']} ({score:.2f})")
+
+    def create_buttons(self, main_frame, colors):
+        """Кнопки и привязки клавиш"""
         button_frame = tk.Frame(main_frame, bg=colors['bg'])
         button_frame.pack(fill=tk.X)
 
+        # Нечёткий поиск: "ул."/"улица", ё/е, кавычки, опечатки
+        self.fuzzy_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(button_frame, text="Нечёткий поиск (ул./улица, ё/е, опечатки)",
+                       variable=self.fuzzy_var, font=('Segoe UI', 10),
+                       fg=colors['text'], bg=colors['bg'],
+                       activebackground=colors['bg'],
+                       command=self.request_live_search).pack(side=tk.LEFT)
+
         if self.style_manager:
             search_btn = self.style_manager.create_button(
                 button_frame, text="Найти и привязать",
@@ -291,10 +383,11 @@ class SmartSearchDialog:
                 'settlement': settlement,
                 'street': street,
                 'prg_id': prg_id,
-                'share': share
+                'share': share,
+                'fuzzy': self.fuzzy_var.get()
             }
 
-            self.dialog.destroy()
+            self.close()
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка ввода данных: {str(e)}")
@@ -302,4 +395,10 @@ class SmartSearchDialog:
     def cancel_clicked(self):
         """Обработка отмены"""
         self.result = None
+        self.close()
+
+    def close(self):
+        """Остановить поиск при вводе и закрыть диалог"""
+        if self.live_search is not None:
+            self.live_search.close()
         self.dialog.destroy()
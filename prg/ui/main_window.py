@@ -3,11 +3,35 @@
 import warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 
+from prg.data import (DataStore, ChangeJournal, ChangeWAL, LoadCancelledError, location_key, patch_cells,
+                      XlsxPatchError, content_hash)
+from prg.utils.excel_utils import index_to_col
+from prg.ui.trees import LazyTree, DEFAULT_ROW_BUDGET
+
+
+# Interval of polling the loading worker for progress events (ms)
+LOAD_POLL_INTERVAL_MS = 100
+
+# Lines per page of the calculation log viewer
+CALCULATION_LOG_PAGE_SIZE = 500
+
+# PRG load fields and the settings keys of their columns
+PRG_LOAD_FIELDS = (
+    ('qy_pop_col', 'QY_pop'),
+    ('qh_pop_col', 'QH_pop'),
+    ('qy_ind_col', 'QY_ind'),
+    ('qh_ind_col', 'QH_ind'),
+    ('year_volume_col', 'Year_volume'),
+    ('max_hour_col', 'Max_Hour'),
+)
+
 
 class PRGPipelineManager:
     """
@@ -17,7 +41,8 @@ class PRGPipelineManager:
 
     def __init__(self, root, settings_manager, excel_loader,
                  validation_service, calculation_service,
-                 binding_service, search_service, style_manager):
+                 binding_service, search_service, style_manager,
+                 data_store=None, change_wal=None):
         """Initialize main window with injected services."""
         self.root = root
         self.settings_manager = settings_manager
@@ -33,12 +58,25 @@ class PRGPipelineManager:
         self.prg_data: List[Dict[str, Any]] = []
         self.grs_data: List[Dict[str, Any]] = []
         self.consumer_data: List[Dict[str, Any]] = []
-        self.changes: Dict[str, Dict[str, Any]] = {}
+        # Pending changes, appended to the on-disk journal of the workbook as they are made
+        self.change_wal: Optional[ChangeWAL] = change_wal
+        self.changes = ChangeJournal(change_wal)
+
+        # Indexes over the loaded data (shared with the services)
+        self.data_store = data_store if data_store is not None else DataStore()
 
         # Selected elements
         self.selected_prg = None
         self.selected_consumer = None
 
+        # Last full load calculation (its log is shown on demand)
+        self.last_calculation = None
+
+        # Background loading (worker thread -> UI events)
+        self._load_thread: Optional[threading.Thread] = None
+        self._load_events: Optional[queue.Queue] = None
+        self._load_cancel: Optional[threading.Event] = None
+
         # Setup UI
         self.root.title("PRG Pipeline Manager v7.4 - Professional Edition")
 
@@ -78,8 +116,10 @@ class PRGPipelineManager:
                            activebackground=colors['primary'], activeforeground='white')
         menubar.add_cascade(label="Файл", menu=file_menu)
         file_menu.add_command(label="Открыть Excel...", command=self.open_excel_file)
+        file_menu.add_command(label="Обновить измененные листы", command=self.reload_changed_sheets)
         file_menu.add_separator()
         file_menu.add_command(label="Сохранить изменения", command=self.save_changes_to_excel)
+        file_menu.add_command(label="История изменений", command=self.show_change_history)
         file_menu.add_separator()
         file_menu.add_command(label="Выход", command=self.on_close_window)
 
@@ -109,6 +149,11 @@ class PRGPipelineManager:
         tools_menu.add_command(label="Проверить доли всех", command=self.check_all_consumer_shares)
         tools_menu.add_separator()
         tools_menu.add_command(label="Подсчитать нагрузку ПРГ", command=self.calculate_prg_load)
+        tools_menu.add_command(label="Журнал расчета", command=self.show_calculation_log)
+        self.fast_calculation_var = tk.BooleanVar(
+            value=self.settings_manager.get_ui_preference('fast_calculation', False))
+        tools_menu.add_checkbutton(label="Быстрый расчет (без журнала)", variable=self.fast_calculation_var,
+                                   command=self.toggle_fast_calculation)
         tools_menu.add_separator()
         tools_menu.add_command(label="Показать непривязанные", command=self.show_unbound_analysis)
         tools_menu.add_command(label="Показать без расходов", command=self.show_no_expenses_analysis)
@@ -172,14 +217,16 @@ class PRGPipelineManager:
         prg_tree_frame = tk.Frame(prg_frame, bg=colors['bg'])
         prg_tree_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
 
-        self.prg_tree = ttk.Treeview(prg_tree_frame, columns=('prg_id', 'grs_id'),
+        self.prg_tree = ttk.Treeview(prg_tree_frame, columns=('prg_id', 'grs_id', 'load'),
                                      height=30, style='Modern.Treeview')
         self.prg_tree.heading('#0', text='Структура ПРГ')
         self.prg_tree.heading('prg_id', text='ПРГ ID')
         self.prg_tree.heading('grs_id', text='ГРС ID')
+        self.prg_tree.heading('load', text='Qгод')
         self.prg_tree.column('#0', width=280)
         self.prg_tree.column('prg_id', width=80)
         self.prg_tree.column('grs_id', width=80)
+        self.prg_tree.column('load', width=80, anchor='e')
 
         prg_scroll = ttk.Scrollbar(prg_tree_frame, orient=tk.VERTICAL, command=self.prg_tree.yview,
                                    style='Modern.Vertical.TScrollbar')
@@ -190,6 +237,10 @@ class PRGPipelineManager:
 
         self.prg_tree.bind('<<TreeviewSelect>>', self.on_prg_tree_select)
 
+        # Settlements and PRG rows are inserted when their parent is opened
+        row_budget = self.settings_manager.get_ui_preference('tree_row_budget', DEFAULT_ROW_BUDGET)
+        self.prg_rows = LazyTree(self.prg_tree, self._prg_row, row_budget)
+
         # Центральная панель с кнопками
         center_frame = tk.Frame(main_frame, bg=colors['bg'], width=180)
         center_frame.pack(side=tk.LEFT, fill=tk.Y, padx=16)
@@ -286,6 +337,10 @@ class PRGPipelineManager:
 
         self.consumer_tree.bind('<<TreeviewSelect>>', self.on_consumer_tree_select)
 
+        # Settlements and consumer rows are inserted when their parent is opened
+        row_budget = self.settings_manager.get_ui_preference('tree_row_budget', DEFAULT_ROW_BUDGET)
+        self.consumer_rows = LazyTree(self.consumer_tree, self._consumer_row, row_budget)
+
     def create_status_panel(self):
         """Создание нижней панели статуса"""
         colors = self.style_manager.colors
@@ -309,6 +364,25 @@ class PRGPipelineManager:
                                     font=('Segoe UI', 10, 'bold'))
         self.stats_label.pack(side=tk.RIGHT)
 
+        # Прогресс загрузки (показывается только во время загрузки)
+        self.load_progress_frame = tk.Frame(info_frame, bg=colors['bg_secondary'])
+
+        self.load_cancel_button = self.style_manager.create_button(
+            self.load_progress_frame,
+            text="Отмена",
+            command=self.cancel_loading,
+            color='danger'
+        )
+        self.load_cancel_button.pack(side=tk.RIGHT, padx=(10, 0))
+
+        self.load_progress_bar = ttk.Progressbar(self.load_progress_frame, mode='indeterminate', length=200)
+        self.load_progress_bar.pack(side=tk.RIGHT, padx=(10, 0))
+
+        self.load_progress_label = tk.Label(self.load_progress_frame, text="",
+                                            bg=colors['bg_secondary'], fg=colors['text'],
+                                            font=('Segoe UI', 10))
+        self.load_progress_label.pack(side=tk.RIGHT)
+
         # Детальная информационная панель
         detail_frame = tk.LabelFrame(status_frame, text="Детальная информация (можно выделять и копировать)",
                                      bg=colors['bg_secondary'], fg=colors['text'],
@@ -382,6 +456,9 @@ class PRGPipelineManager:
 
     def open_excel_file(self):
         """Открытие Excel файла"""
+        if self.warn_if_loading():
+            return
+
         try:
             file_path = filedialog.askopenfilename(
                 title="Выберите Excel файл",
@@ -389,21 +466,18 @@ class PRGPipelineManager:
             )
 
             if file_path:
-                self.excel_path = Path(file_path)
-                self.file_label.config(text=f"📄 {self.excel_path.name}")
-
-                self.clear_all_changes()
-                self.show_settings_dialog()
+                # The file becomes current (and pending changes are dropped) once it is loaded
+                self.show_settings_dialog(Path(file_path))
 
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось открыть файл: {str(e)}")
 
-    def show_settings_dialog(self):
+    def show_settings_dialog(self, excel_path: Path):
         """Диалог настройки таблиц перед загрузкой"""
         # Ask user if they want to check settings first
         response = messagebox.askyesnocancel(
             "Загрузка данных",
-            f"Файл: {self.excel_path.name}\n\n"
+            f"Файл: {excel_path.name}\n\n"
             f"Загрузить данные с текущими настройками?\n\n"
             f"Да - загрузить сейчас\n"
             f"Нет - открыть настройки столбцов\n"
@@ -411,21 +485,20 @@ class PRGPipelineManager:
         )
 
         if response is None:  # Cancel
-            self.excel_path = None
-            self.file_label.config(text="Файл не выбран")
             return
         elif response is False:  # No - show settings
-            self.open_settings_dialog()
+            self.open_settings_dialog(excel_path)
             return
 
         # Yes - load data
         try:
-            self.load_all_data()
+            self.load_all_data(excel_path)
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка загрузки данных: {str(e)}")
 
-    def open_settings_dialog(self):
-        """Открыть диалог настройки столбцов"""
+    def open_settings_dialog(self, excel_path: Optional[Path] = None):
+        """Открыть диалог настройки столбцов (и загрузить excel_path или текущий файл)"""
+        excel_path = excel_path or self.excel_path
         try:
             from prg.ui.dialogs import SettingsDialog
 
@@ -435,8 +508,8 @@ class PRGPipelineManager:
                 self.style_manager
             )
 
-            # If settings were saved and file is loaded, ask to reload
-            if dialog.result and self.excel_path:
+            # If settings were saved and a file is chosen, ask to (re)load
+            if dialog.result and excel_path and not self.is_loading():
                 response = messagebox.askyesno(
                     "Перезагрузка данных",
                     "Настройки сохранены!\n\n"
@@ -445,7 +518,7 @@ class PRGPipelineManager:
 
                 if response:
                     try:
-                        self.load_all_data()
+                        self.load_all_data(excel_path)
                     except Exception as e:
                         messagebox.showerror("Ошибка", f"Ошибка загрузки данных: {str(e)}")
 
@@ -454,31 +527,268 @@ class PRGPipelineManager:
             import traceback
             traceback.print_exc()
 
-    def load_all_data(self):
-        """Загрузка всех данных из Excel"""
-        try:
-            print(f"[INFO] Loading data from: {self.excel_path}")
+    def load_all_data(self, excel_path: Optional[Path] = None):
+        """Загрузка всех данных из Excel (excel_path или текущего файла) в фоновом потоке"""
+        if self.is_loading():
+            return
 
-            # Load all data using ExcelLoader service
-            data = self.excel_loader.load_all_data(str(self.excel_path))
+        excel_path = Path(excel_path or self.excel_path)
+        print(f"[INFO] Loading data from: {excel_path}")
+        # 'parallel' loads every sheet in its own process (opt-in in prg_settings.json)
+        load_mode = self.settings_manager.get_ui_preference('load_mode', 'single_pass')
+        events: queue.Queue = queue.Queue()
+        cancel_event = threading.Event()
 
-            self.prg_data = data.get('prg', [])
-            self.grs_data = data.get('grs', [])
-            self.consumer_data = data.get('consumers', [])
+        def worker():
+            try:
+                data = self.excel_loader.load_all_data(
+                    str(excel_path),
+                    mode=load_mode,
+                    progress_callback=lambda sheet, rows: events.put(('progress', sheet, rows)),
+                    cancel_event=cancel_event
+                )
+                # Hashed here, so starting the change journal on the UI thread reuses it
+                try:
+                    content_hash(excel_path)
+                except OSError:
+                    pass  # Reported when the journal starts
+                events.put(('done', excel_path, data))
+            except LoadCancelledError:
+                events.put(('cancelled',))
+            except Exception as e:
+                events.put(('error', str(e)))
+
+        self._load_events = events
+        self._load_cancel = cancel_event
+        self._load_thread = threading.Thread(target=worker, name='excel-loader', daemon=True)
+        self._load_thread.start()
+
+        self.load_progress_label.config(text=f"Загрузка: {excel_path.name}...")
+        self.load_cancel_button.config(state=tk.NORMAL)
+        self.load_progress_frame.pack(side=tk.RIGHT, padx=(0, 15))
+        self.load_progress_bar.start(15)
+        # Records shown until the load finishes must not be edited
+        self.update_button_states()
+        self.root.after(LOAD_POLL_INTERVAL_MS, self._poll_load_events)
+
+    def is_loading(self) -> bool:
+        """Идет ли фоновая загрузка данных"""
+        return self._load_thread is not None
+
+    def warn_if_loading(self) -> bool:
+        """Предупредить, что идет загрузка (действия с данными недоступны до ее окончания)"""
+        if self.is_loading():
+            messagebox.showwarning("Предупреждение", "Дождитесь окончания загрузки данных")
+            return True
+        return False
+
+    def cancel_loading(self):
+        """Отменить фоновую загрузку данных"""
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+            self.load_progress_label.config(text="Отмена загрузки...")
+            self.load_cancel_button.config(state=tk.DISABLED)
+
+    def _poll_load_events(self):
+        """Обработать события фоновой загрузки (вызывается через root.after)"""
+        while True:
+            try:
+                event = self._load_events.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = event[0]
+            if kind == 'progress':
+                _, sheet, rows = event
+                self.load_progress_label.config(text=f"Лист \"{sheet}\": {rows} строк")
+                continue
+
+            self._finish_loading()
+            if kind == 'done':
+                self._apply_loaded_data(event[1], event[2])
+            elif kind == 'cancelled':
+                print("[INFO] Loading cancelled")
+                self.info_label.config(text="Загрузка отменена")
+            else:
+                messagebox.showerror("Ошибка", f"Ошибка загрузки данных: {event[1]}")
+            return
 
-            print(f"[OK] Loaded: {len(self.prg_data)} PRG, {len(self.grs_data)} GRS, {len(self.consumer_data)} consumers")
+        self.root.after(LOAD_POLL_INTERVAL_MS, self._poll_load_events)
+
+    def _finish_loading(self):
+        """Скрыть прогресс загрузки и освободить поток"""
+        self.load_progress_bar.stop()
+        self.load_progress_frame.pack_forget()
+        self._load_thread = None
+        self._load_events = None
+        self._load_cancel = None
+        self.update_button_states()
+
+    def _apply_loaded_data(self, excel_path: Path, data: Dict[str, List[Dict[str, Any]]]):
+        """Показать загруженные данные (excel_path становится текущим файлом)"""
+        if excel_path != self.excel_path:
+            # Pending changes belong to the previous file
+            self.clear_all_changes()
+            self.excel_path = excel_path
+            self.file_label.config(text=f"📄 {excel_path.name}")
+
+        self.prg_data = data.get('prg', [])
+        self.grs_data = data.get('grs', [])
+        self.consumer_data = data.get('consumers', [])
+        self.data_store.load(self.prg_data, self.grs_data, self.consumer_data)
+        self.calculation_service.start_live_loads(self.consumer_data)
+        self.selected_prg = None
+        self.selected_consumer = None
+        self.open_change_journal()
 
-            # Update UI
-            self.populate_prg_tree()
-            self.populate_consumer_tree()
-            self.update_statistics()
+        print(f"[OK] Loaded: {len(self.prg_data)} PRG, {len(self.grs_data)} GRS, {len(self.consumer_data)} consumers")
+
+        # Update UI
+        self.populate_prg_tree()
+        self.populate_consumer_tree()
+        self.update_statistics()
+        self.update_button_states()
+
+        # Show statistics
+        self.show_load_statistics()
+
+    def open_change_journal(self):
+        """Открыть журнал изменений книги и предложить восстановить несохраненные изменения"""
+        if self.change_wal is None or self.excel_path is None:
+            return
+        if self.change_wal.is_open_for(self.excel_path):
+            # Same workbook reloaded: the journal already holds the pending changes
+            return
+
+        try:
+            pending = self.change_wal.read(self.excel_path)
+            if not pending or not pending['changes']:
+                self._start_change_journal()
+                return
+
+            from datetime import datetime
+            created = datetime.fromtimestamp(pending['created']).strftime('%d.%m.%Y %H:%M')
+            warning = ("" if pending['matches_workbook'] else
+                       "ВНИМАНИЕ: файл был изменен после начала журнала,\n"
+                       "строки могли сместиться.\n\n")
+            response = messagebox.askyesno(
+                "Несохраненные изменения",
+                f"Найден журнал несохраненных изменений от {created}:\n"
+                f"операций: {len(pending['changes'])}\n\n"
+                f"{warning}"
+                f"Восстановить изменения?\n\n"
+                f"Нет - журнал будет удален"
+            )
+            if not response:
+                self._start_change_journal()
+                return
+
+            applied = self._replay_changes(pending['changes'])
+            self.changes.restore(applied)
+            if pending['matches_workbook'] and len(applied) == len(pending['changes']):
+                self.change_wal.resume(self.excel_path)
+            else:
+                self._start_change_journal(self.changes.history())
+            print(f"[OK] Restored {len(applied)} of {len(pending['changes'])} journaled changes")
+            self.update_changes_display()
             self.update_button_states()
 
-            # Show statistics
-            self.show_load_statistics()
+        except Exception as e:
+            messagebox.showwarning("Предупреждение", f"Не удалось открыть журнал изменений:\n\n{str(e)}")
+            print(f"[WARNING] Change journal: {e}")
 
+    def _start_change_journal(self, changes: Optional[List[Dict[str, Any]]] = None):
+        """Начать новый журнал изменений для текущего состояния файла"""
+        if self.change_wal is None or self.excel_path is None:
+            return
+        try:
+            self.change_wal.start(self.excel_path, changes or [])
         except Exception as e:
-            raise Exception(f"Ошибка загрузки данных: {str(e)}")
+            print(f"[WARNING] {e}")
+
+    def _replay_changes(self, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply journaled changes to the loaded records.
+
+        Args:
+            changes: Change dictionaries from the journal, in order
+
+        Returns:
+            Changes whose cell belongs to a loaded consumer code or PRG load
+        """
+        consumers_by_cell = {(c['sheet_name'], c['excel_row']): c for c in self.consumer_data}
+        prg_by_cell = {(p['sheet_name'], p['excel_row']): p for p in self.prg_data}
+
+        applied = []
+        for change in changes:
+            cell = (change.get('sheet_name'), change.get('row'))
+            col = change.get('col')
+
+            consumer = consumers_by_cell.get(cell)
+            if consumer is not None and consumer.get('code_col') == col:
+                old_code = consumer.get('code', '')
+                new_code = change.get('new_value') or ''
+                self.data_store.set_consumer_code(consumer, new_code)
+                self.calculation_service.apply_binding_change(consumer, old_code, new_code)
+                applied.append(change)
+                continue
+
+            prg = prg_by_cell.get(cell)
+            field = next((f for key, f in PRG_LOAD_FIELDS if prg.get(key) == col), None) if prg else None
+            if field is not None:
+                prg[field] = change.get('new_value')
+                applied.append(change)
+                continue
+
+            print(f"[WARNING] Journaled change for unknown cell skipped: {change.get('description', '')}")
+
+        return applied
+
+    def reload_changed_sheets(self):
+        """Перечитать из Excel только измененные листы"""
+        if not self.excel_path:
+            messagebox.showwarning("Предупреждение", "Нет загруженного файла")
+            return
+        if self.warn_if_loading():
+            return
+
+        if self.changes and not messagebox.askyesno(
+                "Обновление данных",
+                f"Есть несохраненные изменения: {len(self.changes)}\n\n"
+                f"Изменения на перечитанных листах будут отменены. Продолжить?"):
+            return
+
+        try:
+            data = {'prg': self.prg_data, 'grs': self.grs_data, 'consumers': self.consumer_data}
+            changed = self.excel_loader.reload_changed(str(self.excel_path), data)
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка обновления данных: {str(e)}")
+            return
+
+        if not changed:
+            messagebox.showinfo("Обновление данных", "Файл не изменился после загрузки")
+            return
+
+        # The lists were updated in place
+        self.data_store.load(self.prg_data, self.grs_data, self.consumer_data)
+        self.calculation_service.start_live_loads(self.consumer_data)
+
+        # Pending changes of reloaded sheets point at replaced records
+        changed_sheets = {self.settings_manager.get_table_settings(t)['sheet'] for t in changed}
+        self.changes.discard_sheets(changed_sheets)
+        # The workbook on disk changed: journal the remaining changes against it
+        self._start_change_journal(self.changes.history())
+
+        self.selected_prg = None
+        self.selected_consumer = None
+        self.populate_prg_tree()
+        self.populate_consumer_tree()
+        self.update_statistics()
+        self.update_changes_display()
+        self.update_button_states()
+
+        sheet_list = "\n".join(f"• {sheet}" for sheet in sorted(changed_sheets))
+        messagebox.showinfo("Обновление данных", f"Перечитаны измененные листы:\n\n{sheet_list}")
 
     def show_load_statistics(self):
         """Показать статистику загруженных данных"""
@@ -522,12 +832,17 @@ class PRGPipelineManager:
         messagebox.showinfo("Данные загружены v7.4", message)
 
     def clear_all_changes(self):
-        """Очистка всех изменений"""
+        """Очистка всех изменений (журнал на диске сохраняется для восстановления)"""
         self.changes.clear()
+        if self.change_wal is not None:
+            self.change_wal.close()
         self.update_changes_display()
 
     def save_changes_to_excel(self):
         """Сохранение изменений в Excel"""
+        if self.warn_if_loading():
+            return
+
         if not self.excel_path:
             messagebox.showwarning("Предупреждение", "Нет загруженного файла")
             return
@@ -550,69 +865,27 @@ class PRGPipelineManager:
             return
 
         try:
-            from openpyxl import load_workbook
-            from prg.utils.excel_utils import index_to_col
-
             print(f"[INFO] Saving {len(self.changes)} changes to {self.excel_path}...")
 
-            # Load workbook
-            wb = load_workbook(str(self.excel_path))
-
-            success_count = 0
-            error_count = 0
-            errors = []
-
             # Group changes by sheet for efficiency
             changes_by_sheet = {}
-            for change_id, change in self.changes.items():
+            for change in self.changes.values():
                 sheet_name = change.get('sheet_name', '')
                 if sheet_name not in changes_by_sheet:
                     changes_by_sheet[sheet_name] = []
                 changes_by_sheet[sheet_name].append(change)
 
-            # Apply changes
-            for sheet_name, sheet_changes in changes_by_sheet.items():
-                try:
-                    if sheet_name not in wb.sheetnames:
-                        print(f"[WARNING] Sheet '{sheet_name}' not found")
-                        for change in sheet_changes:
-                            errors.append(f"Sheet not found: {sheet_name}")
-                            error_count += 1
-                        continue
-
-                    ws = wb[sheet_name]
-
-                    for change in sheet_changes:
-                        try:
-                            row = change.get('row', 0) + 1  # Convert to 1-based Excel row
-                            col = change.get('col', 0) + 1  # Convert to 1-based Excel column
-                            new_value = change.get('new_value', '')
-
-                            # Write to cell
-                            ws.cell(row=row, column=col, value=new_value)
-                            success_count += 1
-
-                            print(f"  [OK] {sheet_name}!{index_to_col(col-1)}{row} = '{new_value[:30]}...' " if len(str(new_value)) > 30 else f"  [OK] {sheet_name}!{index_to_col(col-1)}{row} = '{new_value}'")
-
-                        except Exception as e:
-                            error_msg = f"{sheet_name} row {row}: {str(e)}"
-                            errors.append(error_msg)
-                            error_count += 1
-                            print(f"  [ERROR] {error_msg}")
-
-                except Exception as e:
-                    error_msg = f"Sheet {sheet_name}: {str(e)}"
-                    errors.append(error_msg)
-                    error_count += len(sheet_changes)
-                    print(f"[ERROR] {error_msg}")
-
-            # Save workbook
-            wb.save(str(self.excel_path))
-            wb.close()
+            # Patch the edited cells in place; full openpyxl save only if that is not possible
+            try:
+                success_count, error_count, errors = self._write_changes_patched(changes_by_sheet)
+            except XlsxPatchError as e:
+                print(f"[WARNING] Direct cell patch not possible ({e}), saving with openpyxl")
+                success_count, error_count, errors = self._write_changes_openpyxl(changes_by_sheet)
 
             # Clear saved changes
             if success_count > 0:
                 self.changes.clear()
+                self._start_change_journal()
                 self.update_changes_display()
 
             # Show result
@@ -643,11 +916,115 @@ class PRGPipelineManager:
             import traceback
             traceback.print_exc()
 
+    def _write_changes_patched(self, changes_by_sheet: Dict[str, List[Dict[str, Any]]]):
+        """
+        Write changes by patching only the edited cells of the xlsx package.
+
+        Args:
+            changes_by_sheet: Sheet name -> list of change dictionaries
+
+        Returns:
+            Tuple (success_count, error_count, errors)
+
+        Raises:
+            XlsxPatchError: If the file has to be saved with openpyxl instead
+        """
+        errors = []
+        edits = {}
+        for sheet_name, sheet_changes in changes_by_sheet.items():
+            cells = edits.setdefault(sheet_name, {})
+            for change in sheet_changes:
+                cells[(change.get('row', 0), change.get('col', 0))] = change.get('new_value', '')
+
+        written = patch_cells(self.excel_path, edits)
+
+        success_count = 0
+        error_count = 0
+        for sheet_name, sheet_changes in changes_by_sheet.items():
+            if sheet_name not in written:
+                print(f"[WARNING] Sheet '{sheet_name}' not found")
+                for change in sheet_changes:
+                    errors.append(f"Sheet not found: {sheet_name}")
+                    error_count += 1
+                continue
+            for change in sheet_changes:
+                self._log_saved_cell(sheet_name, change)
+                success_count += 1
+
+        return success_count, error_count, errors
+
+    def _write_changes_openpyxl(self, changes_by_sheet: Dict[str, List[Dict[str, Any]]]):
+        """
+        Write changes by loading and saving the whole workbook with openpyxl.
+
+        Args:
+            changes_by_sheet: Sheet name -> list of change dictionaries
+
+        Returns:
+            Tuple (success_count, error_count, errors)
+        """
+        from openpyxl import load_workbook
+
+        # Load workbook
+        wb = load_workbook(str(self.excel_path))
+
+        success_count = 0
+        error_count = 0
+        errors = []
+
+        # Apply changes
+        for sheet_name, sheet_changes in changes_by_sheet.items():
+            try:
+                if sheet_name not in wb.sheetnames:
+                    print(f"[WARNING] Sheet '{sheet_name}' not found")
+                    for change in sheet_changes:
+                        errors.append(f"Sheet not found: {sheet_name}")
+                        error_count += 1
+                    continue
+
+                ws = wb[sheet_name]
+
+                for change in sheet_changes:
+                    try:
+                        row = change.get('row', 0) + 1  # Convert to 1-based Excel row
+                        col = change.get('col', 0) + 1  # Convert to 1-based Excel column
+                        new_value = change.get('new_value', '')
+
+                        # Write to cell
+                        ws.cell(row=row, column=col, value=new_value)
+                        success_count += 1
+
+                        self._log_saved_cell(sheet_name, change)
+
+                    except Exception as e:
+                        error_msg = f"{sheet_name} row {row}: {str(e)}"
+                        errors.append(error_msg)
+                        error_count += 1
+                        print(f"  [ERROR] {error_msg}")
+
+            except Exception as e:
+                error_msg = f"Sheet {sheet_name}: {str(e)}"
+                errors.append(error_msg)
+                error_count += len(sheet_changes)
+                print(f"[ERROR] {error_msg}")
+
+        # Save workbook
+        wb.save(str(self.excel_path))
+        wb.close()
+
+        return success_count, error_count, errors
+
+    def _log_saved_cell(self, sheet_name: str, change: Dict[str, Any]):
+        """Вывод записанной ячейки в консоль"""
+        cell = f"{sheet_name}!{index_to_col(change.get('col', 0))}{change.get('row', 0) + 1}"
+        new_value = str(change.get('new_value', ''))
+        print(f"  [OK] {cell} = '{new_value[:30]}...' " if len(new_value) > 30 else f"  [OK] {cell} = '{new_value}'")
+
     # === TREE POPULATION ===
 
     def populate_prg_tree(self):
-        """Заполнение дерева ПРГ"""
-        self.prg_tree.delete(*self.prg_tree.get_children())
+        """Заполнение дерева ПРГ (районы; остальное - при раскрытии)"""
+        self.prg_rows.clear()
 
         if not self.prg_data:
             return
@@ -666,27 +1043,51 @@ class PRGPipelineManager:
             structure[mo][settlement].append(prg)
 
         # Build tree
-        for mo in sorted(structure.keys()):
-            mo_node = self.prg_tree.insert('', 'end', text=f"📍 {mo}", values=('', ''))
+        self.prg_rows.populate([
+            (f"📍 {mo}", [(f"🏘️ {settlement}", structure[mo][settlement])
+                         for settlement in sorted(structure[mo].keys())])
+            for mo in sorted(structure.keys())
+        ])
 
-            for settlement in sorted(structure[mo].keys()):
-                settlement_node = self.prg_tree.insert(mo_node, 'end', text=f"🏘️ {settlement}", values=('', ''))
+        self.calculation_service.pop_changed_live_prg_ids()
+        print(f"[OK] PRG tree populated with {len(self.prg_data)} items")
 
-                for prg in structure[mo][settlement]:
-                    prg_id = prg.get('prg_id', '')
-                    grs_id = prg.get('grs_id', '')
+    def _prg_row(self, prg: Dict[str, Any]):
+        """Строка ПРГ в дереве: (текст, значения, теги)"""
+        prg_id = prg.get('prg_id', '')
+        grs_id = prg.get('grs_id', '')
+        return f"🏭 {prg_id}", (prg_id, grs_id, self._prg_load_text(prg_id)), (prg['id'],)
 
-                    display_text = f"🏭 {prg_id}"
+    def refresh_prg_loads(self):
+        """Обновление текущих нагрузок ПРГ после изменения привязок"""
+        changed = set(self.calculation_service.pop_changed_live_prg_ids())
+        if not changed:
+            return
 
-                    self.prg_tree.insert(settlement_node, 'end', text=display_text,
-                                       values=(prg_id, grs_id),
-                                       tags=(prg['id'],))
+        # Rows that are not inserted get the current load when their settlement is opened
+        for record_id, item in self.prg_rows.rows():
+            prg = self.data_store.get_prg(record_id)
+            if prg and prg.get('prg_id') in changed:
+                self.prg_tree.set(item, 'load', self._prg_load_text(prg['prg_id']))
 
-        print(f"[OK] PRG tree populated with {len(self.prg_data)} items")
+        if self.selected_prg and self.selected_prg.get('prg_id') in changed:
+            self.update_detail_panel_prg(self.selected_prg)
+
+    def refresh_consumer_rows(self, changes: List[Dict[str, Any]]):
+        """Обновление строк потребителей из изменений привязок (без перестроения дерева)"""
+        consumer_ids = dict.fromkeys(change.get('consumer_id') for change in changes)
+        consumers = [self.data_store.get_consumer(consumer_id) for consumer_id in consumer_ids if consumer_id]
+        refreshed = self.consumer_rows.refresh(consumer for consumer in consumers if consumer is not None)
+        print(f"[INFO] Consumer rows refreshed: {refreshed} of {len(consumers)} changed consumers")
+
+    def _prg_load_text(self, prg_id: str) -> str:
+        """Текущая годовая нагрузка ПРГ для дерева"""
+        load = self.calculation_service.get_live_load(prg_id)
+        return f"{load['Year_volume']:.3f}" if load else ''
 
     def populate_consumer_tree(self):
-        """Заполнение дерева потребителей"""
-        self.consumer_tree.delete(*self.consumer_tree.get_children())
+        """Заполнение дерева потребителей (районы; остальное - при раскрытии)"""
+        self.consumer_rows.clear()
 
         if not self.consumer_data:
             return
@@ -707,79 +1108,45 @@ class PRGPipelineManager:
             if c_type in structure[mo][settlement]:
                 structure[mo][settlement][c_type].append(consumer)
 
-        # Build tree
-        from prg.data.parsers import parse_prg_bindings, calculate_total_share
+        # Build tree: population first, then organizations in every settlement
+        self.consumer_rows.populate([
+            (f"📍 {mo}", [(f"🏘️ {settlement}", groups['Население'] + groups['Организация'])
+                         for settlement, groups in sorted(structure[mo].items())])
+            for mo in sorted(structure.keys())
+        ])
 
-        for mo in sorted(structure.keys()):
-            mo_node = self.consumer_tree.insert('', 'end', text=f"📍 {mo}", values=('', '', ''))
+        print(f"[OK] Consumer tree populated with {len(self.consumer_data)} items")
 
-            for settlement in sorted(structure[mo].keys()):
-                settlement_node = self.consumer_tree.insert(mo_node, 'end', text=f"🏘️ {settlement}",
-                                                          values=('', '', ''))
+    def _consumer_row(self, consumer: Dict[str, Any]):
+        """Строка потребителя в дереве: (текст, значения, теги)"""
+        from prg.data.parsers import calculate_total_share
 
-                # Add population consumers
-                for consumer in structure[mo][settlement]['Население']:
-                    name = consumer.get('name', consumer.get('settlement', ''))
-                    code = consumer.get('code', '')
-
-                    # Parse bindings
-                    bindings = parse_prg_bindings(code)
-                    total_share = calculate_total_share(bindings)
-
-                    # Check expenses
-                    has_expenses = self.validation_service.has_expenses(consumer)
-
-                    # Display icon based on state
-                    icon = "👤"
-                    if not has_expenses:
-                        icon = "🚫"
-                    elif not bindings:
-                        icon = "🟡"
-                    elif total_share > 1.01:  # Sum > 1 with tolerance
-                        icon = "🟡"
-                    elif total_share < 0.99 and bindings:  # Sum < 1 with tolerance
-                        icon = "🔵"
-
-                    display_text = f"{icon} {name}"
-                    binding_display = f"{len(bindings)} привязок" if bindings else "Нет"
-                    share_display = f"{total_share:.2f}" if bindings else ""
-
-                    self.consumer_tree.insert(settlement_node, 'end', text=display_text,
-                                            values=('Население', binding_display, share_display),
-                                            tags=(consumer['id'],))
-
-                # Add organization consumers
-                for consumer in structure[mo][settlement]['Организация']:
-                    name = consumer.get('name', '')
-                    code = consumer.get('code', '')
-
-                    # Parse bindings
-                    bindings = parse_prg_bindings(code)
-                    total_share = calculate_total_share(bindings)
-
-                    # Check expenses
-                    has_expenses = self.validation_service.has_expenses(consumer)
-
-                    # Display icon based on state
-                    icon = "🏢"
-                    if not has_expenses:
-                        icon = "🚫"
-                    elif not bindings:
-                        icon = "🟡"
-                    elif total_share > 1.01:  # Sum > 1 with tolerance
-                        icon = "🟡"
-                    elif total_share < 0.99 and bindings:  # Sum < 1 with tolerance
-                        icon = "🔵"
-
-                    display_text = f"{icon} {name}"
-                    binding_display = f"{len(bindings)} привязок" if bindings else "Нет"
-                    share_display = f"{total_share:.2f}" if bindings else ""
-
-                    self.consumer_tree.insert(settlement_node, 'end', text=display_text,
-                                            values=('Организация', binding_display, share_display),
-                                            tags=(consumer['id'],))
+        is_population = consumer.get('type') == 'Население'
+        name = consumer.get('name', consumer.get('settlement', '')) if is_population else consumer.get('name', '')
 
-        print(f"[OK] Consumer tree populated with {len(self.consumer_data)} items")
+        # Parse bindings
+        bindings = self.data_store.bindings(consumer)
+        total_share = calculate_total_share(bindings)
+
+        # Check expenses
+        has_expenses = self.validation_service.has_expenses(consumer)
+
+        # Display icon based on state
+        icon = "👤" if is_population else "🏢"
+        if not has_expenses:
+            icon = "🚫"
+        elif not bindings:
+            icon = "🟡"
+        elif total_share > 1.01:  # Sum > 1 with tolerance
+            icon = "🟡"
+        elif total_share < 0.99 and bindings:  # Sum < 1 with tolerance
+            icon = "🔵"
+
+        display_text = f"{icon} {name}"
+        binding_display = f"{len(bindings)} привязок" if bindings else "Нет"
+        share_display = f"{total_share:.2f}" if bindings else ""
+
+        return display_text, (consumer.get('type'), binding_display, share_display), (consumer['id'],)
 
     # === EVENT HANDLERS ===
 
@@ -795,7 +1162,7 @@ class PRGPipelineManager:
 
         if tags:
             prg_id = tags[0]
-            self.selected_prg = next((p for p in self.prg_data if p['id'] == prg_id), None)
+            self.selected_prg = self.data_store.get_prg(prg_id)
 
             if self.selected_prg:
                 self.update_detail_panel_prg(self.selected_prg)
@@ -813,7 +1180,7 @@ class PRGPipelineManager:
 
         if tags:
             consumer_id = tags[0]
-            self.selected_consumer = next((c for c in self.consumer_data if c['id'] == consumer_id), None)
+            self.selected_consumer = self.data_store.get_consumer(consumer_id)
 
             if self.selected_consumer:
                 self.update_detail_panel_consumer(self.selected_consumer)
@@ -834,6 +1201,16 @@ class PRGPipelineManager:
         details += f"\nЛист Excel: {prg.get('sheet_name', '')}\n"
         details += f"Строка Excel: {prg.get('excel_row', '')}\n"
 
+        load = self.calculation_service.get_live_load(prg.get('prg_id', ''))
+        if load:
+            details += f"\nНагрузка по текущим привязкам:\n"
+            details += f"QY население: {load['QY_pop']:.3f}\n"
+            details += f"QH население: {load['QH_pop']:.4f}\n"
+            details += f"QY организации: {load['QY_ind']:.3f}\n"
+            details += f"QH организации: {load['QH_ind']:.4f}\n"
+            details += f"Годовой объем: {load['Year_volume']:.3f}\n"
+            details += f"Макс. час: {load['Max_Hour']:.4f}\n"
+
         self.detail_text.insert(1.0, details)
         self.detail_text.config(state=tk.DISABLED)
 
@@ -866,16 +1243,18 @@ class PRGPipelineManager:
     def update_changes_display(self):
         """Обновление отображения изменений"""
         if self.changes:
-            self.changes_label.config(text=f"⚠️ Несохраненных изменений: {len(self.changes)}")
-            self.save_button.config(state=tk.NORMAL)
+            self.changes_label.config(text=f"⚠️ Несохраненных изменений: {len(self.changes)} "
+                                           f"(операций: {self.changes.operation_count})")
+            self.save_button.config(state=tk.DISABLED if self.is_loading() else tk.NORMAL)
         else:
             self.changes_label.config(text="")
 
     def update_button_states(self):
-        """Обновление состояния кнопок"""
-        has_data = bool(self.prg_data or self.consumer_data)
-        has_prg = self.selected_prg is not None
-        has_consumer = self.selected_consumer is not None
+        """Обновление состояния кнопок (во время загрузки действия с данными недоступны)"""
+        loading = self.is_loading()
+        has_data = bool(self.prg_data or self.consumer_data) and not loading
+        has_prg = self.selected_prg is not None and not loading
+        has_consumer = self.selected_consumer is not None and not loading
 
         # PRG-related buttons (require PRG selection)
         state = tk.NORMAL if has_prg else tk.DISABLED
@@ -1091,6 +1470,7 @@ class PRGPipelineManager:
                 skipped_count = 0
                 already_bound_count = 0
                 errors = []
+                bound_changes = []
 
                 for consumer in result_holder['consumers']:
                     result = self.binding_service.bind_single_consumer(
@@ -1103,8 +1483,8 @@ class PRGPipelineManager:
 
                     if result.success_count > 0:
                         success_count += 1
-                        for change in result.changes:
-                            self.changes[change['change_id']] = change
+                        self.changes.record_all(result.changes)
+                        bound_changes.extend(result.changes)
                     elif result.already_bound_count > 0:
                         already_bound_count += 1
                     else:
@@ -1113,7 +1493,8 @@ class PRGPipelineManager:
                             errors.extend(result.errors)
 
                 # Update UI
-                self.populate_consumer_tree()
+                self.refresh_consumer_rows(bound_changes)
+                self.refresh_prg_loads()
                 self.update_changes_display()
                 self.update_button_states()
 
@@ -1158,9 +1539,8 @@ class PRGPipelineManager:
             return
 
         # Count consumers with bindings
-        from prg.data.parsers import parse_prg_bindings
         bound_count = sum(1 for c in consumers_in_settlement.matches
-                         if parse_prg_bindings(c.get('code', '')))
+                         if self.data_store.bindings(c))
 
         if bound_count == 0:
             messagebox.showinfo(
@@ -1196,11 +1576,11 @@ class PRGPipelineManager:
             )
 
             # Add changes to tracking
-            for change in result.changes:
-                self.changes[change['change_id']] = change
+            self.changes.record_all(result.changes)
 
             # Update UI
-            self.populate_consumer_tree()
+            self.refresh_consumer_rows(result.changes)
+            self.refresh_prg_loads()
             self.update_changes_display()
             self.update_button_states()
 
@@ -1228,10 +1608,8 @@ class PRGPipelineManager:
             messagebox.showwarning("Предупреждение", "Выберите потребителя")
             return
 
-        from prg.data.parsers import parse_prg_bindings
-
         consumer_name = self.selected_consumer.get('name', self.selected_consumer.get('settlement', ''))
-        bindings = parse_prg_bindings(self.selected_consumer.get('code', ''))
+        bindings = self.data_store.bindings(self.selected_consumer)
 
         if not bindings:
             messagebox.showinfo(
@@ -1262,11 +1640,11 @@ class PRGPipelineManager:
             result = self.binding_service.unbind_single_consumer(self.selected_consumer)
 
             # Add changes to tracking
-            for change in result.changes:
-                self.changes[change['change_id']] = change
+            self.changes.record_all(result.changes)
 
             # Update UI
-            self.populate_consumer_tree()
+            self.refresh_consumer_rows(result.changes)
+            self.refresh_prg_loads()
             self.update_changes_display()
             self.update_button_states()
             self.update_detail_panel_consumer(self.selected_consumer)
@@ -1295,6 +1673,9 @@ class PRGPipelineManager:
 
     def calculate_prg_load(self):
         """Подсчитать нагрузку ПРГ"""
+        if self.warn_if_loading():
+            return
+
         if not self.prg_data or not self.consumer_data:
             messagebox.showwarning("Предупреждение", "Загрузите данные перед расчетом")
             return
@@ -1317,11 +1698,22 @@ class PRGPipelineManager:
 
             print("[INFO] Calculating PRG loads...")
 
-            # Calculate loads
+            # Calculate loads (the log is kept unless fast mode is on)
             result = self.calculation_service.calculate_prg_loads(
                 self.prg_data,
-                self.consumer_data
+                self.consumer_data,
+                record_details=not self.fast_calculation_var.get()
             )
+            self.last_calculation = result
+            codec_stats = self.data_store.binding_codec.get_stats()
+            print(f"[INFO] Binding codec: {codec_stats['parses']} parses, {codec_stats['hits']} hits")
+
+            self.calculation_service.reset_live_loads(result)
+
+            # Values in the sheet before this calculation (old values of the change records)
+            load_fields = ('QY_pop', 'QH_pop', 'QY_ind', 'QH_ind', 'Year_volume', 'Max_Hour')
+            previous_loads = {prg['id']: {field: prg.get(field, 0) for field in load_fields}
+                              for prg in self.prg_data}
 
             # Apply loads to PRG data and create change records
             updated_count = self.calculation_service.apply_loads_to_prg_data(
@@ -1334,6 +1726,7 @@ class PRGPipelineManager:
             total_hourly = sum(prg.get('Max_Hour', 0) for prg in self.prg_data)
 
             # Create change records for each PRG with updated loads
+            load_changes = []
             for prg in self.prg_data:
                 prg_id = prg['prg_id']
 
@@ -1362,17 +1755,20 @@ class PRGPipelineManager:
                                 'row': prg['excel_row'],
                                 'col': prg[col_key],
                                 'new_value': round(value, 4),
-                                'old_value': prg.get(field_name, 0),
+                                'old_value': previous_loads[prg['id']][field_name],
                                 'description': f"Нагрузка ПРГ {prg_id}: {field_name} = {value:.4f}"
                             }
-                            self.changes[change_id] = change
+                            load_changes.append(change)
+            self.changes.record_all(load_changes)
 
             # Update UI
-            self.populate_prg_tree()
+            self.calculation_service.pop_changed_live_prg_ids()
+            self.prg_rows.refresh(self.data_store.get_prg(record_id) for record_id, _ in self.prg_rows.rows())
             self.update_changes_display()
             self.update_button_states()
 
             print(f"[OK] Loads calculated for {updated_count} PRGs")
+            log_hint = "Журнал расчета: Инструменты → Журнал расчета\n\n" if result.details is not None else ""
 
             messagebox.showinfo(
                 "Расчет завершен",
@@ -1384,6 +1780,7 @@ class PRGPipelineManager:
                 f"Общая годовая нагрузка: {total_yearly:.2f}\n"
                 f"Общая часовая нагрузка: {total_hourly:.4f}\n\n"
                 f"Создано изменений: {len(self.changes)}\n\n"
+                f"{log_hint}"
                 f"Не забудьте сохранить изменения!"
             )
 
@@ -1395,6 +1792,9 @@ class PRGPipelineManager:
 
     def bind_by_search(self):
         """Привязать по умному поиску"""
+        if self.warn_if_loading():
+            return
+
         if not self.selected_prg:
             messagebox.showwarning("Предупреждение", "Сначала выберите ПРГ в дереве слева")
             return
@@ -1415,6 +1815,13 @@ class PRGPipelineManager:
                 self.selected_prg['settlement']
             )
 
+            # Live results while the street is typed (runs on the dialog's worker thread)
+            consumer_data = self.consumer_data
+
+            def live_search(district, settlement, street, fuzzy):
+                return self.search_service.smart_search_organizations(
+                    consumer_data, district, settlement, street, require_expenses=True, fuzzy=fuzzy)
+
             # Import and show smart search dialog
             from prg.ui.dialogs import SmartSearchDialog
             dialog = SmartSearchDialog(
@@ -1423,7 +1830,8 @@ class PRGPipelineManager:
                 settlements,
                 prg_ids,
                 self.selected_prg,
-                self.style_manager
+                self.style_manager,
+                search_callback=live_search
             )
 
             if dialog.result:
@@ -1433,7 +1841,8 @@ class PRGPipelineManager:
                     dialog.result['mo_district'],
                     dialog.result['settlement'],
                     dialog.result['street'],
-                    require_expenses=True
+                    require_expenses=True,
+                    fuzzy=dialog.result.get('fuzzy', False)
                 )
 
                 if search_result.total_count == 0:
@@ -1448,7 +1857,10 @@ class PRGPipelineManager:
                     return
 
                 # Show found organizations and ask for confirmation
-                found_names = "\n".join([f"  - {c['name']}" for c in search_result.matches[:10]])
+                found_names = "\n".join([
+                    f"  - {c['name']}" + (f" ({search_result.scores[c['id']]:.2f})"
+                                          if c['id'] in search_result.scores else "")
+                    for c in search_result.matches[:10]])
                 if search_result.total_count > 10:
                     found_names += f"\n  ... и еще {search_result.total_count - 10}"
 
@@ -1476,6 +1888,7 @@ class PRGPipelineManager:
                 success_count = 0
                 skipped_count = 0
                 errors = []
+                bound_changes = []
 
                 for consumer in search_result.matches:
                     result = self.binding_service.bind_single_consumer(
@@ -1488,15 +1901,16 @@ class PRGPipelineManager:
 
                     if result.success_count > 0:
                         success_count += 1
-                        for change in result.changes:
-                            self.changes[change['change_id']] = change
+                        self.changes.record_all(result.changes)
+                        bound_changes.extend(result.changes)
                     else:
                         skipped_count += 1
                         if result.errors:
                             errors.extend(result.errors)
 
                 # Update UI
-                self.populate_consumer_tree()
+                self.refresh_consumer_rows(bound_changes)
+                self.refresh_prg_loads()
                 self.update_changes_display()
                 self.update_button_states()
 
@@ -1520,6 +1934,9 @@ class PRGPipelineManager:
 
     def bind_manually(self):
         """Привязать вручную (принудительно)"""
+        if self.warn_if_loading():
+            return
+
         if not self.selected_prg:
             messagebox.showwarning("Предупреждение", "Сначала выберите ПРГ")
             return
@@ -1528,13 +1945,13 @@ class PRGPipelineManager:
             messagebox.showwarning("Предупреждение", "Выберите потребителя для ручной привязки")
             return
 
-        from prg.data.parsers import parse_prg_bindings, calculate_total_share
+        from prg.data.parsers import calculate_total_share
 
         prg_id = self.selected_prg['prg_id']
         consumer_name = self.selected_consumer.get('name', self.selected_consumer.get('settlement', ''))
 
         # Get current bindings
-        bindings = parse_prg_bindings(self.selected_consumer.get('code', ''))
+        bindings = self.data_store.bindings(self.selected_consumer)
         current_total = calculate_total_share(bindings)
         has_expenses = self.validation_service.has_expenses(self.selected_consumer)
 
@@ -1638,8 +2055,7 @@ class PRGPipelineManager:
 
                 if result.success_count > 0:
                     # Add changes to tracking
-                    for change in result.changes:
-                        self.changes[change['change_id']] = change
+                    self.changes.record_all(result.changes)
 
                     result_holder['success'] = True
                     dialog.destroy()
@@ -1691,7 +2107,8 @@ class PRGPipelineManager:
 
         if result_holder['success']:
             # Update UI
-            self.populate_consumer_tree()
+            self.consumer_rows.refresh([self.selected_consumer])
+            self.refresh_prg_loads()
             self.update_changes_display()
             self.update_button_states()
             self.update_detail_panel_consumer(self.selected_consumer)
@@ -1705,32 +2122,15 @@ class PRGPipelineManager:
 
     def auto_bind_all_prg(self):
         """Автоматическая привязка всех ПРГ"""
+        if self.warn_if_loading():
+            return
+
         if not self.prg_data or not self.consumer_data:
             messagebox.showwarning("Предупреждение", "Загрузите данные перед автопривязкой")
             return
 
         # Analyze what will be done
-        from prg.data.parsers import parse_prg_bindings
-
-        prg_to_process = []
-        for prg in self.prg_data:
-            mo = prg['mo']
-            settlement = prg['settlement']
-
-            # Find unbound consumers in this location
-            consumers_in_location = [
-                c for c in self.consumer_data
-                if c['mo'].strip().lower() == mo.strip().lower()
-                and c['settlement'].strip().lower() == settlement.strip().lower()
-                and not parse_prg_bindings(c.get('code', ''))  # Not bound
-                and self.validation_service.has_expenses(c)  # Has expenses
-            ]
-
-            if consumers_in_location:
-                prg_to_process.append({
-                    'prg': prg,
-                    'consumers': consumers_in_location
-                })
+        prg_to_process = self.binding_service.find_auto_bind_candidates(self.prg_data, self.consumer_data)
 
         if not prg_to_process:
             messagebox.showinfo(
@@ -1758,40 +2158,24 @@ class PRGPipelineManager:
             return
 
         try:
-            total_success = 0
-            total_skipped = 0
-            total_errors = 0
-
-            # Process each PRG
-            for item in prg_to_process:
-                prg = item['prg']
-                grs_id = prg.get('grs_id', '')
-                grs_name = self.validation_service.get_grs_name_by_id(self.grs_data, grs_id)
-
-                # Create dummy consumer for settlement binding
-                dummy_consumer = {
-                    'mo': prg['mo'],
-                    'settlement': prg['settlement']
-                }
-
-                result = self.binding_service.bind_prg_to_settlement(
-                    prg,
-                    dummy_consumer,
-                    self.consumer_data,
-                    grs_name,
-                    share=1.0
-                )
+            # Bind every PRG to its settlement in one batch
+            result = self.binding_service.bind_prgs_to_settlements(
+                [item['prg'] for item in prg_to_process],
+                self.consumer_data,
+                self.grs_data,
+                share=1.0
+            )
 
-                total_success += result.success_count
-                total_skipped += result.skipped_count + result.already_bound_count
-                total_errors += len(result.errors)
+            total_success = result.success_count
+            total_skipped = result.skipped_count + result.already_bound_count
+            total_errors = len(result.errors)
 
-                # Add changes to tracking
-                for change in result.changes:
-                    self.changes[change['change_id']] = change
+            # Add changes to tracking
+            self.changes.record_all(result.changes)
 
             # Update UI
-            self.populate_consumer_tree()
+            self.refresh_consumer_rows(result.changes)
+            self.refresh_prg_loads()
             self.update_changes_display()
             self.update_button_states()
 
@@ -1816,16 +2200,18 @@ class PRGPipelineManager:
 
     def edit_consumer_shares(self):
         """Редактировать доли потребителя"""
+        if self.warn_if_loading():
+            return
+
         if not self.selected_consumer:
             messagebox.showwarning("Предупреждение", "Сначала выберите потребителя")
             return
 
         # Get current bindings
-        code = self.selected_consumer.get('code', '')
-        from prg.data.parsers import parse_prg_bindings, calculate_total_share, format_prg_bindings
+        from prg.data.parsers import calculate_total_share, format_prg_bindings
         from datetime import datetime
 
-        bindings = parse_prg_bindings(code)
+        bindings = self.data_store.bindings(self.selected_consumer)
         total_share = calculate_total_share(bindings)
 
         consumer_name = self.selected_consumer.get('name', self.selected_consumer.get('settlement', ''))
@@ -1983,7 +2369,8 @@ class PRGPipelineManager:
                 # Format and save new bindings
                 old_code = self.selected_consumer.get('code', '')
                 new_code = format_prg_bindings(new_bindings)
-                self.selected_consumer['code'] = new_code
+                self.data_store.set_consumer_code(self.selected_consumer, new_code)
+                self.calculation_service.apply_binding_change(self.selected_consumer, old_code, new_code)
 
                 # Create change record
                 change_id = f"edit_shares_{self.selected_consumer['id']}_{datetime.now().timestamp()}"
@@ -1999,7 +2386,7 @@ class PRGPipelineManager:
                     'description': f"Редактирование долей: {consumer_name}"
                 }
 
-                self.changes[change_id] = change
+                self.changes.record(change)
                 result_holder['success'] = True
                 dialog.destroy()
 
@@ -2036,7 +2423,8 @@ class PRGPipelineManager:
 
         if result_holder['success']:
             # Update UI
-            self.populate_consumer_tree()
+            self.consumer_rows.refresh([self.selected_consumer])
+            self.refresh_prg_loads()
             self.update_changes_display()
             self.update_button_states()
             self.update_detail_panel_consumer(self.selected_consumer)
@@ -2054,12 +2442,11 @@ class PRGPipelineManager:
             messagebox.showwarning("Предупреждение", "Загрузите данные перед проверкой")
             return
 
-        from prg.data.parsers import parse_prg_bindings, calculate_total_share
+        from prg.data.parsers import calculate_total_share
 
         issues = []
         for consumer in self.consumer_data:
-            code = consumer.get('code', '')
-            bindings = parse_prg_bindings(code)
+            bindings = self.data_store.bindings(consumer)
 
             if bindings:
                 total_share = calculate_total_share(bindings)
@@ -2077,19 +2464,141 @@ class PRGPipelineManager:
 
         messagebox.showinfo("Проверка долей", message)
 
+    def toggle_fast_calculation(self):
+        """Переключение быстрого расчета (без журнала)"""
+        self.settings_manager.set_ui_preference('fast_calculation', self.fast_calculation_var.get())
+
+    def show_change_history(self):
+        """Просмотр истории несохраненных изменений по операциям"""
+        history = self.changes.history()
+        if not history:
+            messagebox.showinfo("История изменений", "Нет несохраненных изменений")
+            return
+
+        colors = self.style_manager.colors
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("История изменений")
+        dialog.geometry("900x600")
+        dialog.transient(self.root)
+        dialog.configure(bg=colors['bg'])
+
+        main_frame = tk.Frame(dialog, padx=20, pady=20, bg=colors['bg'])
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(main_frame, text=f"ИСТОРИЯ ИЗМЕНЕНИЙ ({len(history)} операций, "
+                                  f"{len(self.changes)} ячеек к сохранению)",
+                 font=('Segoe UI', 14, 'bold'), fg=colors['primary'],
+                 bg=colors['bg']).pack(pady=(0, 10))
+
+        text_frame = tk.Frame(main_frame, bg=colors['bg'])
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        history_text = tk.Text(text_frame, wrap=tk.NONE, font=('Consolas', 9),
+                               bg=colors['bg_panel'], fg=colors['text'])
+        history_scroll = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=history_text.yview,
+                                       style='Modern.Vertical.TScrollbar')
+        history_text.configure(yscrollcommand=history_scroll.set)
+        history_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        history_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        lines = []
+        for i, change in enumerate(history, 1):
+            sheet_name, row, col = ChangeJournal.cell_key(change)
+            pending = self.changes.get(sheet_name, row, col)
+            if pending is None:
+                status = "без изменений"
+            elif pending['change_id'] == change.get('change_id'):
+                status = "к сохранению"
+            else:
+                status = "перезаписано"
+            lines.append(f"{i}. [{status}] {sheet_name}!{index_to_col(col)}{row + 1}: "
+                         f"{change.get('description', '')} ('{change.get('old_value', '')}' → "
+                         f"'{change.get('new_value', '')}')")
+        history_text.insert(1.0, "\n".join(lines))
+        history_text.config(state=tk.DISABLED)
+
+        self.style_manager.create_button(main_frame, "Закрыть", dialog.destroy,
+                                         color='secondary').pack(side=tk.RIGHT, pady=(10, 0))
+
+    def show_calculation_log(self):
+        """Просмотр журнала последнего расчета (постранично)"""
+        details = self.last_calculation.details if self.last_calculation else None
+        if details is None:
+            messagebox.showinfo(
+                "Журнал расчета",
+                "Журнал недоступен.\n\n"
+                "Выполните расчет нагрузки ПРГ с выключенным быстрым расчетом."
+            )
+            return
+
+        colors = self.style_manager.colors
+        page_count = max(1, (len(details) + CALCULATION_LOG_PAGE_SIZE - 1) // CALCULATION_LOG_PAGE_SIZE)
+        state = {'page': 0}
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Журнал расчета")
+        dialog.geometry("900x600")
+        dialog.transient(self.root)
+        dialog.configure(bg=colors['bg'])
+
+        main_frame = tk.Frame(dialog, padx=20, pady=20, bg=colors['bg'])
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(main_frame, text=f"ЖУРНАЛ РАСЧЕТА ({len(details)} привязок)",
+                 font=('Segoe UI', 14, 'bold'), fg=colors['primary'],
+                 bg=colors['bg']).pack(pady=(0, 10))
+
+        text_frame = tk.Frame(main_frame, bg=colors['bg'])
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        log_text = tk.Text(text_frame, wrap=tk.NONE, font=('Consolas', 9),
+                           bg=colors['bg_panel'], fg=colors['text'])
+        log_scroll = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=log_text.yview,
+                                   style='Modern.Vertical.TScrollbar')
+        log_text.configure(yscrollcommand=log_scroll.set)
+        log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        log_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        nav_frame = tk.Frame(main_frame, bg=colors['bg'])
+        nav_frame.pack(fill=tk.X, pady=(10, 0))
+        page_label = tk.Label(nav_frame, font=('Segoe UI', 10), bg=colors['bg'], fg=colors['text'])
+
+        def show_page(page):
+            """Render only the lines of one page"""
+            state['page'] = max(0, min(page, page_count - 1))
+            start = state['page'] * CALCULATION_LOG_PAGE_SIZE
+            lines = details.render_page(start, CALCULATION_LOG_PAGE_SIZE)
+            log_text.config(state=tk.NORMAL)
+            log_text.delete(1.0, tk.END)
+            log_text.insert(1.0, "\n".join(f"{start + i + 1}. {line}" for i, line in enumerate(lines)))
+            log_text.config(state=tk.DISABLED)
+            page_label.config(text=f"Стр. {state['page'] + 1} из {page_count}")
+
+        self.style_manager.create_button(nav_frame, "◀ Назад", lambda: show_page(state['page'] - 1),
+                                         color='secondary').pack(side=tk.LEFT)
+        page_label.pack(side=tk.LEFT, padx=15)
+        self.style_manager.create_button(nav_frame, "Вперед ▶", lambda: show_page(state['page'] + 1),
+                                         color='secondary').pack(side=tk.LEFT)
+        self.style_manager.create_button(nav_frame, "Закрыть", dialog.destroy,
+                                         color='secondary').pack(side=tk.RIGHT)
+
+        show_page(0)
+
     def show_unbound_analysis(self):
         """Показать анализ непривязанных элементов"""
         if not self.prg_data or not self.consumer_data:
             messagebox.showwarning("Предупреждение", "Загрузите данные перед анализом")
             return
 
-        unbound_prg = self.validation_service.find_unbound_prg(self.prg_data, self.consumer_data)
+        unbound_prg, settlement_counts = self.validation_service.analyze_prg_coverage(
+            self.prg_data, self.consumer_data)
         unbound_consumers = self.validation_service.find_unbound_consumers(self.consumer_data)
+        empty_settlements = {location_key(prg['mo'], prg['settlement']) for prg in unbound_prg}
 
         message = f"""📊 АНАЛИЗ НЕПРИВЯЗАННЫХ ЭЛЕМЕНТОВ
 
-🏭 ПРГ без потребителей: {len(unbound_prg)}
+🏭 ПРГ без потребителей: {len(unbound_prg)} (НП без потребителей: {len(empty_settlements)})
 👥 Потребители без ПРГ: {len(unbound_consumers)}
+🏘 НП с потребителями: {len(settlement_counts)}
 
 Используйте кнопки привязки для добавления связей."""
 
@@ -2125,9 +2634,13 @@ class PRGPipelineManager:
     def on_close_window(self):
         """Обработка закрытия окна"""
         if self.changes:
+            journal_hint = ("Без сохранения изменения останутся в журнале и будут\n"
+                            "предложены к восстановлению при следующем открытии файла.\n\n"
+                            if self.change_wal is not None and self.change_wal.is_open else "")
             response = messagebox.askyesnocancel(
                 "Несохраненные изменения",
                 f"У вас есть {len(self.changes)} несохраненных изменений.\n\n"
+                f"{journal_hint}"
                 "Сохранить перед выходом?"
             )
 
@@ -2136,6 +2649,13 @@ class PRGPipelineManager:
             elif response:  # Yes
                 self.save_changes_to_excel()
 
+        # Stop background loading (the worker thread is a daemon)
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+
+        if self.change_wal is not None:
+            self.change_wal.close()
+
         # Save window geometry and theme preference
         geometry = self.root.geometry()
         self.settings_manager.set_ui_preference('window_geometry', geometry)
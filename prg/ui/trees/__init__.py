@@ -0,0 +1,8 @@
+"""Tree components for PRG Pipeline Manager."""
+
+from .lazy_tree import LazyTree, DEFAULT_ROW_BUDGET
+
+__all__ = [
+    'LazyTree',
+    'DEFAULT_ROW_BUDGET',
+]
@@ -0,0 +1,204 @@
+"""Treeview filling that inserts children only when their parent is opened."""
+
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple, Callable, Optional, Iterable, Iterator
+
+# Display row of a record: (text, values, tags)
+RowSpec = Tuple[str, tuple, tuple]
+
+# District -> settlement -> records, in display order
+TreeStructure = List[Tuple[str, List[Tuple[str, List[Dict[str, Any]]]]]]
+
+# Inserted rows kept before children of collapsed nodes are dropped
+DEFAULT_ROW_BUDGET = 20000
+
+# Tag of the dummy child that gives unopened nodes their expand arrow
+PLACEHOLDER_TAG = '__lazy_placeholder__'
+
+
+class LazyTree:
+    """
+    Fills a ttk.Treeview with district -> settlement -> record rows lazily.
+
+    Only district nodes are inserted up front. Settlement nodes are inserted
+    when a district is opened, record rows when a settlement is opened
+    (<<TreeviewOpen>>). Until then a node has a single placeholder child.
+
+    When more than row_budget rows are inserted, the children of the least
+    recently opened nodes that are no longer visible (collapsed themselves or
+    under a collapsed node) are deleted and replaced by a placeholder again,
+    so they are rebuilt from the current records when reopened. Nodes on the
+    path to the selection are kept.
+
+    Record rows keep tags=(record id,), and the item of every inserted
+    record row can be looked up by record id.
+    """
+
+    def __init__(self, tree, make_row: Callable[[Dict[str, Any]], RowSpec],
+                 row_budget: int = DEFAULT_ROW_BUDGET):
+        """
+        Initialize lazy filling of a treeview.
+
+        Args:
+            tree: ttk.Treeview (the <<TreeviewOpen>> binding is added)
+            make_row: Function record -> (text, values, tags) of its row
+            row_budget: Inserted rows kept before collapsed nodes are emptied
+        """
+        self.tree = tree
+        self.make_row = make_row
+        self.row_budget = row_budget
+        self.row_count = 0
+        self._children: Dict[str, list] = {}   # node -> settlements or records to insert on open
+        self._loaded: 'OrderedDict[str, int]' = OrderedDict()  # opened node -> inserted rows, oldest first
+        self._items: Dict[Any, str] = {}        # record id -> row item
+        self._records: Dict[str, Any] = {}      # row item -> record id
+        tree.bind('<<TreeviewOpen>>', self._on_open, add='+')
+
+    def populate(self, structure: TreeStructure):
+        """
+        Replace the tree content, inserting district nodes only.
+
+        Args:
+            structure: [(district text, [(settlement text, records)])]
+        """
+        self.clear()
+        for district_text, settlements in structure:
+            node = self.tree.insert('', 'end', text=district_text, values=('', '', ''))
+            self._set_placeholder(node, settlements)
+
+    def clear(self):
+        """Delete all rows."""
+        self.tree.delete(*self.tree.get_children())
+        self._children.clear()
+        self._loaded.clear()
+        self._items.clear()
+        self._records.clear()
+        self.row_count = 0
+
+    def expand(self, node: str):
+        """
+        Insert the children of a node if they are not inserted yet.
+
+        Args:
+            node: Treeview item of a district or settlement
+        """
+        if node in self._loaded:
+            self._loaded.move_to_end(node)
+            return
+        children = self._children.get(node)
+        if children is None:
+            return
+
+        self.tree.delete(*self.tree.get_children(node))
+        for child in children:
+            if isinstance(child, tuple):
+                settlement_text, records = child
+                settlement_node = self.tree.insert(node, 'end', text=settlement_text, values=('', '', ''))
+                self._set_placeholder(settlement_node, records)
+            else:
+                text, values, tags = self.make_row(child)
+                item = self.tree.insert(node, 'end', text=text, values=values, tags=tags)
+                self._items[child['id']] = item
+                self._records[item] = child['id']
+
+        self._loaded[node] = len(children)
+        self.row_count += len(children)
+        self.trim(keep=node)
+
+    def trim(self, keep: Optional[str] = None):
+        """
+        Empty hidden nodes, least recently opened first, until the budget is met.
+
+        Args:
+            keep: Node that must stay filled (with its ancestors)
+        """
+        if self.row_count <= self.row_budget:
+            return
+
+        protected = set()
+        for item in list(self.tree.selection()) + ([keep] if keep else []):
+            while item:
+                protected.add(item)
+                item = self.tree.parent(item)
+
+        for node in list(self._loaded):
+            if self.row_count <= self.row_budget:
+                break
+            if node in self._loaded and node not in protected and not self._is_visible(node):
+                self._unload(node)
+
+    def refresh(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Rebuild the rows of records in place.
+
+        Records without an inserted row are skipped; their rows are built
+        from the current records when their settlement is opened.
+
+        Args:
+            records: Records whose display changed
+
+        Returns:
+            Number of refreshed rows
+        """
+        refreshed = 0
+        for record in records:
+            item = self._items.get(record['id'])
+            if item is None:
+                continue
+            text, values, tags = self.make_row(record)
+            self.tree.item(item, text=text, values=values, tags=tags)
+            refreshed += 1
+        return refreshed
+
+    def item_for(self, record_id: Any) -> Optional[str]:
+        """
+        Get the row item of a record.
+
+        Args:
+            record_id: Record 'id'
+
+        Returns:
+            Treeview item, or None if the row is not inserted
+        """
+        return self._items.get(record_id)
+
+    def rows(self) -> Iterator[Tuple[Any, str]]:
+        """Inserted record rows as (record id, item) pairs."""
+        return iter(list(self._items.items()))
+
+    def _on_open(self, event):
+        """Fill the node being opened (it has the focus)."""
+        node = self.tree.focus()
+        if node:
+            self.expand(node)
+
+    def _set_placeholder(self, node: str, children: list):
+        """Remember the children of a node and give it a placeholder child."""
+        self._children[node] = children
+        if children:
+            self.tree.insert(node, 'end', text='…', values=('', '', ''), tags=(PLACEHOLDER_TAG,))
+
+    def _unload(self, node: str):
+        """Delete the inserted children of a node, leaving a placeholder."""
+        self._forget_children(node)
+        self.tree.delete(*self.tree.get_children(node))
+        self.tree.insert(node, 'end', text='…', values=('', '', ''), tags=(PLACEHOLDER_TAG,))
+
+    def _forget_children(self, node: str):
+        """Drop bookkeeping of everything inserted below a node."""
+        self.row_count -= self._loaded.pop(node, 0)
+        for child in self.tree.get_children(node):
+            record_id = self._records.pop(child, None)
+            if record_id is not None:
+                self._items.pop(record_id, None)
+            elif child in self._children:
+                self._forget_children(child)
+                del self._children[child]
+
+    def _is_visible(self, node: str) -> bool:
+        """True if the node and all its ancestors are open."""
+        while node:
+            if not self.tree.tk.getboolean(self.tree.item(node, 'open')):
+                return False
+            node = self.tree.parent(node)
+        return True
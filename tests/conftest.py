@@ -0,0 +1,6 @@
+"""Make the prg package importable when pytest runs from the repository root."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
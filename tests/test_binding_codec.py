@@ -0,0 +1,158 @@
+"""BindingCodec decoding against the original per-call parsers."""
+
+import pandas as pd
+import pytest
+
+from prg.business import CalculationService, ValidationService
+from prg.data import (BindingCodec, BINDING_CODEC, DataStore, intern_string_column, parse_share_from_excel,
+                      parse_prg_bindings, format_prg_bindings)
+from prg.data.binding_codec import SHARED_CODEC_MAX_ENTRIES
+from prg.models import PRGBinding
+from benchmarks.synthetic_workbook import build_records
+
+CODES = [
+    '',
+    '   ',
+    'ПРГ-1|1|ГРС Станция 1',
+    'ПРГ-1|0,5|ГРС Станция 1;ПРГ-2|0.5|ГРС Станция 2',
+    ' ПРГ-3 | 0,25 | ГРС | с чертой ;',
+    'ПРГ-4|abc|ГРС',
+    'ПРГ-5||ГРС',
+    'ПРГ-6|1;;ПРГ-7|1|ГРС 7',
+    'только текст',
+]
+
+
+def reference_parse(binding_string):
+    """Previous parse_prg_bindings: a fresh list of dicts per call."""
+    if not binding_string or binding_string.strip() == '':
+        return []
+    bindings = []
+    for part in binding_string.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        components = part.split('|')
+        if len(components) >= 3:
+            bindings.append({
+                'prg_id': components[0].strip(),
+                'share': parse_share_from_excel(components[1].strip()),
+                'grs_name': '|'.join(components[2:]).strip()
+            })
+    return bindings
+
+
+def reference_split_colon(binding_str):
+    """Previous PRGBinding.from_string."""
+    parts = binding_str.split(':')
+    if len(parts) < 2:
+        raise ValueError(binding_str)
+    return parts[0].strip(), float(parts[1].strip()), parts[2].strip() if len(parts) > 2 else ""
+
+
+@pytest.mark.parametrize('code', CODES)
+def test_decode_equals_reference_parse(code):
+    assert BindingCodec().decode(code) == reference_parse(code)
+
+
+def test_decode_none_is_empty():
+    assert BindingCodec().decode(None) == []
+
+
+def test_equal_strings_share_one_decoded_result():
+    codec = BindingCodec()
+    first = codec.decode('ПРГ-1|0,5|ГРС 1;ПРГ-2|0,5|ГРС 2')
+    second = codec.decode(''.join(['ПРГ-1|0,5|ГРС 1;', 'ПРГ-2|0,5|ГРС 2']))
+
+    assert second is first
+    assert codec.get_stats()['parses'] == 1 and codec.get_stats()['hits'] == 1
+
+
+def test_parts_are_interned():
+    codec = BindingCodec()
+    a = codec.decode('ПРГ-1|1|ГРС 1')
+    b = codec.decode('ПРГ-2|1|ГРС 1;ПРГ-1|0,5|ГРС 1')
+
+    assert b[0]['grs_name'] is a[0]['grs_name']
+    assert b[1]['prg_id'] is a[0]['prg_id']
+
+
+@pytest.mark.parametrize('code', [code.replace('|', ':').replace(',', '.') for code in CODES[2:4]]
+                         + ['ПРГ-1:0.5', 'ПРГ-1:x:ГРС;ПРГ-2:1', 'без двоеточия;ПРГ-3:0.1:ГРС'])
+def test_decode_colon_equals_model_parser(code):
+    expected = []
+    for part in code.split(';'):
+        if part.strip():
+            try:
+                expected.append(PRGBinding(*reference_split_colon(part.strip())))
+            except ValueError:
+                continue
+    assert PRGBinding.parse_bindings(code) == expected
+
+
+def test_split_colon_rejects_invalid_bindings():
+    codec = BindingCodec()
+    with pytest.raises(ValueError):
+        codec.split_colon('ПРГ-1')
+    with pytest.raises(ValueError):
+        codec.split_colon('ПРГ-1:доля')
+
+
+def test_format_and_parse_round_trip():
+    bindings = [{'prg_id': 'ПРГ-1', 'share': 0.5, 'grs_name': 'ГРС 1'},
+                {'prg_id': 'ПРГ-2', 'share': 1.0, 'grs_name': 'ГРС 2'}]
+    assert parse_prg_bindings(format_prg_bindings(bindings)) == bindings
+
+
+def test_interned_column_keeps_values_and_shares_objects():
+    # Separate string objects per row, as pandas returns them
+    per_row = [value.encode().decode() for value in ['ПРГ-1|1|ГРС'] * 3 + ['ПРГ-2|1|ГРС']]
+    interned = intern_string_column(pd.Series(per_row, dtype=object)).tolist()
+
+    assert interned == per_row
+    assert interned[0] is interned[1] is interned[2]
+
+
+def test_bounded_codec_empties_full_tables():
+    codec = BindingCodec(max_entries=3)
+    codes = [f"ПРГ-{i}|1|ГРС {i}" for i in range(10)]
+    for code in codes:
+        assert codec.decode(code) == reference_parse(code)
+
+    stats = codec.get_stats()
+    assert stats['codes'] <= 3 and stats['strings'] <= 3
+    assert codec.decode(codes[-1]) is codec.decode(codes[-1])
+
+
+def test_shared_codec_is_bounded():
+    assert BINDING_CODEC.max_entries == SHARED_CODEC_MAX_ENTRIES
+
+
+def test_data_store_load_starts_a_new_codec():
+    consumers = [{'id': f"c_{i}", 'mo': 'Район', 'settlement': 'НП', 'code': f"ПРГ-{i}|1|ГРС"}
+                 for i in range(5)]
+    store = DataStore([], [], consumers)
+    for consumer in consumers:
+        store.bindings(consumer)
+    first_codec = store.binding_codec
+
+    store.load([], [], consumers[:1])
+
+    assert store.binding_codec is not first_codec
+    assert store.binding_codec.get_stats()['codes'] == 0
+    assert store.bindings(consumers[0]) == reference_parse(consumers[0]['code'])
+
+
+def test_services_with_store_equal_services_without():
+    data = build_records(n_prg=40, n_grs=4, n_population=800, n_organizations=200, n_settlements=30)
+    prg_data, consumers = data['prg'], data['consumers']
+    store = DataStore(prg_data, data['grs'], consumers)
+    plain_validation, store_validation = ValidationService(), ValidationService(store)
+
+    plain = CalculationService(plain_validation).calculate_prg_loads(prg_data, consumers)
+    indexed = CalculationService(store_validation, store).calculate_prg_loads(prg_data, consumers)
+
+    assert indexed.prg_loads == plain.prg_loads
+    assert (store_validation.find_unbound_consumers(consumers)
+            == plain_validation.find_unbound_consumers(consumers))
+    assert [store.bindings(c) for c in consumers] == [parse_prg_bindings(c['code']) for c in consumers]
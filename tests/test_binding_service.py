@@ -0,0 +1,92 @@
+"""Settlement-grouped batch binding of BindingService against per-PRG binding."""
+
+import copy
+
+import pytest
+
+from prg.business import BindingService, ValidationService
+from prg.data import DataStore, parse_prg_bindings
+from benchmarks.synthetic_workbook import build_records
+
+
+def reference_candidates(validation, prg_data, consumers):
+    """auto_bind_all_prg candidates as a scan over all consumers per PRG."""
+    prg_to_process = []
+    for prg in prg_data:
+        in_location = [
+            c for c in consumers
+            if c['mo'].strip().lower() == prg['mo'].strip().lower()
+            and c['settlement'].strip().lower() == prg['settlement'].strip().lower()
+            and not parse_prg_bindings(c.get('code', ''))
+            and validation.has_expenses(c)
+        ]
+        if in_location:
+            prg_to_process.append({'prg': prg, 'consumers': in_location})
+    return prg_to_process
+
+
+def reference_bind(service, validation, prgs, consumers, grs_data):
+    """bind_prg_to_settlement() per PRG, results added up."""
+    totals = [0, 0, 0, 0]
+    changes = []
+    for prg in prgs:
+        grs_name = validation.get_grs_name_by_id(grs_data, prg.get('grs_id', ''))
+        result = service.bind_prg_to_settlement(
+            prg, {'mo': prg['mo'], 'settlement': prg['settlement']}, consumers, grs_name, share=1.0)
+        totals[0] += result.success_count
+        totals[1] += result.skipped_count
+        totals[2] += result.already_bound_count
+        totals[3] += len(result.errors)
+        changes.extend(result.changes)
+    return totals, changes
+
+
+def without_ids(changes):
+    return [{k: v for k, v in change.items() if k != 'change_id'} for change in changes]
+
+
+@pytest.fixture
+def data():
+    records = build_records(n_prg=60, n_grs=5, n_population=1500, n_organizations=300, n_settlements=40)
+    # Some PRGs share a settlement, some settlements have no PRG
+    records['prg'] += [dict(prg, id=f"{prg['id']}_b", prg_id=f"{prg['prg_id']}Б") for prg in records['prg'][:10]]
+    return records
+
+
+@pytest.mark.parametrize('with_store', [False, True])
+def test_batch_auto_bind_equals_per_prg_binding(data, with_store):
+    validation = ValidationService()
+    reference = BindingService(validation)
+    ref_consumers = copy.deepcopy(data['consumers'])
+    ref_candidates = reference_candidates(validation, data['prg'], ref_consumers)
+    ref_totals, ref_changes = reference_bind(
+        reference, validation, [c['prg'] for c in ref_candidates], ref_consumers, data['grs'])
+
+    store = DataStore(data['prg'], data['grs'], data['consumers']) if with_store else None
+    service = BindingService(ValidationService(store), store)
+    candidates = service.find_auto_bind_candidates(data['prg'], data['consumers'])
+    result = service.bind_prgs_to_settlements([c['prg'] for c in candidates], data['consumers'], data['grs'])
+
+    assert [c['prg'] for c in candidates] == [c['prg'] for c in ref_candidates]
+    assert [c['consumers'] for c in candidates] == [c['consumers'] for c in ref_candidates]
+    assert [result.success_count, result.skipped_count, result.already_bound_count,
+            len(result.errors)] == ref_totals
+    assert without_ids(result.changes) == without_ids(ref_changes)
+    assert [c['code'] for c in data['consumers']] == [c['code'] for c in ref_consumers]
+
+
+def test_unbind_entire_settlement_merges_consumer_results(data):
+    consumers = data['consumers']
+    target = next(c for c in consumers if c['code'])
+    in_settlement = [c for c in consumers
+                     if (c['mo'], c['settlement']) == (target['mo'], target['settlement'])]
+    bound = [c for c in in_settlement if c['code']]
+
+    result = BindingService().unbind_entire_settlement(target, consumers)
+
+    assert result.operation_type == 'unbind_settlement'
+    assert result.success_count == len(bound)
+    assert result.skipped_count == len(in_settlement) - len(bound)
+    assert [change['consumer_id'] for change in result.changes] == [c['id'] for c in bound]
+    assert len(result.details) == result.skipped_count
+    assert all(not c['code'] for c in in_settlement)
@@ -0,0 +1,71 @@
+"""Structured calculation log (CalculationDetails) and its fast-mode opt-out."""
+
+import pytest
+
+from prg.business import CalculationService, ValidationService
+
+
+def consumer(name, code, expenses=10.0, consumer_type='Население'):
+    record = {'id': name or 'noname', 'type': consumer_type, 'mo': 'Район', 'settlement': 'НП',
+              'code': code, 'expenses': expenses, 'hourly_expenses': 1.0}
+    if name:
+        record['name'] = name
+    return record
+
+
+@pytest.fixture
+def consumers():
+    return [
+        consumer('Первый', 'ПРГ-1|0,5|ГРС;ПРГ-2|0,5|ГРС'),
+        consumer('Без привязки', ''),
+        consumer('Без расходов', 'ПРГ-1|1|ГРС', expenses=0.0),
+        consumer('', 'ПРГ-2|0,25|ГРС', consumer_type='Организация'),
+    ]
+
+
+@pytest.fixture
+def details(consumers):
+    return CalculationService(ValidationService()).calculate_prg_loads([], consumers).details
+
+
+def test_entries_point_into_the_consumer_list(details, consumers):
+    assert len(details) == 3
+    assert details.consumer_data is consumers
+    assert details[0] == (0, 'ПРГ-1', 0.5, 5.0, 0.5)
+    assert details[1] == (0, 'ПРГ-2', 0.5, 5.0, 0.5)
+    assert details[2] == (3, 'ПРГ-2', 0.25, 2.5, 0.25)
+    assert details[-1] == details[2]
+
+
+def test_index_out_of_range(details):
+    with pytest.raises(IndexError):
+        details[3]
+    with pytest.raises(IndexError):
+        details[-4]
+
+
+def test_render(details):
+    assert details.render(0) == "Первый (тип: Население) -> ПРГ ПРГ-1: доля 0.500, годовая 5.000, часовая 0.500"
+    assert details.render(2) == "Unknown (тип: Организация) -> ПРГ ПРГ-2: доля 0.250, годовая 2.500, часовая 0.250"
+
+
+def test_render_page_bounds(details):
+    lines = [details.render(index) for index in range(len(details))]
+
+    assert details.render_page(0, 100) == lines
+    assert details.render_page(1, 1) == lines[1:2]
+    assert details.render_page(2, 5) == lines[2:]
+    assert details.render_page(-5, 6) == lines[:1]
+    assert details.render_page(3, 10) == []
+    assert details.render_page(0, 0) == []
+
+
+def test_fast_mode_keeps_no_log(consumers):
+    service = CalculationService(ValidationService())
+
+    fast = service.calculate_prg_loads([], consumers, record_details=False)
+    full = service.calculate_prg_loads([], consumers)
+
+    assert fast.details is None
+    assert fast.prg_loads == full.prg_loads
+    assert fast.processed_bindings == full.processed_bindings == len(full.details)
@@ -0,0 +1,89 @@
+"""Coalescing rules of ChangeJournal."""
+
+from prg.data import ChangeJournal
+
+
+def change(new_value, old_value='', row=5, col=12, sheet_name='Население', **fields):
+    return dict(sheet_name=sheet_name, row=row, col=col, new_value=new_value, old_value=old_value, **fields)
+
+
+def test_entry_keeps_first_old_value_and_latest_new_value():
+    journal = ChangeJournal()
+    journal.record(change('A', old_value='orig', description='first'))
+    journal.record(change('B', old_value='A', description='second'))
+
+    entry = journal.get('Население', 5, 12)
+    assert entry['old_value'] == 'orig'
+    assert entry['new_value'] == 'B'
+    assert entry['description'] == 'second'
+    assert entry['operations'] == 2
+    assert len(journal) == 1
+    assert journal.operation_count == 2
+
+
+def test_cell_back_to_original_value_is_dropped():
+    journal = ChangeJournal()
+    journal.record(change('A', old_value='orig'))
+    assert journal.record(change('orig', old_value='A')) is None
+
+    assert journal.get('Население', 5, 12) is None
+    assert not journal
+    assert len(journal.history()) == 2
+
+
+def test_cells_are_kept_apart():
+    journal = ChangeJournal()
+    journal.record_all([change('A'), change('B', col=13), change('C', sheet_name='ПРГ')])
+
+    assert [entry['new_value'] for entry in journal.values()] == ['A', 'B', 'C']
+    assert [c['new_value'] for c in journal.history('Население', 5, 13)] == ['B']
+
+
+def test_empty_string_and_none_are_the_same_empty_cell():
+    assert ChangeJournal.same_value('', None)
+    assert ChangeJournal.same_value(None, '')
+    assert not ChangeJournal.same_value('', 0)
+    assert not ChangeJournal.same_value('x', None)
+
+    journal = ChangeJournal()
+    assert journal.record(change(None, old_value='')) is None
+
+
+def test_int_and_float_compare_by_value():
+    assert ChangeJournal.same_value(1, 1.0)
+    assert ChangeJournal.same_value(2.5, 2.5)
+    assert not ChangeJournal.same_value(1, 1.5)
+    assert not ChangeJournal.same_value('1', 1)
+
+    journal = ChangeJournal()
+    journal.record(change(3.5, old_value=2))
+    assert journal.record(change(2.0, old_value=3.5)) is None
+
+
+def test_discard_sheets_drops_entries_and_history():
+    journal = ChangeJournal()
+    journal.record_all([change('A'), change('B', sheet_name='ПРГ')])
+
+    assert journal.discard_sheets(['Население']) == 1
+    assert [entry['sheet_name'] for entry in journal] == ['ПРГ']
+    assert [c['sheet_name'] for c in journal.history()] == ['ПРГ']
+
+
+def test_restore_does_not_append_to_the_wal():
+    class RecordingWAL:
+        def __init__(self):
+            self.appended, self.syncs = [], 0
+
+        def append(self, change):
+            self.appended.append(change)
+
+        def sync(self):
+            self.syncs += 1
+
+    wal = RecordingWAL()
+    journal = ChangeJournal(wal)
+    journal.restore([change('A')])
+    assert wal.appended == [] and len(journal) == 1
+
+    journal.record_all([change('B'), change('C', col=1)])
+    assert len(wal.appended) == 2 and wal.syncs == 1
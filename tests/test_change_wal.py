@@ -0,0 +1,155 @@
+"""Crash recovery of ChangeWAL journals."""
+
+import json
+import os
+
+import pytest
+
+from prg.data import ChangeJournal, ChangeWAL
+from prg.data import change_wal
+
+
+def make_changes(count):
+    return [{'sheet_name': 'Население', 'row': 10 + i, 'col': 12,
+             'new_value': f"ПРГ-{i}|1|ГРС", 'old_value': ''} for i in range(count)]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / 'workbook.xlsx'
+    path.write_bytes(b'workbook bytes' * 100)
+    return path
+
+
+@pytest.fixture
+def wal(tmp_path):
+    return ChangeWAL(tmp_path / 'journal')
+
+
+def write_journal(wal, workbook, changes):
+    wal.start(workbook)
+    for change in changes:
+        wal.append(change)
+    wal.close()
+    return wal._journal_path(workbook)
+
+
+def test_read_replays_appended_changes(wal, workbook):
+    changes = make_changes(3)
+    write_journal(wal, workbook, changes)
+
+    pending = wal.read(workbook)
+    assert pending['changes'] == changes
+    assert pending['matches_workbook']
+
+
+def test_read_without_journal(wal, workbook):
+    assert wal.read(workbook) is None
+
+
+def test_torn_last_line_is_dropped(wal, workbook):
+    changes = make_changes(3)
+    journal_path = write_journal(wal, workbook, changes)
+    with open(journal_path, 'r+b') as f:
+        f.truncate(journal_path.stat().st_size - 5)
+
+    assert wal.read(workbook)['changes'] == changes[:2]
+
+
+def test_corrupt_line_ends_the_replay(wal, workbook):
+    changes = make_changes(3)
+    journal_path = write_journal(wal, workbook, changes)
+    lines = journal_path.read_bytes().splitlines(keepends=True)
+    lines[2] = lines[2].replace(b'"row":11', b'"row":77')  # second change: checksum no longer matches
+    journal_path.write_bytes(b''.join(lines))
+
+    assert wal.read(workbook)['changes'] == changes[:1]
+
+
+def test_resume_truncates_torn_tail_before_appending(wal, workbook):
+    changes = make_changes(3)
+    journal_path = write_journal(wal, workbook, changes[:2])
+    with open(journal_path, 'ab') as f:
+        f.write(b'0badc0de {"row": 1')
+
+    wal.resume(workbook)
+    assert wal.is_open_for(workbook)
+    wal.append(changes[2])
+    wal.close()
+    assert wal.read(workbook)['changes'] == changes
+
+
+def test_resume_without_readable_journal_starts_a_new_one(wal, workbook):
+    journal_path = wal._journal_path(workbook)
+    journal_path.parent.mkdir(parents=True)
+    journal_path.write_bytes(b'garbage')
+
+    wal.resume(workbook)
+    wal.append(make_changes(1)[0])
+    wal.close()
+    assert wal.read(workbook)['changes'] == make_changes(1)
+
+
+def test_journal_of_another_format_is_ignored(wal, workbook):
+    journal_path = write_journal(wal, workbook, make_changes(2))
+    lines = journal_path.read_bytes().splitlines(keepends=True)
+    header = json.loads(lines[0][9:])
+    header['format'] = change_wal.WAL_FORMAT + 1
+    lines[0] = ChangeWAL._encode_line(header)
+    journal_path.write_bytes(b''.join(lines))
+
+    assert wal.read(workbook) is None
+
+
+def test_matches_workbook_after_touch_with_same_content(wal, workbook):
+    write_journal(wal, workbook, make_changes(1))
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    # mtime differs, the content hash still matches
+    assert wal.read(workbook)['matches_workbook']
+
+
+def test_workbook_changed_with_same_size(wal, workbook):
+    write_journal(wal, workbook, make_changes(1))
+    stat = workbook.stat()
+    data = bytearray(workbook.read_bytes())
+    data[0] ^= 1
+    workbook.write_bytes(bytes(data))
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert not wal.read(workbook)['matches_workbook']
+
+
+def test_workbook_changed_size(wal, workbook):
+    write_journal(wal, workbook, make_changes(1))
+    with open(workbook, 'ab') as f:
+        f.write(b'more')
+
+    assert not wal.read(workbook)['matches_workbook']
+
+
+def test_start_replaces_previous_journal_with_given_changes(wal, workbook):
+    write_journal(wal, workbook, make_changes(3))
+    wal.start(workbook, make_changes(1))
+    wal.close()
+
+    assert wal.read(workbook)['changes'] == make_changes(1)
+
+
+def test_journaled_operations_restore_the_pending_cells(wal, workbook):
+    operations = [make_changes(3), make_changes(1), [dict(c, new_value='') for c in make_changes(2)]]
+    wal.start(workbook)
+    journal = ChangeJournal(wal)
+    for operation in operations:
+        journal.record_all(operation)
+    wal.close()
+
+    pending = wal.read(workbook)
+    restored = ChangeJournal()
+    restored.restore(pending['changes'])
+
+    assert pending['changes'] == [change for operation in operations for change in operation]
+    assert wal.get_stats()['syncs'] == len(operations)
+    assert [entry['new_value'] for entry in restored] == [entry['new_value'] for entry in journal]
+    assert len(restored) == 1  # cells set and cleared again are no longer pending
@@ -0,0 +1,235 @@
+"""Indexes of DataStore and their upkeep on binding changes and reloads."""
+
+import pytest
+
+from prg.business import BindingService, SearchService, ValidationService
+from prg.data import DataStore, location_key, consumer_bindings, parse_prg_bindings
+from benchmarks.synthetic_workbook import build_records
+
+
+def prg(number, mo='Район', settlement='НП 1', grs_id='1'):
+    return {'id': f"prg_{number}", 'prg_id': f"ПРГ-{number}", 'mo': mo, 'settlement': settlement,
+            'grs_id': grs_id}
+
+
+def consumer(number, code='', mo='Район', settlement='НП 1', consumer_type='Население', name=''):
+    return {'id': f"c_{number}", 'type': consumer_type, 'mo': mo, 'settlement': settlement,
+            'code': code, 'name': name}
+
+
+@pytest.fixture
+def records():
+    prg_data = [prg(1), prg(2, settlement='НП 2', grs_id='2'), prg(3, mo=' район ', settlement='нп 1 ')]
+    grs_data = [{'id': 'grs_1', 'grs_id': '1'}, {'id': 'grs_2', 'grs_id': '2'}]
+    consumer_data = [
+        consumer(1, 'ПРГ-1|1|ГРС'),
+        consumer(2, 'ПРГ-1|0,5|ГРС;ПРГ-2|0,5|ГРС', consumer_type='Организация', name='ООО "Ромашка"'),
+        consumer(3, settlement='НП 2'),
+        consumer(4, 'ПРГ-2|1|ГРС', mo='РАЙОН', settlement=' нп 1'),
+        consumer(5, 'ПРГ-1|1|ГРС'),
+    ]
+    return prg_data, grs_data, consumer_data
+
+
+@pytest.fixture
+def store(records):
+    return DataStore(*records)
+
+
+def ids(found):
+    return [record['id'] for record in found]
+
+
+def test_location_key_normalizes_case_and_spaces():
+    assert location_key(' Район ', 'НП 1') == location_key('район', 'нп 1 ') == ('район', 'нп 1')
+    assert location_key(None, None) == ('', '')
+
+
+def test_id_lookups(store, records):
+    prg_data, grs_data, consumer_data = records
+    assert store.get_prg('prg_2') is prg_data[1]
+    assert store.get_grs('grs_1') is grs_data[0]
+    assert store.get_consumer('c_3') is consumer_data[2]
+    assert store.get_consumer('missing') is None
+
+
+def test_grouped_lookups(store):
+    assert ids(store.find_prg_by_prg_id('ПРГ-1')) == ['prg_1']
+    assert ids(store.find_prg_by_grs_id('1')) == ['prg_1', 'prg_3']
+    assert ids(store.find_grs_by_grs_id('2')) == ['grs_2']
+    assert store.find_prg_by_prg_id('ПРГ-9') == []
+
+
+def test_location_lookups_ignore_case_and_spaces(store):
+    assert ids(store.find_prg_by_location('район', 'нп 1')) == ['prg_1', 'prg_3']
+    assert ids(store.find_consumers_by_location('Район', 'НП 1')) == ['c_1', 'c_2', 'c_4', 'c_5']
+    assert ids(store.find_consumers_by_location('Район', 'НП 1', 'Организация')) == ['c_2']
+    assert store.find_consumers_by_location('Район', 'НП 9') == []
+
+
+def test_lookups_return_copies(store):
+    store.find_consumers_by_location('Район', 'НП 1').clear()
+    store.find_prg_by_grs_id('1').clear()
+
+    assert len(store.find_consumers_by_location('Район', 'НП 1')) == 4
+    assert len(store.find_prg_by_grs_id('1')) == 2
+
+
+def test_type_index_and_counts(store):
+    assert ids(store.find_consumers_by_type('Организация')) == ['c_2']
+    assert store.consumer_counts_by_location() == {('район', 'нп 1'): 4, ('район', 'нп 2'): 1}
+    assert sorted(store.locations()) == [('район', 'нп 1'), ('район', 'нп 2')]
+
+
+def test_consumers_by_prg_id_in_load_order(store):
+    assert ids(store.find_consumers_by_prg_id('ПРГ-1')) == ['c_1', 'c_2', 'c_5']
+    assert ids(store.find_consumers_by_prg_id('ПРГ-2')) == ['c_2', 'c_4']
+    assert store.find_consumers_by_prg_id('ПРГ-3') == []
+
+
+def test_duplicate_prg_in_one_code_is_listed_once(records):
+    records[2][0]['code'] = 'ПРГ-1|0,5|ГРС;ПРГ-1|0,5|ГРС'
+    store = DataStore(*records)
+
+    assert ids(store.find_consumers_by_prg_id('ПРГ-1')) == ['c_1', 'c_2', 'c_5']
+
+
+def test_set_consumer_code_keeps_load_order(store, records):
+    consumer_data = records[2]
+    store.find_consumers_by_prg_id('ПРГ-1')  # build the binding index
+
+    store.set_consumer_code(consumer_data[2], 'ПРГ-1|1|ГРС')  # bind
+    store.set_consumer_code(consumer_data[0], '')  # unbind
+    store.set_consumer_code(consumer_data[1], 'ПРГ-2|1|ГРС')  # move
+
+    assert ids(store.find_consumers_by_prg_id('ПРГ-1')) == ['c_3', 'c_5']
+    assert ids(store.find_consumers_by_prg_id('ПРГ-2')) == ['c_2', 'c_4']
+
+
+def test_reindex_before_first_use_is_deferred(store, records):
+    consumer_data = records[2]
+    consumer_data[0]['code'] = 'ПРГ-2|1|ГРС'
+    store.reindex_consumer(consumer_data[0])
+
+    assert ids(store.find_consumers_by_prg_id('ПРГ-1')) == ['c_2', 'c_5']
+    assert ids(store.find_consumers_by_prg_id('ПРГ-2')) == ['c_1', 'c_2', 'c_4']
+
+
+def test_reindex_ignores_foreign_records(store):
+    store.find_consumers_by_prg_id('ПРГ-1')
+    stranger = consumer(1, 'ПРГ-3|1|ГРС')  # same id, another record
+
+    store.reindex_consumer(stranger)
+
+    assert store.find_consumers_by_prg_id('ПРГ-3') == []
+    assert ids(store.find_consumers_by_prg_id('ПРГ-1')) == ['c_1', 'c_2', 'c_5']
+
+
+def test_index_matches_scan_after_many_changes(store, records):
+    consumer_data = records[2]
+    codes = ['', 'ПРГ-1|1|ГРС', 'ПРГ-2|1|ГРС', 'ПРГ-1|0,3|ГРС;ПРГ-3|0,7|ГРС']
+    store.find_consumers_by_prg_id('ПРГ-1')
+    for step in range(20):
+        store.set_consumer_code(consumer_data[step * 3 % len(consumer_data)], codes[step % len(codes)])
+
+    for prg_id in ('ПРГ-1', 'ПРГ-2', 'ПРГ-3'):
+        expected = [c for c in consumer_data if any(b['prg_id'] == prg_id for b in store.bindings(c))]
+        assert store.find_consumers_by_prg_id(prg_id) == expected
+
+
+def test_bindings_follow_code_changes(store, records):
+    consumer_data = records[2]
+    assert [b['prg_id'] for b in store.bindings(consumer_data[1])] == ['ПРГ-1', 'ПРГ-2']
+
+    consumer_data[1]['code'] = 'ПРГ-3|1|ГРС'
+    assert [b['prg_id'] for b in store.bindings(consumer_data[1])] == ['ПРГ-3']
+
+
+def test_covers_only_the_stored_lists(store, records):
+    prg_data, grs_data, consumer_data = records
+    assert store.covers(prg_data) and store.covers(grs_data) and store.covers(consumer_data)
+    assert not store.covers(list(consumer_data))
+    assert not store.covers([])
+
+
+def test_load_replaces_records_and_indexes(store, records):
+    prg_data, grs_data, consumer_data = records
+    store.find_consumers_by_prg_id('ПРГ-1')
+    reloaded = [dict(c) for c in consumer_data[:2]]
+    reloaded[0]['code'] = 'ПРГ-2|1|ГРС'
+
+    store.load(prg_data[:1], grs_data, reloaded)
+
+    assert store.covers(reloaded) and not store.covers(consumer_data)
+    assert store.get_consumer('c_5') is None
+    assert store.get_prg('prg_2') is None
+    assert store.find_consumers_by_prg_id('ПРГ-1') == [reloaded[1]]
+    assert store.find_consumers_by_prg_id('ПРГ-2') == reloaded
+    assert store.locations() == [('район', 'нп 1')]
+
+
+def test_load_after_in_place_update(store, records):
+    prg_data, grs_data, consumer_data = records
+    store.find_consumers_by_prg_id('ПРГ-1')
+    consumer_data[:] = [c for c in consumer_data if c['id'] != 'c_1']
+
+    store.load(prg_data, grs_data, consumer_data)
+
+    assert ids(store.find_consumers_by_prg_id('ПРГ-1')) == ['c_2', 'c_5']
+    assert store.get_consumer('c_1') is None
+
+
+def test_empty_store():
+    store = DataStore()
+
+    assert store.find_consumers_by_prg_id('ПРГ-1') == []
+    assert store.find_organizations_by_name('Район', 'НП 1', 'Ромашка') == []
+    assert store.locations() == []
+
+
+def test_consumer_bindings_with_and_without_store(store, records):
+    consumer_data = records[2]
+    assert consumer_bindings(consumer_data[1], store) is store.bindings(consumer_data[1])
+    assert consumer_bindings(consumer_data[1]) == store.bindings(consumer_data[1])
+    assert consumer_bindings({'id': 'x'}) == []
+
+
+@pytest.fixture
+def synthetic():
+    return build_records(n_prg=40, n_grs=3, n_population=600, n_organizations=200, n_settlements=25)
+
+
+def scan_bound(consumers, prg_id):
+    return [c for c in consumers if any(b['prg_id'] == prg_id for b in parse_prg_bindings(c.get('code', '')))]
+
+
+def test_service_lookups_equal_scans(synthetic):
+    prg_data, grs_data, consumers = synthetic['prg'], synthetic['grs'], synthetic['consumers']
+    store = DataStore(prg_data, grs_data, consumers)
+    plain = SearchService(ValidationService())
+    indexed = SearchService(ValidationService(store), store)
+
+    for target in consumers[::37]:
+        for consumer_type in (None, 'Организация'):
+            assert indexed.find_consumers_by_location(consumers, target['mo'], target['settlement'],
+                                                      consumer_type).matches == \
+                plain.find_consumers_by_location(consumers, target['mo'], target['settlement'],
+                                                 consumer_type).matches
+        assert indexed.get_prg_ids_by_location(prg_data, target['mo'], target['settlement']) == \
+            plain.get_prg_ids_by_location(prg_data, target['mo'], target['settlement'])
+    for prg in prg_data:
+        assert store.find_consumers_by_prg_id(prg['prg_id']) == scan_bound(consumers, prg['prg_id'])
+
+
+def test_binding_index_follows_binding_service(synthetic):
+    prg_data, consumers = synthetic['prg'], synthetic['consumers']
+    store = DataStore(prg_data, synthetic['grs'], consumers)
+    store.find_consumers_by_prg_id('ПРГ-0')  # build the binding index
+    binding = BindingService(ValidationService(store), store)
+
+    for target, prg in zip(consumers[::40], prg_data[-15:]):
+        binding.bind_prg_to_settlement(prg, target, consumers, 'ГРС Станция 0', 0.25)
+        binding.unbind_single_consumer(target)
+
+    for prg in prg_data:
+        assert store.find_consumers_by_prg_id(prg['prg_id']) == scan_bound(consumers, prg['prg_id'])
@@ -0,0 +1,147 @@
+"""Load modes and sheet parsing of ExcelLoader."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader
+from prg.data.excel_loader import TABLE_TYPES
+from prg.utils import col_to_index
+from benchmarks import iterrows_reference
+from benchmarks.synthetic_workbook import build_workbook
+
+SETTINGS_FILE = Path(__file__).resolve().parent.parent / 'prg_settings.json'
+
+
+@pytest.fixture(scope='module')
+def settings_manager():
+    return SettingsManager(str(SETTINGS_FILE))
+
+
+@pytest.fixture(scope='module')
+def workbook(tmp_path_factory, settings_manager):
+    path = tmp_path_factory.mktemp('excel_loader') / 'workbook.xlsx'
+    build_workbook(path, settings_manager, n_prg=40, n_grs=5, n_population=300,
+                   n_organizations=80, n_settlements=12)
+    return path
+
+
+@pytest.fixture(scope='module')
+def per_sheet(workbook, settings_manager):
+    return ExcelLoader(settings_manager).load_all_data(workbook, 'per_sheet')
+
+
+def test_single_pass_equals_per_sheet(workbook, settings_manager, per_sheet):
+    progress = []
+
+    single = ExcelLoader(settings_manager).load_all_data(
+        workbook, 'single_pass', progress_callback=lambda sheet, rows: progress.append((sheet, rows)))
+
+    assert single == per_sheet
+    assert [len(single['prg']), len(single['grs'])] == [40, 5]
+    assert len(single['consumers']) == 380
+    assert [sheet for sheet, _ in progress] == [settings_manager.get_table_settings(t)['sheet']
+                                                for t in ('prg', 'grs', 'population', 'organizations')]
+
+
+def test_invalid_mode(workbook, settings_manager):
+    with pytest.raises(ValueError):
+        ExcelLoader(settings_manager).load_all_data(workbook, 'no_such_mode')
+
+
+# Odd rows appended to the synthetic sheets: (table type, {column setting: value})
+ODD_ROWS = [
+    ('prg', {'mo_col': 'Район 0', 'prg_id_col': 'ПРГ-без НП', 'grs_id_col': '1'}),
+    ('prg', {'mo_col': ' Район 0 ', 'settlement_col': 'НП 0', 'prg_id_col': 123, 'grs_id_col': 3.0,
+             'qy_pop_col': ' 1 234,5 ', 'qh_pop_col': 'нет', 'year_volume_col': -2}),
+    ('prg', {'mo_col': 'Район 0', 'settlement_col': 'НП 0', 'prg_id_col': 'ПРГ-Х', 'grs_id_col': '0; '}),
+    ('grs', {'mo_col': 'Район 0', 'grs_id_col': 99, 'grs_name_col': 'ГРС без района'}),
+    ('grs', {'mo_col': 'Район 0', 'grs_id_col': 100}),
+    ('population', {'mo_col': 'Район 0', 'settlement_col': 7, 'code_col': ' ПРГ-1|1|ГРС ',
+                    'expenses_col': '12,5', 'hourly_expenses_col': ''}),
+    ('population', {'mo_col': 'Район 0', 'settlement_col': 'НП 1', 'expenses_col': 'abc',
+                    'hourly_expenses_col': -1}),
+    ('population', {'settlement_col': 'НП 1', 'expenses_col': 5}),
+    ('organizations', {'mo_col': 'Район 0', 'settlement_col': 'НП 0', 'expenses_col': 3}),
+    ('organizations', {'mo_col': 'Район 0', 'settlement_col': 'НП 0', 'name_col': 42,
+                       'grs_id_col': 2, 'expenses_col': '1e3', 'hourly_expenses_col': 0}),
+]
+
+
+@pytest.fixture(scope='module')
+def odd_workbook(tmp_path_factory, workbook, settings_manager):
+    path = tmp_path_factory.mktemp('excel_loader_odd') / 'odd.xlsx'
+    wb = load_workbook(workbook)
+    for table_type, cells in ODD_ROWS:
+        settings = settings_manager.get_table_settings(table_type)
+        ws = wb[settings['sheet']]
+        row = ws.max_row + 1
+        for key, value in cells.items():
+            ws.cell(row=row, column=col_to_index(settings[key]) + 1, value=value)
+        ws.append([])  # blank row between odd rows
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize('book', ['workbook', 'odd_workbook'])
+def test_columnar_loaders_equal_iterrows_reference(request, book, settings_manager):
+    path = request.getfixturevalue(book)
+    loader = ExcelLoader(settings_manager)
+    settings = {t: settings_manager.get_table_settings(t) for t in TABLE_TYPES}
+    full = pd.read_excel(path, sheet_name=[settings[t]['sheet'] for t in TABLE_TYPES], header=None)
+    full = {t: full[settings[t]['sheet']] for t in TABLE_TYPES}
+    frames = loader.read_sheets(path)
+
+    assert loader.load_prg_data(path, frames['prg']) == \
+        iterrows_reference.load_prg(full['prg'], settings['prg'])
+    assert loader.load_grs_data(path, frames['grs']) == \
+        iterrows_reference.load_grs(full['grs'], settings['grs'])
+    assert loader.load_population_data(path, frames['population']) == \
+        iterrows_reference.load_consumers(full['population'], settings['population'], organizations=False)
+    assert loader.load_organization_data(path, frames['organizations']) == \
+        iterrows_reference.load_consumers(full['organizations'], settings['organizations'], organizations=True)
+
+
+def test_read_sheets_keeps_only_configured_columns_and_rows(workbook, settings_manager):
+    frames = ExcelLoader(settings_manager).read_sheets(workbook)
+    full = pd.read_excel(workbook, sheet_name=None, header=None)
+
+    for table_type in TABLE_TYPES:
+        settings = settings_manager.get_table_settings(table_type)
+        columns = sorted({col_to_index(v) for k, v in settings.items() if k.endswith('_col')})
+        skipped = int(settings['start_row']) - 1
+        frame = frames[table_type]
+        sheet = full[settings['sheet']]
+
+        assert list(frame.columns) == [c for c in columns if c < sheet.shape[1]]
+        assert len(frame) == len(sheet) - skipped
+        # Frame row 0 is Excel row start_row, cells as read
+        expected = sheet.iloc[skipped:, frame.columns].reset_index(drop=True).astype(object)
+        pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected, check_dtype=False)
+
+
+def test_read_sheets_subset(workbook, settings_manager):
+    frames = ExcelLoader(settings_manager).read_sheets(workbook, ('grs', 'prg'))
+
+    assert list(frames) == ['grs', 'prg']
+
+
+@pytest.mark.parametrize('book', ['workbook', 'odd_workbook'])
+def test_streaming_equals_per_sheet(request, book, settings_manager):
+    path = request.getfixturevalue(book)
+    loader = ExcelLoader(settings_manager)
+
+    assert loader.load_all_data(path, 'streaming') == loader.load_all_data(path, 'per_sheet')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100000])
+def test_streamed_records_equal_frame_records(odd_workbook, settings_manager, chunk_size):
+    loader = ExcelLoader(settings_manager)
+
+    assert list(loader.iter_population_records(odd_workbook, chunk_size)) == \
+        loader.load_population_data(odd_workbook)
+    assert list(loader.iter_organization_records(odd_workbook, chunk_size)) == \
+        loader.load_organization_data(odd_workbook)
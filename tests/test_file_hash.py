@@ -0,0 +1,88 @@
+"""Workbook content hashes shared by SnapshotCache and ChangeWAL."""
+
+import hashlib
+import os
+
+import pytest
+
+from prg.data import ChangeWAL, SnapshotCache, content_hash
+from prg.data import file_hash
+
+
+@pytest.fixture(autouse=True)
+def empty_memo():
+    file_hash._hash_memo.clear()
+    yield
+    file_hash._hash_memo.clear()
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / 'workbook.xlsx'
+    path.write_bytes(os.urandom(3 * file_hash.HASH_CHUNK_BYTES + 17))
+    return path
+
+
+@pytest.fixture
+def hashed_reads(monkeypatch):
+    """Count files actually read by content_hash."""
+    reads = []
+    monkeypatch.setattr(file_hash, 'open', lambda *a, **k: reads.append(a[0]) or open(*a, **k), raising=False)
+    return reads
+
+
+def test_hash_of_whole_content(workbook):
+    assert content_hash(workbook) == hashlib.blake2b(workbook.read_bytes()).hexdigest()
+
+
+def test_unchanged_file_is_read_once(workbook, hashed_reads):
+    first = content_hash(workbook)
+
+    assert content_hash(str(workbook)) == first
+    assert content_hash(workbook.parent / '.' / workbook.name) == first
+    assert len(hashed_reads) == 1
+
+
+def test_changed_file_is_read_again(workbook, hashed_reads):
+    first = content_hash(workbook)
+    stat = workbook.stat()
+    workbook.write_bytes(b'x' * stat.st_size)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert content_hash(workbook) != first
+    assert len(hashed_reads) == 2
+
+
+def test_memo_is_bounded(tmp_path):
+    for number in range(file_hash.HASH_MEMO_MAX_ENTRIES * 3):
+        path = tmp_path / f"{number}.xlsx"
+        path.write_bytes(b'%d' % number)
+        content_hash(path)
+
+    assert len(file_hash._hash_memo) <= file_hash.HASH_MEMO_MAX_ENTRIES
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(OSError):
+        content_hash(tmp_path / 'missing.xlsx')
+
+
+def test_journal_start_reuses_the_snapshot_hash(tmp_path, workbook, hashed_reads):
+    SnapshotCache(tmp_path / 'cache').store(workbook, {}, {'data': []})
+    wal = ChangeWAL(tmp_path / 'journal')
+
+    wal.start(workbook)
+    wal.close()
+
+    assert len(hashed_reads) == 1
+    assert wal.read(workbook)['matches_workbook']
+
+
+def test_journal_matches_a_touched_workbook(tmp_path, workbook):
+    wal = ChangeWAL(tmp_path / 'journal')
+    wal.start(workbook)
+    wal.close()
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert wal.read(workbook)['matches_workbook']
@@ -0,0 +1,71 @@
+"""ExcelLoader.reload_changed against full loads and the snapshot cache."""
+
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader, SnapshotCache
+from prg.utils import col_to_index
+from benchmarks.synthetic_workbook import build_workbook
+
+SETTINGS_FILE = Path(__file__).resolve().parent.parent / 'prg_settings.json'
+
+
+@pytest.fixture
+def settings_manager():
+    return SettingsManager(str(SETTINGS_FILE))
+
+
+@pytest.fixture
+def workbook(tmp_path, settings_manager):
+    path = tmp_path / 'workbook.xlsx'
+    build_workbook(path, settings_manager, n_prg=20, n_grs=3, n_population=40,
+                   n_organizations=30, n_settlements=10)
+    # Re-saved once, so the edited version comes from the same writer
+    wb = load_workbook(path)
+    wb.save(path)
+    wb.close()
+    return path
+
+
+def rename_first_organization(path, settings_manager, name):
+    settings = settings_manager.get_table_settings('organizations')
+    wb = load_workbook(path)
+    wb[settings['sheet']].cell(row=int(settings['start_row']),
+                               column=col_to_index(settings['name_col']) + 1).value = name
+    wb.save(path)
+    wb.close()
+
+
+def test_reload_merges_changed_sheet(workbook, settings_manager):
+    loader = ExcelLoader(settings_manager)
+    data = loader.load_all_data(workbook)
+    rename_first_organization(workbook, settings_manager, 'ООО "Новая фирма"')
+
+    assert loader.reload_changed(workbook, data) == ['organizations']
+    assert data == ExcelLoader(settings_manager).load_all_data(workbook)
+    assert loader.reload_changed(workbook, data) == []
+
+
+def test_reload_keeps_unsaved_edits_out_of_the_snapshot(tmp_path, workbook, settings_manager):
+    cache = SnapshotCache(tmp_path / 'cache')
+    loader = ExcelLoader(settings_manager, cache)
+    data = loader.load_all_data(workbook)
+    population = next(c for c in data['consumers'] if c['consumer_type'] == 'population')
+    original_code = population['code']
+    original_load = data['prg'][0]['QY_pop']
+
+    # Pending edits in the unchanged sheets, as MainWindow keeps them
+    population['code'] = 'ПРГ-999|1|ГРС'
+    data['prg'][0]['QY_pop'] = original_load + 1000
+    rename_first_organization(workbook, settings_manager, 'ООО "Новая фирма"')
+    assert loader.reload_changed(workbook, data) == ['organizations']
+    assert population['code'] == 'ПРГ-999|1|ГРС'
+
+    reopened = ExcelLoader(settings_manager, cache).load_all_data(workbook)
+    reopened_population = next(c for c in reopened['consumers'] if c['id'] == population['id'])
+    assert reopened_population['code'] == original_code
+    assert reopened['prg'][0]['QY_pop'] == original_load
+    assert reopened == ExcelLoader(settings_manager).load_all_data(workbook)
@@ -0,0 +1,151 @@
+"""Live PRG loads of CalculationService against a full recalculation."""
+
+import random
+
+import pytest
+
+from prg.business import BindingService, CalculationService, ValidationService
+from prg.data import DataStore, format_prg_bindings
+from benchmarks.synthetic_workbook import build_records
+
+
+@pytest.fixture
+def data():
+    return build_records(n_prg=30, n_grs=3, n_population=800, n_organizations=300, n_settlements=20)
+
+
+@pytest.fixture
+def services(data):
+    store = DataStore(data['prg'], data['grs'], data['consumers'])
+    validation = ValidationService(store)
+    calculation = CalculationService(validation, store)
+    binding = BindingService(validation, store, calculation)
+    calculation.start_live_loads(data['consumers'])
+    return store, calculation, binding
+
+
+def assert_live_equals_full(calculation, data):
+    full = calculation.calculate_prg_loads(data['prg'], data['consumers'], record_details=False)
+    assert calculation.check_live_loads(full, tolerance=1e-9) == []
+    assert set(calculation.live_loads) == set(full.prg_loads)
+
+
+def bound_consumers(data):
+    return [c for c in data['consumers'] if c['code']]
+
+
+def test_start_equals_full(services, data):
+    assert_live_equals_full(services[1], data)
+
+
+def test_bind(services, data):
+    _, calculation, binding = services
+    unbound = [c for c in data['consumers'] if not c['code']]
+    prg = data['prg'][0]
+
+    binding.bind_single_consumer(unbound[0], prg, 'ГРС Станция 0', 0.5)
+    binding.bind_prg_to_settlement(prg, unbound[1], data['consumers'], 'ГРС Станция 0', 1.0)
+
+    assert_live_equals_full(calculation, data)
+
+
+def test_unbind(services, data):
+    _, calculation, binding = services
+    consumers = bound_consumers(data)
+
+    binding.unbind_single_consumer(consumers[0])
+    binding.remove_prg_from_consumer(consumers[1], consumers[1]['code'].split('|', 1)[0])
+    binding.unbind_entire_settlement(consumers[2], data['consumers'])
+
+    assert_live_equals_full(calculation, data)
+
+
+def test_unbinding_the_last_consumer_drops_the_prg(services, data):
+    store, calculation, binding = services
+    prg_id = data['prg'][0]['prg_id']
+
+    for consumer in store.find_consumers_by_prg_id(prg_id):
+        binding.remove_prg_from_consumer(consumer, prg_id)
+
+    assert prg_id not in calculation.live_loads
+    assert calculation.get_live_load(prg_id)['Year_volume'] == 0.0
+    assert_live_equals_full(calculation, data)
+
+
+def test_share_edit(services, data):
+    store, calculation, binding = services
+    multi = next(c for c in data['consumers'] if ';' in c['code'])
+    single = next(c for c in data['consumers'] if c['code'] and ';' not in c['code'])
+
+    # As the share dialog does it, shares not summing to 1 included
+    for consumer, factor in ((multi, 0.3), (single, 1.7)):
+        old_code = consumer['code']
+        new_code = format_prg_bindings([dict(b, share=b['share'] * factor) for b in store.bindings(consumer)])
+        store.set_consumer_code(consumer, new_code)
+        calculation.apply_binding_change(consumer, old_code, new_code)
+    # Rebinding with another share replaces the old one
+    binding.bind_single_consumer(single, data['prg'][1], 'ГРС Станция 0', 0.25, force=True)
+
+    assert_live_equals_full(calculation, data)
+
+
+def test_replay(services, data):
+    store, calculation, _ = services
+    rnd = random.Random(5)
+    codes = ['', 'ПРГ-1|1|ГРС', 'ПРГ-2|0,5|ГРС;ПРГ-3|0,5|ГРС', 'ПРГ-4|0,5|ГРС;ПРГ-4|0,5|ГРС']
+    journal = [(rnd.choice(data['consumers']), rnd.choice(codes)) for _ in range(200)]
+
+    # As _replay_changes applies journaled code changes
+    for consumer, new_code in journal:
+        old_code = consumer.get('code', '')
+        store.set_consumer_code(consumer, new_code)
+        calculation.apply_binding_change(consumer, old_code, new_code)
+
+    assert_live_equals_full(calculation, data)
+
+
+def test_random_edits(services, data):
+    _, calculation, binding = services
+    rnd = random.Random(3)
+    for _ in range(300):
+        consumer = rnd.choice(data['consumers'])
+        prg = rnd.choice(data['prg'])
+        action = rnd.randrange(4)
+        if action == 0:
+            binding.bind_single_consumer(consumer, prg, 'ГРС Станция 0', rnd.choice((0.25, 0.5, 1.0)), force=True)
+        elif action == 1:
+            binding.unbind_single_consumer(consumer)
+        elif action == 2 and consumer.get('code'):
+            binding.remove_prg_from_consumer(consumer, consumer['code'].split('|', 1)[0])
+        else:
+            binding.bind_prg_to_settlement(prg, consumer, data['consumers'], 'ГРС Станция 0', 0.5)
+
+    assert_live_equals_full(calculation, data)
+
+
+def test_changes_of_consumers_without_expenses_are_ignored(services, data):
+    _, calculation, _ = services
+    consumer = dict(data['consumers'][0], expenses=0.0, hourly_expenses=0.0)
+
+    assert calculation.apply_binding_change(consumer, '', 'ПРГ-1|1|ГРС') == []
+    assert_live_equals_full(calculation, data)
+
+
+def test_changed_prg_ids(services):
+    _, calculation, _ = services
+    consumer = {'id': 'x', 'type': 'Население', 'expenses': 10.0, 'hourly_expenses': 1.0}
+    calculation.pop_changed_live_prg_ids()
+
+    changed = calculation.apply_binding_change(consumer, 'ПРГ-1|1|ГРС', 'ПРГ-2|0,5|ГРС;ПРГ-1|0,5|ГРС')
+
+    assert changed == ['ПРГ-1', 'ПРГ-2']
+    assert sorted(calculation.pop_changed_live_prg_ids()) == ['ПРГ-1', 'ПРГ-2']
+    assert calculation.pop_changed_live_prg_ids() == []
+
+
+def test_without_live_loads():
+    calculation = CalculationService(ValidationService())
+    consumer = {'id': 'x', 'type': 'Население', 'expenses': 10.0, 'hourly_expenses': 1.0}
+
+    assert calculation.apply_binding_change(consumer, '', 'ПРГ-1|1|ГРС') == []
+    assert calculation.get_live_load('ПРГ-1') is None
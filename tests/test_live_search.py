@@ -0,0 +1,165 @@
+"""Debouncing, superseding and chunked rows of LiveSearch on a fake event loop."""
+
+import heapq
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from prg.ui.dialogs.live_search import LiveSearch, DEBOUNCE_MS
+
+
+class EventLoop:
+    """after()/after_cancel() of a Tk widget on a virtual clock (ms)."""
+
+    def __init__(self):
+        self.now = 0
+        self._tasks = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+
+    def after(self, ms, func):
+        task_id = next(self._ids)
+        heapq.heappush(self._tasks, (self.now + ms, task_id, func))
+        return task_id
+
+    def after_cancel(self, task_id):
+        self._cancelled.add(task_id)
+
+    def run(self, until=None, stop=lambda: False, timeout=5.0):
+        """Run due callbacks in order until none are left, the clock passes until, or stop() holds."""
+        deadline = time.monotonic() + timeout
+        while self._tasks and not stop():
+            assert time.monotonic() < deadline, "event loop did not settle"
+            due, task_id, func = self._tasks[0]
+            if until is not None and due > until:
+                break
+            heapq.heappop(self._tasks)
+            if task_id in self._cancelled:
+                continue
+            self.now = due
+            func()
+            time.sleep(0)  # let the worker thread run
+        if until is not None:
+            self.now = max(self.now, until)
+
+
+class Searcher:
+    """Search function with optional gates that hold a query until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.gates = {}
+        self.started = threading.Event()
+
+    def hold(self, query):
+        self.gates[query] = threading.Event()
+
+    def __call__(self, query):
+        self.calls.append(query)
+        gate = self.gates.get(query)
+        if gate is not None:
+            self.started.set()
+            gate.wait(5)
+        if query == 'ошибка':
+            raise ValueError('поиск не удался')
+        return SimpleNamespace(matches=[f"{query}:{n}" for n in range(int(query.split()[-1]))])
+
+
+@pytest.fixture
+def loop():
+    return EventLoop()
+
+
+@pytest.fixture
+def searcher():
+    return Searcher()
+
+
+@pytest.fixture
+def shown():
+    return SimpleNamespace(results=[], rows=[], chunks=[], errors=[])
+
+
+@pytest.fixture
+def live(loop, searcher, shown):
+    def on_rows(chunk):
+        shown.chunks.append(len(chunk))
+        shown.rows.extend(chunk)
+
+    live = LiveSearch(loop, searcher, lambda query, result: shown.results.append(query), on_rows,
+                      on_error=lambda query, message: shown.errors.append((query, message)),
+                      rows_per_frame=50, max_rows=120)
+    yield live
+    live.close()
+
+
+def test_typing_runs_only_the_last_query(loop, live, searcher, shown):
+    for length in range(1, 6):
+        live.request(f"ул {length}")
+        loop.run(until=loop.now + DEBOUNCE_MS - 10)
+    loop.run()
+
+    assert searcher.calls == ['ул 5']
+    assert shown.results == ['ул 5']
+    assert shown.rows == [f"ул 5:{n}" for n in range(5)]
+    assert live.get_stats() == {'requested': 5, 'started': 1, 'skipped': 0, 'dropped': 0, 'shown': 5}
+
+
+def test_rows_come_in_chunks_up_to_max_rows(loop, live, shown):
+    live.request('ул 300')
+    loop.run()
+
+    assert shown.chunks == [50, 50, 20]
+    assert shown.rows == [f"ул 300:{n}" for n in range(120)]
+
+
+def test_superseded_queries_are_skipped_or_dropped(loop, live, searcher, shown):
+    searcher.hold('ул 1')
+    live.request('ул 1')
+    loop.run(until=DEBOUNCE_MS)
+    assert searcher.started.wait(5)
+
+    live.request('ул 2')  # queued behind the running query
+    loop.run(until=loop.now + DEBOUNCE_MS)
+    live.request('ул 3')  # supersedes the queued one before it starts
+    searcher.gates['ул 1'].set()
+    loop.run()
+
+    assert searcher.calls == ['ул 1', 'ул 3']
+    assert shown.results == ['ул 3']
+    assert shown.rows == ['ул 3:0', 'ул 3:1', 'ул 3:2']
+    stats = live.get_stats()
+    assert (stats['started'], stats['skipped'], stats['dropped']) == (2, 1, 1)
+
+
+def test_new_request_stops_drawing_old_rows(loop, live, shown):
+    live.request('ул 300')
+    loop.run(stop=lambda: shown.rows)
+    live.request('ул 2')
+    loop.run()
+
+    assert shown.chunks == [50, 2]
+    assert shown.rows[-2:] == ['ул 2:0', 'ул 2:1']
+
+
+def test_errors_go_to_on_error(loop, live, shown):
+    live.request('ошибка')
+    loop.run()
+
+    assert shown.errors == [('ошибка', 'поиск не удался')]
+    assert shown.results == [] and shown.rows == []
+
+
+def test_close_stops_the_worker(loop, live, searcher):
+    live.request('ул 1')
+    loop.run()
+    live.close()
+    live.request('ул 2')
+    loop.run()
+
+    live._thread.join(5)
+    assert not live._thread.is_alive()
+    assert searcher.calls == ['ул 1']
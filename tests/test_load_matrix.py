@@ -0,0 +1,136 @@
+"""PRG loads of CalculationService (LoadMatrix) against the per-binding loop."""
+
+import math
+
+import pytest
+
+from prg.business import CalculationService, CalculationResult, ValidationService
+from prg.data import DataStore, consumer_bindings
+from benchmarks.synthetic_workbook import build_records
+
+
+def reference_loads(service, consumer_data):
+    """Previous calculate_prg_loads body (detail lines returned in result.details as text)."""
+    result = CalculationResult()
+    result.details = []
+    for consumer in consumer_data:
+        expenses = service._get_expenses(consumer)
+        if not expenses or (expenses.get('yearly', 0) == 0 and expenses.get('hourly', 0) == 0):
+            continue
+        bindings = consumer_bindings(consumer, service.data_store)
+        if not bindings:
+            continue
+        result.processed_consumers += 1
+        is_population = (consumer.get('type') == 'Население')
+        is_organization = (consumer.get('type') == 'Организация')
+        for binding in bindings:
+            prg_id = binding['prg_id']
+            share = binding['share']
+            if prg_id not in result.prg_loads:
+                result.prg_loads[prg_id] = {'QY_pop': 0.0, 'QH_pop': 0.0, 'QY_ind': 0.0, 'QH_ind': 0.0}
+                result.prg_binding_counts[prg_id] = 0
+            yearly_load = expenses['yearly'] * share
+            hourly_load = expenses['hourly'] * share
+            if is_population:
+                result.prg_loads[prg_id]['QY_pop'] += yearly_load
+                result.prg_loads[prg_id]['QH_pop'] += hourly_load
+            elif is_organization:
+                result.prg_loads[prg_id]['QY_ind'] += yearly_load
+                result.prg_loads[prg_id]['QH_ind'] += hourly_load
+            result.prg_binding_counts[prg_id] += 1
+            result.processed_bindings += 1
+            result.details.append(
+                f"{consumer.get('name', 'Unknown')} (тип: {consumer.get('type')}) -> "
+                f"ПРГ {prg_id}: доля {share:.3f}, годовая {yearly_load:.3f}, "
+                f"часовая {hourly_load:.3f}"
+            )
+    result.updated_prg_count = len(result.prg_loads)
+    return result
+
+
+def consumer(number, code, expenses=10.0, hourly_expenses=0.5, consumer_type='Население'):
+    return {'id': f"edge_{number}", 'type': consumer_type, 'mo': 'Район 0', 'settlement': 'НП 0',
+            'name': f"Потребитель {number}", 'code': code, 'expenses': expenses,
+            'hourly_expenses': hourly_expenses}
+
+
+EDGE_CONSUMERS = [
+    consumer(1, 'ПРГ-1|0,3|ГРС;ПРГ-2|0,3|ГРС'),  # shares sum to 0.6
+    consumer(2, 'ПРГ-1|0,8|ГРС;ПРГ-3|0,7|ГРС', consumer_type='Организация'),  # shares sum to 1.5
+    consumer(3, 'ПРГ-1|0,5|ГРС;ПРГ-1|0,5|ГРС'),  # same PRG twice
+    consumer(4, 'ПРГ-2|0,25|ГРС;ПРГ-4|0,5|ГРС;ПРГ-2|0,25|ГРС', consumer_type='Организация'),
+    consumer(5, 'ПРГ-1|1|ГРС', expenses=0.0, hourly_expenses=0.0),  # zero expenses
+    consumer(6, 'ПРГ-1|1|ГРС', expenses=None, hourly_expenses=None),  # no expenses
+    consumer(7, 'ПРГ-5|1|ГРС', expenses='', hourly_expenses=''),  # empty cells
+    consumer(8, 'ПРГ-2|1|ГРС', expenses='12,5', hourly_expenses=''),  # text cell, hourly derived
+    consumer(9, 'ПРГ-2|0,5|ГРС', expenses=-3.0, hourly_expenses=1.0),  # negative expenses
+    consumer(10, 'ПРГ-6|1|ГРС', consumer_type='Прочее'),  # neither population nor organization
+    consumer(11, ''),  # unbound
+]
+
+
+def assert_same_result(new, ref):
+    assert list(new.prg_loads) == list(ref.prg_loads)
+    for prg_id, load in ref.prg_loads.items():
+        for column, value in load.items():
+            assert math.isclose(new.prg_loads[prg_id][column], value, rel_tol=1e-12, abs_tol=1e-9), \
+                (prg_id, column)
+    assert new.prg_binding_counts == ref.prg_binding_counts
+    assert (new.processed_consumers, new.processed_bindings, new.updated_prg_count) == \
+        (ref.processed_consumers, ref.processed_bindings, ref.updated_prg_count)
+    assert new.details.render_page(0, len(new.details)) == ref.details
+
+
+def make_service(prg_data, grs_data, consumer_data, with_store):
+    store = DataStore(prg_data, grs_data, consumer_data) if with_store else None
+    return CalculationService(ValidationService(store), store)
+
+
+@pytest.mark.parametrize('with_store', [False, True])
+def test_loads_equal_reference_on_synthetic_data(with_store):
+    data = build_records(n_prg=40, n_grs=4, n_population=1500, n_organizations=600, n_settlements=30)
+    service = make_service(data['prg'], data['grs'], data['consumers'], with_store)
+
+    new = service.calculate_prg_loads(data['prg'], data['consumers'])
+
+    assert new.processed_bindings > 0
+    assert_same_result(new, reference_loads(service, data['consumers']))
+
+
+@pytest.mark.parametrize('with_store', [False, True])
+def test_loads_equal_reference_on_edge_cases(with_store):
+    consumers = [dict(c) for c in EDGE_CONSUMERS]
+    service = make_service([], [], consumers, with_store)
+
+    new = service.calculate_prg_loads([], consumers)
+
+    assert_same_result(new, reference_loads(service, consumers))
+
+
+def test_edge_case_loads():
+    consumers = [dict(c) for c in EDGE_CONSUMERS]
+    result = CalculationService(ValidationService()).calculate_prg_loads([], consumers)
+    loads = result.prg_loads
+
+    # 0.3 + 0.5 + 0.5 of a population consumer, 0.8 of an organization
+    assert loads['ПРГ-1']['QY_pop'] == pytest.approx(13.0)
+    assert loads['ПРГ-1']['QY_ind'] == pytest.approx(8.0)
+    assert result.prg_binding_counts['ПРГ-1'] == 4
+    # Both halves of a repeated PRG count; hourly of a text cell is derived from yearly
+    assert loads['ПРГ-2']['QY_ind'] == pytest.approx(5.0)
+    assert loads['ПРГ-2']['QY_pop'] == pytest.approx(3.0 + 12.5)
+    assert loads['ПРГ-2']['QH_pop'] == pytest.approx(0.15 + 12.5 / 8760)
+    # Consumers without (positive) expenses load nothing
+    assert 'ПРГ-5' not in loads
+    assert result.processed_consumers == 6
+    # Unknown types count as bindings but add no load
+    assert loads['ПРГ-6'] == dict.fromkeys(('QY_pop', 'QH_pop', 'QY_ind', 'QH_ind'), 0.0)
+    assert result.prg_binding_counts['ПРГ-6'] == 1
+
+
+def test_no_consumers():
+    result = CalculationService(ValidationService()).calculate_prg_loads([], [])
+
+    assert result.prg_loads == {}
+    assert result.processed_bindings == 0
+    assert len(result.details) == 0
@@ -0,0 +1,102 @@
+"""Substring search of NameIndex against a full scan."""
+
+import random
+
+import pytest
+
+from prg.business import SearchService
+from prg.data import DataStore, location_key
+
+
+def build_consumers(seed, count=400):
+    rnd = random.Random(seed)
+    places = [('Район 1', 'НП 1'), ('Район 1', 'НП 2'), (' район 1 ', 'нп 1'), ('Район 2', 'НП 1')]
+    streets = ['Ленина', 'Ленинградская', 'Мира', 'Садовая', 'Школьная']
+    consumers = []
+    for i in range(count):
+        mo, settlement = rnd.choice(places)
+        kind = rnd.choice(['Организация', 'Организация', 'Население'])
+        consumers.append({
+            'id': f"c_{i}", 'type': kind, 'mo': mo, 'settlement': settlement,
+            'name': f'ООО "Фирма {i}", ул.{rnd.choice(streets)}, {rnd.randrange(1, 30)}',
+            'expenses': rnd.choice([0.0, 5.0]),
+        })
+    return consumers
+
+
+PATTERNS = ['Ленина', 'ленин', 'УЛ.МИРА', 'ра, 1', 'ад', 'л', ', ', '"', '', 'Фирма 1', 'нет такой']
+
+
+def scan(consumers, district, settlement, pattern):
+    """Previous smart search: every consumer, substring test."""
+    return [c for c in consumers
+            if c['type'] == 'Организация'
+            and c['mo'].strip().lower() == district.strip().lower()
+            and c['settlement'].strip().lower() == settlement.strip().lower()
+            and pattern.lower() in c['name'].lower()]
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_index_equals_full_scan(seed, pattern):
+    consumers = build_consumers(seed)
+    store = DataStore([], [], consumers)
+    for district, settlement in [('Район 1', 'НП 1'), ('РАЙОН 1', 'нп 2'), ('Район 2', 'НП 1'), ('Район 3', 'НП 1')]:
+        assert store.find_organizations_by_name(district, settlement, pattern) == \
+            scan(consumers, district, settlement, pattern)
+
+
+def test_search_service_uses_index_with_same_result():
+    consumers = build_consumers(7)
+    store = DataStore([], [], consumers)
+    indexed = SearchService(data_store=store)
+    plain = SearchService()
+    for pattern in PATTERNS:
+        a = indexed.smart_search_organizations(consumers, 'Район 1', 'НП 1', pattern)
+        b = plain.smart_search_organizations(consumers, 'Район 1', 'НП 1', pattern)
+        assert a.matches == b.matches and a.details == b.details
+
+
+def test_search_service_scans_lists_the_store_does_not_hold():
+    consumers = build_consumers(8)
+    store = DataStore([], [], consumers)
+    service = SearchService(data_store=store)
+    edited = [dict(c) for c in consumers]
+    edited[0].update(type='Организация', mo='Район 1', settlement='НП 1', name='ООО "Новая", ул.Ленина, 1')
+
+    result = service.smart_search_organizations(edited, 'Район 1', 'НП 1', 'Ленина', require_expenses=False)
+    assert result.matches == scan(edited, 'Район 1', 'НП 1', 'Ленина')
+    assert service.find_consumers_by_location(edited, 'Район 1', 'НП 1').matches == \
+        SearchService().find_consumers_by_location(edited, 'Район 1', 'НП 1').matches
+
+
+def test_reload_reuses_unchanged_partitions_and_reindexes_renamed_ones():
+    consumers = build_consumers(3)
+    store = DataStore([], [], consumers)
+    for district, settlement in [('Район 1', 'НП 1'), ('Район 1', 'НП 2')]:
+        store.find_organizations_by_name(district, settlement, 'Ленина')
+    builds = store.name_index.builds
+
+    renamed_key = location_key('Район 1', 'НП 2')
+    reloaded = [dict(c) for c in consumers]
+    for consumer in reloaded:
+        if location_key(consumer['mo'], consumer['settlement']) == renamed_key:
+            consumer['name'] = consumer['name'].replace('ул.', 'улица ')
+    store.load([], [], reloaded)
+
+    for district, settlement in [('Район 1', 'НП 1'), ('Район 1', 'НП 2')]:
+        result = store.find_organizations_by_name(district, settlement, 'Ленина')
+        assert result == scan(reloaded, district, settlement, 'Ленина')
+        assert all(any(r is c for c in reloaded) for r in result)
+    assert store.name_index.builds == builds + 1
+    assert store.name_index.rebinds == 1
+
+
+def test_vanished_locations_are_dropped_on_load():
+    consumers = build_consumers(1)
+    store = DataStore([], [], consumers)
+    store.find_organizations_by_name('Район 2', 'НП 1', 'Мира')
+    store.load([], [], [c for c in consumers if c['mo'] != 'Район 2'])
+
+    assert store.name_index.get_stats()['partitions'] == 0
+    assert store.find_organizations_by_name('Район 2', 'НП 1', 'Мира') == []
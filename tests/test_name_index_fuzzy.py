@@ -0,0 +1,145 @@
+"""Fuzzy organization name matching of NameIndex."""
+
+import random
+
+import pytest
+
+from prg.business import SearchService
+from prg.data import DataStore, NameIndex, normalize_name_tokens
+from prg.data.name_index import allowed_edit_distance, edit_distance, STREET_TYPES
+
+KEY = ('район', 'нп')
+
+
+def organizations(*names, mo='Район', settlement='НП'):
+    return [{'id': f"org_{i}", 'type': 'Организация', 'mo': mo, 'settlement': settlement,
+             'name': name, 'expenses': 1.0} for i, name in enumerate(names)]
+
+
+def ranked(records, query):
+    return [(record['name'], round(score, 3)) for record, score in NameIndex().search_fuzzy(KEY, records, query)]
+
+
+def reference_fuzzy(records, query):
+    """Brute force: compare every query word with every name word."""
+    abbreviations = set(STREET_TYPES.values())
+    query_words = list(dict.fromkeys(normalize_name_tokens(query)))
+    street_types = [w for w in query_words if w in abbreviations]
+    words = [w for w in query_words if w not in abbreviations] or street_types
+    if words is street_types:
+        street_types = []
+    if not words:
+        return []
+    result = []
+    for position, record in enumerate(records):
+        if record.get('type') != 'Организация':
+            continue
+        name_words = set(normalize_name_tokens(record['name']))
+        total = 0.0
+        for word in words:
+            limit = allowed_edit_distance(word)
+            best = max((1.0 - d / max(len(word), len(w))
+                        for w in name_words for d in [edit_distance(word, w, limit)] if d <= limit), default=None)
+            if best is None:
+                break
+            total += best
+        else:
+            total += sum(1.0 for street_type in street_types if street_type in name_words)
+            result.append((position, record, total / (len(words) + len(street_types))))
+    result.sort(key=lambda item: (-item[2], item[0]))
+    return [(record, score) for _, record, score in result]
+
+
+def test_normalization():
+    assert normalize_name_tokens('ООО «Ромашка», УЛИЦА Молодёжная, д. 5') == \
+        ['ооо', 'ромашка', 'ул', 'молодежная', 'д', '5']
+    assert normalize_name_tokens('ул."Ленина"') == ['ул', 'ленина']
+    assert normalize_name_tokens('пр-т Мира; проспект Мира') == ['пр', 'мира', 'пр', 'мира']
+    assert normalize_name_tokens(None) == []
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance('ленина', 'ленина', 2) == 0
+    assert edit_distance('ленина', 'ленена', 2) == 1
+    assert edit_distance('ленина', 'лнина', 2) == 1
+    assert edit_distance('ленина', 'мира', 1) == 2
+    assert edit_distance('а', 'абвгд', 2) == 3
+
+
+def test_spelling_variants_match_exactly():
+    records = organizations('ООО "Фирма", ул.Молодёжная, 5', 'ИП Иванов, улица МОЛОДЕЖНАЯ 7',
+                            'Магазин, ул. «Молодежная»', 'Кафе, ул. Садовая')
+    assert ranked(records, 'ул. Молодежная') == [
+        ('ООО "Фирма", ул.Молодёжная, 5', 1.0),
+        ('ИП Иванов, улица МОЛОДЕЖНАЯ 7', 1.0),
+        ('Магазин, ул. «Молодежная»', 1.0),
+    ]
+
+
+def test_typos_rank_below_exact_matches():
+    records = organizations('Аптека, ул. Ленена', 'Школа, ул. Ленина', 'Почта, пер. Ленина', 'Банк, ул. Лесная')
+    assert ranked(records, 'улица Ленина') == [
+        ('Школа, ул. Ленина', 1.0),
+        ('Аптека, ул. Ленена', 0.917),
+        ('Почта, пер. Ленина', 0.5),
+    ]
+
+
+def test_every_word_must_match_and_numbers_are_exact():
+    records = organizations('Кафе, ул. Гагарина, 15', 'Склад, ул. Гагарина, 16', 'Бар, ул. Мира, 15')
+    assert [name for name, _ in ranked(records, 'Гагарина 15')] == ['Кафе, ул. Гагарина, 15']
+    assert ranked(records, 'Нет такой') == []
+    assert ranked(records, '') == []
+
+
+def test_short_words_allow_no_typos():
+    records = organizations('Кафе, ул. Мира', 'Бар, ул. Мора')
+    assert allowed_edit_distance('мир') == 0
+    assert [name for name, _ in ranked(records, 'мира')] == ['Кафе, ул. Мира', 'Бар, ул. Мора']
+    assert ranked(records, 'мир') == []
+
+
+def test_street_type_only_query():
+    records = organizations('Кафе, пер. Тихий', 'Бар, ул. Мира')
+    assert [name for name, _ in ranked(records, 'переулок')] == ['Кафе, пер. Тихий']
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_candidates_equal_brute_force(seed):
+    rnd = random.Random(seed)
+    streets = ['Ленина', 'Лёнина', 'Ленинская', 'Молодёжная', 'Молодежная', 'Мира', 'Мора', 'Садовая',
+               'Садовоя', 'Первомайская', 'Первомайкая', 'Гагарина', 'Гагрина']
+    types = ['ул.', 'улица', 'пер.', 'пр-т', '']
+    records = organizations(*[f'ООО "Фирма {i}", {rnd.choice(types)} {rnd.choice(streets)}, {rnd.randrange(1, 20)}'
+                              for i in range(300)])
+    records.insert(5, {'id': 'pop', 'type': 'Население', 'name': 'ул. Ленина'})
+    index = NameIndex()
+    for query in ['Ленина', 'ул. Молодежная', 'Садовая 3', 'улица Первомайская', 'пер Мира', 'Гагарина',
+                  'ленинская', 'фирма 12', 'ул']:
+        assert index.search_fuzzy(KEY, records, query) == reference_fuzzy(records, query), query
+
+
+def test_search_service_fuzzy_with_and_without_store():
+    consumers = organizations('Аптека, ул. Ленена', 'Школа, ул. Ленина') + \
+        organizations('Кафе, ул. Ленина', settlement='Другой НП')
+    consumers[1]['expenses'] = 0.0
+    store = DataStore([], [], consumers)
+
+    for service in (SearchService(data_store=store), SearchService()):
+        result = service.smart_search_organizations(consumers, 'район', ' нп ', 'ул Ленина',
+                                                    require_expenses=False, fuzzy=True)
+        assert [c['id'] for c in result.matches] == ['org_1', 'org_0']
+        assert result.scores == {'org_1': 1.0, 'org_0': pytest.approx(11 / 12)}
+
+        with_expenses = service.smart_search_organizations(consumers, 'Район', 'НП', 'Ленина', fuzzy=True)
+        assert [c['id'] for c in with_expenses.matches] == ['org_0']
+
+
+def test_reload_with_new_names_reindexes_the_partition():
+    records = organizations('Кафе, ул. Мира')
+    index = NameIndex()
+    assert len(index.search_fuzzy(KEY, records, 'Мира')) == 1
+
+    renamed = [dict(records[0], name='Кафе, ул. Садовая')]
+    assert index.search_fuzzy(KEY, renamed, 'Мира') == []
+    assert index.search_fuzzy(KEY, renamed, 'Садовая')[0][0] is renamed[0]
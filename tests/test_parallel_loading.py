@@ -0,0 +1,53 @@
+"""'parallel' load mode of ExcelLoader."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from prg.config import SettingsManager
+from prg.data import ExcelLoader, LoadCancelledError
+from benchmarks.synthetic_workbook import build_workbook
+
+SETTINGS_FILE = Path(__file__).resolve().parent.parent / 'prg_settings.json'
+
+
+@pytest.fixture
+def settings_manager():
+    return SettingsManager(str(SETTINGS_FILE))
+
+
+@pytest.fixture
+def workbook(tmp_path, settings_manager):
+    path = tmp_path / 'workbook.xlsx'
+    build_workbook(path, settings_manager, n_prg=30, n_grs=4, n_population=200,
+                   n_organizations=50, n_settlements=10)
+    return path
+
+
+def test_parallel_equals_per_sheet(workbook, settings_manager):
+    loader = ExcelLoader(settings_manager)
+    progress = []
+
+    parallel = loader.load_all_data(workbook, 'parallel',
+                                    progress_callback=lambda sheet, rows: progress.append(sheet))
+
+    assert parallel == loader.load_all_data(workbook, 'per_sheet')
+    assert sorted(progress) == sorted(settings_manager.get_table_settings(t)['sheet']
+                                      for t in ('prg', 'grs', 'population', 'organizations'))
+
+
+def test_cancel_does_not_wait_for_a_sheet(workbook, settings_manager):
+    cancel_event = threading.Event()
+    progress = []
+    # Spawned workers need far longer than this to import their modules
+    timer = threading.Timer(0.05, cancel_event.set)
+    timer.start()
+
+    with pytest.raises(LoadCancelledError):
+        ExcelLoader(settings_manager).load_all_data(
+            workbook, 'parallel', progress_callback=lambda sheet, rows: progress.append(sheet),
+            cancel_event=cancel_event)
+    timer.join()
+
+    assert progress == []
@@ -0,0 +1,127 @@
+"""Validity rules of SnapshotCache snapshots."""
+
+import os
+
+import pytest
+
+from prg.data import SnapshotCache
+from prg.data import snapshot_cache
+
+SETTINGS = {
+    'prg': {'sheet': 'ПРГ', 'start_row': '3', 'prg_id_col': 'A'},
+    'population': {'sheet': 'Население', 'start_row': '10', 'code_col': 'M'},
+}
+
+DATA = {'data': {'prg': [{'id': 'prg_1', 'prg_id': 'ПРГ-1'}], 'grs': [], 'consumers': []},
+        'fingerprints': None}
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / 'workbook.xlsx'
+    path.write_bytes(b'workbook bytes' * 100)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SnapshotCache(tmp_path / 'cache')
+
+
+def shift_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_round_trip(cache, workbook):
+    assert cache.store(workbook, SETTINGS, DATA)
+    assert cache.load(workbook, SETTINGS) == DATA
+
+
+def test_missing_snapshot(cache, workbook):
+    assert cache.load(workbook, SETTINGS) is None
+
+
+def test_size_change_invalidates(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    workbook.write_bytes(workbook.read_bytes() + b'x')
+
+    assert cache.load(workbook, SETTINGS) is None
+
+
+def test_touched_workbook_stays_valid(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    shift_mtime(workbook)
+
+    assert cache.load(workbook, SETTINGS) == DATA
+
+
+def test_same_size_content_change_invalidates(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    content = bytearray(workbook.read_bytes())
+    content[0] ^= 1
+    workbook.write_bytes(bytes(content))
+    shift_mtime(workbook)
+
+    assert cache.load(workbook, SETTINGS) is None
+
+
+def test_same_size_and_mtime_is_trusted(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    stat = workbook.stat()
+    content = bytearray(workbook.read_bytes())
+    content[0] ^= 1
+    workbook.write_bytes(bytes(content))
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cache.load(workbook, SETTINGS) == DATA
+
+
+def test_changed_settings_select_another_snapshot(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    changed = {**SETTINGS, 'prg': {**SETTINGS['prg'], 'prg_id_col': 'B'}}
+
+    assert cache.load(workbook, changed) is None
+    assert cache.load(workbook, SETTINGS) == DATA
+
+
+def test_settings_key_ignores_key_order(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    reordered = {table: dict(reversed(list(settings.items()))) for table, settings in reversed(SETTINGS.items())}
+
+    assert cache.load(workbook, reordered) == DATA
+
+
+def test_format_mismatch_invalidates(cache, workbook, monkeypatch):
+    cache.store(workbook, SETTINGS, DATA)
+    monkeypatch.setattr(snapshot_cache, 'SNAPSHOT_FORMAT', snapshot_cache.SNAPSHOT_FORMAT + 1)
+
+    assert cache.load(workbook, SETTINGS) is None
+
+
+@pytest.mark.parametrize('keep', [0, 10, -10])
+def test_corrupt_snapshot_is_ignored(cache, workbook, keep, capsys):
+    cache.store(workbook, SETTINGS, DATA)
+    snapshot_path, = cache.cache_dir.glob('*.snapshot')
+    content = snapshot_path.read_bytes()
+    snapshot_path.write_bytes(content[:keep] if keep else b'not a pickle')
+
+    assert cache.load(workbook, SETTINGS) is None
+    assert '[WARNING] Snapshot cache read failed' in capsys.readouterr().out
+
+
+def test_store_replaces_previous_snapshot(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    updated = {'data': {'prg': [], 'grs': [], 'consumers': []}, 'fingerprints': None}
+    cache.store(workbook, SETTINGS, updated)
+
+    assert cache.load(workbook, SETTINGS) == updated
+    assert len(list(cache.cache_dir.iterdir())) == 1
+
+
+def test_clear(cache, workbook):
+    cache.store(workbook, SETTINGS, DATA)
+    cache.store(workbook, {}, DATA)
+
+    assert cache.clear() == 2
+    assert cache.load(workbook, SETTINGS) is None
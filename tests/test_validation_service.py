@@ -0,0 +1,67 @@
+"""PRG coverage analysis of ValidationService against the nested-loop scan."""
+
+from collections import Counter
+
+import pytest
+
+from prg.business import ValidationService
+from prg.data import DataStore
+from benchmarks.synthetic_workbook import build_records
+
+
+def nested_loop_unbound(prg_data, consumer_data):
+    """Previous find_unbound_prg: every consumer per PRG."""
+    unbound_prg = []
+    for prg in prg_data:
+        prg_mo = prg['mo'].strip().lower()
+        prg_settlement = prg['settlement'].strip().lower()
+        has_consumers = False
+        for consumer in consumer_data:
+            if (prg_mo == consumer['mo'].strip().lower()
+                    and prg_settlement == consumer['settlement'].strip().lower()):
+                has_consumers = True
+                break
+        if not has_consumers:
+            unbound_prg.append(prg)
+    return unbound_prg
+
+
+@pytest.fixture
+def data():
+    # More settlements than consumers cover, so some PRGs are unbound
+    records = build_records(n_prg=200, n_grs=5, n_population=300, n_organizations=100, n_settlements=150)
+    for number, consumer in enumerate(records['consumers']):
+        if consumer['settlement'].endswith('7'):
+            consumer['settlement'] += ' (старый)'
+        elif number % 5 == 0:
+            consumer['mo'] = f"  {consumer['mo'].upper()} "
+            consumer['settlement'] = consumer['settlement'].lower() + ' '
+    return records
+
+
+@pytest.mark.parametrize('with_store', [False, True])
+def test_unbound_prg_equals_nested_loop(data, with_store):
+    store = DataStore(data['prg'], data['grs'], data['consumers']) if with_store else None
+    service = ValidationService(store)
+
+    unbound = service.find_unbound_prg(data['prg'], data['consumers'])
+
+    assert unbound == nested_loop_unbound(data['prg'], data['consumers'])
+    assert 0 < len(unbound) < len(data['prg'])
+
+
+@pytest.mark.parametrize('with_store', [False, True])
+def test_settlement_counts(data, with_store):
+    store = DataStore(data['prg'], data['grs'], data['consumers']) if with_store else None
+
+    _, counts = ValidationService(store).analyze_prg_coverage(data['prg'], data['consumers'])
+
+    assert counts == Counter((c['mo'].strip().lower(), c['settlement'].strip().lower())
+                             for c in data['consumers'])
+
+
+def test_without_consumers(data):
+    service = ValidationService()
+
+    assert service.find_unbound_prg(data['prg'], []) == data['prg']
+    assert service.find_unbound_prg([], data['consumers']) == []
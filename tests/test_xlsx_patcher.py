@@ -0,0 +1,165 @@
+"""Round trip of patch_cells against openpyxl writes."""
+
+import os
+import struct
+import zipfile
+
+import numpy as np
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from prg.data import patch_cells, XlsxPatchError
+from prg.data.xlsx_parts import sheet_part_paths
+
+EDITS = {
+    'ПРГ': {
+        (1, 3): 12.5,                      # number over a number
+        (2, 3): np.float64(0.1),           # numpy float
+        (1, 4): 7,                         # int into an empty cell of an existing row
+        (3, 0): True,                      # bool
+    },
+    'Население': {
+        (1, 2): 'ПРГ-1|0,5|ГРС <1> & Ко',  # text with XML special characters
+        (2, 2): '  padded  ',              # leading/trailing spaces
+        (3, 2): None,                      # cleared cell
+        (2, 1): '',                        # cleared styled cell
+        (9, 6): 'new row',                 # row and column beyond the used range
+    },
+}
+
+
+def build(path):
+    wb = Workbook()
+    prg = wb.active
+    prg.title = 'ПРГ'
+    prg.append(['id', 'mo', 'settlement', 'QY', 'QH'])
+    for i in range(4):
+        prg.append([f"ПРГ-{i}", 'Район', 'НП', i * 1.5, None])
+    population = wb.create_sheet('Население')
+    population.append(['id', 'name', 'code'])
+    for i in range(4):
+        population.append([i, f"Дом {i}", f"ПРГ-{i}|1|ГРС"])
+    population['B3'].font = Font(bold=True)
+    wb.create_sheet('Пустой')
+    wb.save(path)
+    wb.close()
+
+
+def values(path):
+    wb = load_workbook(path)
+    result = {ws.title: [[cell.value for cell in row] for row in ws.iter_rows()] for ws in wb}
+    wb.close()
+    return result
+
+
+def parts(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}, sheet_part_paths(archive)
+
+
+@pytest.fixture
+def original(tmp_path):
+    path = tmp_path / 'original.xlsx'
+    build(path)
+    return path
+
+
+def test_patched_values_equal_openpyxl_writes(tmp_path, original):
+    expected_path = tmp_path / 'openpyxl.xlsx'
+    wb = load_workbook(original)
+    for sheet_name, cells in EDITS.items():
+        for (row, col), value in cells.items():
+            # Assigned, not cell(value=...): that call ignores None
+            wb[sheet_name].cell(row=row + 1, column=col + 1).value = \
+                float(value) if isinstance(value, np.floating) else value or None
+    wb.save(expected_path)
+    wb.close()
+
+    patched = tmp_path / 'patched.xlsx'
+    patched.write_bytes(original.read_bytes())
+    written = patch_cells(patched, EDITS)
+
+    assert written == {name: len(cells) for name, cells in EDITS.items()}
+    assert values(patched) == values(expected_path)
+    assert load_workbook(patched)['Население']['B3'].font.b
+
+
+def test_other_parts_are_byte_identical(tmp_path, original):
+    patched = tmp_path / 'patched.xlsx'
+    patched.write_bytes(original.read_bytes())
+    patch_cells(patched, EDITS)
+
+    before, paths = parts(original)
+    after, _ = parts(patched)
+    edited = {paths[name] for name in EDITS}
+    assert list(after) == list(before)
+    assert {name for name in before if after[name] != before[name]} <= edited
+
+
+def test_missing_sheets_are_left_out(original):
+    assert patch_cells(original, {'Нет такого': {(0, 0): 1}, 'ПРГ': {(1, 3): 2}}) == {'ПРГ': 1}
+
+
+def test_keeps_file_mode(original):
+    os.chmod(original, 0o664)
+    patch_cells(original, {'ПРГ': {(1, 3): 2}})
+    assert os.stat(original).st_mode & 0o777 == 0o664
+
+
+@pytest.mark.parametrize('value', ['=SUM(A1:A2)', 'bad\x01char', float('nan'), np.int64(3), object()])
+def test_values_that_cannot_be_written_leave_the_file_untouched(original, value):
+    content = original.read_bytes()
+    with pytest.raises(XlsxPatchError):
+        patch_cells(original, {'ПРГ': {(1, 3): value}})
+    assert original.read_bytes() == content
+
+
+def test_formula_cell_is_not_overwritten(tmp_path):
+    path = tmp_path / 'formula.xlsx'
+    wb = Workbook()
+    wb.active.title = 'ПРГ'
+    wb.active['A1'] = 1
+    wb.active['B1'] = '=A1*2'
+    wb.save(path)
+
+    with pytest.raises(XlsxPatchError):
+        patch_cells(path, {'ПРГ': {(0, 1): 5}})
+
+
+def extra_records(extra):
+    records = []
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, size = struct.unpack_from('<HH', extra, pos)
+        records.append((header_id, extra[pos + 4:pos + 4 + size]))
+        pos += 4 + size
+    return records
+
+
+def local_extra(path, info):
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        f.seek(info.header_offset + 30 + name_length)
+        return f.read(extra_length)
+
+
+def test_zip64_extra_field_is_not_copied(tmp_path, original):
+    # Parts carrying a zip64 field (as written for large parts) next to another field
+    custom = struct.pack('<HH', 0xCAFE, 3) + b'abc'
+    zip64 = struct.pack('<HHQQ', 1, 16, 0, 0)
+    path = tmp_path / 'zip64.xlsx'
+    with zipfile.ZipFile(original) as source, zipfile.ZipFile(path, 'w') as target:
+        for info in source.infolist():
+            info.extra = zip64 + custom
+            target.writestr(info, source.read(info))
+
+    patch_cells(path, EDITS)
+
+    with zipfile.ZipFile(path) as patched:
+        assert patched.testzip() is None
+        for info in patched.infolist():
+            assert extra_records(info.extra) == [(0xCAFE, b'abc')]
+            assert extra_records(local_extra(path, info)) == [(0xCAFE, b'abc')]